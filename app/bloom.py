@@ -0,0 +1,135 @@
+"""
+Compact Bloom filter for fast "definitely not seen" checks.
+
+Used by app.database to answer most dedupe lookups without touching SQLite:
+a negative answer is always correct, a positive one must be confirmed.
+"""
+
+import hashlib
+import math
+import os
+import struct
+from pathlib import Path
+
+# File header: magic, format version, num_bits, num_hashes, capacity, count,
+# watermark length (followed by the watermark and the bit array)
+_MAGIC = b"FSBF"
+_VERSION = 1
+_HEADER = struct.Struct("<4sHQIQQH")
+
+
+class BloomFilter:
+    """Bloom filter over string keys, backed by a bytearray."""
+
+    def __init__(
+        self,
+        capacity: int,
+        error_rate: float = 0.001,
+        num_bits: int | None = None,
+        num_hashes: int | None = None,
+        bits: bytearray | None = None,
+        count: int = 0,
+    ):
+        """
+        Create an empty filter sized for `capacity` keys at `error_rate`.
+
+        Args:
+            capacity: Expected number of keys
+            error_rate: Target false-positive rate at capacity
+            num_bits: Explicit bit count (used when loading from disk)
+            num_hashes: Explicit hash count (used when loading from disk)
+            bits: Existing bit array (used when loading from disk)
+            count: Number of keys already added (used when loading from disk)
+        """
+        capacity = max(1, capacity)
+        if num_bits is None:
+            num_bits = math.ceil(-capacity * math.log(error_rate) / (math.log(2) ** 2))
+        if num_hashes is None:
+            num_hashes = max(1, round(num_bits / capacity * math.log(2)))
+
+        self.capacity = capacity
+        self.num_bits = num_bits
+        self.num_hashes = num_hashes
+        self.count = count
+        self._bits = bits if bits is not None else bytearray((num_bits + 7) // 8)
+
+    def _positions(self, key: str) -> list[int]:
+        """Bit positions for a key (Kirsch-Mitzenmacher double hashing)."""
+        digest = hashlib.blake2b(key.encode(), digest_size=16).digest()
+        h1 = int.from_bytes(digest[:8], "little")
+        h2 = int.from_bytes(digest[8:], "little") | 1
+        m = self.num_bits
+        return [(h1 + i * h2) % m for i in range(self.num_hashes)]
+
+    def add(self, key: str) -> None:
+        """Add a key to the filter."""
+        bits = self._bits
+        for pos in self._positions(key):
+            bits[pos >> 3] |= 1 << (pos & 7)
+        self.count += 1
+
+    def __contains__(self, key: str) -> bool:
+        """Return False if the key was definitely never added."""
+        bits = self._bits
+        return all(bits[pos >> 3] & (1 << (pos & 7)) for pos in self._positions(key))
+
+    def __len__(self) -> int:
+        return self.count
+
+    @property
+    def is_saturated(self) -> bool:
+        """True once more keys were added than the filter was sized for."""
+        return self.count > self.capacity
+
+    def save(self, path: str, watermark: str = "") -> None:
+        """
+        Atomically write the filter to disk.
+
+        Args:
+            path: Destination file
+            watermark: Opaque marker of how far the source data was covered
+        """
+        encoded = watermark.encode()
+        tmp_path = f"{path}.tmp"
+        with open(tmp_path, "wb") as f:
+            f.write(_HEADER.pack(
+                _MAGIC, _VERSION, self.num_bits, self.num_hashes,
+                self.capacity, self.count, len(encoded),
+            ))
+            f.write(encoded)
+            f.write(self._bits)
+        os.replace(tmp_path, path)
+
+    @classmethod
+    def load(cls, path: str) -> tuple["BloomFilter", str] | None:
+        """
+        Read a filter written by save().
+
+        Returns:
+            (filter, watermark), or None if the file is missing or invalid
+        """
+        try:
+            data = Path(path).read_bytes()
+            magic, version, num_bits, num_hashes, capacity, count, wm_len = (
+                _HEADER.unpack_from(data)
+            )
+        except (OSError, struct.error):
+            return None
+
+        if magic != _MAGIC or version != _VERSION:
+            return None
+
+        offset = _HEADER.size
+        watermark = data[offset:offset + wm_len].decode(errors="replace")
+        bits = bytearray(data[offset + wm_len:])
+        if len(bits) != (num_bits + 7) // 8:
+            return None
+
+        bloom = cls(
+            capacity,
+            num_bits=num_bits,
+            num_hashes=num_hashes,
+            bits=bits,
+            count=count,
+        )
+        return bloom, watermark
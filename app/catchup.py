@@ -0,0 +1,261 @@
+"""
+Catch-up mode for draining a mention backlog after downtime.
+
+A poll reads only the newest RSSHub page. After an outage that page can be
+entirely newer than last_seen_id, so the mentions between last_seen_id and
+the page's oldest entry are never fetched, and the poll moves last_seen_id
+past them. The poll reports such a gap here instead of losing it.
+
+The catch-up runner pages backward through RSSHub (keyword search with
+max_id) from the gap's top down to the old last_seen_id. It runs in the
+background while normal polling continues, with its own budgets:
+
+- catchup_max_pages_per_run RSSHub pages per run (a paused run resumes on
+  the next poll), catchup_page_delay_seconds apart
+- catchup_batch_size tweets per Grok request, and the next page is fetched
+  while the current one is analyzed
+
+Replies go through the shared outbox, where their age already ranks them
+below fresh mentions. Catch-up replies to mentions up to catchup_max_age_hours
+old (live polls stop at reply_max_age_hours, which an outage longer than a
+day would otherwise exceed for the whole backlog); older ones are skipped
+and counted as stale, and a page of only such mentions ends the gap early
+(everything older is staler).
+
+Progress is kept in the poll_state table, so a restart resumes where the
+runner stopped.
+"""
+
+import asyncio
+import json
+import logging
+import time
+from dataclasses import asdict, dataclass, field
+from typing import Awaitable, Callable
+
+from app.config import get_settings
+from app.database import get_poll_state, set_poll_state
+from app.priority import is_stale
+from app.rss_client import FeedPage, RSSMention, fetch_mentions_page
+
+logger = logging.getLogger(__name__)
+
+# poll_state key the progress is persisted under
+CATCHUP_STATE_KEY = "catchup"
+
+# Analyzes mentions (oldest first) in batches of the given size, skipping
+# those older than the given age limit in hours, and returns the ones that
+# failed, by tweet ID (see app.main)
+MentionHandler = Callable[
+    [list[RSSMention], int, float], Awaitable[dict[str, BaseException]]
+]
+
+
+@dataclass
+class Gap:
+    """Mentions newer than `floor` and older than `cursor` not yet fetched."""
+    floor: str  # last_seen_id when the gap was found
+    cursor: str  # everything from here up has been handled
+
+
+@dataclass
+class CatchUpProgress:
+    """Persisted catch-up state, also reported by the /catchup endpoint."""
+    gaps: list[Gap] = field(default_factory=list)
+    pages: int = 0
+    mentions: int = 0
+    stale: int = 0  # skipped as older than catchup_max_age_hours
+    failed: int = 0
+    last_error: str | None = None
+    started_at: float | None = None
+    finished_at: float | None = None
+
+
+class CatchUpRunner:
+    """Pages backward through RSSHub until every reported gap is closed."""
+
+    def __init__(self, progress: CatchUpProgress | None = None):
+        """
+        Args:
+            progress: Saved progress to resume from
+        """
+        self.progress = progress or CatchUpProgress()
+        self._task: asyncio.Task | None = None
+
+    @property
+    def active(self) -> bool:
+        """True while a catch-up run is in progress."""
+        return self._task is not None and not self._task.done()
+
+    def add_gap(self, floor: str, ceiling: str) -> None:
+        """
+        Record mentions between `floor` and `ceiling` (both exclusive) as missing.
+
+        A gap reported again with the same floor (the poll held
+        last_seen_id) is widened instead of duplicated.
+        """
+        for gap in self.progress.gaps:
+            if gap.floor == floor:
+                if int(ceiling) > int(gap.cursor):
+                    gap.cursor = ceiling
+                return
+        logger.warning(f"Feed page didn't reach last_seen_id {floor}; catching up below {ceiling}")
+        self.progress.gaps.append(Gap(floor, ceiling))
+        if self.progress.started_at is None or self.progress.finished_at is not None:
+            self.progress.started_at = time.time()
+            self.progress.finished_at = None
+
+    def resume(self, handle: MentionHandler) -> bool:
+        """
+        Start a background run if there are open gaps and none is running.
+
+        Args:
+            handle: Analyzes a list of mentions (see MentionHandler)
+
+        Returns:
+            True if a run was started
+        """
+        if self.active or not self.progress.gaps or not get_settings().catchup_enabled:
+            return False
+        self._task = asyncio.create_task(self.run(handle))
+        return True
+
+    async def stop(self) -> None:
+        """Cancel a run in progress (its progress so far is kept)."""
+        if self.active:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+
+    async def run(self, handle: MentionHandler) -> None:
+        """Work through the open gaps within this run's page budget."""
+        settings = get_settings()
+        budget = max(1, settings.catchup_max_pages_per_run)
+        try:
+            while self.progress.gaps and budget > 0:
+                gap = self.progress.gaps[0]
+                budget, closed = await self._catch_up(gap, handle, budget)
+                if not closed:
+                    break
+                self.progress.gaps.pop(0)
+                logger.info(f"Caught up to last_seen_id {gap.floor}")
+            if not self.progress.gaps:
+                self.progress.finished_at = time.time()
+                self.progress.last_error = None
+            elif budget <= 0:
+                logger.info("Catch-up page budget spent, resuming on the next poll")
+        finally:
+            await asyncio.to_thread(self.save)
+
+    async def _catch_up(self, gap: Gap, handle: MentionHandler, budget: int) -> tuple[int, bool]:
+        """
+        Page backward through one gap.
+
+        Returns:
+            (pages left in the budget, True if the gap is closed)
+        """
+        settings = get_settings()
+        batch_size = max(1, settings.catchup_batch_size)
+        fetch = asyncio.create_task(self._fetch(gap.floor, gap.cursor, delay=0.0))
+        try:
+            while True:
+                page = await fetch
+                budget -= 1
+                self.progress.pages += 1
+                if page is None:
+                    self._pause("RSSHub page fetch failed")
+                    return budget, False
+
+                mentions = sorted(page.mentions, key=lambda m: int(m.tweet_id))
+                if not mentions:
+                    return budget, True
+
+                # Fetch the next page while this one is analyzed
+                more = not page.reached_since and budget > 0
+                if more:
+                    fetch = asyncio.create_task(self._fetch(
+                        gap.floor, mentions[0].tweet_id, settings.catchup_page_delay_seconds
+                    ))
+
+                self.progress.mentions += len(mentions)
+                failures = await handle(mentions, batch_size, settings.catchup_max_age_hours)
+
+                # The cursor only moves down over a contiguous run of handled
+                # mentions, so a failed one is fetched again when resuming
+                now = time.time()
+                stale = {
+                    mention.tweet_id for mention in mentions
+                    if is_stale(mention, now, settings.catchup_max_age_hours)
+                }
+                for mention in reversed(mentions):
+                    if mention.tweet_id in failures:
+                        self.progress.failed += 1
+                        self._pause(f"mention {mention.tweet_id} failed: {failures[mention.tweet_id]!r}")
+                        return budget, False
+                    gap.cursor = mention.tweet_id
+                    if mention.tweet_id in stale:
+                        self.progress.stale += 1
+                await asyncio.to_thread(self.save)
+
+                if page.reached_since:
+                    return budget, True
+                if len(stale) == len(mentions):
+                    logger.info("Catch-up reached mentions too old to reply to, stopping")
+                    return budget, True
+                if not more:
+                    return budget, False
+        finally:
+            if not fetch.done():
+                fetch.cancel()
+
+    @staticmethod
+    async def _fetch(floor: str, below: str, delay: float) -> FeedPage | None:
+        """Fetch the page of mentions newer than `floor` and older than `below`."""
+        if delay > 0:
+            await asyncio.sleep(delay)
+        return await fetch_mentions_page(since_id=floor, max_id=str(int(below) - 1))
+
+    def _pause(self, error: str) -> None:
+        logger.warning(f"Catch-up paused: {error}")
+        self.progress.last_error = error
+
+    def save(self) -> None:
+        """Persist the progress (blocking; run in a worker thread)."""
+        set_poll_state(CATCHUP_STATE_KEY, json.dumps(asdict(self.progress)))
+
+    def stats(self) -> dict:
+        """Progress for the /catchup and /status endpoints."""
+        return {"active": self.active, **asdict(self.progress)}
+
+
+def _load_progress() -> CatchUpProgress | None:
+    saved = get_poll_state(CATCHUP_STATE_KEY)
+    if not saved:
+        return None
+    try:
+        state = json.loads(saved)
+        state["gaps"] = [Gap(**gap) for gap in state.get("gaps", [])]
+        return CatchUpProgress(**state)
+    except (TypeError, ValueError) as e:
+        logger.warning(f"Ignoring unreadable saved catch-up progress: {e}")
+        return None
+
+
+# Global runner instance - restored from the database on first use
+_catchup_runner: CatchUpRunner | None = None
+
+
+def get_catchup_runner() -> CatchUpRunner:
+    """Get the global catch-up runner, restoring its saved progress if needed."""
+    global _catchup_runner
+    if _catchup_runner is None:
+        _catchup_runner = CatchUpRunner(_load_progress())
+    return _catchup_runner
+
+
+def reset_catchup_runner() -> None:
+    """Drop the runner so it is reloaded (for testing)."""
+    global _catchup_runner
+    _catchup_runner = None
@@ -22,20 +22,119 @@ class Settings(BaseSettings):
 
     # RSSHub configuration (for reading tweets - bypasses API limits)
     rsshub_url: str = "http://localhost:1200"
+    # Comma-separated RSSHub mirrors: requests are hedged across rsshub_url
+    # and these, and slow or failing instances ejected (see app/rss_instances.py)
+    rsshub_mirrors: str = ""
     rsshub_access_key: str | None = None
 
     # Grok API
     grok_api_key: str
 
-    # Polling configuration
+    # Grok results are cached by tweet content; 0 hours disables the cache
+    analysis_cache_ttl_hours: int = 24
+    # Entries kept in the in-memory LRU tier in front of SQLite
+    analysis_cache_size: int = 1024
+    # Reuse analyses of near-duplicate tweets (estimated Jaccard similarity
+    # of character shingles) analyzed within the window; 0 minutes disables
+    near_duplicate_min_similarity: float = 0.8
+    near_duplicate_window_minutes: int = 60
+
+    # Polling configuration. The interval starts at poll_interval_minutes and
+    # then follows the mention rate (see app/poll_interval.py): about
+    # poll_target_mentions new mentions per poll, growing by
+    # poll_backoff_factor after empty polls, within the min/max bounds
+    # (set them equal for a fixed interval)
     poll_interval_minutes: int = 5
+    poll_interval_min_seconds: int = 60
+    poll_interval_max_seconds: int = 900
+    poll_target_mentions: float = 2.0
+    poll_backoff_factor: float = 2.0
+
+    # Catch-up after downtime (see app/catchup.py): when the newest feed page
+    # doesn't reach last_seen_id, older pages are read in the background,
+    # at most catchup_max_pages_per_run per poll and catchup_page_delay_seconds
+    # apart, analyzing catchup_batch_size mentions per Grok request
+    catchup_enabled: bool = True
+    catchup_max_pages_per_run: int = 10
+    catchup_page_delay_seconds: float = 2.0
+    catchup_batch_size: int = 16
+    # Mentions found by catch-up are replied to up to this age (0 = no
+    # limit); live polls stop at reply_max_age_hours, which would otherwise
+    # skip the whole backlog of an outage longer than a day
+    catchup_max_age_hours: float = 72.0
+
+    # With several worker processes, the one holding the leader lease polls,
+    # catches up and posts (see app/leader.py); it renews the lease every
+    # third of this and another process takes over once it lapses
+    leader_lease_seconds: int = 30
+    # A mention claimed for analysis is freed after this long if its holder
+    # crashed (longer than any Grok call with its retries)
+    mention_claim_seconds: int = 600
+    # Every process (leader or not) claims and analyzes waiting mentions
+    # this often, as many as its Grok limiter lets through
+    mention_worker_seconds: int = 5
+
+    # Grok requests allowed in flight at startup (the adaptive limiter below
+    # takes it from there)
+    max_concurrent_mentions: int = 4
+
+    # Mentions analyzed together in one Grok request (1 disables batching)
+    grok_batch_size: int = 8
+
+    # Stream single-tweet analyses and stop once confidence is below threshold
+    grok_streaming: bool = True
+
+    # Adaptive (AIMD) limit on concurrent Grok requests across the process.
+    # It starts at max_concurrent_mentions, grows while responses are
+    # healthy and halves (at most once per round trip) on 429/5xx/timeouts or
+    # responses slower than the target per analyzed tweet
+    grok_min_concurrency: int = 1
+    grok_max_concurrency: int = 16
+    grok_latency_target_seconds: float = 30.0
 
     # Confidence threshold (0-100) - only post if confidence >= this value
     confidence_threshold: int = 90
 
+    # Local pre-filter that drops mentions unlikely to clear the threshold
+    # before calling Grok (see app/prefilter.py)
+    prefilter_enabled: bool = True
+    # Mentions with fewer real words (no handles, links or trigger) are dropped
+    prefilter_min_words: int = 3
+    # Drop when the model's estimated chance of clearing the threshold is below this
+    prefilter_drop_below: float = 0.05
+    # Share of would-be-dropped mentions analyzed anyway to measure the filter
+    prefilter_shadow_rate: float = 0.05
+    prefilter_model_path: str = "data/prefilter_model.json"
+
+    # X write budget (see app/write_budget.py). Posts per 24 hours assumed
+    # until X's rate-limit headers report the real limit (X free tier: 17);
+    # what is left is spread over the day, at most reply_burst back to back
+    reply_rate_limit: int = 17
+    reply_burst: int = 3
+    # Transient posting failures (5xx, network) before a reply is abandoned
+    reply_max_attempts: int = 5
+    # Mentions a live poll finds older than this are not replied to
+    # (0 = no limit; catch-up uses catchup_max_age_hours)
+    reply_max_age_hours: float = 24.0
+
+    # Reply priority when the budget is short (see app/priority.py):
+    #   confidence weight * confidence / 100
+    #   + popularity weight * log2(mentions tagging the same tweet)
+    #   - age weight * hours since the mention was posted
+    priority_confidence_weight: float = 1.0
+    priority_popularity_weight: float = 0.25
+    priority_age_weight: float = 0.1
+
+    # Connection pools of the shared Grok/RSSHub/X clients (per client)
+    http_max_connections: int = 20
+    http_max_keepalive_connections: int = 10
+
     # App configuration
     database_path: str = "data/tweets.db"
 
+    # Processed tweets older than this (by snowflake timestamp) are pruned daily
+    retention_days: int = 30
+
     model_config = SettingsConfigDict(
         env_file=".env",
         env_file_encoding="utf-8",
@@ -1,15 +1,254 @@
 """
-SQLite database operations for tracking processed tweets and poll state.
-Prevents duplicate replies by storing tweet IDs.
+SQLite database operations for tracking processed tweets, mention states
+and poll state. Prevents duplicate replies by storing tweet IDs.
+
+Connections are long-lived and pooled per database path (WAL journaling,
+one writer, one reader per thread) instead of opened per call.
 """
 
+import logging
 import sqlite3
+import threading
+import time
 from contextlib import contextmanager
-from datetime import datetime, timezone
+from datetime import datetime, timedelta, timezone
 from pathlib import Path
-from typing import Generator
+from typing import Generator, Iterable
 
+from app.bloom import BloomFilter
 from app.config import get_settings
+from app.snowflake import snowflake_from_datetime
+
+logger = logging.getLogger(__name__)
+
+# Connection tuning applied to every pooled connection
+SQLITE_BUSY_TIMEOUT_MS = 5000
+SQLITE_CACHE_SIZE_KB = 16 * 1024  # page cache per connection
+SQLITE_MMAP_SIZE_BYTES = 256 * 1024 * 1024
+SQLITE_STATEMENT_CACHE_SIZE = 128  # prepared statements kept per connection
+# PRAGMA auto_vacuum value for INCREMENTAL
+AUTO_VACUUM_INCREMENTAL = 2
+
+# In-memory Bloom filter in front of processed_tweets (~1.8 MB at capacity)
+PROCESSED_FILTER_CAPACITY = 1_000_000
+PROCESSED_FILTER_ERROR_RATE = 0.001
+# Rows newer than (saved watermark - margin) are re-added on load, which
+# covers writes made after the last save and small clock adjustments
+PROCESSED_FILTER_RESCAN_MARGIN = timedelta(hours=1)
+
+# Current processed_tweets layout: snowflake IDs as INTEGER keys in a
+# WITHOUT ROWID table (one B-tree), timestamps as epoch seconds
+_SQL_CREATE_PROCESSED_TWEETS = """
+    CREATE TABLE IF NOT EXISTS processed_tweets (
+        tweet_id INTEGER PRIMARY KEY,
+        processed_at INTEGER NOT NULL
+    ) WITHOUT ROWID
+"""
+
+# SQL used by the helpers below. Keeping the text constant lets sqlite3's
+# per-connection statement cache reuse the prepared statements.
+_SQL_IS_PROCESSED = "SELECT 1 FROM processed_tweets WHERE tweet_id = ?"
+_SQL_MARK_PROCESSED = (
+    "INSERT OR IGNORE INTO processed_tweets (tweet_id, processed_at) VALUES (?, ?)"
+)
+# Largest IN (...) list per query; older SQLite builds cap host parameters at 999
+_MAX_IN_PARAMS = 500
+
+_SQL_GET_POLL_STATE = "SELECT value FROM poll_state WHERE key = ?"
+_SQL_SET_POLL_STATE = """
+    INSERT INTO poll_state (key, value, updated_at)
+    VALUES (?, ?, ?)
+    ON CONFLICT(key) DO UPDATE SET value = excluded.value, updated_at = excluded.updated_at
+"""
+_SQL_DELETE_POLL_STATE = "DELETE FROM poll_state WHERE key = ?"
+
+# Cached Grok analyses, keyed by a content hash computed in app.grok_client
+_SQL_CREATE_ANALYSIS_CACHE = """
+    CREATE TABLE IF NOT EXISTS analysis_cache (
+        cache_key TEXT PRIMARY KEY,
+        analysis TEXT NOT NULL,
+        latency_ms INTEGER NOT NULL,
+        created_at INTEGER NOT NULL
+    ) WITHOUT ROWID
+"""
+# Analyzed mentions with the prefilter's score and Grok's confidence,
+# used to train and evaluate app.prefilter offline
+_SQL_CREATE_PREFILTER_EXAMPLES = """
+    CREATE TABLE IF NOT EXISTS prefilter_examples (
+        id INTEGER PRIMARY KEY,
+        text TEXT NOT NULL,
+        score REAL NOT NULL,
+        confidence INTEGER NOT NULL,
+        shadow INTEGER NOT NULL,
+        created_at INTEGER NOT NULL
+    )
+"""
+_SQL_ADD_PREFILTER_EXAMPLE = """
+    INSERT INTO prefilter_examples (text, score, confidence, shadow, created_at)
+    VALUES (?, ?, ?, ?, ?)
+"""
+
+# Replies waiting to be posted by app.outbox, one row per mention. Status
+# moves pending -> sending -> sent, or back to pending for a retry, or to
+# failed once the reply can't (or mustn't) be posted. When the write budget
+# is short, higher-priority replies are posted first; priority is the
+# age-independent score from app.priority and published_at (the mention's
+# post time) supplies the age part.
+_SQL_CREATE_REPLY_OUTBOX = """
+    CREATE TABLE IF NOT EXISTS reply_outbox (
+        tweet_id INTEGER PRIMARY KEY,
+        text TEXT NOT NULL,
+        priority REAL NOT NULL DEFAULT 0,
+        published_at INTEGER,
+        status TEXT NOT NULL,
+        attempts INTEGER NOT NULL,
+        next_attempt_at INTEGER NOT NULL,
+        last_error TEXT,
+        reply_id TEXT,
+        created_at INTEGER NOT NULL,
+        updated_at INTEGER NOT NULL
+    ) WITHOUT ROWID
+"""
+_SQL_CREATE_REPLY_OUTBOX_DUE_INDEX = """
+    CREATE INDEX IF NOT EXISTS reply_outbox_due
+    ON reply_outbox (status, next_attempt_at)
+"""
+_SQL_ENQUEUE_REPLY = """
+    INSERT OR IGNORE INTO reply_outbox
+        (tweet_id, text, priority, published_at, status, attempts, next_attempt_at,
+         created_at, updated_at)
+    VALUES (?, ?, ?, ?, 'pending', 0, ?, ?, ?)
+"""
+# One statement, so a row can only ever be claimed once. Ranking by
+# priority + age weight * publish hour is the same as ranking by the score
+# minus the age penalty, which drops at the same rate for every row.
+_SQL_CLAIM_DUE_REPLY = """
+    UPDATE reply_outbox SET status = 'sending', updated_at = ?
+    WHERE tweet_id = (
+        SELECT tweet_id FROM reply_outbox
+        WHERE status = 'pending' AND next_attempt_at <= ?
+        ORDER BY priority + ? * COALESCE(published_at, created_at) / 3600.0 DESC,
+                 next_attempt_at, tweet_id
+        LIMIT 1
+    )
+    RETURNING tweet_id, text, attempts
+"""
+
+# Named leases held by one process at a time (app.leader). The holder
+# renews its lease before it expires; an expired lease can be taken over.
+_SQL_CREATE_LEASES = """
+    CREATE TABLE IF NOT EXISTS leases (
+        name TEXT PRIMARY KEY,
+        holder TEXT NOT NULL,
+        expires_at REAL NOT NULL
+    ) WITHOUT ROWID
+"""
+_SQL_ACQUIRE_LEASE = """
+    INSERT INTO leases (name, holder, expires_at) VALUES (:name, :holder, :expires_at)
+    ON CONFLICT(name) DO UPDATE SET holder = excluded.holder, expires_at = excluded.expires_at
+    WHERE leases.holder = excluded.holder OR leases.expires_at <= :now
+    RETURNING holder
+"""
+_SQL_RELEASE_LEASE = "DELETE FROM leases WHERE name = ? AND holder = ?"
+_SQL_GET_LEASE = "SELECT holder, expires_at FROM leases WHERE name = ?"
+
+# Every mention the bot has picked up, moved through its states by single
+# atomic statements:
+#
+#   discovered -> claimed -> analyzed -> queued -> posted
+#                     \           \          \-> skipped (reply failed)
+#                      \-----------\--> skipped (nothing to reply)
+#
+# A claim (claimed/analyzed) carries a lease; a worker that crashes leaves
+# its mentions to be reclaimed once the lease expires, and a failed mention
+# goes back to discovered. A mention can't be claimed once it is queued,
+# posted or skipped, or once it is in processed_tweets (checked here rather
+# than through the per-process Bloom filter), so overlapping polls in this
+# or another worker process never handle it twice. The mention itself is
+# stored as JSON so abandoned work can be picked up without the feed.
+MENTION_STATES = ("discovered", "claimed", "analyzed", "queued", "posted", "skipped")
+_SQL_CREATE_MENTIONS = """
+    CREATE TABLE IF NOT EXISTS mentions (
+        tweet_id INTEGER PRIMARY KEY,
+        state TEXT NOT NULL,
+        mention TEXT,
+        holder TEXT,
+        lease_expires_at REAL NOT NULL,
+        updated_at INTEGER NOT NULL
+    ) WITHOUT ROWID
+"""
+_SQL_CREATE_MENTIONS_STATE_INDEX = """
+    CREATE INDEX IF NOT EXISTS mentions_state ON mentions (state, lease_expires_at)
+"""
+# Unclaimed discoveries expire too, in case their discoverer crashed
+# before claiming them
+_SQL_DISCOVER_MENTION = """
+    INSERT OR IGNORE INTO mentions (tweet_id, state, mention, lease_expires_at, updated_at)
+    VALUES (?, 'discovered', ?, ?, ?)
+"""
+_SQL_CLAIM_MENTION = """
+    INSERT INTO mentions (tweet_id, state, holder, lease_expires_at, updated_at)
+    SELECT :tweet_id, 'claimed', :holder, :expires_at, :updated_at
+    WHERE NOT EXISTS (SELECT 1 FROM processed_tweets WHERE tweet_id = :tweet_id)
+    ON CONFLICT(tweet_id) DO UPDATE SET
+        state = 'claimed', holder = excluded.holder,
+        lease_expires_at = excluded.lease_expires_at, updated_at = excluded.updated_at
+    WHERE mentions.state = 'discovered'
+       OR (mentions.state IN ('claimed', 'analyzed') AND mentions.lease_expires_at <= :now)
+    RETURNING tweet_id
+"""
+_SQL_CLAIM_ABANDONED_MENTIONS = """
+    UPDATE mentions SET state = 'claimed', holder = :holder,
+        lease_expires_at = :expires_at, updated_at = :updated_at
+    WHERE tweet_id IN (
+        SELECT tweet_id FROM mentions
+        WHERE state IN ('discovered', 'claimed', 'analyzed')
+          AND lease_expires_at <= :now AND mention IS NOT NULL
+          AND NOT EXISTS (
+              SELECT 1 FROM processed_tweets WHERE tweet_id = mentions.tweet_id
+          )
+        ORDER BY tweet_id
+        LIMIT :limit
+    )
+    RETURNING tweet_id, mention
+"""
+_SQL_MARK_MENTION_ANALYZED = """
+    UPDATE mentions SET state = 'analyzed', updated_at = ?
+    WHERE tweet_id = ? AND state = 'claimed' AND holder = ?
+"""
+_SQL_RELEASE_MENTION = """
+    UPDATE mentions SET state = 'discovered', holder = NULL,
+        lease_expires_at = 0, updated_at = ?
+    WHERE tweet_id = ? AND state IN ('claimed', 'analyzed')
+"""
+# Finished without a queued reply (processed, or not a trigger mention)
+_SQL_SKIP_MENTION = """
+    UPDATE mentions SET state = 'skipped', holder = NULL, updated_at = ?
+    WHERE tweet_id = ? AND state IN ('discovered', 'claimed', 'analyzed')
+"""
+_SQL_QUEUE_MENTION = """
+    UPDATE mentions SET state = 'queued', holder = NULL, updated_at = ?
+    WHERE tweet_id = ? AND state IN ('discovered', 'claimed', 'analyzed')
+"""
+_SQL_POST_MENTION = "UPDATE mentions SET state = 'posted', updated_at = ? WHERE tweet_id = ?"
+# Replies the outbox gave up on leave their mention skipped
+_SQL_SKIP_FAILED_REPLIES = """
+    UPDATE mentions SET state = 'skipped', updated_at = ?
+    WHERE state = 'queued'
+      AND tweet_id IN (SELECT tweet_id FROM reply_outbox WHERE status = 'failed')
+"""
+
+_SQL_GET_CACHED_ANALYSIS = (
+    "SELECT analysis, latency_ms FROM analysis_cache WHERE cache_key = ? AND created_at >= ?"
+)
+_SQL_SET_CACHED_ANALYSIS = """
+    INSERT INTO analysis_cache (cache_key, analysis, latency_ms, created_at)
+    VALUES (?, ?, ?, ?)
+    ON CONFLICT(cache_key) DO UPDATE SET
+        analysis = excluded.analysis,
+        latency_ms = excluded.latency_ms,
+        created_at = excluded.created_at
+"""
 
 
 def _get_db_path() -> str:
@@ -17,10 +256,231 @@ def _get_db_path() -> str:
     return get_settings().database_path
 
 
+class ConnectionPool:
+    """
+    Long-lived SQLite connections for one database file.
+
+    A single writer connection is shared behind a lock, while each thread
+    gets its own read-only connection. With WAL journaling, readers never
+    block the writer (or each other). In-memory databases exist per
+    connection, so for ":memory:" every operation uses the writer.
+
+    The pool also owns the Bloom filter over processed tweet IDs, loaded by
+    init_db() and saved next to the database file on close. The filter
+    holds the rows present when it was last loaded or saved plus this
+    process's own writes, so its misses are only definitive with a single
+    worker process; with several, rows other processes write in between
+    are missing until the next load or save, and the mention claims'
+    SQL check against processed_tweets is what keeps them from being
+    handled twice.
+    """
+
+    def __init__(self, path: str):
+        self.path = path
+        self._in_memory = path == ":memory:"
+        self._write_lock = threading.Lock()
+        self._local = threading.local()
+        self._readers: list[sqlite3.Connection] = []
+        self._readers_lock = threading.Lock()
+        self._closed = False
+        self._writer = self._connect()
+        self.processed_filter: BloomFilter | None = None
+        # processed_at up to which every row of the table is in the filter
+        self._filter_watermark = 0
+
+    @property
+    def filter_path(self) -> str | None:
+        """Where the processed-tweets filter is persisted (None for :memory:)."""
+        return None if self._in_memory else f"{self.path}.bloom"
+
+    def _connect(self, read_only: bool = False) -> sqlite3.Connection:
+        """Open a connection with the pool's pragmas applied."""
+        conn = sqlite3.connect(
+            self.path,
+            check_same_thread=False,
+            timeout=SQLITE_BUSY_TIMEOUT_MS / 1000,
+            cached_statements=SQLITE_STATEMENT_CACHE_SIZE,
+        )
+        if not read_only:
+            # Lets prune_processed() hand freed pages back to the filesystem.
+            # Must come before anything (even the switch to WAL) writes the
+            # file header; init_db() converts older files with a VACUUM.
+            conn.execute("PRAGMA auto_vacuum=INCREMENTAL")
+        conn.execute("PRAGMA journal_mode=WAL")
+        conn.execute("PRAGMA synchronous=NORMAL")
+        conn.execute(f"PRAGMA cache_size=-{SQLITE_CACHE_SIZE_KB}")
+        conn.execute(f"PRAGMA mmap_size={SQLITE_MMAP_SIZE_BYTES}")
+        conn.execute(f"PRAGMA busy_timeout={SQLITE_BUSY_TIMEOUT_MS}")
+        conn.execute("PRAGMA temp_store=MEMORY")
+        if read_only:
+            conn.execute("PRAGMA query_only=ON")
+        return conn
+
+    @contextmanager
+    def reader(self) -> Generator[sqlite3.Connection, None, None]:
+        """Yield this thread's read connection."""
+        if self._closed:
+            raise sqlite3.ProgrammingError(f"Connection pool for {self.path} is closed")
+
+        if self._in_memory:
+            with self._write_lock:
+                yield self._writer
+            return
+
+        conn = getattr(self._local, "conn", None)
+        if conn is None:
+            conn = self._connect(read_only=True)
+            self._local.conn = conn
+            with self._readers_lock:
+                self._readers.append(conn)
+        yield conn
+
+    @contextmanager
+    def writer(self) -> Generator[sqlite3.Connection, None, None]:
+        """Yield the shared write connection, committing on success."""
+        if self._closed:
+            raise sqlite3.ProgrammingError(f"Connection pool for {self.path} is closed")
+
+        with self._write_lock:
+            try:
+                yield self._writer
+                self._writer.commit()
+            except BaseException:
+                self._writer.rollback()
+                raise
+
+    def load_processed_filter(self) -> None:
+        """
+        Load the processed-tweets filter from disk, catching up on rows
+        written since it was saved, or rebuild it from the table.
+        """
+        loaded = BloomFilter.load(self.filter_path) if self.filter_path else None
+
+        with self.writer() as conn:
+            if loaded is not None and not loaded[0].is_saturated:
+                bloom, watermark = loaded
+                try:
+                    since = int(watermark) - int(PROCESSED_FILTER_RESCAN_MARGIN.total_seconds())
+                except ValueError:
+                    since = 0
+                _add_processed_since(conn, bloom, since)
+                logger.info(f"Loaded processed-tweets filter ({len(bloom)} entries)")
+            else:
+                total = conn.execute("SELECT COUNT(*) FROM processed_tweets").fetchone()[0]
+                bloom = BloomFilter(
+                    max(PROCESSED_FILTER_CAPACITY, total * 2),
+                    PROCESSED_FILTER_ERROR_RATE,
+                )
+                for (tweet_id,) in conn.execute("SELECT tweet_id FROM processed_tweets"):
+                    bloom.add(str(tweet_id))
+                logger.info(f"Built processed-tweets filter from {total} rows")
+
+            self.processed_filter = bloom
+            self._filter_watermark = _max_processed_at(conn)
+
+    def save_processed_filter(self) -> None:
+        """
+        Persist the processed-tweets filter next to the database file.
+
+        Rows written since the filter was last synced (by this or another
+        worker process) are added first, so the saved watermark never
+        claims rows the snapshot doesn't hold, whichever process saves last.
+        """
+        if self.processed_filter is None or self.filter_path is None:
+            return
+
+        with self.writer() as conn:
+            since = self._filter_watermark - int(PROCESSED_FILTER_RESCAN_MARGIN.total_seconds())
+            _add_processed_since(conn, self.processed_filter, since)
+            watermark = _max_processed_at(conn)
+            try:
+                self.processed_filter.save(self.filter_path, str(watermark))
+            except OSError as e:
+                logger.warning(f"Could not save processed-tweets filter: {e}")
+            else:
+                self._filter_watermark = watermark
+
+    def close(self) -> None:
+        """Save the filter, then close the writer and every reader connection."""
+        if not self._closed:
+            self.save_processed_filter()
+        self._closed = True
+        with self._readers_lock:
+            readers, self._readers = self._readers, []
+        for conn in readers:
+            conn.close()
+        with self._write_lock:
+            self._writer.close()
+
+
+def _add_processed_since(conn: sqlite3.Connection, bloom: BloomFilter, since: int) -> None:
+    """Add processed tweets from `since` (epoch seconds) on that the filter lacks."""
+    cursor = conn.execute(
+        "SELECT tweet_id FROM processed_tweets WHERE processed_at >= ?", (since,)
+    )
+    for (tweet_id,) in cursor:
+        # Re-adding a key would inflate the count and the error estimate
+        if str(tweet_id) not in bloom:
+            bloom.add(str(tweet_id))
+
+
+def _max_processed_at(conn: sqlite3.Connection) -> int:
+    """Newest processed_at in the table (0 if empty)."""
+    return conn.execute("SELECT MAX(processed_at) FROM processed_tweets").fetchone()[0] or 0
+
+
+# Pools keyed by database path, created on first use
+_pools: dict[str, ConnectionPool] = {}
+_pools_lock = threading.Lock()
+
+
+def get_pool(db_path: str | None = None) -> ConnectionPool:
+    """
+    Get the connection pool for a database, creating it if needed.
+
+    Args:
+        db_path: Optional path override (used for testing)
+
+    Returns:
+        The shared ConnectionPool for that path
+    """
+    path = db_path or _get_db_path()
+    pool = _pools.get(path)
+    if pool is None:
+        with _pools_lock:
+            pool = _pools.get(path)
+            if pool is None:
+                pool = ConnectionPool(path)
+                _pools[path] = pool
+    return pool
+
+
+def save_processed_filter(db_path: str | None = None) -> None:
+    """
+    Snapshot the processed-tweets filter without closing the pool, so a
+    crash loses at most the rows written since (they are rescanned on load).
+
+    Args:
+        db_path: Optional path override (used for testing)
+    """
+    get_pool(db_path).save_processed_filter()
+
+
+def close_pools() -> None:
+    """Close every open connection pool (called on app shutdown)."""
+    with _pools_lock:
+        pools = list(_pools.values())
+        _pools.clear()
+    for pool in pools:
+        pool.close()
+
+
 def init_db(db_path: str | None = None) -> None:
     """
     Initialize the database and create tables if they don't exist.
 
+    Also opens the connection pool used by the helpers below.
+
     Args:
         db_path: Optional path override (used for testing)
     """
@@ -30,14 +490,18 @@ def init_db(db_path: str | None = None) -> None:
     if path != ":memory:":
         Path(path).parent.mkdir(parents=True, exist_ok=True)
 
-    with sqlite3.connect(path) as conn:
+    pool = get_pool(path)
+    migrated = False
+
+    with pool.writer() as conn:
+        # Files created before auto_vacuum was set need a VACUUM to switch
+        needs_vacuum = conn.execute("PRAGMA auto_vacuum").fetchone()[0] != AUTO_VACUUM_INCREMENTAL
+        if needs_vacuum:
+            conn.execute("PRAGMA auto_vacuum=INCREMENTAL")
+
         # Table for tracking processed tweets
-        conn.execute("""
-            CREATE TABLE IF NOT EXISTS processed_tweets (
-                tweet_id TEXT PRIMARY KEY,
-                processed_at TEXT NOT NULL
-            )
-        """)
+        migrated = _migrate_processed_tweets(conn)
+        conn.execute(_SQL_CREATE_PROCESSED_TWEETS)
 
         # Table for storing poll state (like last_seen_id)
         conn.execute("""
@@ -47,14 +511,76 @@ def init_db(db_path: str | None = None) -> None:
                 updated_at TEXT NOT NULL
             )
         """)
+        conn.execute(_SQL_CREATE_ANALYSIS_CACHE)
+        conn.execute(_SQL_CREATE_PREFILTER_EXAMPLES)
+        conn.execute(_SQL_CREATE_REPLY_OUTBOX)
+        _migrate_reply_outbox(conn)
+        conn.execute(_SQL_CREATE_REPLY_OUTBOX_DUE_INDEX)
+        conn.execute(_SQL_CREATE_LEASES)
+        conn.execute(_SQL_CREATE_MENTIONS)
+        conn.execute(_SQL_CREATE_MENTIONS_STATE_INDEX)
 
-        conn.commit()
+    if migrated or needs_vacuum:
+        # Rebuild the file so the new layout and auto_vacuum take effect
+        with pool.writer() as conn:
+            conn.execute("VACUUM")
+
+    pool.load_processed_filter()
+
+
+def _migrate_processed_tweets(conn: sqlite3.Connection) -> bool:
+    """
+    Convert the legacy TEXT-keyed processed_tweets table to the current
+    INTEGER / WITHOUT ROWID layout.
+
+    Legacy rows keep their snowflake ID; ISO timestamps become epoch
+    seconds. Rows whose ID isn't numeric can't be a real tweet and are
+    dropped.
+
+    Returns:
+        True if a migration was performed
+    """
+    columns = conn.execute("PRAGMA table_info(processed_tweets)").fetchall()
+    types = {row[1]: row[2].upper() for row in columns}
+    if types.get("tweet_id") != "TEXT":
+        return False
+
+    logger.info("Migrating processed_tweets to INTEGER keys (WITHOUT ROWID)...")
+    conn.execute("BEGIN")
+    conn.execute("ALTER TABLE processed_tweets RENAME TO processed_tweets_legacy")
+    conn.execute(_SQL_CREATE_PROCESSED_TWEETS)
+    conn.execute(
+        """
+        INSERT OR IGNORE INTO processed_tweets (tweet_id, processed_at)
+        SELECT CAST(tweet_id AS INTEGER),
+               COALESCE(CAST(strftime('%s', processed_at) AS INTEGER), 0)
+        FROM processed_tweets_legacy
+        WHERE tweet_id <> '' AND tweet_id NOT GLOB '*[^0-9]*'
+        """
+    )
+    conn.execute("DROP TABLE processed_tweets_legacy")
+    return True
+
+
+def _migrate_reply_outbox(conn: sqlite3.Connection) -> None:
+    """Add the priority columns to reply_outbox tables created without them."""
+    columns = {row[1] for row in conn.execute("PRAGMA table_info(reply_outbox)")}
+    if "priority" not in columns:
+        logger.info("Adding priority column to reply_outbox...")
+        conn.execute("ALTER TABLE reply_outbox ADD COLUMN priority REAL NOT NULL DEFAULT 0")
+    if "published_at" not in columns:
+        logger.info("Adding published_at column to reply_outbox...")
+        conn.execute("ALTER TABLE reply_outbox ADD COLUMN published_at INTEGER")
 
 
 @contextmanager
 def get_connection(db_path: str | None = None) -> Generator[sqlite3.Connection, None, None]:
     """
-    Context manager for database connections.
+    Context manager for a one-off database connection.
+
+    The helpers in this module use the pooled connections from get_pool();
+    this is for ad-hoc access (scripts, maintenance) that wants its own
+    short-lived connection.
 
     Args:
         db_path: Optional path override (used for testing)
@@ -70,7 +596,7 @@ def get_connection(db_path: str | None = None) -> Generator[sqlite3.Connection,
         conn.close()
 
 
-def is_processed(tweet_id: str, db_path: str | None = None) -> bool:
+def is_processed(tweet_id: str | int, db_path: str | None = None) -> bool:
     """
     Check if a tweet has already been processed.
 
@@ -81,15 +607,20 @@ def is_processed(tweet_id: str, db_path: str | None = None) -> bool:
     Returns:
         True if tweet was already processed, False otherwise
     """
-    with get_connection(db_path) as conn:
-        cursor = conn.execute(
-            "SELECT 1 FROM processed_tweets WHERE tweet_id = ?",
-            (tweet_id,)
-        )
+    pool = get_pool(db_path)
+    snowflake = int(tweet_id)
+
+    # A Bloom filter miss is definitive; only hits need confirming in SQLite
+    bloom = pool.processed_filter
+    if bloom is not None and str(snowflake) not in bloom:
+        return False
+
+    with pool.reader() as conn:
+        cursor = conn.execute(_SQL_IS_PROCESSED, (snowflake,))
         return cursor.fetchone() is not None
 
 
-def mark_processed(tweet_id: str, db_path: str | None = None) -> None:
+def mark_processed(tweet_id: str | int, db_path: str | None = None) -> None:
     """
     Mark a tweet as processed.
 
@@ -97,12 +628,305 @@ def mark_processed(tweet_id: str, db_path: str | None = None) -> None:
         tweet_id: The tweet ID to mark as processed
         db_path: Optional path override (used for testing)
     """
-    with get_connection(db_path) as conn:
-        conn.execute(
-            "INSERT OR IGNORE INTO processed_tweets (tweet_id, processed_at) VALUES (?, ?)",
-            (tweet_id, datetime.now(timezone.utc).isoformat())
-        )
-        conn.commit()
+    pool = get_pool(db_path)
+    snowflake = int(tweet_id)
+    with pool.writer() as conn:
+        now = int(time.time())
+        conn.execute(_SQL_MARK_PROCESSED, (snowflake, now))
+        conn.execute(_SQL_SKIP_MENTION, (now, snowflake))
+        if pool.processed_filter is not None:
+            pool.processed_filter.add(str(snowflake))
+
+
+def filter_unprocessed(tweet_ids: Iterable[str | int], db_path: str | None = None) -> list[str | int]:
+    """
+    Return the tweet IDs that have not been processed yet.
+
+    IDs the Bloom filter has never seen are returned without a query; the
+    rest are checked with one IN (...) query per chunk.
+
+    Args:
+        tweet_ids: Tweet IDs to check
+        db_path: Optional path override (used for testing)
+
+    Returns:
+        Unprocessed IDs, de-duplicated, in their original order
+    """
+    ids = list(dict.fromkeys(tweet_ids))
+    snowflakes = [int(tweet_id) for tweet_id in ids]
+    pool = get_pool(db_path)
+
+    bloom = pool.processed_filter
+    candidates = (
+        snowflakes if bloom is None else [n for n in snowflakes if str(n) in bloom]
+    )
+    if not candidates:
+        return ids
+
+    seen: set[int] = set()
+    with pool.reader() as conn:
+        for start in range(0, len(candidates), _MAX_IN_PARAMS):
+            chunk = candidates[start:start + _MAX_IN_PARAMS]
+            placeholders = ",".join("?" * len(chunk))
+            cursor = conn.execute(
+                f"SELECT tweet_id FROM processed_tweets WHERE tweet_id IN ({placeholders})",
+                chunk,
+            )
+            seen.update(row[0] for row in cursor)
+
+    return [tweet_id for tweet_id, n in zip(ids, snowflakes) if n not in seen]
+
+
+def mark_processed_many(tweet_ids: Iterable[str | int], db_path: str | None = None) -> None:
+    """
+    Mark many tweets as processed in a single transaction.
+
+    Args:
+        tweet_ids: Tweet IDs to mark as processed
+        db_path: Optional path override (used for testing)
+    """
+    processed_at = int(time.time())
+    rows = [(snowflake, processed_at) for snowflake in dict.fromkeys(map(int, tweet_ids))]
+    if not rows:
+        return
+
+    pool = get_pool(db_path)
+    with pool.writer() as conn:
+        conn.executemany(_SQL_MARK_PROCESSED, rows)
+        conn.executemany(_SQL_SKIP_MENTION, [(processed_at, snowflake) for snowflake, _ in rows])
+        if pool.processed_filter is not None:
+            for snowflake, _ in rows:
+                pool.processed_filter.add(str(snowflake))
+
+
+def discover_mentions(
+    mentions: Iterable[tuple[str | int, str]], ttl: timedelta, db_path: str | None = None
+) -> None:
+    """
+    Record newly fetched mentions (no-op for ones already known).
+
+    Args:
+        mentions: (tweet_id, mention as JSON) pairs
+        ttl: Unclaimed discoveries are treated as abandoned after this long
+        db_path: Optional path override (used for testing)
+    """
+    now = time.time()
+    rows = [
+        (int(tweet_id), mention, now + ttl.total_seconds(), int(now))
+        for tweet_id, mention in mentions
+    ]
+    if not rows:
+        return
+    with get_pool(db_path).writer() as conn:
+        conn.executemany(_SQL_DISCOVER_MENTION, rows)
+
+
+def claim_mentions(
+    tweet_ids: Iterable[str | int], holder: str, ttl: timedelta, db_path: str | None = None
+) -> list[str | int]:
+    """
+    Claim mentions for analysis, atomically per mention.
+
+    Discovered (or unknown) mentions can be claimed, as can claimed or
+    analyzed ones whose lease has expired; finished or processed ones
+    can't.
+
+    Args:
+        tweet_ids: Mentions to claim
+        holder: Who is claiming
+        ttl: How long the claim lasts unless the mention is finished first
+        db_path: Optional path override (used for testing)
+
+    Returns:
+        The claimed IDs, de-duplicated, in their original order
+    """
+    ids = list(dict.fromkeys(tweet_ids))
+    now = time.time()
+    claimed: set[int] = set()
+    with get_pool(db_path).writer() as conn:
+        for tweet_id in ids:
+            row = conn.execute(_SQL_CLAIM_MENTION, {
+                "tweet_id": int(tweet_id),
+                "holder": holder,
+                "expires_at": now + ttl.total_seconds(),
+                "updated_at": int(now),
+                "now": now,
+            }).fetchone()
+            if row:
+                claimed.add(row[0])
+    return [tweet_id for tweet_id in ids if int(tweet_id) in claimed]
+
+
+def claim_abandoned_mentions(
+    holder: str, ttl: timedelta, limit: int, db_path: str | None = None
+) -> list[tuple[str, str]]:
+    """
+    Claim mentions whose previous holder crashed or gave them back, oldest first.
+
+    Args:
+        holder: Who is claiming
+        ttl: How long the claim lasts unless the mention is finished first
+        limit: Most mentions to claim
+        db_path: Optional path override (used for testing)
+
+    Returns:
+        (tweet_id, mention as JSON) for each claimed mention
+    """
+    now = time.time()
+    with get_pool(db_path).writer() as conn:
+        rows = conn.execute(_SQL_CLAIM_ABANDONED_MENTIONS, {
+            "holder": holder,
+            "expires_at": now + ttl.total_seconds(),
+            "updated_at": int(now),
+            "now": now,
+            "limit": limit,
+        }).fetchall()
+    return sorted((str(tweet_id), mention) for tweet_id, mention in rows)
+
+
+def mark_mentions_analyzed(
+    tweet_ids: Iterable[str | int], holder: str, db_path: str | None = None
+) -> None:
+    """
+    Record that Grok analyzed claimed mentions (only while `holder` holds them).
+
+    Args:
+        tweet_ids: Analyzed mentions
+        holder: The claim's holder
+        db_path: Optional path override (used for testing)
+    """
+    now = int(time.time())
+    rows = [(now, int(tweet_id), holder) for tweet_id in dict.fromkeys(tweet_ids)]
+    if not rows:
+        return
+    with get_pool(db_path).writer() as conn:
+        conn.executemany(_SQL_MARK_MENTION_ANALYZED, rows)
+
+
+def release_mentions(tweet_ids: Iterable[str | int], db_path: str | None = None) -> None:
+    """
+    Give claimed mentions back (as discovered) after a failure, for a retry.
+
+    Args:
+        tweet_ids: Claimed mentions
+        db_path: Optional path override (used for testing)
+    """
+    now = int(time.time())
+    rows = [(now, int(tweet_id)) for tweet_id in dict.fromkeys(tweet_ids)]
+    if not rows:
+        return
+    with get_pool(db_path).writer() as conn:
+        conn.executemany(_SQL_RELEASE_MENTION, rows)
+
+
+def skip_mentions(tweet_ids: Iterable[str | int], db_path: str | None = None) -> None:
+    """
+    Finish mentions that won't get a reply without marking them processed
+    (e.g. mentions without the trigger phrase).
+
+    Args:
+        tweet_ids: Mentions to finish
+        db_path: Optional path override (used for testing)
+    """
+    now = int(time.time())
+    rows = [(now, int(tweet_id)) for tweet_id in dict.fromkeys(tweet_ids)]
+    if not rows:
+        return
+    with get_pool(db_path).writer() as conn:
+        conn.executemany(_SQL_SKIP_MENTION, rows)
+
+
+def get_mention_counts(db_path: str | None = None) -> dict[str, int]:
+    """
+    Count mentions by state.
+
+    Args:
+        db_path: Optional path override (used for testing)
+
+    Returns:
+        Row count for each state in MENTION_STATES
+    """
+    counts = dict.fromkeys(MENTION_STATES, 0)
+    with get_pool(db_path).reader() as conn:
+        for state, count in conn.execute(
+            "SELECT state, COUNT(*) FROM mentions GROUP BY state"
+        ):
+            counts[state] = count
+    return counts
+
+
+def prune_mentions(max_age: timedelta, db_path: str | None = None) -> int:
+    """
+    Delete posted and skipped mentions last updated more than `max_age` ago.
+
+    Args:
+        max_age: Retention window
+        db_path: Optional path override (used for testing)
+
+    Returns:
+        Number of rows deleted
+    """
+    oldest = int(time.time() - max_age.total_seconds())
+    with get_pool(db_path).writer() as conn:
+        return conn.execute(
+            "DELETE FROM mentions WHERE state IN ('posted', 'skipped') AND updated_at < ?",
+            (oldest,),
+        ).rowcount
+
+
+def acquire_lease(name: str, holder: str, ttl: timedelta, db_path: str | None = None) -> bool:
+    """
+    Take or renew a named lease in one statement.
+
+    Succeeds if the lease is free, expired or already held by `holder`.
+
+    Args:
+        name: Lease name
+        holder: Unique ID of the caller (process)
+        ttl: How long the lease lasts unless renewed
+        db_path: Optional path override (used for testing)
+
+    Returns:
+        True if `holder` now holds the lease
+    """
+    now = time.time()
+    with get_pool(db_path).writer() as conn:
+        row = conn.execute(_SQL_ACQUIRE_LEASE, {
+            "name": name,
+            "holder": holder,
+            "expires_at": now + ttl.total_seconds(),
+            "now": now,
+        }).fetchone()
+        return row is not None
+
+
+def release_lease(name: str, holder: str, db_path: str | None = None) -> None:
+    """
+    Give up a lease (no-op unless `holder` holds it).
+
+    Args:
+        name: Lease name
+        holder: The caller's ID
+        db_path: Optional path override (used for testing)
+    """
+    with get_pool(db_path).writer() as conn:
+        conn.execute(_SQL_RELEASE_LEASE, (name, holder))
+
+
+def get_lease(name: str, db_path: str | None = None) -> tuple[str, float] | None:
+    """
+    Look up who holds a lease.
+
+    Args:
+        name: Lease name
+        db_path: Optional path override (used for testing)
+
+    Returns:
+        (holder, expires_at epoch seconds), or None if never taken or released
+    """
+    with get_pool(db_path).reader() as conn:
+        row = conn.execute(_SQL_GET_LEASE, (name,)).fetchone()
+        return (row[0], row[1]) if row else None
 
 
 def get_last_seen_id(db_path: str | None = None) -> str | None:
@@ -115,12 +939,7 @@ def get_last_seen_id(db_path: str | None = None) -> str | None:
     Returns:
         The last seen tweet ID, or None if not set
     """
-    with get_connection(db_path) as conn:
-        cursor = conn.execute(
-            "SELECT value FROM poll_state WHERE key = 'last_seen_id'"
-        )
-        row = cursor.fetchone()
-        return row[0] if row else None
+    return get_poll_state("last_seen_id", db_path)
 
 
 def set_last_seen_id(tweet_id: str, db_path: str | None = None) -> None:
@@ -131,18 +950,393 @@ def set_last_seen_id(tweet_id: str, db_path: str | None = None) -> None:
         tweet_id: The tweet ID to store
         db_path: Optional path override (used for testing)
     """
-    with get_connection(db_path) as conn:
+    set_poll_state("last_seen_id", tweet_id, db_path)
+
+
+def get_poll_state(key: str, db_path: str | None = None) -> str | None:
+    """
+    Get a value from the poll_state key/value table.
+
+    Args:
+        key: State key
+        db_path: Optional path override (used for testing)
+
+    Returns:
+        The stored value, or None if not set
+    """
+    with get_pool(db_path).reader() as conn:
+        row = conn.execute(_SQL_GET_POLL_STATE, (key,)).fetchone()
+        return row[0] if row else None
+
+
+def set_poll_state(key: str, value: str, db_path: str | None = None) -> None:
+    """
+    Store a value in the poll_state key/value table.
+
+    Args:
+        key: State key
+        value: Value to store
+        db_path: Optional path override (used for testing)
+    """
+    with get_pool(db_path).writer() as conn:
         conn.execute(
-            """
-            INSERT INTO poll_state (key, value, updated_at) 
-            VALUES ('last_seen_id', ?, ?)
-            ON CONFLICT(key) DO UPDATE SET value = ?, updated_at = ?
-            """,
-            (
-                tweet_id,
-                datetime.now(timezone.utc).isoformat(),
-                tweet_id,
-                datetime.now(timezone.utc).isoformat(),
-            )
+            _SQL_SET_POLL_STATE,
+            (key, value, datetime.now(timezone.utc).isoformat())
+        )
+
+
+def delete_poll_state(key: str, db_path: str | None = None) -> None:
+    """
+    Remove a key from the poll_state table (no-op if missing).
+
+    Args:
+        key: State key
+        db_path: Optional path override (used for testing)
+    """
+    with get_pool(db_path).writer() as conn:
+        conn.execute(_SQL_DELETE_POLL_STATE, (key,))
+
+
+def prune_processed(max_age: timedelta, db_path: str | None = None) -> int:
+    """
+    Delete processed tweets older than `max_age`, judged by the timestamp
+    encoded in their snowflake ID, and release the freed pages.
+
+    Pruned IDs stay in the Bloom filter; that only costs the occasional
+    extra confirmation query, never a wrong answer. Pruned tweets are also
+    far below last_seen_id, so they are never reconsidered.
+
+    Args:
+        max_age: Retention window
+        db_path: Optional path override (used for testing)
+
+    Returns:
+        Number of rows deleted
+    """
+    cutoff = snowflake_from_datetime(datetime.now(timezone.utc) - max_age)
+
+    with get_pool(db_path).writer() as conn:
+        deleted = conn.execute(
+            "DELETE FROM processed_tweets WHERE tweet_id < ?", (cutoff,)
+        ).rowcount
+
+    if deleted:
+        with get_pool(db_path).writer() as conn:
+            conn.execute("PRAGMA incremental_vacuum").fetchall()
+
+    return deleted
+
+
+def get_cached_analysis(
+    cache_key: str, max_age: timedelta, db_path: str | None = None
+) -> tuple[str, int] | None:
+    """
+    Look up a cached Grok analysis that is younger than `max_age`.
+
+    Args:
+        cache_key: Content hash of the analysis request
+        max_age: Entries older than this are treated as missing
+        db_path: Optional path override (used for testing)
+
+    Returns:
+        (serialized analysis, original latency in ms), or None on a miss
+    """
+    oldest = int(time.time() - max_age.total_seconds())
+    with get_pool(db_path).reader() as conn:
+        row = conn.execute(_SQL_GET_CACHED_ANALYSIS, (cache_key, oldest)).fetchone()
+        return (row[0], row[1]) if row else None
+
+
+def set_cached_analysis(
+    cache_key: str, analysis: str, latency_ms: int, db_path: str | None = None
+) -> None:
+    """
+    Store (or refresh) a cached Grok analysis.
+
+    Args:
+        cache_key: Content hash of the analysis request
+        analysis: Serialized analysis (JSON)
+        latency_ms: How long the uncached request took
+        db_path: Optional path override (used for testing)
+    """
+    with get_pool(db_path).writer() as conn:
+        conn.execute(
+            _SQL_SET_CACHED_ANALYSIS,
+            (cache_key, analysis, latency_ms, int(time.time()))
         )
-        conn.commit()
+
+
+def prune_analysis_cache(max_age: timedelta, db_path: str | None = None) -> int:
+    """
+    Delete cached analyses older than `max_age`.
+
+    Args:
+        max_age: Cache TTL
+        db_path: Optional path override (used for testing)
+
+    Returns:
+        Number of rows deleted
+    """
+    oldest = int(time.time() - max_age.total_seconds())
+    with get_pool(db_path).writer() as conn:
+        return conn.execute(
+            "DELETE FROM analysis_cache WHERE created_at < ?", (oldest,)
+        ).rowcount
+
+
+def add_prefilter_examples(
+    examples: Iterable[tuple[str, float, int, bool]], db_path: str | None = None
+) -> None:
+    """
+    Store analyzed mentions for prefilter training in one transaction.
+
+    Args:
+        examples: (text, prefilter score, Grok confidence, shadow sample) tuples
+        db_path: Optional path override (used for testing)
+    """
+    now = int(time.time())
+    rows = [(text, score, confidence, int(shadow), now) for text, score, confidence, shadow in examples]
+    if not rows:
+        return
+    with get_pool(db_path).writer() as conn:
+        conn.executemany(_SQL_ADD_PREFILTER_EXAMPLE, rows)
+
+
+def prune_prefilter_examples(max_age: timedelta, db_path: str | None = None) -> int:
+    """
+    Delete prefilter training examples older than `max_age`.
+
+    Args:
+        max_age: Retention window
+        db_path: Optional path override (used for testing)
+
+    Returns:
+        Number of rows deleted
+    """
+    oldest = int(time.time() - max_age.total_seconds())
+    with get_pool(db_path).writer() as conn:
+        return conn.execute(
+            "DELETE FROM prefilter_examples WHERE created_at < ?", (oldest,)
+        ).rowcount
+
+
+def enqueue_reply(
+    tweet_id: str | int,
+    text: str,
+    priority: float = 0.0,
+    published_at: float | None = None,
+    db_path: str | None = None,
+) -> bool:
+    """
+    Queue a reply to a mention for the posting worker.
+
+    Each mention gets at most one outbox row, so queueing the same mention
+    again is a no-op.
+
+    Args:
+        tweet_id: The mention to reply to
+        text: Reply text
+        priority: Age-independent score; due replies are posted highest first
+        published_at: When the mention was posted (epoch seconds; default: now)
+        db_path: Optional path override (used for testing)
+
+    Returns:
+        True if the reply was queued, False if the mention already had one
+    """
+    now = int(time.time())
+    published = int(published_at) if published_at is not None else None
+    with get_pool(db_path).writer() as conn:
+        cursor = conn.execute(
+            _SQL_ENQUEUE_REPLY, (int(tweet_id), text, priority, published, now, now, now)
+        )
+        conn.execute(_SQL_QUEUE_MENTION, (now, int(tweet_id)))
+        return cursor.rowcount == 1
+
+
+def claim_due_reply(
+    age_weight: float = 0.0, db_path: str | None = None
+) -> tuple[str, str, int] | None:
+    """
+    Claim the highest-scoring due reply (the longest-due one on ties).
+
+    The row is moved to "sending" so no other worker picks it up.
+
+    Args:
+        age_weight: Priority points a reply loses per hour since its
+            mention was posted
+        db_path: Optional path override (used for testing)
+
+    Returns:
+        (tweet_id, text, attempts so far), or None if nothing is due
+    """
+    now = int(time.time())
+    with get_pool(db_path).writer() as conn:
+        row = conn.execute(_SQL_CLAIM_DUE_REPLY, (now, now, age_weight)).fetchone()
+        return (str(row[0]), row[1], row[2]) if row else None
+
+
+def expire_stale_replies(max_age: timedelta, db_path: str | None = None) -> int:
+    """
+    Fail queued replies whose mention is older than `max_age`.
+
+    Args:
+        max_age: Oldest mention still worth a reply
+        db_path: Optional path override (used for testing)
+
+    Returns:
+        Number of replies failed
+    """
+    now = int(time.time())
+    with get_pool(db_path).writer() as conn:
+        expired = conn.execute(
+            "UPDATE reply_outbox SET status = 'failed', last_error = 'stale', updated_at = ? "
+            "WHERE status = 'pending' AND COALESCE(published_at, created_at) < ?",
+            (now, now - int(max_age.total_seconds())),
+        ).rowcount
+        if expired:
+            conn.execute(_SQL_SKIP_FAILED_REPLIES, (now,))
+        return expired
+
+
+def complete_reply(tweet_id: str | int, reply_id: str, db_path: str | None = None) -> None:
+    """
+    Record that a queued reply was posted.
+
+    Args:
+        tweet_id: The mention that was replied to
+        reply_id: ID of the posted reply
+        db_path: Optional path override (used for testing)
+    """
+    now = int(time.time())
+    with get_pool(db_path).writer() as conn:
+        conn.execute(
+            "UPDATE reply_outbox SET status = 'sent', reply_id = ?, last_error = NULL, "
+            "updated_at = ? WHERE tweet_id = ?",
+            (reply_id, now, int(tweet_id)),
+        )
+        conn.execute(_SQL_POST_MENTION, (now, int(tweet_id)))
+
+
+def retry_reply(
+    tweet_id: str | int,
+    delay: timedelta,
+    error: str,
+    count_attempt: bool = True,
+    db_path: str | None = None,
+) -> None:
+    """
+    Put a claimed reply back in the queue to be retried later.
+
+    Args:
+        tweet_id: The mention to reply to
+        delay: How long to wait before the next attempt
+        error: Why the attempt failed
+        count_attempt: False for rate limits, which say nothing about the reply
+        db_path: Optional path override (used for testing)
+    """
+    now = int(time.time())
+    with get_pool(db_path).writer() as conn:
+        conn.execute(
+            "UPDATE reply_outbox SET status = 'pending', attempts = attempts + ?, "
+            "next_attempt_at = ?, last_error = ?, updated_at = ? WHERE tweet_id = ?",
+            (int(count_attempt), now + int(delay.total_seconds()), error, now, int(tweet_id)),
+        )
+
+
+def fail_reply(tweet_id: str | int, error: str, db_path: str | None = None) -> None:
+    """
+    Give up on a queued reply.
+
+    Args:
+        tweet_id: The mention that won't be replied to
+        error: Why the reply was abandoned
+        db_path: Optional path override (used for testing)
+    """
+    now = int(time.time())
+    with get_pool(db_path).writer() as conn:
+        conn.execute(
+            "UPDATE reply_outbox SET status = 'failed', attempts = attempts + 1, "
+            "last_error = ?, updated_at = ? WHERE tweet_id = ?",
+            (error, now, int(tweet_id)),
+        )
+        conn.execute(_SQL_SKIP_FAILED_REPLIES, (now,))
+
+
+def recover_interrupted_replies(db_path: str | None = None) -> int:
+    """
+    Fail replies that were being posted when the process stopped.
+
+    X may or may not have accepted them, and a second reply is worse than
+    a missing one, so they are not retried.
+
+    Args:
+        db_path: Optional path override (used for testing)
+
+    Returns:
+        Number of replies failed
+    """
+    now = int(time.time())
+    with get_pool(db_path).writer() as conn:
+        failed = conn.execute(
+            "UPDATE reply_outbox SET status = 'failed', "
+            "last_error = 'interrupted while posting', updated_at = ? "
+            "WHERE status = 'sending'",
+            (now,),
+        ).rowcount
+        if failed:
+            conn.execute(_SQL_SKIP_FAILED_REPLIES, (now,))
+        return failed
+
+
+def next_reply_due_at(db_path: str | None = None) -> int | None:
+    """
+    When the next queued reply becomes due.
+
+    Args:
+        db_path: Optional path override (used for testing)
+
+    Returns:
+        Epoch seconds, or None if the queue is empty
+    """
+    with get_pool(db_path).reader() as conn:
+        return conn.execute(
+            "SELECT MIN(next_attempt_at) FROM reply_outbox WHERE status = 'pending'"
+        ).fetchone()[0]
+
+
+def get_outbox_counts(db_path: str | None = None) -> dict[str, int]:
+    """
+    Count outbox rows by status.
+
+    Args:
+        db_path: Optional path override (used for testing)
+
+    Returns:
+        Row count for each of pending, sending, sent and failed
+    """
+    counts = dict.fromkeys(("pending", "sending", "sent", "failed"), 0)
+    with get_pool(db_path).reader() as conn:
+        for status, count in conn.execute(
+            "SELECT status, COUNT(*) FROM reply_outbox GROUP BY status"
+        ):
+            counts[status] = count
+    return counts
+
+
+def prune_outbox(max_age: timedelta, db_path: str | None = None) -> int:
+    """
+    Delete sent and failed replies last updated more than `max_age` ago.
+
+    Args:
+        max_age: Retention window
+        db_path: Optional path override (used for testing)
+
+    Returns:
+        Number of rows deleted
+    """
+    oldest = int(time.time() - max_age.total_seconds())
+    with get_pool(db_path).writer() as conn:
+        return conn.execute(
+            "DELETE FROM reply_outbox WHERE status IN ('sent', 'failed') AND updated_at < ?",
+            (oldest,),
+        ).rowcount
@@ -3,17 +3,49 @@ Grok API client for analyzing tweets for logical fallacies.
 Uses OpenAI-compatible API with x.ai endpoint.
 """
 
+import asyncio
+import hashlib
 import json
 import logging
 import re
-from dataclasses import dataclass
-
-from openai import OpenAI
+import sqlite3
+import time
+import unicodedata
+from array import array
+from collections import OrderedDict
+from contextlib import asynccontextmanager
+from dataclasses import asdict, dataclass
+from datetime import datetime, timedelta, timezone
+from email.utils import parsedate_to_datetime
+from typing import AsyncGenerator
+
+import httpx
+import openai
+from openai import AsyncOpenAI
 
 from app.config import get_settings
+from app.database import get_cached_analysis, set_cached_analysis
+from app.http_clients import HTTP2_AVAILABLE, connection_limits
+from app.limiter import AIMDLimiter
+from app.minhash import MinHashIndex, minhash, shingles, tokenize
 
 logger = logging.getLogger(__name__)
 
+GROK_MODEL = "grok-4-1-fast-reasoning-latest"
+
+# Bump whenever SYSTEM_PROMPT or the request format changes so cached
+# analyses produced by the old prompt are no longer served
+PROMPT_VERSION = 1
+
+_WHITESPACE_RE = re.compile(r"\s+")
+
+# A complete "confidence" value in a partially streamed JSON answer
+_STREAM_CONFIDENCE_RE = re.compile(r'"confidence"\s*:\s*(\d+)\s*[,}\n]')
+
+# Texts shorter than this (in words, ignoring handles and links) are too
+# short for MinHash to tell a paraphrase from a different claim
+NEAR_DUPLICATE_MIN_TOKENS = 8
+
 
 @dataclass
 class FallacyAnalysis:
@@ -22,6 +54,9 @@ class FallacyAnalysis:
     confidence: int  # 0-100 percentage
     fallacy_detected: bool
     fallacy_name: str | None
+    # True if the completion was cut off once the confidence was known to be
+    # below threshold; reply_text is then empty
+    truncated: bool = False
 
 
 # System prompt that defines FallacySheriff's personality and response format
@@ -83,13 +118,431 @@ Response:
 Remember: Reply must be UNDER 280 CHARACTERS. Be concise. Be fair. Be slightly tired of nonsense."""
 
 
-def get_grok_client() -> OpenAI:
-    """Create and return a Grok API client."""
+def _normalize_tweet_text(text: str | None) -> str:
+    """
+    Normalize tweet text for cache keys.
+
+    Only Unicode form and whitespace are folded; case is kept because the
+    prompt reads ALL CAPS as hostility and answers in a different tone.
+    """
+    if not text:
+        return ""
+    return _WHITESPACE_RE.sub(" ", unicodedata.normalize("NFKC", text)).strip()
+
+
+def analysis_cache_key(fallacy_tweet: str, context_tweet: str | None = None) -> str:
+    """Hash of everything that determines Grok's answer for a tweet."""
+    payload = json.dumps([
+        _normalize_tweet_text(fallacy_tweet),
+        _normalize_tweet_text(context_tweet),
+        GROK_MODEL,
+        PROMPT_VERSION,
+    ])
+    return hashlib.sha256(payload.encode()).hexdigest()
+
+
+class AnalysisCache:
+    """
+    Two-tier cache of FallacyAnalysis results.
+
+    An in-memory LRU answers repeats within the process; SQLite keeps
+    results across restarts until they are older than the TTL. Concurrent
+    lookups of the same key share a single Grok request.
+
+    With a MinHashIndex, a miss whose tweet text is a near duplicate of a
+    recently analyzed one (same context tweet) reuses that analysis, which
+    catches paraphrased pile-on replies that exact keys miss.
+    """
+
+    def __init__(
+        self,
+        max_entries: int,
+        ttl: timedelta,
+        near_duplicates: MinHashIndex | None = None,
+    ):
+        self.max_entries = max(1, max_entries)
+        self.ttl = ttl
+        self._entries: OrderedDict[str, tuple[FallacyAnalysis, float, float]] = OrderedDict()
+        self._inflight: dict[str, asyncio.Future] = {}
+        # MinHash of each claimed key's tweet, computed during its lookup
+        self._fingerprints: dict[str, array] = {}
+        self._near_duplicates = near_duplicates
+        self.hits = 0
+        self.near_hits = 0
+        self.misses = 0
+        self.saved_seconds = 0.0
+
+    def _remember(self, key: str, analysis: FallacyAnalysis, latency: float, stored_at: float) -> None:
+        self._entries[key] = (analysis, latency, stored_at)
+        self._entries.move_to_end(key)
+        while len(self._entries) > self.max_entries:
+            self._entries.popitem(last=False)
+
+    def _record_hit(self, latency: float) -> None:
+        self.hits += 1
+        self.saved_seconds += latency
+
+    def _fingerprint(self, fallacy_tweet: str | None) -> array | None:
+        """MinHash of the tweet, or None if near-duplicate matching doesn't apply."""
+        if self._near_duplicates is None or not fallacy_tweet:
+            return None
+        tokens = tokenize(fallacy_tweet)
+        if len(tokens) < NEAR_DUPLICATE_MIN_TOKENS:
+            return None
+        return minhash(shingles(tokens))
+
+    async def get(
+        self,
+        key: str,
+        fallacy_tweet: str | None = None,
+        context_tweet: str | None = None,
+    ) -> FallacyAnalysis | None:
+        """
+        Return a cached analysis, checking memory, SQLite and then (if the
+        texts are given) recent near duplicates.
+
+        A request already in flight for the same key is awaited instead of
+        counting as a miss. On a miss the caller owns the request for `key`
+        and must call finish() once it has a result (or failed).
+        """
+        entry = self._entries.get(key)
+        if entry is not None:
+            analysis, latency, stored_at = entry
+            if time.time() - stored_at < self.ttl.total_seconds() and _usable(analysis):
+                self._entries.move_to_end(key)
+                self._record_hit(latency)
+                return analysis
+            del self._entries[key]
+
+        while (pending := self._inflight.get(key)) is not None:
+            analysis = await asyncio.shield(pending)
+            if analysis is not None:
+                self._record_hit(0.0)
+                return analysis
+
+        # Claim the key before the first await so concurrent callers wait
+        self._inflight[key] = asyncio.get_running_loop().create_future()
+        try:
+            analysis = await self._lookup(key, fallacy_tweet, context_tweet)
+        except BaseException:
+            # Decode errors and cancellation must not strand callers waiting on the claim
+            self._release(key, None)
+            raise
+        if analysis is None:
+            self.misses += 1
+            return None
+        self._release(key, analysis)
+        return analysis
+
+    async def _lookup(
+        self,
+        key: str,
+        fallacy_tweet: str | None,
+        context_tweet: str | None,
+    ) -> FallacyAnalysis | None:
+        """Check SQLite and then recent near duplicates for a claimed key."""
+        row, fingerprint = await asyncio.to_thread(self._read, key, fallacy_tweet)
+
+        analysis = None
+        if row is not None:
+            try:
+                analysis = FallacyAnalysis(**json.loads(row[0]))
+            except (TypeError, ValueError) as e:
+                logger.warning(f"Ignoring unreadable cached analysis {key[:12]}: {e}")
+        if analysis is not None and _usable(analysis):
+            latency_ms = row[1]
+            self._remember(key, analysis, latency_ms / 1000, time.time())
+            self._record_hit(latency_ms / 1000)
+            return analysis
+
+        if fingerprint is not None:
+            similar = self._near_duplicates.find(_normalize_tweet_text(context_tweet), fingerprint)
+            if similar is not None and _usable(similar[0]):
+                analysis, latency = similar
+                self._remember(key, analysis, latency, time.time())
+                self.near_hits += 1
+                self.saved_seconds += latency
+                return analysis
+            # Indexed with the result once the caller finishes the request
+            self._fingerprints[key] = fingerprint
+
+        return None
+
+    def _read(self, key: str, fallacy_tweet: str | None) -> tuple[tuple | None, array | None]:
+        """
+        SQLite row for `key` and the tweet's MinHash (blocking; run in a
+        worker thread, as the signature takes about as long as the query).
+        """
+        try:
+            row = get_cached_analysis(key, self.ttl)
+        except sqlite3.Error as e:
+            logger.warning(f"Analysis cache lookup failed: {e}")
+            row = None
+        return row, self._fingerprint(fallacy_tweet)
+
+    def in_flight(self, key: str) -> bool:
+        """True while another caller owns the request for `key`."""
+        return key in self._inflight
+
+    async def wait(self, key: str) -> FallacyAnalysis | None:
+        """
+        Await another caller's request for `key` without claiming it.
+
+        Returns:
+            Its result, or None if it failed or nothing was in flight
+        """
+        pending = self._inflight.get(key)
+        if pending is None:
+            return None
+        analysis = await asyncio.shield(pending)
+        if analysis is not None:
+            self._record_hit(0.0)
+        return analysis
+
+    def _release(self, key: str, analysis: FallacyAnalysis | None) -> None:
+        self._fingerprints.pop(key, None)
+        pending = self._inflight.pop(key, None)
+        if pending is not None and not pending.done():
+            pending.set_result(analysis)
+
+    def release(
+        self,
+        key: str,
+        analysis: FallacyAnalysis | None,
+        latency: float,
+        fallacy_tweet: str | None = None,
+        context_tweet: str | None = None,
+    ) -> None:
+        """
+        Complete a request claimed by a missed get() in memory only.
+
+        Waiting callers are woken without awaiting anything, so a caller
+        releasing several keys can't be cancelled halfway and strand the
+        rest. Follow with store() to persist the result.
+
+        Args:
+            key: Cache key that missed
+            analysis: The result, or None if it must not be cached
+            latency: Seconds the Grok request took
+            fallacy_tweet: Analyzed text, indexed for near-duplicate reuse
+            context_tweet: Context the analysis was made with
+        """
+        fingerprint = self._fingerprints.get(key)
+        self._release(key, analysis)
+        if analysis is None:
+            return
+
+        self._remember(key, analysis, latency, time.time())
+        if fingerprint is None:
+            # Only short tweets (cheap) or keys claimed without their text
+            fingerprint = self._fingerprint(fallacy_tweet)
+        if fingerprint is not None:
+            self._near_duplicates.add(
+                _normalize_tweet_text(context_tweet), fingerprint, (analysis, latency)
+            )
+
+    async def store(self, key: str, analysis: FallacyAnalysis | None, latency: float) -> None:
+        """Persist a released result to SQLite (no-op for None)."""
+        if analysis is None:
+            return
+        try:
+            await asyncio.to_thread(
+                set_cached_analysis, key, json.dumps(asdict(analysis)), round(latency * 1000)
+            )
+        except sqlite3.Error as e:
+            logger.warning(f"Analysis cache write failed: {e}")
+
+    async def finish(
+        self,
+        key: str,
+        analysis: FallacyAnalysis | None,
+        latency: float,
+        fallacy_tweet: str | None = None,
+        context_tweet: str | None = None,
+    ) -> None:
+        """Complete a request claimed by a missed get() and store its result."""
+        self.release(key, analysis, latency, fallacy_tweet, context_tweet)
+        await self.store(key, analysis, latency)
+
+    def stats(self) -> dict:
+        """Hit/miss counters for the status endpoint."""
+        reused = self.hits + self.near_hits
+        lookups = reused + self.misses
+        return {
+            "hits": self.hits,
+            "near_duplicate_hits": self.near_hits,
+            "misses": self.misses,
+            "hit_rate": round(reused / lookups, 3) if lookups else 0.0,
+            "saved_latency_seconds": round(self.saved_seconds, 3),
+            "entries": len(self._entries),
+        }
+
+
+def _usable(analysis: FallacyAnalysis) -> bool:
+    """
+    False for a cached truncated analysis that would now clear the threshold
+    (it was cut short under a higher one and has no reply text to post).
+    """
+    return not analysis.truncated or analysis.confidence < get_settings().confidence_threshold
+
+
+# Global cache instance - lazily created from settings
+_analysis_cache: AnalysisCache | None = None
+
+
+def get_analysis_cache() -> AnalysisCache | None:
+    """Get the global analysis cache, or None if caching is disabled."""
+    global _analysis_cache
     settings = get_settings()
-    return OpenAI(
-        api_key=settings.grok_api_key,
-        base_url="https://api.x.ai/v1",
-    )
+    if settings.analysis_cache_ttl_hours <= 0:
+        return None
+    if _analysis_cache is None:
+        near_duplicates = None
+        if settings.near_duplicate_window_minutes > 0:
+            near_duplicates = MinHashIndex(
+                settings.near_duplicate_min_similarity,
+                settings.analysis_cache_size,
+                settings.near_duplicate_window_minutes * 60,
+            )
+        _analysis_cache = AnalysisCache(
+            settings.analysis_cache_size,
+            timedelta(hours=settings.analysis_cache_ttl_hours),
+            near_duplicates,
+        )
+    return _analysis_cache
+
+
+def reset_analysis_cache() -> None:
+    """Drop the in-memory cache tier and counters (for testing)."""
+    global _analysis_cache
+    _analysis_cache = None
+
+
+class GrokUnavailableError(Exception):
+    """
+    Grok is rate limiting, failing or unreachable (429, 5xx, timeout,
+    connection error).
+
+    Raised instead of returning a low-confidence fallback so the mention is
+    not marked processed and is retried on a later poll.
+    """
+
+
+# Global limiter instance - lazily created from settings
+_grok_limiter: AIMDLimiter | None = None
+
+
+def get_grok_limiter() -> AIMDLimiter:
+    """Get the adaptive concurrency limiter shared by all Grok requests."""
+    global _grok_limiter
+    if _grok_limiter is None:
+        settings = get_settings()
+        _grok_limiter = AIMDLimiter(
+            initial_limit=settings.max_concurrent_mentions,
+            min_limit=settings.grok_min_concurrency,
+            max_limit=settings.grok_max_concurrency,
+            latency_target=settings.grok_latency_target_seconds,
+        )
+    return _grok_limiter
+
+
+def reset_grok_limiter() -> None:
+    """Drop the limiter so it is rebuilt from settings (for testing)."""
+    global _grok_limiter
+    _grok_limiter = None
+
+
+def _retry_after_seconds(response) -> float | None:
+    """Parse Retry-After (seconds or HTTP date) or retry-after-ms from a response."""
+    if response is None:
+        return None
+    headers = response.headers
+    if "retry-after-ms" in headers:
+        try:
+            return float(headers["retry-after-ms"]) / 1000
+        except ValueError:
+            pass
+    value = headers.get("retry-after")
+    if not value:
+        return None
+    try:
+        return float(value)
+    except ValueError:
+        pass
+    try:
+        retry_at = parsedate_to_datetime(value)
+    except (TypeError, ValueError):
+        return None
+    return max(0.0, (retry_at - datetime.now(timezone.utc)).total_seconds())
+
+
+@asynccontextmanager
+async def _grok_call(items: int = 1) -> AsyncGenerator[None, None]:
+    """
+    Run one Grok request inside the adaptive limiter.
+
+    Feeds latency and overload signals back into the window and turns
+    429/5xx/timeouts and network failures into GrokUnavailableError.
+
+    Args:
+        items: Tweets analyzed by the request; latency is compared with the
+            target per tweet so batches aren't mistaken for overload
+    """
+    limiter = get_grok_limiter()
+    async with limiter.slot() as started:
+        try:
+            yield
+        except openai.APITimeoutError as e:
+            limiter.on_overload(started=started)
+            raise GrokUnavailableError(f"Grok request timed out: {e}") from e
+        except (openai.APIConnectionError, httpx.TransportError) as e:
+            # DNS failures, refused or reset connections (also mid-stream)
+            limiter.on_overload(started=started)
+            raise GrokUnavailableError(f"Grok unreachable: {e!r}") from e
+        except openai.APIStatusError as e:
+            if e.status_code != 429 and e.status_code < 500:
+                raise
+            retry_after = _retry_after_seconds(e.response)
+            limiter.on_overload(retry_after, started=started)
+            logger.warning(
+                f"Grok returned {e.status_code}, concurrency window now {limiter.window}"
+                + (f", retrying after {retry_after:.1f}s" if retry_after else "")
+            )
+            raise GrokUnavailableError(f"Grok returned {e.status_code}") from e
+        limiter.on_success((time.monotonic() - started) / max(1, items), started)
+
+
+# Global client instance - opened in the app lifespan
+_grok_client: AsyncOpenAI | None = None
+
+
+def get_grok_client() -> AsyncOpenAI:
+    """
+    Get the shared async Grok API client, creating it if needed.
+
+    One client (and so one keep-alive connection pool) serves every
+    request; the app lifespan closes it on shutdown.
+    """
+    global _grok_client
+    if _grok_client is None:
+        settings = get_settings()
+        _grok_client = AsyncOpenAI(
+            api_key=settings.grok_api_key,
+            base_url="https://api.x.ai/v1",
+            http_client=openai.DefaultAsyncHttpxClient(
+                limits=connection_limits(),
+                http2=HTTP2_AVAILABLE,
+            ),
+        )
+    return _grok_client
+
+
+async def close_grok_client() -> None:
+    """Close the shared Grok client and its connections."""
+    global _grok_client
+    if _grok_client is not None:
+        client, _grok_client = _grok_client, None
+        await client.close()
 
 
 def _parse_analysis_response(response_text: str) -> FallacyAnalysis:
@@ -147,61 +600,365 @@ def _parse_analysis_response(response_text: str) -> FallacyAnalysis:
         )
 
 
-def analyze_fallacy(
+def _fallback_analysis() -> FallacyAnalysis:
+    """Result used when Grok can't be reached: low confidence so we don't post."""
+    return FallacyAnalysis(
+        reply_text="Unable to analyze this tweet right now. More: yourlogicalfallacyis.com",
+        confidence=0,
+        fallacy_detected=False,
+        fallacy_name=None,
+    )
+
+
+def is_fallback_analysis(analysis: FallacyAnalysis) -> bool:
+    """True if the analysis is the placeholder for a failed Grok request."""
+    return analysis == _fallback_analysis()
+
+
+async def analyze_fallacy(
     fallacy_tweet: str,
     context_tweet: str | None = None,
-    client: OpenAI | None = None
+    client: AsyncOpenAI | None = None,
+    use_cache: bool = True,
 ) -> FallacyAnalysis:
     """
     Analyze a tweet for logical fallacies using Grok.
 
+    Results are cached by normalized tweet content, model and prompt
+    version, so repeated tags of the same tweet cost one Grok call.
+    Failed requests are never cached.
+
     Args:
         fallacy_tweet: The reply tweet containing the potential fallacy to analyze
         context_tweet: The original tweet being replied to (provides context)
-        client: Optional OpenAI client (for testing)
+        client: Optional AsyncOpenAI client (for testing)
+        use_cache: Set False to always ask Grok
 
     Returns:
         FallacyAnalysis with reply text, confidence score, and fallacy info
     """
-    if client is None:
-        client = get_grok_client()
+    cache = get_analysis_cache() if use_cache else None
+    key = analysis_cache_key(fallacy_tweet, context_tweet)
+    if cache is not None:
+        cached = await cache.get(key, fallacy_tweet, context_tweet)
+        if cached is not None:
+            logger.info(f"Using cached analysis {key[:12]}")
+            return cached
+
+    started = time.perf_counter()
+    analysis = None
+    try:
+        analysis = await _request_analysis(fallacy_tweet, context_tweet, client)
+        return analysis or _fallback_analysis()
+    finally:
+        if cache is not None:
+            await cache.finish(
+                key, analysis, time.perf_counter() - started, fallacy_tweet, context_tweet
+            )
 
-    # Build user message with context if available
-    if context_tweet:
-        user_message = f"""Analyze this reply for logical fallacies:
 
-ORIGINAL TWEET (context - what they're replying to):
+def _tweet_block(fallacy_tweet: str, context_tweet: str | None) -> str:
+    """The tweet (and its context, if any) as presented to the model."""
+    if context_tweet:
+        return f"""ORIGINAL TWEET (context - what they're replying to):
 {context_tweet}
 
 REPLY TO ANALYZE (check for fallacies):
 {fallacy_tweet}"""
+    return fallacy_tweet
+
+
+async def _request_analysis(
+    fallacy_tweet: str,
+    context_tweet: str | None,
+    client: AsyncOpenAI | None,
+) -> FallacyAnalysis | None:
+    """Call Grok once; returns None if the request failed."""
+    if client is None:
+        client = get_grok_client()
+
+    # Build user message with context if available
+    if context_tweet:
+        user_message = "Analyze this reply for logical fallacies:\n\n"
     else:
-        user_message = f"""Analyze this tweet for logical fallacies:
+        user_message = "Analyze this tweet for logical fallacies:\n\n"
+    user_message += _tweet_block(fallacy_tweet, context_tweet)
 
-{fallacy_tweet}"""
+    settings = get_settings()
+    if settings.grok_streaming:
+        return await _stream_analysis(user_message, client, settings.confidence_threshold)
 
     try:
-        response = client.chat.completions.create(
-            model="grok-4-1-fast-reasoning-latest",
-            messages=[
-                {"role": "system", "content": SYSTEM_PROMPT},
-                {"role": "user", "content": user_message}
-            ],
-            max_tokens=300,
-            temperature=0.7,
-        )
+        async with _grok_call():
+            response = await client.chat.completions.create(
+                model=GROK_MODEL,
+                messages=[
+                    {"role": "system", "content": SYSTEM_PROMPT},
+                    {"role": "user", "content": user_message}
+                ],
+                max_tokens=300,
+                temperature=0.7,
+            )
 
         response_text = response.choices[0].message.content.strip()
         logger.debug(f"Grok raw response: {response_text}")
         
         return _parse_analysis_response(response_text)
 
+    except GrokUnavailableError:
+        raise
     except Exception as e:
         logger.error(f"Grok API error: {e}")
-        # Return a fallback with low confidence so we don't post
-        return FallacyAnalysis(
-            reply_text="Unable to analyze this tweet right now. More: yourlogicalfallacyis.com",
-            confidence=0,
-            fallacy_detected=False,
-            fallacy_name=None,
+        return None
+
+
+async def _stream_analysis(
+    user_message: str,
+    client: AsyncOpenAI,
+    threshold: int,
+) -> FallacyAnalysis | None:
+    """
+    Stream a single analysis and stop as soon as it can't be posted.
+
+    SYSTEM_PROMPT asks for "confidence" first, so it usually arrives within
+    the first few tokens. If it is below `threshold` the stream is closed
+    and a truncated result is returned without the reply text.
+    """
+    try:
+        async with _grok_call():
+            stream = await client.chat.completions.create(
+                model=GROK_MODEL,
+                messages=[
+                    {"role": "system", "content": SYSTEM_PROMPT},
+                    {"role": "user", "content": user_message}
+                ],
+                max_tokens=300,
+                temperature=0.7,
+                stream=True,
+            )
+
+            parts: list[str] = []
+            confidence_seen = False
+            async for chunk in stream:
+                if not chunk.choices or not chunk.choices[0].delta.content:
+                    continue
+                parts.append(chunk.choices[0].delta.content)
+                if confidence_seen:
+                    continue
+
+                match = _STREAM_CONFIDENCE_RE.search("".join(parts))
+                if match is None:
+                    continue
+                confidence_seen = True
+                confidence = int(match.group(1))
+                if confidence < threshold:
+                    await stream.close()
+                    logger.info(
+                        f"Confidence {confidence}% below threshold {threshold}%, "
+                        "stopped Grok stream early"
+                    )
+                    return FallacyAnalysis(
+                        reply_text="",
+                        confidence=confidence,
+                        fallacy_detected=False,
+                        fallacy_name=None,
+                        truncated=True,
+                    )
+
+        response_text = "".join(parts).strip()
+        logger.debug(f"Grok raw response: {response_text}")
+
+        return _parse_analysis_response(response_text)
+
+    except GrokUnavailableError:
+        raise
+    except Exception as e:
+        logger.error(f"Grok API error: {e}")
+        return None
+
+
+async def analyze_fallacies_batch(
+    tweets: list[tuple[str, str | None]],
+    client: AsyncOpenAI | None = None,
+    use_cache: bool = True,
+) -> list[FallacyAnalysis]:
+    """
+    Analyze several tweets with one Grok request.
+
+    Packs every uncached tweet into a single chat completion that answers
+    with a JSON array, so SYSTEM_PROMPT and the round trip are paid once per
+    batch instead of once per tweet. Answers are matched to tweets by id,
+    tweets left unanswered are re-requested one at a time, and tweets that
+    fail entirely get the usual low-confidence fallback.
+
+    Tweets another caller is already analyzing are awaited only after this
+    batch's own request has finished, so concurrent batches never wait on
+    each other while holding claims.
+
+    Args:
+        tweets: (fallacy_tweet, context_tweet) pairs
+        client: Optional AsyncOpenAI client (for testing)
+        use_cache: Set False to always ask Grok
+
+    Returns:
+        One FallacyAnalysis per input pair, in order
+    """
+    cache = get_analysis_cache() if use_cache else None
+    keys = [analysis_cache_key(fallacy, context) for fallacy, context in tweets]
+
+    # Identical tweets in one batch are looked up and analyzed once
+    todo: dict[str, tuple[str, str | None]] = {}
+    for key, tweet in zip(keys, tweets):
+        todo.setdefault(key, tweet)
+
+    results: dict[str, FallacyAnalysis | None] = {}
+    while todo:
+        # Keys another caller is already analyzing are only awaited once our
+        # own request is done: waiting on them while holding claims could
+        # deadlock against a batch holding the same keys in another order
+        misses: dict[str, tuple[str, str | None]] = {}
+        waiting: dict[str, tuple[str, str | None]] = {}
+        try:
+            for key, (fallacy, context) in todo.items():
+                if cache is not None and cache.in_flight(key):
+                    waiting[key] = (fallacy, context)
+                    continue
+                cached = await cache.get(key, fallacy, context) if cache is not None else None
+                if cached is not None:
+                    results[key] = cached
+                else:
+                    misses[key] = (fallacy, context)
+        except BaseException:
+            # Hand back the keys claimed so far
+            if cache is not None:
+                for key in misses:
+                    cache.release(key, None, 0.0)
+            raise
+
+        if misses:
+            logger.info(f"Analyzing {len(misses)} tweets in one Grok request ({len(results)} cached)")
+            started = time.perf_counter()
+            fresh: list[FallacyAnalysis | None] = [None] * len(misses)
+            try:
+                fresh = await _request_batch_analysis(
+                    list(misses.values()), client or get_grok_client()
+                )
+            finally:
+                # Each tweet is charged an equal share of the batch latency
+                latency = (time.perf_counter() - started) / len(misses)
+                for (key, (fallacy, context)), analysis in zip(misses.items(), fresh):
+                    results[key] = analysis
+                    if cache is not None:
+                        cache.release(key, analysis, latency, fallacy, context)
+                # Persist only once every claim is released: a cancellation
+                # during these writes must not leave lookups waiting forever
+                if cache is not None:
+                    for key in misses:
+                        await cache.store(key, results[key], latency)
+
+        # Keys whose owner failed (or finished meanwhile) are looked up again
+        todo = {}
+        for key, tweet in waiting.items():
+            analysis = await cache.wait(key)
+            if analysis is not None:
+                results[key] = analysis
+            else:
+                todo[key] = tweet
+
+    return [results[key] or _fallback_analysis() for key in keys]
+
+
+async def _request_batch_analysis(
+    tweets: list[tuple[str, str | None]],
+    client: AsyncOpenAI,
+) -> list[FallacyAnalysis | None]:
+    """Call Grok once for many tweets; None marks items that failed."""
+    if len(tweets) == 1:
+        return [await _request_analysis(*tweets[0], client)]
+
+    sections = [
+        f"TWEET {number}:\n{_tweet_block(fallacy, context)}"
+        for number, (fallacy, context) in enumerate(tweets, start=1)
+    ]
+    user_message = (
+        f"Analyze each of these {len(tweets)} tweets for logical fallacies independently.\n"
+        f"Respond with a JSON array of {len(tweets)} objects, each in the JSON format "
+        'described above plus an "id" field holding the number of the tweet it '
+        "answers (TWEET 1 -> \"id\": 1).\n\n"
+        + "\n\n".join(sections)
+    )
+
+    try:
+        async with _grok_call(len(tweets)):
+            response = await client.chat.completions.create(
+                model=GROK_MODEL,
+                messages=[
+                    {"role": "system", "content": SYSTEM_PROMPT},
+                    {"role": "user", "content": user_message}
+                ],
+                max_tokens=300 * len(tweets),
+                temperature=0.7,
+            )
+        response_text = response.choices[0].message.content.strip()
+        logger.debug(f"Grok raw batch response: {response_text}")
+    except GrokUnavailableError:
+        raise
+    except Exception as e:
+        logger.error(f"Grok API error: {e}")
+        return [None] * len(tweets)
+
+    analyses = _parse_batch_response(response_text, len(tweets))
+
+    # Anything the batch answer didn't cover is asked for on its own
+    retry = [i for i, analysis in enumerate(analyses) if analysis is None]
+    if retry:
+        logger.warning(f"Batch response covered {len(tweets) - len(retry)}/{len(tweets)} tweets, retrying the rest")
+        retried = await asyncio.gather(
+            *(_request_analysis(*tweets[i], client) for i in retry)
         )
+        for i, analysis in zip(retry, retried):
+            analyses[i] = analysis
+
+    return analyses
+
+
+def _parse_batch_response(response_text: str, expected: int) -> list[FallacyAnalysis | None]:
+    """
+    Parse a JSON array answer into one FallacyAnalysis per tweet.
+
+    Items are matched to tweets by their "id" field (1-based), never by
+    position, so a skipped or reordered item can't attach an analysis to
+    the wrong tweet. Each matched object goes through
+    _parse_analysis_response. Tweets without exactly one usable item (or
+    an answer that isn't an array at all) come back as None.
+    """
+    try:
+        data = json.loads(response_text)
+    except json.JSONDecodeError:
+        logger.warning("Failed to parse batch response as JSON")
+        return [None] * expected
+
+    if not isinstance(data, list):
+        logger.warning("Batch response is not a JSON array")
+        return [None] * expected
+
+    analyses: list[FallacyAnalysis | None] = [None] * expected
+    seen: set[int] = set()
+    for item in data:
+        item_id = item.get("id") if isinstance(item, dict) else None
+        if isinstance(item_id, str) and item_id.strip().isdigit():
+            item_id = int(item_id)
+        if isinstance(item_id, bool) or not isinstance(item_id, int) or not 1 <= item_id <= expected:
+            logger.warning(f"Ignoring batch item without a valid id: {str(item)[:80]}")
+            continue
+        if item_id in seen:
+            # Two answers for one tweet: trust neither
+            logger.warning(f"Batch response answered tweet {item_id} more than once")
+            analyses[item_id - 1] = None
+            continue
+        seen.add(item_id)
+        try:
+            analyses[item_id - 1] = _parse_analysis_response(json.dumps(item))
+        except (TypeError, ValueError, AttributeError) as e:
+            logger.warning(f"Malformed batch item: {e}")
+    return analyses
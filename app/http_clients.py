@@ -0,0 +1,30 @@
+"""
+Shared HTTP connection settings for the process-wide API clients.
+
+The Grok, X and RSSHub clients are created once in the app lifespan and
+reuse pooled keep-alive connections, so requests skip DNS and TLS setup.
+"""
+
+import httpx
+
+from app.config import get_settings
+
+# HTTP/2 (one multiplexed connection per host) needs the h2 package
+try:
+    import h2  # noqa: F401
+    HTTP2_AVAILABLE = True
+except ImportError:
+    HTTP2_AVAILABLE = False
+
+# Idle pooled connections are closed after this many seconds
+KEEPALIVE_EXPIRY_SECONDS = 60.0
+
+
+def connection_limits() -> httpx.Limits:
+    """Connection pool limits for httpx clients, from settings."""
+    settings = get_settings()
+    return httpx.Limits(
+        max_connections=settings.http_max_connections,
+        max_keepalive_connections=settings.http_max_keepalive_connections,
+        keepalive_expiry=KEEPALIVE_EXPIRY_SECONDS,
+    )
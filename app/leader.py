@@ -0,0 +1,134 @@
+"""
+Leader election between worker processes via a lease in SQLite.
+
+With several uvicorn workers, every process runs the app lifespan. Only
+one of them may poll the feed, run catch-up and post replies: the X write
+budget and the Grok limiter are kept per process, and two pollers would
+fetch and analyze every mention twice. The process holding the "leader"
+lease in the leases table does that work; it renews the lease every third
+of leader_lease_seconds, and if it dies another process takes over once
+the lease expires.
+
+Analysis is spread over every process: the leader records the mentions it
+fetches in the mentions table, and each process (app.main.work_on_mentions)
+claims as many as its Grok limiter can take on. Mention claims
+(app.database.claim_mentions) keep two processes from working on the same
+mention; replies go through the shared outbox, which the leader posts.
+"""
+
+import asyncio
+import logging
+import os
+import socket
+import time
+import uuid
+from datetime import timedelta
+from typing import Awaitable, Callable
+
+from app.config import get_settings
+from app.database import acquire_lease, get_lease, release_lease
+
+logger = logging.getLogger(__name__)
+
+LEADER_LEASE_NAME = "leader"
+
+# Identifies this process in leases and mention claims
+PROCESS_ID = f"{socket.gethostname()}:{os.getpid()}:{uuid.uuid4().hex[:8]}"
+
+
+class LeaderLease:
+    """Holds (or waits for) the leader lease and keeps renewing it."""
+
+    def __init__(self, ttl: timedelta, holder: str = PROCESS_ID, name: str = LEADER_LEASE_NAME):
+        """
+        Args:
+            ttl: How long the lease lasts without renewal
+            holder: This process's ID
+            name: Lease name
+        """
+        self.ttl = ttl
+        self.holder = holder
+        self.name = name
+        self.is_leader = False
+        self._expires_at = 0.0  # local monotonic view of our lease's expiry
+        self._stopping = asyncio.Event()
+
+    async def acquire(self) -> bool:
+        """
+        Try once to take or renew the lease.
+
+        A database error keeps a held lease only until it would expire.
+
+        Returns:
+            True if this process is the leader
+        """
+        started = time.monotonic()
+        try:
+            held = await asyncio.to_thread(acquire_lease, self.name, self.holder, self.ttl)
+        except Exception as e:
+            logger.warning(f"Could not renew the {self.name} lease: {e!r}")
+            held = self.is_leader and time.monotonic() < self._expires_at
+        else:
+            if held:
+                self._expires_at = started + self.ttl.total_seconds()
+        if held != self.is_leader:
+            logger.info(
+                f"{'Acquired' if held else 'Lost'} the {self.name} lease ({self.holder})"
+            )
+        self.is_leader = held
+        return held
+
+    async def run(self, on_change: Callable[[bool], Awaitable[None]] | None = None) -> None:
+        """
+        Renew (or try to take) the lease until stop() is called.
+
+        Args:
+            on_change: Awaited with the new state whenever leadership changes
+        """
+        interval = self.ttl.total_seconds() / 3
+        while not self._stopping.is_set():
+            was_leader = self.is_leader
+            await self.acquire()
+            if on_change is not None and self.is_leader != was_leader:
+                try:
+                    await on_change(self.is_leader)
+                except Exception as e:
+                    logger.error(f"Leadership change handler failed: {e!r}")
+            try:
+                await asyncio.wait_for(self._stopping.wait(), interval)
+            except asyncio.TimeoutError:
+                pass
+
+    async def stop(self) -> None:
+        """Stop renewing and hand the lease over right away."""
+        self._stopping.set()
+        if self.is_leader:
+            self.is_leader = False
+            await asyncio.to_thread(release_lease, self.name, self.holder)
+
+    def stats(self) -> dict:
+        """Leadership for the status endpoint."""
+        lease = get_lease(self.name)
+        return {
+            "process": self.holder,
+            "is_leader": self.is_leader,
+            "leader": lease[0] if lease and lease[1] > time.time() else None,
+        }
+
+
+# Global lease instance - created in the app lifespan
+_leader_lease: LeaderLease | None = None
+
+
+def get_leader_lease() -> LeaderLease:
+    """Get the global leader lease, creating it from settings if needed."""
+    global _leader_lease
+    if _leader_lease is None:
+        _leader_lease = LeaderLease(timedelta(seconds=get_settings().leader_lease_seconds))
+    return _leader_lease
+
+
+def reset_leader_lease() -> None:
+    """Drop the lease so it is rebuilt from settings (for testing)."""
+    global _leader_lease
+    _leader_lease = None
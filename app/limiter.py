@@ -0,0 +1,128 @@
+"""
+Adaptive (AIMD) concurrency limiter for calls to rate-limited APIs.
+
+The window of allowed in-flight requests grows by about one per window of
+healthy responses (additive increase) and halves on overload signals such
+as 429s, 5xx responses or slow responses (multiplicative decrease), the way
+TCP congestion control tracks available bandwidth. Like TCP, the window is
+cut at most once per round trip: signals from requests that started before
+the last decrease describe the old window and are not counted again. A
+Retry-After from the provider pauses new requests until it has passed.
+"""
+
+import asyncio
+import time
+from contextlib import asynccontextmanager
+from typing import AsyncGenerator
+
+
+class AIMDLimiter:
+    """Concurrency window that adapts to the provider's feedback."""
+
+    def __init__(
+        self,
+        initial_limit: int,
+        min_limit: int = 1,
+        max_limit: int = 16,
+        decrease_factor: float = 0.5,
+        latency_target: float | None = None,
+    ):
+        """
+        Args:
+            initial_limit: Starting window
+            min_limit: The window never shrinks below this
+            max_limit: The window never grows above this
+            decrease_factor: Window multiplier on an overload signal
+            latency_target: Responses slower than this (seconds) count as overload
+        """
+        self.min_limit = max(1, min_limit)
+        self.max_limit = max(self.min_limit, max_limit)
+        self.limit = float(min(max(initial_limit, self.min_limit), self.max_limit))
+        self.decrease_factor = decrease_factor
+        self.latency_target = latency_target
+        self.in_flight = 0
+        self.overloads = 0
+        self._blocked_until = 0.0
+        self._last_decrease = float("-inf")
+        self._condition = asyncio.Condition()
+
+    @property
+    def window(self) -> int:
+        """Requests currently allowed in flight."""
+        return max(self.min_limit, int(self.limit))
+
+    @asynccontextmanager
+    async def slot(self) -> AsyncGenerator[float, None]:
+        """
+        Wait for a free slot in the window (and any Retry-After) and hold it.
+
+        Yields:
+            The request's start time, to pass back with its outcome
+        """
+        async with self._condition:
+            while True:
+                delay = self._blocked_until - time.monotonic()
+                if delay > 0:
+                    try:
+                        await asyncio.wait_for(self._condition.wait(), delay)
+                    except asyncio.TimeoutError:
+                        pass
+                    continue
+                if self.in_flight < self.window:
+                    break
+                await self._condition.wait()
+            self.in_flight += 1
+
+        try:
+            yield time.monotonic()
+        finally:
+            async with self._condition:
+                self.in_flight -= 1
+                self._condition.notify_all()
+
+    def on_success(self, latency: float, started: float | None = None) -> None:
+        """
+        Record a completed request.
+
+        The window only grows while it is actually the bottleneck, so an
+        idle period doesn't inflate it far beyond what was ever tested.
+
+        Args:
+            latency: Seconds the request took (per item for batched requests)
+            started: Start time yielded by slot(), if known
+        """
+        if self.latency_target is not None and latency > self.latency_target:
+            self._decrease(started)
+            return
+        if self.in_flight >= self.window:
+            self.limit = min(self.max_limit, self.limit + 1 / self.limit)
+
+    def on_overload(self, retry_after: float | None = None, started: float | None = None) -> None:
+        """
+        Record a 429/5xx/timeout.
+
+        Args:
+            retry_after: Seconds the provider asked us to wait, if any
+            started: Start time yielded by slot(), if known
+        """
+        self.overloads += 1
+        self._decrease(started)
+        if retry_after:
+            self._blocked_until = max(self._blocked_until, time.monotonic() + retry_after)
+
+    def _decrease(self, started: float | None) -> None:
+        # A burst of failures from one window shrinks it once, not per failure
+        if started is not None and started < self._last_decrease:
+            return
+        self.limit = max(self.min_limit, self.limit * self.decrease_factor)
+        self._last_decrease = time.monotonic()
+
+    def stats(self) -> dict:
+        """Current window and counters for the status endpoint."""
+        return {
+            "window": self.window,
+            "limit": round(self.limit, 2),
+            "in_flight": self.in_flight,
+            "overloads": self.overloads,
+            "retry_after_seconds": round(max(0.0, self._blocked_until - time.monotonic()), 1),
+        }
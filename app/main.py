@@ -7,27 +7,86 @@ Uses X API only for posting replies.
 Endpoints:
 - GET /health: Health check for Railway deployment
 - GET /status: Bot status and last poll time
+- GET /catchup: Progress of catching up on mentions missed during downtime
+- POST /poll: Trigger a poll (or join the one in flight)
+- GET /poll/{poll_id}: Status of a recent poll
 """
 
+import asyncio
+import json
 import logging
+import sqlite3
+import threading
+import time
 from contextlib import asynccontextmanager
-from datetime import datetime, timezone
+from dataclasses import asdict
+from datetime import datetime, timedelta, timezone
+from typing import Awaitable, Callable
 
 from apscheduler.schedulers.asyncio import AsyncIOScheduler
 from apscheduler.triggers.interval import IntervalTrigger
-from fastapi import FastAPI
+from fastapi import FastAPI, HTTPException
 
+from app.catchup import CatchUpRunner, get_catchup_runner, reset_catchup_runner
 from app.config import get_settings
 from app.database import (
+    add_prefilter_examples,
+    claim_abandoned_mentions,
+    claim_mentions,
+    close_pools,
+    discover_mentions,
+    enqueue_reply,
+    filter_unprocessed,
     init_db,
-    is_processed,
     mark_processed,
+    mark_mentions_analyzed,
+    mark_processed_many,
+    prune_analysis_cache,
+    prune_prefilter_examples,
+    prune_processed,
     get_last_seen_id,
+    get_mention_counts,
+    get_outbox_counts,
+    prune_mentions,
+    prune_outbox,
+    release_mentions,
+    save_processed_filter,
     set_last_seen_id,
+    skip_mentions,
 )
-from app.grok_client import analyze_fallacy
-from app.rss_client import fetch_mentions_rss, fetch_tweet_chain, RSSMention
-from app.twitter_client import post_reply
+from app.grok_client import (
+    analyze_fallacies_batch,
+    close_grok_client,
+    get_analysis_cache,
+    get_grok_client,
+    get_grok_limiter,
+    is_fallback_analysis,
+    FallacyAnalysis,
+)
+from app.leader import PROCESS_ID, get_leader_lease
+from app.outbox import OutboxWorker, get_outbox_worker, reset_outbox_worker
+from app.poll_coordinator import PollCoordinator
+from app.poll_interval import get_poll_interval
+from app.prefilter import get_prefilter, PrefilterDecision
+from app.rss_instances import get_rss_instance_pool
+from app.priority import (
+    base_score,
+    is_stale,
+    mention_published_at,
+    reply_age_limit_hours,
+    score,
+    thread_sizes,
+)
+from app.rss_client import (
+    close_rss_http_client,
+    fetch_mentions_page,
+    fetch_tweet_chain,
+    get_rss_http_client,
+    invalidate_feed_cache,
+    RSSMention,
+)
+from app.twitter_client import close_twitter_client, get_twitter_client
+from app.write_budget import WriteBudget, get_write_budget, reset_write_budget
 
 # Configure logging
 logging.basicConfig(
@@ -38,10 +97,28 @@ logger = logging.getLogger(__name__)
 
 # Bot configuration
 TRIGGER_PHRASE = "fallacyme"
+# X rejects a post identical to a recent one, and cached/near-duplicate
+# analyses give several mentions the same reply text, so each reply is
+# addressed to its requester with an opener picked by the mention's ID
+REPLY_OPENERS = ("", "Verdict: ", "Checked it: ", "Sheriff's take: ", "Here's the call: ")
+MAX_REPLY_LENGTH = 280
 
 # Global scheduler instance
 scheduler: AsyncIOScheduler | None = None
 
+# Posting worker task (drains the reply outbox; leader process only)
+outbox_task: asyncio.Task | None = None
+
+# Held while the state restored from SQLite (write budget, outbox worker,
+# catch-up runner) is built, so two threads never build it twice
+_leader_state_lock = threading.Lock()
+
+# Renews (or waits for) this process's leader lease
+lease_task: asyncio.Task | None = None
+
+# Lets one poll run at a time; created in the app lifespan
+poll_coordinator: PollCoordinator | None = None
+
 # Track last poll time for status endpoint
 last_poll_time: datetime | None = None
 mentions_processed_count: int = 0
@@ -51,102 +128,371 @@ async def poll_mentions() -> None:
     """
     Poll for new mentions via RSS and process them.
 
-    This function is called by the scheduler every few minutes.
+    This function is called by the scheduler at an interval that follows
+    the mention rate (see app/poll_interval.py).
     It fetches mentions from RSSHub, filters for trigger phrases,
-    and processes matching tweets.
+    and analyzes matching tweets in batches of grok_batch_size per Grok
+    request (as many at a time as the adaptive Grok limiter allows).
+    Mentions the newest feed page no longer reaches (after downtime) are
+    left to the catch-up runner.
+
+    All I/O is non-blocking: network calls are async and SQLite access
+    runs in worker threads, so /health stays responsive during a poll.
     """
     global last_poll_time, mentions_processed_count
 
     logger.info("Polling for new mentions via RSS...")
     last_poll_time = datetime.now(timezone.utc)
 
+    # Finish mentions a crashed worker or a failed attempt left behind
+    retried = await work_on_mentions()
+
     # Get the last seen tweet ID for filtering
-    since_id = get_last_seen_id()
+    since_id = await asyncio.to_thread(get_last_seen_id)
 
-    # Fetch mentions from RSSHub
-    mentions = fetch_mentions_rss()
+    # Fetch the newest page of mentions from RSSHub
+    page = await fetch_mentions_page(since_id=since_id)
+    if page is None:
+        return
+    # A page that ends above since_id after downtime leaves a gap below it,
+    # which the catch-up runner pages back through in the background
+    catchup = get_catchup_runner()
+    mentions = page.mentions
 
     if not mentions:
         logger.debug("No mentions found in RSS feed")
+        get_poll_interval().record(0)
+        catchup.resume(_handle_mentions)
         return
 
-    # Track the newest tweet ID for next poll
-    newest_id = None
-
+    # Keep only mentions newer than since_id, oldest first, so that
+    # last_seen_id can advance over a contiguous prefix of handled tweets
+    # (snowflakes are converted to int once and compared numerically)
+    since = int(since_id) if since_id else 0
+    keyed = []
     for mention in mentions:
-        tweet_id = mention.tweet_id
-
-        # Skip if we've seen this tweet before (older than since_id)
-        if since_id and int(tweet_id) <= int(since_id):
-            logger.debug(f"Tweet {tweet_id} is older than since_id, skipping")
+        snowflake = int(mention.tweet_id)
+        if snowflake <= since:
+            logger.debug(f"Tweet {mention.tweet_id} is older than since_id, skipping")
             continue
+        keyed.append((snowflake, mention))
+    keyed.sort(key=lambda item: item[0])
+    new_mentions = [mention for _, mention in keyed]
+    # The mention rate sets when the next poll runs
+    get_poll_interval().record(len(new_mentions))
+
+    # A mention that just failed again above is re-read from the feed (its
+    # failure held last_seen_id) but not sent to Grok twice in one poll; it
+    # still holds last_seen_id
+    failures = retried | await _handle_mentions(
+        [mention for mention in new_mentions if mention.tweet_id not in retried],
+        max(1, get_settings().grok_batch_size),
+    )
 
-        # Update newest_id
-        if newest_id is None or int(tweet_id) > int(newest_id):
-            newest_id = tweet_id
+    # Make sure the next poll re-reads the feed even if it is unchanged,
+    # otherwise the failed mentions would never be seen again
+    if failures:
+        await asyncio.to_thread(invalidate_feed_cache)
 
-        # Process the mention
-        await process_mention(mention)
+    # Record the gap before last_seen_id moves past it
+    if since_id and new_mentions and not page.reached_since and get_settings().catchup_enabled:
+        catchup.add_gap(since_id, new_mentions[0].tweet_id)
+        await asyncio.to_thread(catchup.save)
+
+    # Never advance past a mention that failed: it must be retried next poll
+    newest_id = None
+    for mention in new_mentions:
+        result = failures.get(mention.tweet_id)
+        if result is not None:
+            logger.error(
+                f"Failed to process mention {mention.tweet_id}: {result!r}; "
+                "holding last_seen_id so it is retried"
+            )
+            break
+        newest_id = mention.tweet_id
 
     # Update the last seen ID for next poll
     if newest_id:
-        set_last_seen_id(newest_id)
+        await asyncio.to_thread(set_last_seen_id, newest_id)
         logger.info(f"Updated last_seen_id to {newest_id}")
 
+    catchup.resume(_handle_mentions)
 
-async def process_mention(mention: RSSMention) -> None:
+
+async def work_on_mentions() -> dict[str, BaseException]:
     """
-    Process a single mention from RSS.
+    Claim and process mentions waiting in the mentions table.
 
-    Checks if the mention:
-    1. Contains "fallacyme" trigger phrase
-    2. Is a reply to another tweet (has in_reply_to info)
-    3. Hasn't been processed before
+    Runs in every worker process (scheduler job), so mentions the leader
+    recorded but didn't claim, gave back after a failure, or whose holder
+    crashed are analyzed by whichever process has Grok capacity. Waiting
+    mentions may come from catch-up, so only the longest age limit applies.
 
-    If all conditions are met, fetches the tweet chain (fallacy tweet + original),
-    analyzes for fallacies, and posts a reply.
+    Returns:
+        The mentions that failed again, by tweet ID
     """
-    global mentions_processed_count
+    waiting = await asyncio.to_thread(
+        claim_abandoned_mentions, PROCESS_ID, _mention_claim_ttl(), _claim_capacity()
+    )
+    if not waiting:
+        return {}
+    logger.info(f"Claimed {len(waiting)} waiting mentions")
+    return await _process_claimed_mentions(
+        [_mention_from_json(mention) for _, mention in waiting],
+        max(1, get_settings().grok_batch_size),
+        reply_age_limit_hours(),
+    )
+
+
+def _claim_capacity() -> int:
+    """Mentions this process takes on at once: what its Grok limiter lets through."""
+    return max(1, get_settings().grok_batch_size) * get_grok_limiter().window
+
+
+async def _handle_mentions(
+    mentions: list[RSSMention], batch_size: int, max_age_hours: float | None = None
+) -> dict[str, BaseException]:
+    """
+    Analyze mentions and queue their replies (shared by polls and catch-up).
+
+    Args:
+        mentions: Mentions to handle, oldest first
+        batch_size: Tweets per Grok request
+        max_age_hours: Skip older mentions (default: reply_max_age_hours)
+
+    Returns:
+        The mentions that failed and must be retried, by tweet ID
+    """
+    # Drop already-processed tweets with one bulk query before any per-mention
+    # work and record the rest as discovered, open to every worker process.
+    # This process claims what its Grok limiter can take on; work_on_mentions
+    # in the other processes (and later in this one) claims the rest.
+    by_id = {m.tweet_id: m for m in mentions}
+    unseen_ids = await asyncio.to_thread(filter_unprocessed, list(by_id))
+    await asyncio.to_thread(
+        discover_mentions,
+        [(tweet_id, _mention_to_json(by_id[tweet_id])) for tweet_id in unseen_ids],
+        timedelta(0),
+    )
+    claimed_ids = set(await asyncio.to_thread(
+        claim_mentions, unseen_ids[:_claim_capacity()], PROCESS_ID, _mention_claim_ttl()
+    ))
+    to_process = [m for m in mentions if m.tweet_id in claimed_ids]
+    if len(to_process) < len(unseen_ids):
+        logger.info(
+            f"Left {len(unseen_ids) - len(to_process)} mentions to other workers "
+            "or a later pass"
+        )
+    return await _process_claimed_mentions(to_process, batch_size, max_age_hours)
+
+
+async def _process_claimed_mentions(
+    mentions: list[RSSMention], batch_size: int, max_age_hours: float | None = None
+) -> dict[str, BaseException]:
+    """
+    Analyze mentions this process has claimed and finish each one.
+
+    Handled mentions end up queued or skipped, failed ones are given back
+    as discovered for a retry.
 
+    Returns:
+        The mentions that failed, by tweet ID
+    """
+    claimed_ids = {m.tweet_id for m in mentions}
+
+    # Check each mention and collect the ones that need a Grok analysis
+    now = time.time()
+    sizes = thread_sizes(mentions)
+    outcomes: dict[str, bool | BaseException] = {}
+    pending: list[tuple[RSSMention, str, str | None, PrefilterDecision | None]] = []
+    for mention in mentions:
+        if not _should_analyze(mention):
+            outcomes[mention.tweet_id] = False
+            continue
+        if is_stale(mention, now, max_age_hours):
+            logger.info(f"Mention {mention.tweet_id} is too old to reply to, skipping")
+            outcomes[mention.tweet_id] = True
+            continue
+        fallacy_text, original_text = fetch_tweet_chain(mention)
+        if not fallacy_text:
+            logger.error(f"Could not fetch fallacy tweet for mention {mention.tweet_id}")
+            outcomes[mention.tweet_id] = True
+            continue
+        decision = _prefilter_mention(mention, fallacy_text)
+        if decision is not None and decision.skip:
+            outcomes[mention.tweet_id] = True
+            continue
+        pending.append((mention, fallacy_text, original_text, decision))
+
+    # Under a backlog the most valuable mentions get the first Grok slots
+    # (confidence isn't known yet, so only popularity and age count)
+    pending.sort(
+        key=lambda item: score(
+            0, sizes[item[0].in_reply_to_tweet_id], mention_published_at(item[0]), now
+        ),
+        reverse=True,
+    )
+
+    # Analyze in batches (one Grok request each); the adaptive Grok limiter
+    # alone decides how many run at once
+    async def _analyze_batch(
+        batch: list[tuple[RSSMention, str, str | None, PrefilterDecision | None]],
+    ) -> None:
+        # A failure anywhere fails only this batch's unfinished mentions,
+        # so the other batches run to completion before claims are released
+        try:
+            analyses = await analyze_fallacies_batch(
+                [(fallacy_text, original_text) for _, fallacy_text, original_text, _ in batch]
+            )
+            await asyncio.to_thread(
+                mark_mentions_analyzed, [mention.tweet_id for mention, _, _, _ in batch], PROCESS_ID
+            )
+            await _record_prefilter_outcomes([
+                (fallacy_text, decision, analysis)
+                for (_, fallacy_text, _, decision), analysis in zip(batch, analyses)
+            ])
+
+            for (mention, _, _, _), analysis in zip(batch, analyses):
+                try:
+                    outcomes[mention.tweet_id] = await _act_on_analysis(
+                        mention, analysis, thread_size=sizes[mention.in_reply_to_tweet_id],
+                    )
+                except Exception as e:
+                    outcomes[mention.tweet_id] = e
+        except Exception as e:
+            for mention, _, _, _ in batch:
+                outcomes.setdefault(mention.tweet_id, e)
+
+    try:
+        # Every batch task has finished (or, if this is cancelled, been
+        # cancelled) before the claims are settled below
+        results = await asyncio.gather(
+            *(
+                _analyze_batch(pending[i:i + batch_size])
+                for i in range(0, len(pending), batch_size)
+            ),
+            return_exceptions=True,
+        )
+        for result in results:
+            if isinstance(result, BaseException):
+                logger.error(f"Analysis batch failed: {result!r}")
+    finally:
+        # Record every handled mention in one transaction (which finishes
+        # it), finish the ones that aren't for the bot and give the rest
+        # back for a retry. If this is cancelled the leftover claims expire.
+        handled_ids = [tweet_id for tweet_id, result in outcomes.items() if result is True]
+        ignored_ids = [tweet_id for tweet_id, result in outcomes.items() if result is False]
+        if handled_ids:
+            await asyncio.to_thread(mark_processed_many, handled_ids)
+        if ignored_ids:
+            await asyncio.to_thread(skip_mentions, ignored_ids)
+        await asyncio.to_thread(
+            release_mentions, claimed_ids.difference(handled_ids, ignored_ids)
+        )
+
+    return {
+        tweet_id: result
+        for tweet_id, result in outcomes.items()
+        if isinstance(result, BaseException)
+    }
+
+
+def _should_analyze(mention: RSSMention) -> bool:
+    """Trigger phrase and reply checks for a mention."""
     tweet_id = mention.tweet_id
     tweet_text = mention.text.lower()
 
     # Check for trigger phrase
     if TRIGGER_PHRASE not in tweet_text:
         logger.debug(f"Tweet {tweet_id} doesn't contain trigger phrase, skipping")
-        return
+        return False
 
     # Must be a reply to another tweet
     if not mention.in_reply_to_tweet_id:
         logger.info(f"Tweet {tweet_id} is not a reply, skipping")
-        return
-
-    # Check for duplicates
-    if is_processed(tweet_id):
-        logger.debug(f"Tweet {tweet_id} already processed, skipping")
-        return
+        return False
 
     logger.info(
         f"Processing mention {tweet_id}, "
         f"replying to {mention.in_reply_to_tweet_id}"
     )
+    return True
+
+
+def _mention_to_json(mention: RSSMention) -> str:
+    """Serialize a mention for the mentions table."""
+    return json.dumps(asdict(mention))
+
+
+def _mention_from_json(data: str) -> RSSMention:
+    """Rebuild a mention stored by _mention_to_json."""
+    return RSSMention(**json.loads(data))
+
+
+def _mention_claim_ttl() -> timedelta:
+    """How long a mention claim lasts if its holder never releases it."""
+    return timedelta(seconds=get_settings().mention_claim_seconds)
+
 
-    # Fetch the two-level tweet chain via RSS
-    # - fallacy_text: the tweet with the fallacy (parent of mention)
-    # - original_text: context tweet (grandparent of mention)
-    fallacy_text, original_text = fetch_tweet_chain(mention)
+def _prefilter_mention(mention: RSSMention, fallacy_text: str) -> PrefilterDecision | None:
+    """Score a mention with the local pre-filter (None if it is disabled)."""
+    prefilter = get_prefilter()
+    if prefilter is None:
+        return None
 
-    if not fallacy_text:
-        logger.error(f"Could not fetch fallacy tweet for mention {tweet_id}")
-        mark_processed(tweet_id)  # Mark to avoid retrying
+    decision = prefilter.decide(fallacy_text)
+    if decision.skip:
+        logger.info(
+            f"Pre-filter dropped mention {mention.tweet_id} "
+            f"(score {decision.score:.3f}), not calling Grok"
+        )
+    elif decision.shadow:
+        logger.info(f"Analyzing pre-filtered mention {mention.tweet_id} as a shadow sample")
+    return decision
+
+
+async def _record_prefilter_outcomes(
+    results: list[tuple[str, PrefilterDecision | None, FallacyAnalysis]],
+) -> None:
+    """Feed Grok's verdicts back into pre-filter metrics and training data."""
+    prefilter = get_prefilter()
+    if prefilter is None:
         return
 
-    # Analyze for fallacies using Grok (with context if available)
-    logger.info(
-        f"Analyzing fallacy tweet: {fallacy_text[:100]}... "
-        f"(context available: {bool(original_text)})"
-    )
-    analysis = analyze_fallacy(fallacy_text, context_tweet=original_text)
+    threshold = get_settings().confidence_threshold
+    examples = []
+    for fallacy_text, decision, analysis in results:
+        # Failed requests say nothing about the tweet
+        if decision is None or is_fallback_analysis(analysis):
+            continue
+        prefilter.record(decision, analysis.confidence, threshold)
+        examples.append((fallacy_text, decision.score, analysis.confidence, decision.shadow))
+
+    try:
+        await asyncio.to_thread(add_prefilter_examples, examples)
+    except sqlite3.Error as e:
+        logger.warning(f"Could not store pre-filter examples: {e}")
+
+
+async def _act_on_analysis(
+    mention: RSSMention,
+    analysis: FallacyAnalysis,
+    thread_size: int = 1,
+) -> bool:
+    """
+    Queue the analysis as a reply if it clears the confidence threshold.
+
+    The reply's priority (app.priority) weighs the confidence, the mention's
+    age and thread_size, the number of mentions tagging the same tweet.
+    A queued reply's mention is marked processed at once; otherwise the
+    caller records it with the rest of its batch.
+
+    Returns:
+        True (the mention is handled either way)
+    """
+    global mentions_processed_count
+
+    tweet_id = mention.tweet_id
 
     # Get confidence threshold from settings
     settings = get_settings()
@@ -154,7 +500,7 @@ async def process_mention(mention: RSSMention) -> None:
 
     # Log the analysis result
     logger.info(
-        f"Analysis result: confidence={analysis.confidence}%, "
+        f"Analysis result for {tweet_id}: confidence={analysis.confidence}%, "
         f"fallacy_detected={analysis.fallacy_detected}, "
         f"fallacy_name={analysis.fallacy_name}"
     )
@@ -165,43 +511,203 @@ async def process_mention(mention: RSSMention) -> None:
             f"Confidence {analysis.confidence}% below threshold {threshold}%, "
             f"not posting reply for tweet {tweet_id}"
         )
-        mark_processed(tweet_id)
+        return True
+
+    # Queue the reply to the mention tweet; the outbox worker posts it,
+    # highest priority first when the write budget is short. The outbox
+    # holds one reply per mention, so re-queueing is a no-op.
+    reply_text = _personalize_reply(mention, analysis.reply_text)
+    if await asyncio.to_thread(
+        enqueue_reply,
+        tweet_id,
+        reply_text,
+        priority=base_score(analysis.confidence, thread_size),
+        published_at=mention_published_at(mention),
+    ):
+        logger.info(f"Queued reply to tweet {tweet_id}")
+        mentions_processed_count += 1
+        get_outbox_worker().wake()
+
+    await asyncio.to_thread(mark_processed, tweet_id)
+    return True
+
+
+def _personalize_reply(mention: RSSMention, reply_text: str) -> str:
+    """
+    Address a reply to the mention's author so reused analyses aren't duplicates.
+
+    The opener varies with the mention's tweet ID, which keeps replies to
+    the same author distinct too. The analysis text is shortened if needed
+    to stay within X's length limit.
+    """
+    opener = REPLY_OPENERS[int(mention.tweet_id) % len(REPLY_OPENERS)]
+    prefix = f"@{mention.author_username} {opener}" if mention.author_username else opener
+    room = MAX_REPLY_LENGTH - len(prefix)
+    if len(reply_text) > room:
+        reply_text = reply_text[:room - 3] + "..."
+    return prefix + reply_text
+
+
+async def prune_history() -> None:
+    """
+    Delete processed tweets and cached analyses past their windows and
+    snapshot the processed-tweets filter (daily job).
+    """
+    settings = get_settings()
+    retention_days = settings.retention_days
+    deleted = await asyncio.to_thread(prune_processed, timedelta(days=retention_days))
+    logger.info(f"Pruned {deleted} processed tweets older than {retention_days} days")
+
+    if settings.analysis_cache_ttl_hours > 0:
+        expired = await asyncio.to_thread(
+            prune_analysis_cache, timedelta(hours=settings.analysis_cache_ttl_hours)
+        )
+        logger.info(f"Pruned {expired} expired cached analyses")
+
+    await asyncio.to_thread(prune_prefilter_examples, timedelta(days=retention_days))
+    await asyncio.to_thread(prune_outbox, timedelta(days=retention_days))
+    await asyncio.to_thread(prune_mentions, timedelta(days=retention_days))
+
+    # The filter is otherwise only saved on a clean shutdown
+    await asyncio.to_thread(save_processed_filter)
+
+
+async def _run_poll() -> None:
+    """The coordinator's poll (looked up on each call so tests can patch it)."""
+    try:
+        await poll_mentions()
+    finally:
+        # Count the next scheduled poll from this one, at the adapted interval
+        # (not once shutdown has stopped the scheduler)
+        if scheduler is not None and scheduler.running:
+            scheduler.reschedule_job(
+                "poll_mentions", trigger=IntervalTrigger(seconds=get_poll_interval().interval)
+            )
+
+
+async def _scheduled_poll() -> None:
+    """Scheduler job: poll, or join a manual poll that is already running."""
+    await poll_coordinator.run("scheduler")
+
+
+def _leader_only(job: Callable[[], Awaitable[None]]) -> Callable[[], Awaitable[None]]:
+    """Wrap a scheduler job so it only runs in the leader process."""
+    async def run() -> None:
+        if get_leader_lease().is_leader:
+            await job()
+    return run
+
+
+def _load_leader_state(reload: bool = False) -> tuple[WriteBudget, OutboxWorker, CatchUpRunner]:
+    """
+    Get the write budget, outbox worker and catch-up runner, restoring
+    their saved state from SQLite if needed (blocking; run in a worker thread).
+
+    Args:
+        reload: Drop the loaded state first and read it again
+    """
+    with _leader_state_lock:
+        if reload:
+            reset_write_budget()
+            reset_outbox_worker()
+            reset_catchup_runner()
+        return get_write_budget(), get_outbox_worker(), get_catchup_runner()
+
+
+async def _on_leadership_change(leader: bool) -> None:
+    """Start or stop the work only the leader process does (posting, catch-up)."""
+    global outbox_task
+
+    if not leader:
+        await _stop_leader_tasks()
         return
 
-    # Post the reply to the mention tweet
-    success = post_reply(tweet_id, analysis.reply_text)
+    # Reload state the previous leader may have changed
+    _, outbox, catchup = await asyncio.to_thread(_load_leader_state, True)
+
+    # Post queued replies (including any left from before a restart)
+    outbox_task = asyncio.create_task(outbox.run())
+    # Finish a catch-up interrupted by a restart
+    catchup.resume(_handle_mentions)
 
-    if success:
-        logger.info(f"Successfully replied to tweet {tweet_id}")
-        mentions_processed_count += 1
-    else:
-        logger.error(f"Failed to reply to tweet {tweet_id}")
 
-    # Mark as processed regardless of success to avoid spam
-    mark_processed(tweet_id)
+async def _stop_leader_tasks() -> None:
+    """Stop catch-up and the outbox worker (after the post in progress)."""
+    global outbox_task
+
+    await get_catchup_runner().stop()
+    if outbox_task:
+        logger.info("Stopping outbox worker...")
+        get_outbox_worker().stop()
+        await outbox_task
+        outbox_task = None
 
 
 @asynccontextmanager
 async def lifespan(app: FastAPI):
-    """Application lifespan handler - initialize database and start scheduler."""
-    global scheduler
+    """
+    Application lifespan handler - open the database pool and API clients,
+    take part in leader election and start the scheduler.
+
+    Every worker process runs this. Only the one holding the leader lease
+    polls, catches up and posts (see app.leader); every process analyzes
+    the mentions it claims from the mentions table, and the others take
+    over polling if the leader dies.
+    """
+    global scheduler, lease_task, poll_coordinator
 
     logger.info("Initializing database...")
     init_db()
 
-    # Get polling interval from settings
-    settings = get_settings()
-    interval_minutes = settings.poll_interval_minutes
+    # Open the shared API clients once; their connection pools are reused
+    # by every poll and reply
+    get_rss_http_client()
+    get_grok_client()
+    get_twitter_client()
+    # Restore saved state off the event loop; followers report it in /status
+    await asyncio.to_thread(_load_leader_state)
+
+    poll_coordinator = PollCoordinator(_run_poll)
+
+    lease = get_leader_lease()
+    if await lease.acquire():
+        await _on_leadership_change(True)
+    lease_task = asyncio.create_task(lease.run(_on_leadership_change))
+
+    # The poll job's interval starts from settings and adapts to the
+    # mention rate after every poll
+    interval_seconds = get_poll_interval().interval
 
     # Create and start the scheduler
-    logger.info(f"Starting scheduler with {interval_minutes} minute interval...")
+    logger.info(f"Starting scheduler with {interval_seconds:.0f} second poll interval...")
     scheduler = AsyncIOScheduler()
+    # A poll that overruns the interval delays the next one instead of
+    # overlapping it or queueing missed runs
     scheduler.add_job(
-        poll_mentions,
-        trigger=IntervalTrigger(minutes=interval_minutes),
+        _leader_only(_scheduled_poll),
+        trigger=IntervalTrigger(seconds=interval_seconds),
         id="poll_mentions",
         name="Poll for mentions via RSS",
         replace_existing=True,
+        coalesce=True,
+        max_instances=1,
+    )
+    # Every process analyzes mentions the leader recorded
+    scheduler.add_job(
+        work_on_mentions,
+        trigger=IntervalTrigger(seconds=get_settings().mention_worker_seconds),
+        id="work_on_mentions",
+        name="Analyze waiting mentions",
+        replace_existing=True,
+        coalesce=True,
+        max_instances=1,
+    )
+    scheduler.add_job(
+        _leader_only(prune_history),
+        trigger=IntervalTrigger(days=1),
+        id="prune_history",
+        name="Prune processed tweet history",
+        replace_existing=True,
     )
     scheduler.start()
 
@@ -216,6 +722,16 @@ async def lifespan(app: FastAPI):
     logger.info("Shutting down scheduler...")
     if scheduler:
         scheduler.shutdown(wait=False)
+    await poll_coordinator.stop()
+    await _stop_leader_tasks()
+    # Hand the lease to another worker without waiting for it to expire
+    await lease.stop()
+    if lease_task:
+        await lease_task
+    await close_rss_http_client()
+    await close_grok_client()
+    close_twitter_client()
+    close_pools()
     logger.info("FallacySheriff bot stopped")
 
 
@@ -241,27 +757,84 @@ async def bot_status() -> dict:
     Returns polling status, last poll time, and processing stats.
     """
     settings = get_settings()
+    cache = get_analysis_cache()
+    prefilter = get_prefilter()
+    budget, outbox, catchup = await asyncio.to_thread(_load_leader_state)
 
     return {
         "status": "running" if scheduler and scheduler.running else "stopped",
         "mode": "rss",
         "rsshub_url": settings.rsshub_url,
+        "rsshub": get_rss_instance_pool().stats(),
         "poll_interval_minutes": settings.poll_interval_minutes,
+        "poll_interval": get_poll_interval().stats(),
         "last_poll_time": last_poll_time.isoformat() if last_poll_time else None,
         "mentions_processed": mentions_processed_count,
-        "last_seen_id": get_last_seen_id(),
+        "last_seen_id": await asyncio.to_thread(get_last_seen_id),
+        "mentions": await asyncio.to_thread(get_mention_counts),
+        "analysis_cache": cache.stats() if cache else None,
+        "prefilter": prefilter.stats() if prefilter else None,
+        "grok_limiter": get_grok_limiter().stats(),
+        "outbox": {
+            **await asyncio.to_thread(get_outbox_counts),
+            **outbox.stats(),
+        },
+        "write_budget": budget.stats(),
+        "catchup": catchup.stats(),
+        "leader": await asyncio.to_thread(get_leader_lease().stats),
+        "poll": poll_coordinator.stats() if poll_coordinator else None,
     }
 
 
+@app.get("/catchup")
+async def catchup_status() -> dict:
+    """
+    Get catch-up progress.
+
+    Returns the open gaps below last_seen_id, pages and mentions read so
+    far, and the error that paused the last run, if any.
+    """
+    _, _, catchup = await asyncio.to_thread(_load_leader_state)
+    return catchup.stats()
+
+
 @app.post("/poll")
-async def trigger_poll() -> dict[str, str]:
+async def trigger_poll(wait: bool = True) -> dict:
     """
     Manually trigger a poll for mentions.
 
-    Useful for testing or catching up after downtime.
+    Useful for testing or catching up after downtime. Only one poll runs
+    at a time: if one is already in flight, this request joins it and gets
+    its result. Only the leader process fetches the feed; other worker
+    processes answer "not_leader" (they analyze the mentions it records
+    through work_on_mentions).
+
+    Args:
+        wait: Wait for the poll to finish (otherwise return its ID at once)
+    """
+    if not get_leader_lease().is_leader:
+        return {"status": "not_leader"}
+
+    if wait:
+        run = await poll_coordinator.run("manual")
+    else:
+        run, _ = poll_coordinator.trigger("manual")
+    status = {"completed": "poll_completed", "failed": "poll_failed"}.get(run.status, "poll_running")
+    return {"status": status, "poll_id": run.poll_id}
+
+
+@app.get("/poll/{poll_id}")
+async def poll_status(poll_id: str) -> dict:
+    """
+    Get the status of a recent poll by the ID POST /poll returned.
+
+    Raises:
+        HTTPException: 404 if the poll is unknown or too old
     """
-    await poll_mentions()
-    return {"status": "poll_completed"}
+    run = poll_coordinator.get(poll_id) if poll_coordinator else None
+    if run is None:
+        raise HTTPException(status_code=404, detail="Unknown poll ID")
+    return run.to_dict()
 
 
 # For local development
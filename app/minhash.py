@@ -0,0 +1,162 @@
+"""
+MinHash signatures and an LSH index for near-duplicate tweet text.
+
+Pile-ons produce many replies that quote the same claim with small edits.
+MinHash estimates the Jaccard similarity of two texts' character shingles
+from compact fixed-size signatures; LSH banding finds likely matches
+without comparing against every recent text.
+"""
+
+import hashlib
+import random
+import re
+import time
+from array import array
+from collections import OrderedDict
+from typing import Any
+
+SHINGLE_SIZE = 3  # characters
+
+# Signature = NUM_BANDS * ROWS_PER_BAND 32-bit minimums (256 bytes). Texts
+# above roughly (1 / NUM_BANDS) ** (1 / ROWS_PER_BAND) ~= 0.5 similarity
+# almost always share a band; candidates are then checked exactly.
+NUM_BANDS = 16
+ROWS_PER_BAND = 4
+NUM_PERMUTATIONS = NUM_BANDS * ROWS_PER_BAND
+
+_MERSENNE_PRIME = (1 << 61) - 1
+_MAX_HASH = (1 << 32) - 1
+_rng = random.Random(0x5EED)  # fixed so signatures are stable across restarts
+_PERMUTATIONS = [
+    (_rng.randrange(1, _MERSENNE_PRIME), _rng.randrange(0, _MERSENNE_PRIME))
+    for _ in range(NUM_PERMUTATIONS)
+]
+
+# Handles and links differ between otherwise identical pile-on replies
+_NOISE_RE = re.compile(r"@\w+|https?://\S+")
+_TOKEN_RE = re.compile(r"\w+")
+
+
+def tokenize(text: str) -> list[str]:
+    """Lowercased word tokens, without @handles and URLs."""
+    return _TOKEN_RE.findall(_NOISE_RE.sub(" ", text).casefold())
+
+
+def shingles(tokens: list[str]) -> set[str]:
+    """Character shingles of the space-joined tokens."""
+    joined = " ".join(tokens)
+    if len(joined) <= SHINGLE_SIZE:
+        return {joined} if joined else set()
+    return {joined[i:i + SHINGLE_SIZE] for i in range(len(joined) - SHINGLE_SIZE + 1)}
+
+
+def minhash(features: set[str]) -> array:
+    """
+    MinHash signature of a feature set.
+
+    Args:
+        features: Output of shingles() (must not be empty)
+
+    Returns:
+        NUM_PERMUTATIONS unsigned 32-bit values
+    """
+    hashes = [
+        int.from_bytes(hashlib.blake2b(f.encode(), digest_size=8).digest(), "little")
+        for f in features
+    ]
+    return array("I", (
+        min(((a * h + b) % _MERSENNE_PRIME) & _MAX_HASH for h in hashes)
+        for a, b in _PERMUTATIONS
+    ))
+
+
+def similarity(left: array, right: array) -> float:
+    """Estimated Jaccard similarity of two signatures."""
+    return sum(x == y for x, y in zip(left, right)) / NUM_PERMUTATIONS
+
+
+class MinHashIndex:
+    """
+    Recent signatures bucketed by LSH band for near-duplicate lookups.
+
+    Entries carry a namespace (e.g. the context tweet) and only match within
+    it. Entries expire after the window and the oldest are evicted beyond
+    max_entries.
+    """
+
+    def __init__(self, min_similarity: float, max_entries: int, window_seconds: float):
+        """
+        Args:
+            min_similarity: Smallest estimated Jaccard similarity that counts as a duplicate
+            max_entries: Oldest entries are evicted beyond this many
+            window_seconds: Entries older than this are ignored and evicted
+        """
+        self.min_similarity = min_similarity
+        self.max_entries = max(1, max_entries)
+        self.window_seconds = window_seconds
+        self._entries: OrderedDict[int, tuple[str, array, Any, float]] = OrderedDict()
+        self._buckets: dict[tuple[str, int, bytes], set[int]] = {}
+        self._next_id = 0
+
+    @staticmethod
+    def _band_keys(namespace: str, signature: array) -> list[tuple[str, int, bytes]]:
+        return [
+            (namespace, band, signature[band * ROWS_PER_BAND:(band + 1) * ROWS_PER_BAND].tobytes())
+            for band in range(NUM_BANDS)
+        ]
+
+    def _evict(self, entry_id: int) -> None:
+        namespace, signature, _, _ = self._entries.pop(entry_id)
+        for band_key in self._band_keys(namespace, signature):
+            bucket = self._buckets.get(band_key)
+            if bucket is not None:
+                bucket.discard(entry_id)
+                if not bucket:
+                    del self._buckets[band_key]
+
+    def _expire(self, now: float) -> None:
+        while self._entries:
+            oldest_id, (_, _, _, added_at) = next(iter(self._entries.items()))
+            if now - added_at <= self.window_seconds and len(self._entries) <= self.max_entries:
+                break
+            self._evict(oldest_id)
+
+    def add(self, namespace: str, signature: array, value: Any) -> None:
+        """Index a signature with the value to return for its near duplicates."""
+        now = time.time()
+        entry_id = self._next_id
+        self._next_id += 1
+        self._entries[entry_id] = (namespace, signature, value, now)
+        for band_key in self._band_keys(namespace, signature):
+            self._buckets.setdefault(band_key, set()).add(entry_id)
+        self._expire(now)
+
+    def find(self, namespace: str, signature: array) -> Any | None:
+        """
+        Return the value of the most similar recent entry above min_similarity.
+
+        Args:
+            namespace: Only entries added under this namespace match
+            signature: Signature to look up
+
+        Returns:
+            The stored value, or None if nothing is similar enough
+        """
+        self._expire(time.time())
+
+        candidates = set()
+        for band_key in self._band_keys(namespace, signature):
+            candidates.update(self._buckets.get(band_key, ()))
+
+        best_value = None
+        best_similarity = self.min_similarity
+        for entry_id in candidates:
+            _, other, value, _ = self._entries[entry_id]
+            score = similarity(signature, other)
+            if score >= best_similarity:
+                best_similarity = score
+                best_value = value
+        return best_value
+
+    def __len__(self) -> int:
+        return len(self._entries)
@@ -0,0 +1,206 @@
+"""
+Posting worker for the durable reply outbox.
+
+Analysis only queues replies (the reply_outbox table in app.database); this
+worker posts them at the pace X allows, independently of polling. The X
+write budget (app.write_budget) decides when the next post may go out and
+the highest-scoring due reply (app.priority) gets it; replies whose mention
+has grown too old are dropped instead. Transient failures are retried
+with exponential backoff, and a 429 reschedules the reply for when the
+limit resets instead of blocking. Every mention has one outbox row that is
+claimed atomically before posting, so it is replied to at most once, and
+queued replies survive restarts.
+"""
+
+import asyncio
+import logging
+import time
+from datetime import timedelta
+
+import requests
+import tweepy
+
+from app.config import get_settings
+from app.database import (
+    claim_due_reply,
+    complete_reply,
+    expire_stale_replies,
+    fail_reply,
+    next_reply_due_at,
+    recover_interrupted_replies,
+    retry_reply,
+)
+from app.priority import reply_age_limit_hours
+from app.twitter_client import send_reply
+from app.write_budget import WriteBudget, get_write_budget
+
+logger = logging.getLogger(__name__)
+
+# Retry delays for transient failures: base * 2^attempts, capped
+OUTBOX_BACKOFF_BASE = timedelta(minutes=1)
+OUTBOX_BACKOFF_MAX = timedelta(hours=1)
+# The queue is re-checked at least this often (seconds), even without a wake-up
+OUTBOX_IDLE_SECONDS = 60.0
+
+
+def _backoff(attempts: int) -> timedelta:
+    """Delay before retrying a reply that has failed `attempts` times before."""
+    return min(OUTBOX_BACKOFF_BASE * 2 ** attempts, OUTBOX_BACKOFF_MAX)
+
+
+class OutboxWorker:
+    """Drains the reply outbox within the X write budget."""
+
+    def __init__(
+        self,
+        budget: WriteBudget,
+        max_attempts: int,
+        client: tweepy.Client | None = None,
+        age_weight: float = 0.0,
+        max_age: timedelta | None = None,
+    ):
+        """
+        Args:
+            budget: X write budget, charged for every post
+            max_attempts: Transient failures after which a reply is abandoned
+            client: Optional Tweepy client (for testing)
+            age_weight: Priority points a reply loses per hour of mention age
+            max_age: Queued replies to older mentions are dropped (None = never)
+        """
+        self.budget = budget
+        self.max_attempts = max(1, max_attempts)
+        self.age_weight = age_weight
+        self.max_age = max_age
+        self._client = client
+        self._wakeup = asyncio.Event()
+        self._stopping = False
+        self.posted = 0
+        self.retried = 0
+        self.abandoned = 0
+        self.rate_limited = 0
+        self.expired = 0
+
+    def wake(self) -> None:
+        """Check the queue now (called after a reply is queued)."""
+        self._wakeup.set()
+
+    def stop(self) -> None:
+        """Make run() return after the post in progress, if any."""
+        self._stopping = True
+        self._wakeup.set()
+
+    async def run(self) -> None:
+        """Post queued replies until stop() is called."""
+        recovered = await asyncio.to_thread(recover_interrupted_replies)
+        if recovered:
+            logger.warning(f"Gave up on {recovered} replies interrupted while posting")
+
+        while not self._stopping:
+            self._wakeup.clear()
+            try:
+                delay = await self.drain()
+            except Exception as e:
+                logger.error(f"Outbox worker error: {e!r}")
+                delay = OUTBOX_IDLE_SECONDS
+            try:
+                await asyncio.wait_for(self._wakeup.wait(), min(delay, OUTBOX_IDLE_SECONDS))
+            except asyncio.TimeoutError:
+                pass
+
+    async def drain(self) -> float:
+        """
+        Post due replies, highest priority first, while the budget allows.
+
+        Returns:
+            Seconds until there may be more work (budget or a due reply)
+        """
+        while not self._stopping:
+            wait = self.budget.wait_time()
+            if wait > 0:
+                return wait
+
+            if self.max_age is not None:
+                expired = await asyncio.to_thread(expire_stale_replies, self.max_age)
+                if expired:
+                    self.expired += expired
+                    logger.info(f"Dropped {expired} queued replies to stale mentions")
+
+            claimed = await asyncio.to_thread(claim_due_reply, self.age_weight)
+            if claimed is None:
+                due_at = await asyncio.to_thread(next_reply_due_at)
+                if due_at is None:
+                    return OUTBOX_IDLE_SECONDS
+                return max(0.0, due_at - time.time())
+
+            await self._post(*claimed)
+        return 0.0
+
+    async def _post(self, tweet_id: str, text: str, attempts: int) -> None:
+        """Post one claimed reply and record the outcome."""
+        try:
+            reply_id = await send_reply(tweet_id, text, self._client, self.budget)
+        except tweepy.TooManyRequests as e:
+            # Not the reply's fault: wait for the window without using up
+            # attempts (send_reply already blocked the budget until then)
+            wait = max(1.0, self.budget.wait_time())
+            self.rate_limited += 1
+            logger.warning(f"X rate limit hit posting reply to {tweet_id}; resuming in {wait:.0f}s")
+            await asyncio.to_thread(
+                retry_reply, tweet_id, timedelta(seconds=wait), str(e), count_attempt=False
+            )
+        except (tweepy.TwitterServerError, requests.RequestException) as e:
+            # If X did accept a post that timed out, it rejects the identical
+            # retry as duplicate content (403), which fails it below
+            if attempts + 1 >= self.max_attempts:
+                self.abandoned += 1
+                logger.error(f"Giving up on reply to {tweet_id} after {attempts + 1} attempts: {e}")
+                await asyncio.to_thread(fail_reply, tweet_id, str(e))
+                return
+            delay = _backoff(attempts)
+            self.retried += 1
+            logger.warning(f"Reply to {tweet_id} failed ({e}); retrying in {delay}")
+            await asyncio.to_thread(retry_reply, tweet_id, delay, str(e))
+        except (tweepy.TweepyException, ValueError) as e:
+            # Rejected (deleted tweet, duplicate, bad text...): retrying won't help
+            self.abandoned += 1
+            logger.error(f"Reply to {tweet_id} rejected: {e}")
+            await asyncio.to_thread(fail_reply, tweet_id, str(e))
+        else:
+            self.posted += 1
+            await asyncio.to_thread(complete_reply, tweet_id, reply_id)
+
+    def stats(self) -> dict:
+        """Counters since startup and the remaining budget, for the status endpoint."""
+        return {
+            "posted": self.posted,
+            "retried": self.retried,
+            "abandoned": self.abandoned,
+            "rate_limited": self.rate_limited,
+            "expired": self.expired,
+        }
+
+
+# Global worker instance - started in the app lifespan
+_outbox_worker: OutboxWorker | None = None
+
+
+def get_outbox_worker() -> OutboxWorker:
+    """Get the global outbox worker, creating it from settings if needed."""
+    global _outbox_worker
+    if _outbox_worker is None:
+        settings = get_settings()
+        # Catch-up may queue replies older than reply_max_age_hours
+        max_age_hours = reply_age_limit_hours()
+        _outbox_worker = OutboxWorker(
+            get_write_budget(),
+            settings.reply_max_attempts,
+            age_weight=settings.priority_age_weight,
+            max_age=timedelta(hours=max_age_hours) if max_age_hours > 0 else None,
+        )
+    return _outbox_worker
+
+
+def reset_outbox_worker() -> None:
+    """Drop the worker so it is rebuilt from settings (for testing)."""
+    global _outbox_worker
+    _outbox_worker = None
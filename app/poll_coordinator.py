@@ -0,0 +1,147 @@
+"""
+Single-flight coordination of polls.
+
+Polls are started by the scheduler and by POST /poll. Two polls at once
+would fetch the same feed and race on last_seen_id, so at most one runs at
+a time: a trigger that arrives while a poll is in flight joins it and gets
+its result instead of starting another. Every poll gets an ID, and the
+last POLL_HISTORY_SIZE polls can be looked up by it.
+"""
+
+import asyncio
+import logging
+import uuid
+from collections import OrderedDict
+from dataclasses import asdict, dataclass
+from datetime import datetime, timezone
+from typing import Awaitable, Callable
+
+logger = logging.getLogger(__name__)
+
+# Finished polls kept for GET /poll/{poll_id}
+POLL_HISTORY_SIZE = 50
+
+
+@dataclass
+class PollRun:
+    """One poll and the triggers it served."""
+    poll_id: str
+    trigger: str  # what started it: "scheduler" or "manual"
+    started_at: str
+    status: str = "running"  # running, completed or failed
+    finished_at: str | None = None
+    error: str | None = None
+    joined: int = 0  # triggers that arrived while it ran and shared its result
+
+    def to_dict(self) -> dict:
+        """JSON-ready view for the API."""
+        return asdict(self)
+
+
+class PollCoordinator:
+    """Runs at most one poll at a time and lets overlapping triggers join it."""
+
+    def __init__(self, poll: Callable[[], Awaitable[None]]):
+        """
+        Args:
+            poll: Runs one poll
+        """
+        self._poll = poll
+        self._current: tuple[PollRun, asyncio.Task] | None = None
+        self._history: OrderedDict[str, PollRun] = OrderedDict()
+        self.coalesced = 0
+
+    @property
+    def current(self) -> PollRun | None:
+        """The poll in flight, if any."""
+        return self._current[0] if self._current else None
+
+    def trigger(self, source: str) -> tuple[PollRun, asyncio.Task]:
+        """
+        Start a poll, or join the one in flight.
+
+        Args:
+            source: What triggered it ("scheduler", "manual")
+
+        Returns:
+            (the poll, a task that finishes with it)
+        """
+        if self._current is not None:
+            run, task = self._current
+            run.joined += 1
+            self.coalesced += 1
+            logger.info(f"Poll {run.poll_id} already running; {source} trigger joins it")
+            return run, task
+
+        run = PollRun(
+            poll_id=uuid.uuid4().hex[:12],
+            trigger=source,
+            started_at=datetime.now(timezone.utc).isoformat(),
+        )
+        task = asyncio.create_task(self._run(run))
+        self._current = (run, task)
+        self._remember(run)
+        return run, task
+
+    async def run(self, source: str) -> PollRun:
+        """
+        Trigger a poll (or join the one in flight) and wait for it.
+
+        Cancelling the caller doesn't cancel the shared poll.
+
+        Args:
+            source: What triggered it ("scheduler", "manual")
+
+        Returns:
+            The finished poll
+        """
+        run, task = self.trigger(source)
+        await asyncio.shield(task)
+        return run
+
+    async def _run(self, run: PollRun) -> None:
+        try:
+            await self._poll()
+        except Exception as e:
+            logger.error(f"Poll {run.poll_id} failed: {e!r}")
+            run.status = "failed"
+            run.error = repr(e)
+        else:
+            run.status = "completed"
+        finally:
+            run.finished_at = datetime.now(timezone.utc).isoformat()
+            self._current = None
+            if run.status == "running":
+                run.status = "failed"
+                run.error = "cancelled"
+
+    def _remember(self, run: PollRun) -> None:
+        self._history[run.poll_id] = run
+        while len(self._history) > POLL_HISTORY_SIZE:
+            self._history.popitem(last=False)
+
+    def get(self, poll_id: str) -> PollRun | None:
+        """Look up a recent poll by ID."""
+        return self._history.get(poll_id)
+
+    async def stop(self) -> None:
+        """Cancel the poll in flight, if any (on shutdown)."""
+        if self._current is not None:
+            _, task = self._current
+            task.cancel()
+            try:
+                await task
+            except asyncio.CancelledError:
+                pass
+
+    def stats(self) -> dict:
+        """In-flight poll, last finished poll and coalesced triggers for /status."""
+        last = next(
+            (run for run in reversed(self._history.values()) if run.status != "running"),
+            None,
+        )
+        return {
+            "in_flight": self.current.poll_id if self.current else None,
+            "last": last.to_dict() if last else None,
+            "coalesced": self.coalesced,
+        }
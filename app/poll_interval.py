@@ -0,0 +1,124 @@
+"""
+Adaptive poll interval driven by the observed mention rate.
+
+A fixed interval either polls an idle feed for nothing or answers a storm
+late. After every poll the interval is recomputed:
+
+- when the poll found new mentions, the mention rate (new mentions per
+  second since the previous poll, smoothed) sets the interval to the time
+  in which about poll_target_mentions new mentions arrive, so busy periods
+  are polled often and quiet ones rarely
+- when it found none, the interval grows by poll_backoff_factor
+
+and always stays within poll_interval_min_seconds..poll_interval_max_seconds.
+Polls follow the mentions instead of the clock, so replies go out sooner
+during storms while idle hours cost fewer requests.
+"""
+
+import logging
+import time
+
+from app.config import get_settings
+
+logger = logging.getLogger(__name__)
+
+# Weight of the newest observation in the smoothed mention rate
+RATE_SMOOTHING = 0.5
+
+
+class AdaptivePollInterval:
+    """Tracks the mention rate and picks the delay until the next poll."""
+
+    def __init__(
+        self,
+        initial: float,
+        minimum: float,
+        maximum: float,
+        target_mentions: float,
+        backoff_factor: float = 2.0,
+    ):
+        """
+        Args:
+            initial: Starting interval (seconds)
+            minimum: Shortest interval (seconds)
+            maximum: Longest interval (seconds)
+            target_mentions: New mentions to aim for per poll
+            backoff_factor: Interval multiplier after a poll with no new mentions
+        """
+        self.minimum = max(1.0, minimum)
+        self.maximum = max(self.minimum, maximum)
+        self.target_mentions = max(0.1, target_mentions)
+        self.backoff_factor = max(1.0, backoff_factor)
+        self.interval = self._clamp(initial)
+        self.rate: float | None = None  # smoothed new mentions per second
+        self.empty_polls = 0
+        self.polls = 0
+        self._last_poll: float | None = None
+
+    def _clamp(self, seconds: float) -> float:
+        return min(self.maximum, max(self.minimum, seconds))
+
+    def record(self, new_mentions: int, now: float | None = None) -> float:
+        """
+        Update the rate with a finished poll's result.
+
+        Args:
+            new_mentions: Mentions the poll found newer than last_seen_id
+            now: Monotonic time of the poll (default: now)
+
+        Returns:
+            Seconds until the next poll
+        """
+        now = time.monotonic() if now is None else now
+        elapsed = now - self._last_poll if self._last_poll is not None else self.interval
+        self._last_poll = now
+        self.polls += 1
+
+        if new_mentions <= 0:
+            self.empty_polls += 1
+            self.interval = self._clamp(self.interval * self.backoff_factor)
+            return self.interval
+
+        self.empty_polls = 0
+        observed = new_mentions / max(elapsed, 1.0)
+        self.rate = (
+            observed if self.rate is None
+            else RATE_SMOOTHING * observed + (1 - RATE_SMOOTHING) * self.rate
+        )
+        self.interval = self._clamp(self.target_mentions / self.rate)
+        return self.interval
+
+    def stats(self) -> dict:
+        """Current cadence for the status endpoint."""
+        return {
+            "interval_seconds": round(self.interval, 1),
+            "mentions_per_minute": round(self.rate * 60, 2) if self.rate is not None else None,
+            "empty_polls": self.empty_polls,
+            "min_seconds": self.minimum,
+            "max_seconds": self.maximum,
+        }
+
+
+# Global interval instance - created from settings on first use
+_poll_interval: AdaptivePollInterval | None = None
+
+
+def get_poll_interval() -> AdaptivePollInterval:
+    """Get the global adaptive poll interval, creating it from settings if needed."""
+    global _poll_interval
+    if _poll_interval is None:
+        settings = get_settings()
+        _poll_interval = AdaptivePollInterval(
+            initial=settings.poll_interval_minutes * 60,
+            minimum=settings.poll_interval_min_seconds,
+            maximum=settings.poll_interval_max_seconds,
+            target_mentions=settings.poll_target_mentions,
+            backoff_factor=settings.poll_backoff_factor,
+        )
+    return _poll_interval
+
+
+def reset_poll_interval() -> None:
+    """Drop the interval so it is rebuilt from settings (for testing)."""
+    global _poll_interval
+    _poll_interval = None
@@ -0,0 +1,314 @@
+"""
+Cheap local pre-filter that skips obvious non-fallacies before Grok.
+
+Bare "@FallacySheriff fallacyme" tags, jokes and one-liners almost always
+come back far below the confidence threshold. A heuristic (too few real
+words) and an optional hashed-feature logistic model, trained offline on
+stored outcomes, estimate the chance that Grok would clear the threshold;
+mentions below the cutoff are dropped without an LLM call.
+
+A small share of dropped mentions is still analyzed ("shadow" samples) so
+the filter's precision and recall can be measured on live traffic.
+
+Train a model from the stored outcomes with:
+
+    python -m app.prefilter train [--db data/tweets.db] [--out data/prefilter_model.json]
+"""
+
+import argparse
+import hashlib
+import json
+import logging
+import math
+import random
+import sqlite3
+from dataclasses import dataclass
+from pathlib import Path
+
+from app.config import get_settings
+from app.minhash import tokenize
+
+logger = logging.getLogger(__name__)
+
+MODEL_VERSION = 1
+NUM_FEATURES = 1 << 18  # hashed feature space
+
+# Words that carry no argument in a trigger tweet
+_TRIGGER_WORDS = frozenset({"fallacyme"})
+
+
+def _content_tokens(text: str) -> list[str]:
+    """Tokens without handles, links and the trigger phrase."""
+    return [token for token in tokenize(text) if token not in _TRIGGER_WORDS]
+
+
+def extract_features(text: str) -> list[int]:
+    """
+    Hashed feature indices for a tweet: words, word pairs and coarse
+    length/punctuation/shouting buckets.
+    """
+    tokens = _content_tokens(text)
+    letters = [c for c in text if c.isalpha()]
+    caps_ratio = sum(c.isupper() for c in letters) / len(letters) if letters else 0.0
+
+    names = [f"w:{token}" for token in tokens]
+    names += [f"b:{a} {b}" for a, b in zip(tokens, tokens[1:])]
+    names += [
+        f"len:{min(len(tokens) // 5, 10)}",
+        f"caps:{round(caps_ratio * 4)}",
+        f"q:{min(text.count('?'), 3)}",
+        f"x:{min(text.count('!'), 3)}",
+    ]
+    return [
+        int.from_bytes(hashlib.blake2b(name.encode(), digest_size=8).digest(), "little") % NUM_FEATURES
+        for name in names
+    ]
+
+
+def _sigmoid(z: float) -> float:
+    if z >= 0:
+        return 1 / (1 + math.exp(-z))
+    e = math.exp(z)
+    return e / (1 + e)
+
+
+class LinearModel:
+    """Sparse logistic regression over hashed features."""
+
+    def __init__(self, weights: dict[int, float] | None = None, bias: float = 0.0):
+        self.weights = weights or {}
+        self.bias = bias
+
+    def predict(self, features: list[int]) -> float:
+        """Probability that Grok's confidence clears the threshold."""
+        weights = self.weights
+        return _sigmoid(self.bias + sum(weights.get(i, 0.0) for i in features))
+
+    @classmethod
+    def train(
+        cls,
+        examples: list[tuple[list[int], bool]],
+        epochs: int = 10,
+        learning_rate: float = 0.1,
+        l2: float = 1e-4,
+        seed: int = 0,
+    ) -> "LinearModel":
+        """
+        Fit by plain SGD on (features, label) pairs.
+
+        Positives are rare, so they are up-weighted to balance the classes.
+        """
+        model = cls()
+        positives = sum(label for _, label in examples)
+        if not positives or positives == len(examples):
+            model.bias = 10.0 if positives else -10.0
+            return model
+        positive_weight = (len(examples) - positives) / positives
+
+        order = list(range(len(examples)))
+        rng = random.Random(seed)
+        for _ in range(epochs):
+            rng.shuffle(order)
+            for idx in order:
+                features, label = examples[idx]
+                error = model.predict(features) - label
+                if label:
+                    error *= positive_weight
+                step = learning_rate * error
+                model.bias -= step
+                for i in features:
+                    w = model.weights.get(i, 0.0)
+                    model.weights[i] = w - step - learning_rate * l2 * w
+        return model
+
+    def save(self, path: str) -> None:
+        """Write the model as JSON (non-zero weights only)."""
+        data = {
+            "version": MODEL_VERSION,
+            "num_features": NUM_FEATURES,
+            "bias": self.bias,
+            "weights": {str(i): w for i, w in self.weights.items() if abs(w) > 1e-6},
+        }
+        Path(path).parent.mkdir(parents=True, exist_ok=True)
+        Path(path).write_text(json.dumps(data))
+
+    @classmethod
+    def load(cls, path: str) -> "LinearModel | None":
+        """Read a model written by save(); None if missing or incompatible."""
+        try:
+            data = json.loads(Path(path).read_text())
+        except (OSError, ValueError):
+            return None
+        if data.get("version") != MODEL_VERSION or data.get("num_features") != NUM_FEATURES:
+            logger.warning(f"Ignoring incompatible prefilter model {path}")
+            return None
+        return cls({int(i): w for i, w in data["weights"].items()}, data["bias"])
+
+
+@dataclass
+class PrefilterDecision:
+    """Outcome of scoring one mention."""
+    score: float  # estimated probability Grok would clear the threshold
+    skip: bool  # drop the mention without calling Grok
+    shadow: bool  # would be dropped, but analyzed anyway to measure the filter
+
+
+class Prefilter:
+    """
+    Scores mentions and tracks how good its drop decisions turn out to be.
+
+    Precision/recall refer to the "drop" decision and are measured only on
+    mentions Grok actually analyzed; shadow samples stand in for all
+    dropped mentions (weighted by 1 / shadow_rate).
+    """
+
+    def __init__(
+        self,
+        model: LinearModel | None,
+        min_words: int,
+        drop_below: float,
+        shadow_rate: float,
+        rng: random.Random | None = None,
+    ):
+        self.model = model
+        self.min_words = min_words
+        self.drop_below = drop_below
+        self.shadow_rate = shadow_rate
+        self._rng = rng or random.Random()
+        self.scored = 0
+        self.dropped = 0
+        self.shadowed = 0
+        # Weighted confusion counts for the drop decision
+        self._true_drops = 0.0
+        self._false_drops = 0.0
+        self._missed_drops = 0.0
+
+    def score(self, text: str) -> float:
+        """Estimated probability that Grok would clear the threshold."""
+        if len(_content_tokens(text)) < self.min_words:
+            return 0.0
+        if self.model is None:
+            return 1.0
+        return self.model.predict(extract_features(text))
+
+    def decide(self, text: str) -> PrefilterDecision:
+        """Score a mention and decide whether to skip, shadow or analyze it."""
+        score = self.score(text)
+        self.scored += 1
+        if score >= self.drop_below:
+            return PrefilterDecision(score, skip=False, shadow=False)
+        if self._rng.random() < self.shadow_rate:
+            self.shadowed += 1
+            return PrefilterDecision(score, skip=False, shadow=True)
+        self.dropped += 1
+        return PrefilterDecision(score, skip=True, shadow=False)
+
+    def record(self, decision: PrefilterDecision, confidence: int, threshold: int) -> None:
+        """Update precision/recall with Grok's verdict on an analyzed mention."""
+        would_drop = decision.score < self.drop_below
+        below = confidence < threshold
+        weight = 1 / self.shadow_rate if decision.shadow else 1.0
+        if would_drop and below:
+            self._true_drops += weight
+        elif would_drop:
+            self._false_drops += weight
+        elif below:
+            self._missed_drops += weight
+
+    def stats(self) -> dict:
+        """Counters and estimated precision/recall for the status endpoint."""
+        drops = self._true_drops + self._false_drops
+        below = self._true_drops + self._missed_drops
+        return {
+            "model_loaded": self.model is not None,
+            "scored": self.scored,
+            "dropped": self.dropped,
+            "shadowed": self.shadowed,
+            "precision": round(self._true_drops / drops, 3) if drops else None,
+            "recall": round(self._true_drops / below, 3) if below else None,
+        }
+
+
+# Global prefilter instance - lazily created from settings
+_prefilter: Prefilter | None = None
+
+
+def get_prefilter() -> Prefilter | None:
+    """Get the global prefilter, or None if it is disabled."""
+    global _prefilter
+    settings = get_settings()
+    if not settings.prefilter_enabled:
+        return None
+    if _prefilter is None:
+        model = LinearModel.load(settings.prefilter_model_path)
+        if model is not None:
+            logger.info(f"Loaded prefilter model from {settings.prefilter_model_path}")
+        _prefilter = Prefilter(
+            model,
+            settings.prefilter_min_words,
+            settings.prefilter_drop_below,
+            settings.prefilter_shadow_rate,
+        )
+    return _prefilter
+
+
+def reset_prefilter() -> None:
+    """Drop the prefilter so it is rebuilt from settings (for testing)."""
+    global _prefilter
+    _prefilter = None
+
+
+def _evaluate(model: LinearModel, examples: list[tuple[list[int], bool]], drop_below: float) -> dict:
+    """Precision/recall of the drop decision on labeled examples."""
+    true_drops = false_drops = missed = 0
+    for features, label in examples:
+        drop = model.predict(features) < drop_below
+        if drop and not label:
+            true_drops += 1
+        elif drop:
+            false_drops += 1
+        elif not label:
+            missed += 1
+    return {
+        "examples": len(examples),
+        "drop_rate": round((true_drops + false_drops) / len(examples), 3) if examples else None,
+        "precision": round(true_drops / (true_drops + false_drops), 3) if true_drops + false_drops else None,
+        "recall": round(true_drops / (true_drops + missed), 3) if true_drops + missed else None,
+    }
+
+
+def main(argv: list[str] | None = None) -> None:
+    """Train a model from the prefilter_examples table and report held-out metrics."""
+    parser = argparse.ArgumentParser(prog="python -m app.prefilter")
+    subcommands = parser.add_subparsers(dest="command", required=True)
+    train = subcommands.add_parser("train", help="train a model from stored analysis outcomes")
+    train.add_argument("--db", help="SQLite database (default: DATABASE_PATH)")
+    train.add_argument("--out", help="model file (default: PREFILTER_MODEL_PATH)")
+    train.add_argument("--threshold", type=int, help="label cutoff (default: CONFIDENCE_THRESHOLD)")
+    train.add_argument("--holdout", type=float, default=0.2, help="share of examples held out")
+    args = parser.parse_args(argv)
+
+    settings = get_settings()
+    db_path = args.db or settings.database_path
+    out_path = args.out or settings.prefilter_model_path
+    threshold = args.threshold if args.threshold is not None else settings.confidence_threshold
+
+    with sqlite3.connect(db_path) as conn:
+        rows = conn.execute("SELECT text, confidence FROM prefilter_examples").fetchall()
+    examples = [(extract_features(text), confidence >= threshold) for text, confidence in rows]
+    random.Random(0).shuffle(examples)
+    split = int(len(examples) * (1 - args.holdout))
+
+    # Report on a held-out split, then fit the saved model on everything
+    model = LinearModel.train(examples[:split])
+    print(json.dumps({
+        "train": _evaluate(model, examples[:split], settings.prefilter_drop_below),
+        "holdout": _evaluate(model, examples[split:], settings.prefilter_drop_below),
+    }, indent=2))
+
+    LinearModel.train(examples).save(out_path)
+    print(f"Saved model to {out_path}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,115 @@
+"""
+Reply priority scoring.
+
+The X write budget can't cover every reply during a storm, so the outbox
+posts the most valuable replies first. A reply's score combines:
+
+- Grok's confidence (a surer call is worth more)
+- thread popularity: how many mentions tag the same tweet (a pile-on
+  reaches more readers)
+- age: each hour since the mention was posted costs points, and mentions
+  older than reply_max_age_hours (catchup_max_age_hours for those found
+  by catch-up) are not replied to at all
+
+Age lowers every queued reply's score at the same rate, so the outbox
+stores the age-independent part (base_score) with the mention's publish
+time and ranks rows by base_score + age weight * publish hour, which orders
+them exactly like the current score would.
+"""
+
+import math
+from collections import Counter
+from datetime import datetime, timezone
+from email.utils import parsedate_to_datetime
+from typing import Iterable
+
+from app.config import get_settings
+from app.rss_client import RSSMention
+from app.snowflake import TIMESTAMP_SHIFT, snowflake_to_datetime
+
+
+def mention_published_at(mention: RSSMention) -> float | None:
+    """
+    When a mention was posted (epoch seconds), or None if unknown.
+
+    Uses the feed's date (RFC 822 as in RSS, or ISO 8601) and falls back
+    to the timestamp in the mention's snowflake ID.
+    """
+    published = mention.published.strip()
+    moment = None
+    if published:
+        try:
+            moment = parsedate_to_datetime(published)
+        except (TypeError, ValueError):
+            try:
+                moment = datetime.fromisoformat(published)
+            except ValueError:
+                moment = None
+    if moment is None and mention.tweet_id.isdigit() and int(mention.tweet_id) >> TIMESTAMP_SHIFT:
+        moment = snowflake_to_datetime(mention.tweet_id)
+    if moment is None:
+        return None
+    if moment.tzinfo is None:
+        moment = moment.replace(tzinfo=timezone.utc)
+    return moment.timestamp()
+
+
+def is_stale(mention: RSSMention, now: float, max_age_hours: float | None = None) -> bool:
+    """
+    True if the mention is too old to be worth a reply.
+
+    Args:
+        mention: The mention to check
+        now: Current time (epoch seconds)
+        max_age_hours: Age limit (default: reply_max_age_hours; 0 = no limit)
+    """
+    if max_age_hours is None:
+        max_age_hours = get_settings().reply_max_age_hours
+    if max_age_hours <= 0:
+        return False
+    published_at = mention_published_at(mention)
+    return published_at is not None and now - published_at > max_age_hours * 3600
+
+
+def reply_age_limit_hours() -> float:
+    """
+    Oldest mention any path still replies to, in hours (0 = no limit): the
+    longer of reply_max_age_hours (live polls) and catchup_max_age_hours.
+    """
+    settings = get_settings()
+    limits = (settings.reply_max_age_hours, settings.catchup_max_age_hours)
+    return 0.0 if min(limits) <= 0 else max(limits)
+
+
+def thread_sizes(mentions: Iterable[RSSMention]) -> Counter:
+    """Mentions per tagged tweet (in_reply_to_tweet_id)."""
+    return Counter(mention.in_reply_to_tweet_id for mention in mentions)
+
+
+def base_score(confidence: int, thread_size: int = 1) -> float:
+    """
+    Age-independent part of a reply's priority.
+
+    Args:
+        confidence: Grok's confidence (0-100)
+        thread_size: Mentions tagging the same tweet
+    """
+    settings = get_settings()
+    return (
+        settings.priority_confidence_weight * confidence / 100
+        + settings.priority_popularity_weight * math.log2(max(1, thread_size))
+    )
+
+
+def score(confidence: int, thread_size: int, published_at: float | None, now: float) -> float:
+    """
+    A reply's current priority (base_score minus the age penalty).
+
+    Args:
+        confidence: Grok's confidence (0-100)
+        thread_size: Mentions tagging the same tweet
+        published_at: When the mention was posted (None counts as now)
+        now: Current time (epoch seconds)
+    """
+    age_hours = max(0.0, now - published_at) / 3600 if published_at is not None else 0.0
+    return base_score(confidence, thread_size) - get_settings().priority_age_weight * age_hours
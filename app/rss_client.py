@@ -3,20 +3,52 @@ RSS client for fetching Twitter/X data via RSSHub.
 Bypasses X API read restrictions by using RSSHub RSS feeds.
 """
 
+import asyncio
+import hashlib
+import json
 import logging
 import re
-import urllib.request
-from dataclasses import dataclass
+import time
+import xml.etree.ElementTree as ET
+from dataclasses import dataclass, field
 from html import unescape
-from urllib.parse import urljoin
+from urllib.parse import quote, urljoin
 
 import feedparser
+import httpx
 
 from app.config import get_settings
+from app.database import delete_poll_state, get_poll_state, set_poll_state
+from app.http_clients import HTTP2_AVAILABLE, connection_limits
+from app.rss_instances import RSSInstance, get_rss_instance_pool
 
 # Timeout for RSS requests (seconds)
 RSS_REQUEST_TIMEOUT = 15
 
+# Bytes fed to the streaming XML parser at a time
+_PARSE_CHUNK_SIZE = 16 * 1024
+
+# Precompiled extraction patterns. None has nested quantifiers, and the tag
+# pattern stops at the next "<", so matching stays linear on any input.
+_STATUS_URL_RE = re.compile(r"(?:twitter\.com|x\.com)/(\w+)/status/(\d+)")
+_REPLY_LINK_RE = re.compile(
+    r"""href=["']?https?://(?:twitter\.com|x\.com)/(\w+)/status/(\d+)"""
+)
+_REPLYING_TO_RE = re.compile(r"Replying to @(\w+)", re.IGNORECASE)
+_TAG_RE = re.compile(r"<[^<>]*>")
+_LINE_AFTER_BREAK_RE = re.compile(r"\n+([^\n]*)")
+
+# Brotli is decoded by httpx only when a brotli package is installed
+try:
+    import brotli  # noqa: F401
+    ACCEPT_ENCODING = "br, gzip"
+except ImportError:
+    try:
+        import brotlicffi  # noqa: F401
+        ACCEPT_ENCODING = "br, gzip"
+    except ImportError:
+        ACCEPT_ENCODING = "gzip"
+
 logger = logging.getLogger(__name__)
 
 
@@ -33,12 +65,22 @@ class RSSMention:
     in_reply_to_username: str | None
 
 
+@dataclass
+class FeedPage:
+    """The mentions parsed from one RSSHub feed page."""
+    mentions: list[RSSMention] = field(default_factory=list)
+    # False if every entry was newer than since_id: mentions between since_id
+    # and the oldest entry may be missing from the page (see app.catchup)
+    reached_since: bool = True
+    # True if the instance reported the feed unchanged since its last
+    # answer (304 or identical body) instead of serving it
+    unchanged: bool = False
 
 
-def _build_rsshub_url(path: str) -> str:
-    """Build full RSSHub URL with optional access key."""
+def _build_rsshub_url(path: str, base_url: str | None = None) -> str:
+    """Build full RSSHub URL with optional access key (on rsshub_url by default)."""
     settings = get_settings()
-    url = urljoin(settings.rsshub_url, path)
+    url = urljoin(base_url or settings.rsshub_url, path)
     
     if settings.rsshub_access_key:
         separator = "&" if "?" in url else "?"
@@ -55,8 +97,8 @@ def _extract_tweet_id_from_link(link: str) -> str | None:
     - https://twitter.com/username/status/1234567890
     - https://x.com/username/status/1234567890
     """
-    match = re.search(r"(?:twitter\.com|x\.com)/\w+/status/(\d+)", link)
-    return match.group(1) if match else None
+    match = _STATUS_URL_RE.search(link)
+    return match.group(2) if match else None
 
 
 def _extract_username_from_link(link: str) -> str | None:
@@ -67,204 +109,579 @@ def _extract_username_from_link(link: str) -> str | None:
     - https://twitter.com/username/status/1234567890
     - https://x.com/username/status/1234567890
     """
-    match = re.search(r"(?:twitter\.com|x\.com)/(\w+)/status/", link)
+    match = _STATUS_URL_RE.search(link)
     return match.group(1) if match else None
 
 
-def _extract_text_from_entry(entry: dict) -> str:
+@dataclass
+class _EntryFields:
+    """Everything extracted from one RSS entry's HTML content."""
+    text: str
+    reply_to_tweet_id: str | None
+    reply_to_username: str | None
+    reply_to_text: str | None
+
+
+def _entry_content(entry) -> str:
     """
-    Extract clean text content from an RSS entry.
-    
+    Return the HTML content of an RSS entry.
+
     RSS entries may have content in 'summary', 'description', or 'content' fields.
-    HTML entities need to be unescaped and HTML tags stripped.
     """
-    # Try different content fields
-    content = ""
     if hasattr(entry, "summary"):
-        content = entry.summary
-    elif hasattr(entry, "description"):
-        content = entry.description
-    elif hasattr(entry, "content") and entry.content:
-        content = entry.content[0].get("value", "")
-    
-    # Strip HTML tags (basic approach)
-    content = re.sub(r"<[^>]+>", " ", content)
-    # Unescape HTML entities
-    content = unescape(content)
-    # Normalize whitespace
-    content = " ".join(content.split())
+        return entry.summary
+    if hasattr(entry, "description"):
+        return entry.description
+    if hasattr(entry, "content") and entry.content:
+        return entry.content[0].get("value", "")
+    return ""
+
+
+def _extract_entry_fields(entry) -> _EntryFields:
+    """
+    Extract text and reply context from an RSS entry in one pass.
+
+    The content is read once and every pattern is precompiled and free of
+    nested quantifiers, so the cost is linear in the content size.
+
+    - text: the whole entry, tags stripped
+    - reply-to ID and username: the first embedded status link, or the
+      "Replying to @username" marker if there is no link
+    - reply-to text: the first line after the first line break (RSSHub
+      puts the replied-to tweet there), kept if longer than 10 chars
+    """
+    content = _entry_content(entry)
+    stripped = _TAG_RE.sub(" ", content)
+
+    tweet_id = None
+    username = None
+    link_match = _REPLY_LINK_RE.search(content)
+    if link_match:
+        username = link_match.group(1)
+        tweet_id = link_match.group(2)
+    else:
+        # We may have the username but not the tweet ID - partial info
+        replying_match = _REPLYING_TO_RE.search(stripped)
+        if replying_match:
+            username = replying_match.group(1)
+
+    reply_text = None
+    line_match = _LINE_AFTER_BREAK_RE.search(stripped)
+    if line_match:
+        candidate = " ".join(unescape(line_match.group(1)).split())
+        if len(candidate) > 10:
+            reply_text = candidate
+
+    return _EntryFields(
+        text=" ".join(unescape(stripped).split()),
+        reply_to_tweet_id=tweet_id,
+        reply_to_username=username,
+        reply_to_text=reply_text,
+    )
+
+
+def _extract_text_from_entry(entry: dict) -> str:
+    """
+    Extract clean text content from an RSS entry.
     
-    return content.strip()
+    HTML entities are unescaped and HTML tags stripped.
+    """
+    return _extract_entry_fields(entry).text
 
 
 def _extract_reply_info_from_entry(entry: dict) -> tuple[str | None, str | None, str | None]:
     """
     Extract in_reply_to tweet ID, username, and text from RSS entry.
     
-    Looks for reply information in:
-    1. Entry content/summary (may contain quoted reply link and text)
-    2. Entry metadata
-    
-    RSSHub often embeds the replied-to tweet content in the entry HTML.
+    RSSHub often embeds the replied-to tweet link and content in the entry HTML.
     
     Returns:
         (in_reply_to_tweet_id, in_reply_to_username, in_reply_to_text)
     """
-    # Try to find reply-to link in content
-    content = ""
-    if hasattr(entry, "summary"):
-        content = entry.summary
-    elif hasattr(entry, "description"):
-        content = entry.description
-    elif hasattr(entry, "content") and entry.content:
-        content = entry.content[0].get("value", "")
-    
-    # Look for "Replying to @username" pattern or quoted tweet links
-    # RSSHub often includes the original tweet link in replies
-    reply_match = re.search(
-        r'href=["\']?(https?://(?:twitter\.com|x\.com)/(\w+)/status/(\d+))["\']?',
-        content
+    fields = _extract_entry_fields(entry)
+    return fields.reply_to_tweet_id, fields.reply_to_username, fields.reply_to_text
+
+
+@dataclass
+class _FeedEntry:
+    """Minimal RSS <item> view with the attributes the extractors read."""
+    link: str
+    summary: str
+    published: str
+
+
+def _mention_from_entry(entry) -> RSSMention | None:
+    """Build an RSSMention from a parsed feed entry (None if not a tweet)."""
+    # Extract tweet link and ID
+    link = getattr(entry, "link", "")
+    tweet_id = _extract_tweet_id_from_link(link)
+
+    if not tweet_id:
+        logger.debug(f"Could not extract tweet ID from: {link}")
+        return None
+
+    # Extract author username from link
+    author_username = _extract_username_from_link(link)
+    if not author_username:
+        logger.debug(f"Could not extract username from: {link}")
+        return None
+
+    # Get tweet text and reply-to information in one pass over the content
+    fields = _extract_entry_fields(entry)
+
+    return RSSMention(
+        tweet_id=tweet_id,
+        text=fields.text,
+        author_username=author_username,
+        published=getattr(entry, "published", ""),
+        link=link,
+        in_reply_to_tweet_id=fields.reply_to_tweet_id,
+        in_reply_to_username=fields.reply_to_username,
     )
-    
-    tweet_id = None
-    username = None
-    reply_text = None
-    
-    if reply_match:
-        username = reply_match.group(2)
-        tweet_id = reply_match.group(3)
-    
-    # Try to find "Replying to @username" text pattern
-    reply_to_match = re.search(r"Replying to @(\w+)", content, re.IGNORECASE)
-    if reply_to_match and not username:
-        # We have username but not tweet ID - partial info
-        username = reply_to_match.group(1)
-    
-    # Extract the replied-to tweet text if it's embedded in the RSS entry
-    # RSSHub sometimes includes quoted tweet content in blockquotes or similar
-    # Look for content between "Replying to" and the mention text
-    if content:
-        # Try to extract text from between markers that indicate reply content
-        # This handles cases where the reply-to tweet text is embedded
-        blockquote_match = re.search(
-            r"(?:Replying to @\w+.*?)?\n+([^<]*(?:<[^>]+>[^<]*)*?)(?:\n|$)",
-            content,
-            re.IGNORECASE
-        )
-        if blockquote_match:
-            potential_text = blockquote_match.group(1)
-            # Clean up the extracted text
-            potential_text = re.sub(r"<[^>]+>", " ", potential_text)
-            potential_text = unescape(potential_text)
-            potential_text = " ".join(potential_text.split())
-            if potential_text and len(potential_text) > 10:
-                reply_text = potential_text.strip()
-    
-    return tweet_id, username, reply_text
 
 
-def fetch_mentions_rss() -> list[RSSMention]:
+def _is_at_or_below(tweet_id: str | None, since: int) -> bool:
+    """True if a tweet ID is not newer than the `since` snowflake."""
+    return since > 0 and tweet_id is not None and int(tweet_id) <= since
+
+
+def _is_above(tweet_id: str | None, max_id: int) -> bool:
+    """True if a tweet ID is newer than the `max_id` snowflake (0 = no bound)."""
+    return max_id > 0 and tweet_id is not None and int(tweet_id) > max_id
+
+
+def _stream_parse_mentions(feed_content: bytes, since: int, max_id: int = 0) -> FeedPage:
     """
-    Fetch mentions of the bot via RSSHub RSS feed.
-    
-    Uses the /twitter/keyword route to search for mentions of the bot.
-    RSSHub includes reply context in the RSS entries.
-    
-    Returns:
-        List of RSSMention objects for tweets mentioning the bot
+    Pull-parse an RSS 2.0 document item by item, newest first.
+
+    Stops at the first item whose snowflake is at or below `since`, so
+    older items are neither parsed nor run through the text extractors.
+    Items newer than `max_id` (if set) are skipped.
+
+    Raises:
+        ET.ParseError: If the document isn't well-formed RSS 2.0
     """
-    settings = get_settings()
-    
-    # RSSHub route for keyword search
-    # Use simple route without routeParams to avoid URL encoding issues
-    url = _build_rsshub_url(f"/twitter/keyword/@{settings.bot_username}")
-    
-    logger.info(f"Fetching mentions from RSSHub: {url}")
-    
-    try:
-        # Use urllib with timeout to prevent hanging indefinitely
-        request = urllib.request.Request(url)
-        request.add_header('User-Agent', 'FallacySheriff/1.0')
-        
-        with urllib.request.urlopen(request, timeout=RSS_REQUEST_TIMEOUT) as response:
-            status_code = response.getcode()
-            content_type = response.headers.get('Content-Type', 'unknown')
-            feed_content = response.read()
-            
-            logger.info(
-                f"RSSHub response: status={status_code}, "
-                f"content_type={content_type}, "
-                f"content_length={len(feed_content)} bytes"
-            )
-            
-            # Log first 500 chars of response for debugging
-            content_preview = feed_content[:500].decode('utf-8', errors='replace')
-            logger.debug(f"Response preview: {content_preview}")
-        
-        feed = feedparser.parse(feed_content)
-        
-        if feed.bozo:
-            logger.error(f"RSS feed parse error: {feed.bozo_exception}")
-            # Log the actual content that failed to parse
-            logger.error(f"Failed content preview: {feed_content[:1000].decode('utf-8', errors='replace')}")
-            return []
-        
-        logger.info(f"Parsed feed: {len(feed.entries)} entries, feed title: {feed.feed.get('title', 'N/A')}")
-        
-        mentions = []
-        for entry in feed.entries:
-            # Extract tweet link and ID
-            link = getattr(entry, "link", "")
-            tweet_id = _extract_tweet_id_from_link(link)
-            
-            if not tweet_id:
-                logger.debug(f"Could not extract tweet ID from: {link}")
+    parser = ET.XMLPullParser(events=("start", "end"))
+    mentions = []
+    seen_root = False
+
+    for offset in range(0, len(feed_content), _PARSE_CHUNK_SIZE):
+        parser.feed(feed_content[offset:offset + _PARSE_CHUNK_SIZE])
+        for event, elem in parser.read_events():
+            if event == "start":
+                if not seen_root:
+                    seen_root = True
+                    if elem.tag != "rss":
+                        raise ET.ParseError(f"not an RSS 2.0 document (root <{elem.tag}>)")
                 continue
-            
-            # Extract author username from link
-            author_username = _extract_username_from_link(link)
-            if not author_username:
-                logger.debug(f"Could not extract username from: {link}")
+
+            if elem.tag != "item":
                 continue
-            
-            # Get tweet text
-            text = _extract_text_from_entry(entry)
-            
-            # Extract reply-to information (includes text if embedded in RSS)
-            reply_to_id, reply_to_username, reply_to_text = _extract_reply_info_from_entry(entry)
-            
-            mention = RSSMention(
-                tweet_id=tweet_id,
-                text=text,
-                author_username=author_username,
-                published=getattr(entry, "published", ""),
-                link=link,
-                in_reply_to_tweet_id=reply_to_id,
-                in_reply_to_username=reply_to_username,
+
+            entry = _FeedEntry(
+                link=(elem.findtext("link") or "").strip(),
+                summary=elem.findtext("description") or "",
+                published=(elem.findtext("pubDate") or "").strip(),
             )
+            elem.clear()
+
+            item_id = _extract_tweet_id_from_link(entry.link)
+            if _is_at_or_below(item_id, since):
+                logger.info(
+                    f"Reached already-seen tweets after {len(mentions)} new entries, "
+                    "stopping parse"
+                )
+                return FeedPage(mentions)
+            if _is_above(item_id, max_id):
+                continue
+
+            mention = _mention_from_entry(entry)
+            if mention:
+                mentions.append(mention)
+
+    parser.close()
+    return FeedPage(mentions, reached_since=since == 0)
+
+
+def _parse_mentions(
+    feed_content: bytes, since_id: str | None = None, max_id: str | None = None
+) -> FeedPage | None:
+    """
+    Parse raw RSS feed bytes into RSSMention objects newer than since_id
+    (and, if given, not newer than max_id).
+
+    Uses the streaming parser for RSSHub's RSS 2.0 output and falls back to
+    feedparser for anything else (Atom, malformed XML, HTML entities).
+    CPU-bound; callers on the event loop run this in a worker thread.
+
+    Returns:
+        The parsed page, or None if the feed could not be parsed
+    """
+    since = int(since_id) if since_id else 0
+    upper = int(max_id) if max_id else 0
+
+    try:
+        page = _stream_parse_mentions(feed_content, since, upper)
+        logger.info(f"Stream-parsed feed: {len(page.mentions)} new entries")
+        return page
+    except ET.ParseError as e:
+        logger.debug(f"Streaming parse failed ({e}), falling back to feedparser")
+
+    feed = feedparser.parse(feed_content)
+
+    if feed.bozo:
+        logger.error(f"RSS feed parse error: {feed.bozo_exception}")
+        # Log the actual content that failed to parse
+        logger.error(f"Failed content preview: {feed_content[:1000].decode('utf-8', errors='replace')}")
+        return None
+
+    logger.info(f"Parsed feed: {len(feed.entries)} entries, feed title: {feed.feed.get('title', 'N/A')}")
+
+    mentions = []
+    reached_since = since == 0
+    for entry in feed.entries:
+        # Skip already-seen entries before running the text extractors
+        item_id = _extract_tweet_id_from_link(getattr(entry, "link", ""))
+        if _is_at_or_below(item_id, since):
+            reached_since = True
+            continue
+        if _is_above(item_id, upper):
+            continue
+
+        mention = _mention_from_entry(entry)
+        if mention:
             mentions.append(mention)
-        
-        logger.info(f"Fetched {len(mentions)} mentions from RSS")
-        return mentions
-        
-    except urllib.error.HTTPError as e:
+
+    return FeedPage(mentions, reached_since)
+
+
+def _feed_cache_key(url: str) -> str:
+    """poll_state key holding the conditional-GET validators for a feed URL."""
+    return f"rss_cache:{hashlib.sha1(url.encode()).hexdigest()[:16]}"
+
+
+def _load_feed_cache(url: str) -> dict:
+    """Load stored ETag / Last-Modified / body hash for a feed URL."""
+    raw = get_poll_state(_feed_cache_key(url))
+    if not raw:
+        return {}
+    try:
+        return json.loads(raw)
+    except json.JSONDecodeError:
+        return {}
+
+
+def _save_feed_cache(url: str, response: httpx.Response, body_hash: str) -> None:
+    """Persist the validators of a successfully parsed feed response."""
+    cache = {
+        "etag": response.headers.get("ETag"),
+        "last_modified": response.headers.get("Last-Modified"),
+        "body_hash": body_hash,
+    }
+    set_poll_state(_feed_cache_key(url), json.dumps(cache))
+
+
+def invalidate_feed_cache() -> None:
+    """
+    Forget the stored validators so the next fetch downloads and parses
+    the full feed, even if it hasn't changed.
+
+    Called when a poll could not handle every mention, so the unchanged
+    feed is re-read and the failed mentions are retried.
+    """
+    for instance in get_rss_instance_pool().instances:
+        delete_poll_state(_feed_cache_key(_mentions_url(base_url=instance.url)))
+
+
+def _mentions_url(max_id: str | None = None, base_url: str | None = None) -> str:
+    """
+    RSSHub keyword-search URL for mentions of the bot.
+
+    With max_id, X's max_id: search operator limits the results to
+    mentions at or below that tweet ID, which pages backward in time.
+    """
+    keyword = f"@{get_settings().bot_username}"
+    if max_id:
+        keyword = quote(f"{keyword} max_id:{max_id}", safe="@")
+    return _build_rsshub_url(f"/twitter/keyword/{keyword}", base_url)
+
+
+# Global HTTP client - opened in the app lifespan
+_rss_http_client: httpx.AsyncClient | None = None
+
+
+def get_rss_http_client() -> httpx.AsyncClient:
+    """Get the shared RSSHub HTTP client (keep-alive pool), creating it if needed."""
+    global _rss_http_client
+    if _rss_http_client is None:
+        _rss_http_client = httpx.AsyncClient(
+            timeout=RSS_REQUEST_TIMEOUT,
+            limits=connection_limits(),
+            http2=HTTP2_AVAILABLE,
+        )
+    return _rss_http_client
+
+
+async def close_rss_http_client() -> None:
+    """Close the shared RSSHub HTTP client and its connections."""
+    global _rss_http_client
+    if _rss_http_client is not None:
+        client, _rss_http_client = _rss_http_client, None
+        await client.aclose()
+
+
+async def _fetch_feed(url: str, headers: dict[str, str] | None = None) -> httpx.Response | None:
+    """
+    Download a feed from RSSHub without blocking the event loop.
+
+    Args:
+        url: Full RSSHub URL (including access key if configured)
+        headers: Extra request headers (e.g. conditional-GET validators)
+
+    Returns:
+        The response (200 or 304), or None if the request failed
+    """
+    request_headers = {
+        "User-Agent": "FallacySheriff/1.0",
+        "Accept-Encoding": ACCEPT_ENCODING,
+    }
+    request_headers.update(headers or {})
+
+    try:
+        response = await get_rss_http_client().get(url, headers=request_headers)
+        if response.status_code != 304:
+            response.raise_for_status()
+
+        feed_content = response.content
+        logger.info(
+            f"RSSHub response: status={response.status_code}, "
+            f"content_type={response.headers.get('Content-Type', 'unknown')}, "
+            f"content_encoding={response.headers.get('Content-Encoding', 'identity')}, "
+            f"content_length={len(feed_content)} bytes"
+        )
+
+        # Log first 500 chars of response for debugging
+        content_preview = feed_content[:500].decode('utf-8', errors='replace')
+        logger.debug(f"Response preview: {content_preview}")
+
+        return response
+
+    except httpx.HTTPStatusError as e:
         # HTTP errors (4xx, 5xx) - log the response body for debugging
-        error_body = e.read().decode('utf-8', errors='replace')[:1000]
+        error_body = e.response.text[:1000]
         logger.error(
-            f"RSS fetch HTTP error: {e.code} {e.reason}\n"
+            f"RSS fetch HTTP error: {e.response.status_code} {e.response.reason_phrase}\n"
             f"URL: {url}\n"
             f"Response body: {error_body}"
         )
-        return []
-    except urllib.error.URLError as e:
-        logger.error(f"RSS fetch failed (URL error): {e.reason}\nURL: {url}")
-        return []
-    except TimeoutError:
+        return None
+    except httpx.TimeoutException:
         logger.error(f"RSS fetch timed out after {RSS_REQUEST_TIMEOUT}s\nURL: {url}")
-        return []
+        return None
+    except httpx.RequestError as e:
+        logger.error(f"RSS fetch failed (request error): {e}\nURL: {url}")
+        return None
+
+
+async def fetch_mentions_rss(since_id: str | None = None) -> list[RSSMention]:
+    """
+    Fetch mentions of the bot via RSSHub RSS feed.
+
+    See fetch_mentions_page, which also reports whether the page reached
+    since_id.
+
+    Args:
+        since_id: Only return mentions newer than this tweet ID
+
+    Returns:
+        List of RSSMention objects for tweets mentioning the bot
+    """
+    page = await fetch_mentions_page(since_id)
+    return page.mentions if page is not None else []
+
+
+async def fetch_mentions_page(
+    since_id: str | None = None, max_id: str | None = None
+) -> FeedPage | None:
+    """
+    Fetch one page of mentions of the bot via RSSHub RSS feed.
+
+    Uses the /twitter/keyword route to search for mentions of the bot.
+    RSSHub includes reply context in the RSS entries.
+
+    With mirrors configured (rsshub_mirrors), the request is hedged: it goes
+    to the healthiest instance first, and if that hasn't answered within its
+    p95 response time (or failed), to the next one as well. The first usable
+    page wins and the requests still running are cancelled; pages that
+    arrive together are merged and deduplicated by tweet ID. An instance
+    reporting the feed unchanged only wins once no other request is still
+    running, so a lagging mirror can't hide mentions another one serves
+    (its answer is merged with theirs). Response times
+    and failures feed the instances' health (see app.rss_instances).
+
+    Args:
+        since_id: Only return mentions newer than this tweet ID
+        max_id: Only return mentions at or below this tweet ID (pages
+            backward for catch-up)
+
+    Returns:
+        The page, or None if no instance could serve it
+    """
+    pool = get_rss_instance_pool()
+    instances = pool.ranked()
+    pending: dict[asyncio.Task, RSSInstance] = {}
+    pages: list[tuple[RSSInstance, FeedPage]] = []
+    hedges: list[RSSInstance] = []
+    launched = 0
+
+    def launch() -> RSSInstance:
+        nonlocal launched
+        instance = instances[launched]
+        launched += 1
+        pending[asyncio.create_task(_fetch_page_from(instance, since_id, max_id))] = instance
+        return instance
+
+    last = launch()
+    try:
+        while pending:
+            # Once an instance has answered, only the requests already sent are awaited
+            hedge_delay = (
+                pool.hedge_delay(last) if launched < len(instances) and not pages else None
+            )
+            done, _ = await asyncio.wait(
+                pending, timeout=hedge_delay, return_when=asyncio.FIRST_COMPLETED
+            )
+            if not done:
+                # No answer within the p95: hedge to the next instance
+                pool.hedged += 1
+                logger.info(
+                    f"RSSHub {last.url} slower than {hedge_delay:.2f}s, "
+                    f"hedging to {instances[launched].url}"
+                )
+                last = launch()
+                hedges.append(last)
+                continue
+            for task in done:
+                instance = pending.pop(task)
+                if task.result() is not None:
+                    pages.append((instance, task.result()))
+            if any(not page.unchanged for _, page in pages) or (pages and not pending):
+                break
+            if launched < len(instances) and not pages:
+                # Every request so far failed: try the next instance now
+                last = launch()
+    finally:
+        for task in pending:
+            task.cancel()
+        if pending:
+            await asyncio.gather(*pending, return_exceptions=True)
+
+    if not pages:
+        return None
+    if any(instance in hedges for instance, _ in pages):
+        pool.hedge_wins += 1
+    return _merge_pages([page for _, page in pages])
+
+
+def _merge_pages(pages: list[FeedPage]) -> FeedPage:
+    """
+    Merge pages from several instances, deduplicated by tweet ID, newest first.
+
+    The merged page reaches since_id only if every page did: otherwise
+    mentions below the oldest entry of a page may be missing.
+    """
+    if len(pages) == 1:
+        return pages[0]
+    by_id = {}
+    for page in pages:
+        for mention in page.mentions:
+            by_id.setdefault(mention.tweet_id, mention)
+    mentions = sorted(by_id.values(), key=lambda mention: int(mention.tweet_id), reverse=True)
+    return FeedPage(
+        mentions,
+        reached_since=all(page.reached_since for page in pages),
+        unchanged=all(page.unchanged for page in pages),
+    )
+
+
+async def _fetch_page_from(
+    instance: RSSInstance, since_id: str | None = None, max_id: str | None = None
+) -> FeedPage | None:
+    """
+    Fetch one page of mentions from one RSSHub instance.
+
+    Requests for the newest page are conditional (ETag / Last-Modified,
+    stored per instance) and compressed. A 304, or a body identical to the
+    last parsed one, returns an empty page without parsing: nothing in it
+    can be newer than last_seen_id. Older pages (max_id) are always fetched
+    in full.
+
+    Parsing stops at the first entry at or below since_id, so its cost
+    scales with the number of new mentions rather than the feed size.
+
+    Args:
+        instance: The RSSHub instance to ask
+        since_id: Only return mentions newer than this tweet ID
+        max_id: Only return mentions at or below this tweet ID
+
+    Returns:
+        The page, or None if it could not be fetched or parsed
+    """
+    pool = get_rss_instance_pool()
+    # RSSHub route for keyword search
+    # Use simple route without routeParams to avoid URL encoding issues
+    url = _mentions_url(max_id, instance.url)
+    conditional = max_id is None
+
+    logger.info(f"Fetching mentions from RSSHub: {url}")
+
+    started = time.monotonic()
+    try:
+        cache = await asyncio.to_thread(_load_feed_cache, url) if conditional else {}
+        conditional_headers = {}
+        if cache.get("etag"):
+            conditional_headers["If-None-Match"] = cache["etag"]
+        if cache.get("last_modified"):
+            conditional_headers["If-Modified-Since"] = cache["last_modified"]
+
+        response = await _fetch_feed(url, conditional_headers)
+        if response is None:
+            pool.record_failure(instance)
+            return None
+        latency = time.monotonic() - started
+
+        if response.status_code == 304:
+            logger.info("RSS feed not modified since last poll (304), skipping parse")
+            pool.record_success(instance, latency)
+            return FeedPage(unchanged=True)
+
+        feed_content = response.content
+        body_hash = hashlib.sha256(feed_content).hexdigest()
+        if body_hash == cache.get("body_hash"):
+            logger.info("RSS feed body unchanged since last poll, skipping parse")
+            pool.record_success(instance, latency)
+            return FeedPage(unchanged=True)
+
+        page = await asyncio.to_thread(_parse_mentions, feed_content, since_id, max_id)
+        if page is None:
+            pool.record_failure(instance)
+            return None
+        pool.record_success(instance, latency)
+
+        if conditional:
+            await asyncio.to_thread(_save_feed_cache, url, response, body_hash)
+
+        logger.info(f"Fetched {len(page.mentions)} mentions from RSS")
+        return page
+
+    except asyncio.CancelledError:
+        # Another instance answered first
+        pool.record_cancelled(instance, time.monotonic() - started)
+        raise
     except Exception as e:
         logger.error(f"Error fetching RSS mentions: {e}\nURL: {url}", exc_info=True)
-        return []
+        pool.record_failure(instance)
+        return None
 
 
 def fetch_tweet_chain(mention: RSSMention) -> tuple[str | None, str | None]:
@@ -0,0 +1,205 @@
+"""
+Health tracking for the RSSHub instances mentions are read from.
+
+rsshub_url can be backed by mirrors (rsshub_mirrors). Each instance keeps
+its recent response times and a smoothed failure rate; instances are tried
+fastest and most reliable first, and the p95 of an instance's response
+times is how long a request to it may take before a hedged request goes to
+the next one (see app.rss_client.fetch_mentions_page).
+
+An instance is ejected for RSS_EJECT_SECONDS after RSS_EJECT_FAILURES
+failures in a row, or when its p95 is more than RSS_SLOW_FACTOR times that
+of the fastest instance. Ejected instances are only used when no healthy
+one is left; after the ejection lapses, one more failure ejects them again.
+"""
+
+import logging
+import math
+import time
+from collections import deque
+from dataclasses import dataclass, field
+
+from app.config import get_settings
+
+logger = logging.getLogger(__name__)
+
+# Response times kept per instance for its p95
+RSS_LATENCY_WINDOW = 50
+# Samples needed before an instance's p95 is trusted (hedge delay, slowness)
+RSS_MIN_SAMPLES = 5
+# Hedge delay until an instance has RSS_MIN_SAMPLES samples (seconds)
+RSS_DEFAULT_HEDGE_DELAY = 2.0
+# Shortest hedge delay, so a fast instance's jitter doesn't double every request
+RSS_MIN_HEDGE_DELAY = 0.25
+# Consecutive failures that eject an instance
+RSS_EJECT_FAILURES = 3
+# An instance whose p95 exceeds this multiple of the fastest one's is ejected
+RSS_SLOW_FACTOR = 3.0
+# How long an ejected instance is passed over (seconds)
+RSS_EJECT_SECONDS = 300
+# Weight of the newest result in the smoothed failure rate
+RSS_FAILURE_SMOOTHING = 0.2
+
+
+def _p95(samples) -> float:
+    ordered = sorted(samples)
+    return ordered[min(len(ordered) - 1, math.ceil(0.95 * len(ordered)) - 1)]
+
+
+@dataclass
+class RSSInstance:
+    """One RSSHub instance and its recent health."""
+    url: str
+    latencies: deque = field(default_factory=lambda: deque(maxlen=RSS_LATENCY_WINDOW))
+    failure_rate: float = 0.0
+    consecutive_failures: int = 0
+    requests: int = 0
+    failures: int = 0
+    ejected_until: float = 0.0  # monotonic
+
+    @property
+    def p95(self) -> float | None:
+        """95th percentile response time (None until RSS_MIN_SAMPLES samples)."""
+        if len(self.latencies) < RSS_MIN_SAMPLES:
+            return None
+        return _p95(self.latencies)
+
+    def is_ejected(self, now: float) -> bool:
+        return now < self.ejected_until
+
+    def score(self) -> float:
+        """Expected cost of a request; lower is better."""
+        latency = self.p95 if self.p95 is not None else RSS_DEFAULT_HEDGE_DELAY
+        return latency * (1 + 4 * self.failure_rate)
+
+
+class RSSInstancePool:
+    """Orders RSSHub instances by health and ejects failing or slow ones."""
+
+    def __init__(self, urls: list[str]):
+        """
+        Args:
+            urls: RSSHub base URLs, preferred first
+        """
+        self.instances = [RSSInstance(url) for url in urls]
+        self.hedged = 0  # hedged requests sent
+        self.hedge_wins = 0  # polls answered by a hedged request
+
+    def ranked(self, now: float | None = None) -> list[RSSInstance]:
+        """
+        Instances in the order to try them: healthy ones by score (ties in
+        configured order), then ejected ones by when their ejection ends.
+        """
+        now = time.monotonic() if now is None else now
+        healthy = [i for i in self.instances if not i.is_ejected(now)]
+        ejected = [i for i in self.instances if i.is_ejected(now)]
+        return (
+            sorted(healthy, key=RSSInstance.score)
+            + sorted(ejected, key=lambda i: i.ejected_until)
+        )
+
+    def hedge_delay(self, instance: RSSInstance) -> float:
+        """Seconds to wait for an instance before hedging to the next one."""
+        if instance.p95 is None:
+            return RSS_DEFAULT_HEDGE_DELAY
+        return max(RSS_MIN_HEDGE_DELAY, instance.p95)
+
+    def record_success(self, instance: RSSInstance, latency: float) -> None:
+        """Record a usable response and its response time."""
+        instance.requests += 1
+        instance.latencies.append(latency)
+        instance.consecutive_failures = 0
+        instance.failure_rate *= 1 - RSS_FAILURE_SMOOTHING
+        self._eject_if_slow(instance)
+
+    def record_failure(self, instance: RSSInstance) -> None:
+        """Record a failed request (error status, timeout, unparseable feed)."""
+        instance.requests += 1
+        instance.failures += 1
+        instance.consecutive_failures += 1
+        instance.failure_rate = (
+            RSS_FAILURE_SMOOTHING + (1 - RSS_FAILURE_SMOOTHING) * instance.failure_rate
+        )
+        if instance.consecutive_failures >= RSS_EJECT_FAILURES:
+            self._eject(instance, f"{instance.consecutive_failures} failures in a row")
+
+    def record_cancelled(self, instance: RSSInstance, elapsed: float) -> None:
+        """
+        Record a request cancelled because another instance answered first.
+
+        Its response time was at least `elapsed`, which is kept as a sample
+        so a consistently slow instance's p95 still grows.
+        """
+        instance.latencies.append(elapsed)
+        self._eject_if_slow(instance)
+
+    def _eject_if_slow(self, instance: RSSInstance) -> None:
+        now = time.monotonic()
+        others = [
+            other.p95 for other in self.instances
+            if other is not instance and other.p95 is not None and not other.is_ejected(now)
+        ]
+        if instance.p95 is None or not others:
+            return
+        fastest = min(others)
+        if instance.p95 > RSS_SLOW_FACTOR * max(fastest, RSS_MIN_HEDGE_DELAY):
+            self._eject(instance, f"p95 {instance.p95:.2f}s vs {fastest:.2f}s")
+
+    def _eject(self, instance: RSSInstance, reason: str) -> None:
+        now = time.monotonic()
+        if instance.is_ejected(now):
+            return
+        instance.ejected_until = now + RSS_EJECT_SECONDS
+        # One more failure after the ejection lapses ejects it again
+        instance.consecutive_failures = RSS_EJECT_FAILURES - 1
+        # Forget the slow samples so it is judged afresh when it comes back
+        instance.latencies.clear()
+        logger.warning(f"Ejecting RSSHub instance {instance.url} for {RSS_EJECT_SECONDS}s: {reason}")
+
+    def stats(self) -> dict:
+        """Per-instance health and hedging counters for the status endpoint."""
+        now = time.monotonic()
+        return {
+            "hedged": self.hedged,
+            "hedge_wins": self.hedge_wins,
+            "instances": [
+                {
+                    "url": instance.url,
+                    "p95_seconds": round(instance.p95, 3) if instance.p95 is not None else None,
+                    "failure_rate": round(instance.failure_rate, 3),
+                    "requests": instance.requests,
+                    "failures": instance.failures,
+                    "ejected_for_seconds": (
+                        round(instance.ejected_until - now) if instance.is_ejected(now) else 0
+                    ),
+                }
+                for instance in self.instances
+            ],
+        }
+
+
+def rsshub_urls() -> list[str]:
+    """Configured RSSHub base URLs: rsshub_url, then rsshub_mirrors, deduplicated."""
+    settings = get_settings()
+    urls = [settings.rsshub_url] + [
+        url.strip() for url in settings.rsshub_mirrors.split(",") if url.strip()
+    ]
+    return list(dict.fromkeys(urls))
+
+
+# Global pool instance - created from settings on first use
+_rss_instance_pool: RSSInstancePool | None = None
+
+
+def get_rss_instance_pool() -> RSSInstancePool:
+    """Get the global RSSHub instance pool, creating it from settings if needed."""
+    global _rss_instance_pool
+    if _rss_instance_pool is None:
+        _rss_instance_pool = RSSInstancePool(rsshub_urls())
+    return _rss_instance_pool
+
+
+def reset_rss_instance_pool() -> None:
+    """Drop the pool so it is rebuilt from settings (for testing)."""
+    global _rss_instance_pool
+    _rss_instance_pool = None
@@ -0,0 +1,26 @@
+"""
+Helpers for X/Twitter snowflake IDs.
+
+A snowflake's upper bits are a millisecond timestamp since the Twitter
+epoch, so IDs sort by creation time and encode their own age.
+"""
+
+from datetime import datetime, timezone
+
+# 2010-11-04T01:42:54.657Z, the Twitter snowflake epoch (milliseconds)
+TWITTER_EPOCH_MS = 1288834974657
+
+# Bits below the timestamp (worker ID + sequence)
+TIMESTAMP_SHIFT = 22
+
+
+def snowflake_to_datetime(tweet_id: int | str) -> datetime:
+    """Return the creation time encoded in a snowflake ID."""
+    ms = (int(tweet_id) >> TIMESTAMP_SHIFT) + TWITTER_EPOCH_MS
+    return datetime.fromtimestamp(ms / 1000, tz=timezone.utc)
+
+
+def snowflake_from_datetime(moment: datetime) -> int:
+    """Return the smallest snowflake ID that could be created at `moment`."""
+    ms = int(moment.timestamp() * 1000) - TWITTER_EPOCH_MS
+    return max(0, ms) << TIMESTAMP_SHIFT
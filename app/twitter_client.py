@@ -5,60 +5,138 @@ Only used for posting replies - reading is handled by RSSHub
 to bypass X API read rate limits.
 """
 
+import asyncio
 import logging
 
+import requests
 import tweepy
+from requests.adapters import HTTPAdapter
 
 from app.config import get_settings
+from app.write_budget import WriteBudget, get_write_budget, save_write_budget
 
 logger = logging.getLogger(__name__)
 
 
+# Global client instance - opened in the app lifespan
+_twitter_client: tweepy.Client | None = None
+
+
 def get_twitter_client() -> tweepy.Client:
-    """Create and return a Tweepy v2 Client."""
-    settings = get_settings()
-    return tweepy.Client(
-        bearer_token=settings.twitter_bearer_token,
-        consumer_key=settings.twitter_consumer_key,
-        consumer_secret=settings.twitter_consumer_secret,
-        access_token=settings.twitter_access_token,
-        access_token_secret=settings.twitter_access_token_secret,
-        wait_on_rate_limit=True,
-    )
-
-
-def post_reply(reply_to_tweet_id: str, text: str, client: tweepy.Client | None = None) -> bool:
     """
-    Post a reply to a tweet.
+    Get the shared Tweepy v2 Client, creating it if needed.
+
+    Tweepy sends everything through one requests.Session, so reusing the
+    client keeps connections to the X API alive between replies. requests
+    has no HTTP/2 support; the session's pool is sized from settings.
+    """
+    global _twitter_client
+    if _twitter_client is None:
+        settings = get_settings()
+        client = tweepy.Client(
+            bearer_token=settings.twitter_bearer_token,
+            consumer_key=settings.twitter_consumer_key,
+            consumer_secret=settings.twitter_consumer_secret,
+            access_token=settings.twitter_access_token,
+            access_token_secret=settings.twitter_access_token_secret,
+            # Rate limits are handled by the outbox worker, which reschedules
+            # instead of sleeping for up to 15 minutes
+            wait_on_rate_limit=False,
+            # Raw responses, so the rate-limit headers reach the write budget
+            return_type=requests.Response,
+        )
+        # pool_maxsize is the number of idle connections kept per host
+        client.session.mount("https://", HTTPAdapter(
+            pool_maxsize=settings.http_max_keepalive_connections,
+        ))
+        _twitter_client = client
+    return _twitter_client
+
+
+def close_twitter_client() -> None:
+    """Close the shared Tweepy client's session and connections."""
+    global _twitter_client
+    if _twitter_client is not None:
+        client, _twitter_client = _twitter_client, None
+        client.session.close()
+
+
+async def send_reply(
+    reply_to_tweet_id: str,
+    text: str,
+    client: tweepy.Client | None = None,
+    budget: WriteBudget | None = None,
+) -> str:
+    """
+    Post a reply to a tweet, raising on failure.
+
+    Tweepy is synchronous, so the request runs in a worker thread to keep
+    the event loop responsive. Every post (and 429) is accounted in the
+    write budget (app.write_budget).
 
     Args:
         reply_to_tweet_id: The ID of the tweet to reply to
         text: The reply text (must be under 280 characters)
         client: Optional Tweepy client (for testing)
+        budget: Write budget to charge (default: the process-wide one)
 
     Returns:
-        True if successful, False otherwise
+        The ID of the posted reply
+
+    Raises:
+        ValueError: If the text is too long or X returned no tweet
+        tweepy.TweepyException: If the X API rejected the request
+        requests.RequestException: If the X API couldn't be reached
     """
     if client is None:
         client = get_twitter_client()
 
     if len(text) > 280:
-        logger.error(f"Reply text too long: {len(text)} characters")
-        return False
+        raise ValueError(f"Reply text too long: {len(text)} characters")
 
+    if budget is None:
+        budget = get_write_budget()
     try:
-        response = client.create_tweet(
+        response = await asyncio.to_thread(
+            client.create_tweet,
             text=text,
             in_reply_to_tweet_id=reply_to_tweet_id,
         )
+    except tweepy.TooManyRequests as e:
+        budget.record_rate_limited(e.response.headers)
+        await asyncio.to_thread(save_write_budget, budget)
+        raise
 
-        if response.data:
-            logger.info(f"Posted reply {response.data['id']} to tweet {reply_to_tweet_id}")
-            return True
+    budget.record_post(response.headers)
+    await asyncio.to_thread(save_write_budget, budget)
+
+    data = response.json().get("data")
+    if not data:
+        raise ValueError("no response data")
+
+    reply_id = str(data["id"])
+    logger.info(f"Posted reply {reply_id} to tweet {reply_to_tweet_id}")
+    return reply_id
 
-        logger.error("Failed to post reply: no response data")
-        return False
 
-    except tweepy.TweepyException as e:
+async def post_reply(reply_to_tweet_id: str, text: str, client: tweepy.Client | None = None) -> bool:
+    """
+    Post a reply to a tweet.
+
+    Replies from the bot go through the outbox (app.outbox), which retries
+    and rate-limits them; this is for one-off posts.
+
+    Args:
+        reply_to_tweet_id: The ID of the tweet to reply to
+        text: The reply text (must be under 280 characters)
+        client: Optional Tweepy client (for testing)
+
+    Returns:
+        True if successful, False otherwise
+    """
+    try:
+        await send_reply(reply_to_tweet_id, text, client)
+        return True
+    except (ValueError, tweepy.TweepyException, requests.RequestException) as e:
         logger.error(f"Error posting reply to {reply_to_tweet_id}: {e}")
         return False
@@ -0,0 +1,220 @@
+"""
+Process-wide budget for X write requests.
+
+X caps tweet creation per 15-minute window (x-rate-limit-* headers) and per
+24 hours (x-user-limit-24hour-* headers). The budget tracks what is left of
+each window from those headers, counts our own posts in between, and keeps
+the state in the poll_state table so a restart doesn't forget posts already
+made.
+
+Posts are paced by a token bucket whose refill rate spreads what is left of
+the daily allowance over the time until it resets. After a quiet period
+replies go out at once (up to the burst size), while a backlog is drained
+steadily, so later high-priority replies still find budget and the
+allowance is spent just as it resets. A window with nothing left blocks
+posting until its reset, so posts never run into a 429.
+"""
+
+import json
+import logging
+import time
+from dataclasses import asdict, dataclass
+from typing import Callable, Mapping
+
+from app.config import get_settings
+from app.database import get_poll_state, set_poll_state
+
+logger = logging.getLogger(__name__)
+
+# Window name -> (X header prefix, window length in seconds)
+WINDOWS = {
+    "15min": ("x-rate-limit", 15 * 60),
+    "24hour": ("x-user-limit-24hour", 24 * 3600),
+}
+# The window whose remaining allowance sets the pace
+PACING_WINDOW = "24hour"
+# poll_state key the budget is persisted under
+BUDGET_STATE_KEY = "x_write_budget"
+# Pause after a 429 that came without usable headers (seconds)
+RATE_LIMIT_DEFAULT_WAIT = 15 * 60
+
+
+@dataclass
+class RateWindow:
+    """One X rate-limit window."""
+    limit: int
+    remaining: int
+    reset_at: float  # epoch seconds
+
+
+class WriteBudget:
+    """Remaining X write allowance, paced by a token bucket."""
+
+    def __init__(self, daily_limit: int, burst: int, clock: Callable[[], float] = time.time):
+        """
+        Args:
+            daily_limit: Posts per 24 hours assumed until X reports its limit
+                (0 = unknown, only the headers count)
+            burst: Posts allowed back to back
+            clock: Wall-clock time source (for testing)
+        """
+        self.burst = max(1, burst)
+        self._clock = clock
+        now = clock()
+        self.windows: dict[str, RateWindow] = {}
+        if daily_limit > 0:
+            self.windows[PACING_WINDOW] = RateWindow(
+                daily_limit, daily_limit, now + WINDOWS[PACING_WINDOW][1]
+            )
+        self._tokens = float(self.burst)
+        self._updated = now
+        self._blocked_until = 0.0
+        self.posts = 0
+        self.rate_limited = 0
+
+    def _roll(self, now: float) -> None:
+        """Restore windows whose reset has passed."""
+        for name, window in self.windows.items():
+            if now >= window.reset_at:
+                window.remaining = window.limit
+                window.reset_at = now + WINDOWS[name][1]
+
+    def _rate(self, now: float) -> float:
+        """Tokens per second: the pacing window's remainder over its time left."""
+        window = self.windows.get(PACING_WINDOW)
+        if window is None:
+            return float(self.burst)  # no daily limit known: only the hard caps apply
+        return window.remaining / max(1.0, window.reset_at - now)
+
+    def _refill(self) -> float:
+        now = self._clock()
+        self._roll(now)
+        if now > self._updated:
+            self._tokens = min(self.burst, self._tokens + (now - self._updated) * self._rate(now))
+        self._updated = now
+        return now
+
+    @property
+    def tokens(self) -> float:
+        """Posts that may be made right now without waiting for the pace."""
+        self._refill()
+        return self._tokens
+
+    def wait_time(self) -> float:
+        """Seconds until the next post fits the budget (0 if it does now)."""
+        now = self._refill()
+        blocked = [self._blocked_until - now]
+        blocked += [w.reset_at - now for w in self.windows.values() if w.remaining <= 0]
+        wait = max(blocked)
+        if wait > 0:
+            return wait
+        if self._tokens >= 1:
+            return 0.0
+        rate = self._rate(now)
+        return (1 - self._tokens) / rate if rate > 0 else RATE_LIMIT_DEFAULT_WAIT
+
+    def observe(self, headers: Mapping[str, str]) -> None:
+        """Take X's view of the windows from a response's rate-limit headers."""
+        for name, (prefix, _) in WINDOWS.items():
+            try:
+                self.windows[name] = RateWindow(
+                    limit=int(headers[f"{prefix}-limit"]),
+                    remaining=int(headers[f"{prefix}-remaining"]),
+                    reset_at=float(headers[f"{prefix}-reset"]),
+                )
+            except (KeyError, TypeError, ValueError):
+                continue
+
+    def record_post(self, headers: Mapping[str, str]) -> None:
+        """Account for a successful post (headers win over local counting)."""
+        self._refill()
+        self._tokens -= 1
+        for window in self.windows.values():
+            window.remaining = max(0, window.remaining - 1)
+        self.observe(headers)
+        self.posts += 1
+
+    def record_rate_limited(self, headers: Mapping[str, str]) -> None:
+        """Account for a 429: block until the exhausted window resets."""
+        now = self._refill()
+        self.rate_limited += 1
+        self.observe(headers)
+        if not any(w.remaining <= 0 and w.reset_at > now for w in self.windows.values()):
+            self._blocked_until = max(self._blocked_until, now + RATE_LIMIT_DEFAULT_WAIT)
+
+    def to_state(self) -> dict:
+        """Serializable state (see load_state)."""
+        self._refill()
+        return {
+            "windows": {name: asdict(window) for name, window in self.windows.items()},
+            "tokens": self._tokens,
+            "updated_at": self._updated,
+            "blocked_until": self._blocked_until,
+        }
+
+    def load_state(self, state: dict) -> None:
+        """Restore state written by to_state(), e.g. before a restart."""
+        self.windows.update({
+            name: RateWindow(**window)
+            for name, window in state.get("windows", {}).items()
+            if name in WINDOWS
+        })
+        self._tokens = min(self.burst, state.get("tokens", self._tokens))
+        self._updated = state.get("updated_at", self._updated)
+        self._blocked_until = state.get("blocked_until", 0.0)
+
+    def stats(self) -> dict:
+        """Remaining allowance per window and pacing, for the status endpoint."""
+        now = self._refill()
+        return {
+            "posts": self.posts,
+            "rate_limited": self.rate_limited,
+            "tokens": round(self._tokens, 2),
+            "wait_seconds": round(self.wait_time(), 1),
+            "windows": {
+                name: {
+                    "limit": window.limit,
+                    "remaining": window.remaining,
+                    "reset_in_seconds": round(max(0.0, window.reset_at - now)),
+                }
+                for name, window in self.windows.items()
+            },
+        }
+
+
+# Global budget instance - loaded from the database on first use
+_write_budget: WriteBudget | None = None
+
+
+def get_write_budget() -> WriteBudget:
+    """Get the global X write budget, restoring its saved state if needed."""
+    global _write_budget
+    if _write_budget is None:
+        settings = get_settings()
+        budget = WriteBudget(settings.reply_rate_limit, settings.reply_burst)
+        saved = get_poll_state(BUDGET_STATE_KEY)
+        if saved:
+            try:
+                budget.load_state(json.loads(saved))
+            except (ValueError, TypeError) as e:
+                logger.warning(f"Ignoring unreadable saved X write budget: {e}")
+        _write_budget = budget
+    return _write_budget
+
+
+def save_write_budget(budget: WriteBudget | None = None) -> None:
+    """
+    Persist a budget (blocking; run in a worker thread).
+
+    Args:
+        budget: Budget to save (default: the global one, if loaded)
+    """
+    budget = budget or _write_budget
+    if budget is not None:
+        set_poll_state(BUDGET_STATE_KEY, json.dumps(budget.to_state()))
+
+
+def reset_write_budget() -> None:
+    """Drop the budget so it is reloaded (for testing)."""
+    global _write_budget
+    _write_budget = None
@@ -6,13 +6,22 @@ Provides mock clients, test database, and FastAPI test client.
 
 import json
 import os
+from datetime import datetime, timezone
 import pytest
 from unittest.mock import MagicMock, AsyncMock
 
 from fastapi.testclient import TestClient
 
+from app.catchup import reset_catchup_runner
 from app.config import Settings, override_settings
-from app.database import init_db
+from app.database import close_pools, init_db
+from app.grok_client import reset_analysis_cache, reset_grok_limiter
+from app.leader import reset_leader_lease
+from app.outbox import reset_outbox_worker
+from app.poll_interval import reset_poll_interval
+from app.prefilter import reset_prefilter
+from app.rss_instances import reset_rss_instance_pool
+from app.write_budget import reset_write_budget
 from app.rss_client import RSSMention
 
 
@@ -32,6 +41,79 @@ def set_test_env():
     os.environ.setdefault("DATABASE_PATH", ":memory:")
 
 
+@pytest.fixture(autouse=True)
+def close_db_pools():
+    """Close pooled database connections after each test."""
+    yield
+    close_pools()
+
+
+@pytest.fixture(autouse=True)
+def clear_analysis_cache():
+    """Start every test with an empty in-memory analysis cache."""
+    reset_analysis_cache()
+    yield
+    reset_analysis_cache()
+
+
+@pytest.fixture(autouse=True)
+def clear_grok_limiter():
+    """Give every test (and event loop) a fresh Grok concurrency limiter."""
+    reset_grok_limiter()
+    yield
+    reset_grok_limiter()
+
+
+@pytest.fixture(autouse=True)
+def clear_prefilter():
+    """Rebuild the pre-filter from the current settings in every test."""
+    reset_prefilter()
+    yield
+    reset_prefilter()
+
+
+@pytest.fixture(autouse=True)
+def clear_outbox_worker():
+    """Give every test (and event loop) a fresh outbox worker and write budget."""
+    reset_outbox_worker()
+    reset_write_budget()
+    yield
+    reset_outbox_worker()
+    reset_write_budget()
+
+
+@pytest.fixture(autouse=True)
+def clear_leader_lease():
+    """Give every test (and event loop) a fresh leader lease."""
+    reset_leader_lease()
+    yield
+    reset_leader_lease()
+
+
+@pytest.fixture(autouse=True)
+def clear_catchup_runner():
+    """Reload the catch-up runner (and its saved progress) in every test."""
+    reset_catchup_runner()
+    yield
+    reset_catchup_runner()
+
+
+@pytest.fixture(autouse=True)
+def clear_poll_interval():
+    """Start every test from the configured poll interval."""
+    reset_poll_interval()
+    yield
+    reset_poll_interval()
+
+
+@pytest.fixture(autouse=True)
+def clear_rss_instance_pool():
+    """Start every test with fresh RSSHub instance health."""
+    reset_rss_instance_pool()
+    yield
+    reset_rss_instance_pool()
+
+
 @pytest.fixture
 def test_settings():
     """Create test settings with in-memory database."""
@@ -50,6 +132,8 @@ def test_settings():
         database_path=":memory:",
     )
     override_settings(settings)
+    # The pooled :memory: database lives until close_db_pools runs
+    init_db(settings.database_path)
     return settings
 
 
@@ -66,10 +150,11 @@ def mock_twitter_client():
     """Create a mock Tweepy client for posting replies."""
     mock_client = MagicMock()
 
-    # Mock create_tweet response (only function we still use)
-    mock_create_data = {"id": "123456789"}
+    # Mock create_tweet response (only function we still use); the client
+    # returns raw requests.Response objects
     mock_create_response = MagicMock()
-    mock_create_response.data = mock_create_data
+    mock_create_response.json.return_value = {"data": {"id": "123456789"}}
+    mock_create_response.headers = {}
     mock_client.create_tweet.return_value = mock_create_response
 
     return mock_client
@@ -77,7 +162,7 @@ def mock_twitter_client():
 
 @pytest.fixture
 def mock_grok_client():
-    """Create a mock OpenAI client for Grok API (legacy non-JSON response)."""
+    """Create a mock AsyncOpenAI client for Grok API (legacy non-JSON response)."""
     mock_client = MagicMock()
 
     # Mock chat completion response (legacy format)
@@ -93,14 +178,14 @@ def mock_grok_client():
     mock_response = MagicMock()
     mock_response.choices = [mock_choice]
 
-    mock_client.chat.completions.create.return_value = mock_response
+    mock_client.chat.completions.create = AsyncMock(return_value=mock_response)
 
     return mock_client
 
 
 @pytest.fixture
 def mock_grok_client_json():
-    """Create a mock OpenAI client for Grok API with JSON response."""
+    """Create a mock AsyncOpenAI client for Grok API with JSON response."""
     mock_client = MagicMock()
 
     # Mock chat completion response with JSON format
@@ -116,7 +201,7 @@ def mock_grok_client_json():
     mock_response = MagicMock()
     mock_response.choices = [mock_choice]
 
-    mock_client.chat.completions.create.return_value = mock_response
+    mock_client.chat.completions.create = AsyncMock(return_value=mock_response)
 
     return mock_client
 
@@ -149,7 +234,7 @@ def sample_rss_mention():
         tweet_id="1234567890",
         text="@FallacySheriff fallacyme",
         author_username="some_user",
-        published="2025-01-01T12:00:00Z",
+        published=datetime.now(timezone.utc).isoformat(),
         link="https://twitter.com/some_user/status/1234567890",
         in_reply_to_tweet_id="9876543210",
         in_reply_to_username="fallacy_poster",
@@ -163,7 +248,7 @@ def sample_rss_mention_no_trigger():
         tweet_id="1234567890",
         text="@FallacySheriff hello there",
         author_username="some_user",
-        published="2025-01-01T12:00:00Z",
+        published=datetime.now(timezone.utc).isoformat(),
         link="https://twitter.com/some_user/status/1234567890",
         in_reply_to_tweet_id="9876543210",
         in_reply_to_username="fallacy_poster",
@@ -177,7 +262,7 @@ def sample_rss_mention_not_reply():
         tweet_id="1234567890",
         text="@FallacySheriff fallacyme",
         author_username="some_user",
-        published="2025-01-01T12:00:00Z",
+        published=datetime.now(timezone.utc).isoformat(),
         link="https://twitter.com/some_user/status/1234567890",
         in_reply_to_tweet_id=None,
         in_reply_to_username=None,
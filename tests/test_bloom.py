@@ -0,0 +1,72 @@
+"""
+Tests for the Bloom filter used in front of processed_tweets.
+
+Tests membership, false-positive rate, and persistence.
+"""
+
+from app.bloom import BloomFilter
+
+
+class TestBloomFilter:
+    """Tests for BloomFilter membership."""
+
+    def test_added_keys_are_members(self):
+        """Test that there are no false negatives."""
+        bloom = BloomFilter(1000)
+        keys = [str(1_800_000_000_000_000_000 + i) for i in range(1000)]
+        for key in keys:
+            bloom.add(key)
+
+        assert all(key in bloom for key in keys)
+        assert len(bloom) == 1000
+
+    def test_false_positive_rate_near_target(self):
+        """Test that the false-positive rate stays close to the configured rate."""
+        bloom = BloomFilter(10_000, error_rate=0.01)
+        for i in range(10_000):
+            bloom.add(f"seen_{i}")
+
+        false_positives = sum(f"unseen_{i}" in bloom for i in range(10_000))
+
+        assert false_positives < 10_000 * 0.02
+
+    def test_saturation(self):
+        """Test that a filter reports when it exceeds its capacity."""
+        bloom = BloomFilter(2)
+        for key in ("a", "b"):
+            bloom.add(key)
+        assert bloom.is_saturated is False
+
+        bloom.add("c")
+        assert bloom.is_saturated is True
+
+
+class TestBloomPersistence:
+    """Tests for saving and loading filters."""
+
+    def test_save_and_load_round_trip(self, tmp_path):
+        """Test that a saved filter loads with the same contents and watermark."""
+        path = str(tmp_path / "filter.bloom")
+        bloom = BloomFilter(100)
+        bloom.add("tweet_1")
+        bloom.save(path, watermark="2025-01-01T00:00:00+00:00")
+
+        loaded = BloomFilter.load(path)
+
+        assert loaded is not None
+        restored, watermark = loaded
+        assert "tweet_1" in restored
+        assert len(restored) == 1
+        assert restored.num_bits == bloom.num_bits
+        assert watermark == "2025-01-01T00:00:00+00:00"
+
+    def test_load_missing_file(self, tmp_path):
+        """Test that a missing file loads as None."""
+        assert BloomFilter.load(str(tmp_path / "missing.bloom")) is None
+
+    def test_load_corrupt_file(self, tmp_path):
+        """Test that a corrupt file loads as None."""
+        path = tmp_path / "corrupt.bloom"
+        path.write_bytes(b"not a bloom filter")
+
+        assert BloomFilter.load(str(path)) is None
@@ -0,0 +1,204 @@
+"""
+Tests for catch-up mode.
+
+Tests paging backward through a gap, pausing and resuming, the page budget,
+and how polls report gaps.
+"""
+
+from unittest.mock import patch
+
+from app.catchup import CatchUpRunner, Gap, get_catchup_runner, reset_catchup_runner
+from app.rss_client import FeedPage, RSSMention
+
+PAGE_SIZE = 3
+
+
+def _mention(tweet_id: int, published: str = "") -> RSSMention:
+    return RSSMention(
+        tweet_id=str(tweet_id),
+        text="@FallacySheriff fallacyme",
+        author_username="user",
+        published=published,
+        link=f"https://twitter.com/user/status/{tweet_id}",
+        in_reply_to_tweet_id="42",
+        in_reply_to_username="target_user",
+    )
+
+
+def _feed(tweet_ids: range, published: str = ""):
+    """fetch_mentions_page fake serving PAGE_SIZE mentions per page, newest first."""
+    async def fetch(since_id=None, max_id=None):
+        matching = [
+            i for i in sorted(tweet_ids, reverse=True)
+            if i > int(since_id or 0) and (max_id is None or i <= int(max_id))
+        ]
+        return FeedPage(
+            [_mention(i, published) for i in matching[:PAGE_SIZE]],
+            reached_since=len(matching) <= PAGE_SIZE,
+        )
+    return fetch
+
+
+class _Handler:
+    """MentionHandler fake recording what it was given, failing chosen IDs once."""
+
+    def __init__(self, fail: set[str] = frozenset()):
+        self.fail = set(fail)
+        self.handled: list[str] = []
+        self.max_age_hours: float | None = None
+
+    async def __call__(self, mentions, batch_size, max_age_hours):
+        self.max_age_hours = max_age_hours
+        failures = {}
+        for mention in mentions:
+            if mention.tweet_id in self.fail:
+                self.fail.discard(mention.tweet_id)
+                failures[mention.tweet_id] = RuntimeError("grok down")
+            else:
+                self.handled.append(mention.tweet_id)
+        return failures
+
+
+class TestCatchUpRunner:
+    """Tests for paging backward through gaps."""
+
+    async def test_pages_back_to_floor(self, test_settings):
+        """Test that a gap is read page by page down to last_seen_id and closed."""
+        test_settings.catchup_page_delay_seconds = 0
+        runner = CatchUpRunner()
+        runner.add_gap("100", "111")
+        handle = _Handler()
+
+        with patch("app.catchup.fetch_mentions_page", side_effect=_feed(range(90, 115))):
+            await runner.run(handle)
+
+        assert sorted(handle.handled) == [str(i) for i in range(101, 111)]
+        assert runner.progress.gaps == []
+        assert runner.progress.pages == 4
+        assert runner.progress.finished_at is not None
+
+    async def test_failure_pauses_and_resumes(self, test_settings):
+        """Test that a failed mention stops the cursor and is fetched again on resume."""
+        test_settings.catchup_page_delay_seconds = 0
+        runner = CatchUpRunner()
+        runner.add_gap("100", "111")
+        handle = _Handler(fail={"105"})
+
+        with patch("app.catchup.fetch_mentions_page", side_effect=_feed(range(101, 111))):
+            await runner.run(handle)
+
+            assert runner.progress.gaps == [Gap("100", "106")]
+            assert "105" in runner.progress.last_error
+
+            await runner.run(handle)
+
+        assert "105" in handle.handled
+        assert runner.progress.gaps == []
+        assert runner.progress.last_error is None
+
+    async def test_page_budget_persists_progress(self, test_settings):
+        """Test that a run stops after its page budget and a reload resumes there."""
+        test_settings.catchup_page_delay_seconds = 0
+        test_settings.catchup_max_pages_per_run = 2
+        runner = get_catchup_runner()
+        runner.add_gap("100", "111")
+
+        with patch("app.catchup.fetch_mentions_page", side_effect=_feed(range(101, 111))):
+            await runner.run(_Handler())
+
+        reset_catchup_runner()
+        restored = get_catchup_runner()
+        assert restored.progress.gaps == [Gap("100", "105")]
+        assert restored.progress.pages == 2
+
+    async def test_stale_page_ends_gap(self, test_settings):
+        """Test that a page of mentions too old to reply to closes the gap early."""
+        test_settings.catchup_page_delay_seconds = 0
+        test_settings.catchup_max_age_hours = 72
+        runner = CatchUpRunner()
+        runner.add_gap("100", "111")
+
+        feed = _feed(range(101, 111), published="2020-01-01T00:00:00Z")
+        with patch("app.catchup.fetch_mentions_page", side_effect=feed) as mock_fetch:
+            await runner.run(_Handler())
+
+        assert runner.progress.gaps == []
+        assert runner.progress.pages == 1
+        assert runner.progress.stale == PAGE_SIZE
+        # The prefetched second page was cancelled or never used
+        assert mock_fetch.call_count <= 2
+
+    async def test_backlog_older_than_reply_max_age_is_caught_up(self, test_settings):
+        """Test that an outage longer than reply_max_age_hours is still caught up."""
+        from datetime import datetime, timedelta, timezone
+
+        test_settings.catchup_page_delay_seconds = 0
+        test_settings.reply_max_age_hours = 24
+        test_settings.catchup_max_age_hours = 72
+        runner = CatchUpRunner()
+        runner.add_gap("100", "111")
+        handle = _Handler()
+
+        published = (datetime.now(timezone.utc) - timedelta(hours=30)).isoformat()
+        feed = _feed(range(101, 111), published=published)
+        with patch("app.catchup.fetch_mentions_page", side_effect=feed):
+            await runner.run(handle)
+
+        assert sorted(handle.handled) == [str(i) for i in range(101, 111)]
+        assert handle.max_age_hours == 72
+        assert runner.progress.stale == 0
+        assert runner.progress.gaps == []
+
+    def test_same_floor_widens_gap(self):
+        """Test that a gap reported again by a held poll is widened, not duplicated."""
+        runner = CatchUpRunner()
+        runner.add_gap("100", "150")
+        runner.add_gap("100", "180")
+        runner.add_gap("100", "120")
+
+        assert runner.progress.gaps == [Gap("100", "180")]
+
+
+class TestPollGaps:
+    """Tests for polls reporting gaps to the runner."""
+
+    @patch("app.catchup.CatchUpRunner.resume")
+    @patch("app.main.analyze_fallacies_batch")
+    @patch("app.main.fetch_mentions_page")
+    @patch("app.main.get_last_seen_id")
+    async def test_page_short_of_since_id_records_gap(
+        self, mock_get_last_seen, mock_fetch, mock_analyze, mock_resume, test_settings
+    ):
+        """Test that a page not reaching last_seen_id leaves a gap below its oldest entry."""
+        from app.main import poll_mentions
+
+        mock_get_last_seen.return_value = "100"
+        mock_fetch.return_value = FeedPage([_mention(205), _mention(204)], reached_since=False)
+        mock_analyze.return_value = []
+
+        await poll_mentions()
+
+        assert get_catchup_runner().progress.gaps == [Gap("100", "204")]
+        mock_resume.assert_called_once()
+
+    @patch("app.main.fetch_mentions_page")
+    @patch("app.main.get_last_seen_id")
+    async def test_complete_page_records_no_gap(self, mock_get_last_seen, mock_fetch, test_settings):
+        """Test that a page reaching last_seen_id needs no catch-up."""
+        from app.main import poll_mentions
+
+        mock_get_last_seen.return_value = "100"
+        mock_fetch.return_value = FeedPage([_mention(101)])
+
+        await poll_mentions()
+
+        assert get_catchup_runner().progress.gaps == []
+
+    def test_catchup_endpoint(self, client):
+        """Test that GET /catchup reports progress."""
+        response = client.get("/catchup")
+
+        assert response.status_code == 200
+        data = response.json()
+        assert data["active"] is False
+        assert data["gaps"] == []
@@ -6,16 +6,51 @@ Tests tweet processing tracking, duplicate prevention, and poll state.
 
 import os
 import sqlite3
+import time
+from datetime import datetime, timedelta, timezone
+
 import pytest
 
 from app.database import (
     init_db,
     is_processed,
     mark_processed,
+    filter_unprocessed,
+    mark_processed_many,
+    close_pools,
     get_connection,
+    get_pool,
     get_last_seen_id,
     set_last_seen_id,
+    get_poll_state,
+    set_poll_state,
+    delete_poll_state,
+    prune_processed,
+    get_cached_analysis,
+    set_cached_analysis,
+    prune_analysis_cache,
+    enqueue_reply,
+    claim_due_reply,
+    complete_reply,
+    retry_reply,
+    fail_reply,
+    recover_interrupted_replies,
+    next_reply_due_at,
+    get_outbox_counts,
+    claim_mentions,
+    claim_abandoned_mentions,
+    discover_mentions,
+    mark_mentions_analyzed,
+    release_mentions,
+    save_processed_filter,
+    skip_mentions,
+    get_mention_counts,
+    prune_mentions,
+    acquire_lease,
+    release_lease,
+    get_lease,
 )
+from app.snowflake import snowflake_from_datetime
 
 
 class TestInitDb:
@@ -75,18 +110,39 @@ class TestInitDb:
         init_db(":memory:")
         # Should not raise
 
+    def test_new_database_uses_incremental_auto_vacuum(self, tmp_path):
+        """Test that a freshly created file can hand pruned pages back."""
+        db_path = str(tmp_path / "test.db")
+        init_db(db_path)
+
+        with sqlite3.connect(db_path) as conn:
+            assert conn.execute("PRAGMA auto_vacuum").fetchone()[0] == 2
+
+    def test_existing_database_switched_to_incremental(self, tmp_path):
+        """Test that a file created without auto_vacuum is converted once."""
+        db_path = str(tmp_path / "test.db")
+        with sqlite3.connect(db_path) as conn:
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.execute("CREATE TABLE legacy (x INTEGER)")
+            assert conn.execute("PRAGMA auto_vacuum").fetchone()[0] == 0
+
+        init_db(db_path)
+
+        with sqlite3.connect(db_path) as conn:
+            assert conn.execute("PRAGMA auto_vacuum").fetchone()[0] == 2
+
 
 class TestIsProcessed:
     """Tests for checking if tweets are processed."""
 
     def test_is_processed_returns_false_for_new(self, test_db):
         """Test that new tweet IDs return False."""
-        result = is_processed("new_tweet_123", db_path=test_db)
+        result = is_processed("1800000000000000123", db_path=test_db)
         assert result is False
 
     def test_is_processed_returns_true_after_mark(self, test_db):
         """Test that marked tweets return True."""
-        tweet_id = "tweet_456"
+        tweet_id = "1800000000000000456"
         mark_processed(tweet_id, db_path=test_db)
 
         result = is_processed(tweet_id, db_path=test_db)
@@ -94,10 +150,10 @@ class TestIsProcessed:
 
     def test_is_processed_different_ids(self, test_db):
         """Test that different tweet IDs are tracked separately."""
-        mark_processed("tweet_1", db_path=test_db)
+        mark_processed("1800000000000000001", db_path=test_db)
 
-        assert is_processed("tweet_1", db_path=test_db) is True
-        assert is_processed("tweet_2", db_path=test_db) is False
+        assert is_processed("1800000000000000001", db_path=test_db) is True
+        assert is_processed("1800000000000000002", db_path=test_db) is False
 
 
 class TestMarkProcessed:
@@ -105,7 +161,7 @@ class TestMarkProcessed:
 
     def test_mark_processed_inserts_record(self, test_db):
         """Test that mark_processed inserts a record."""
-        tweet_id = "tweet_789"
+        tweet_id = "1800000000000000789"
         mark_processed(tweet_id, db_path=test_db)
 
         with sqlite3.connect(test_db) as conn:
@@ -116,11 +172,12 @@ class TestMarkProcessed:
             result = cursor.fetchone()
 
         assert result is not None
-        assert result[0] == tweet_id
+        # Snowflakes are stored as INTEGER keys
+        assert result[0] == int(tweet_id)
 
     def test_mark_processed_stores_timestamp(self, test_db):
         """Test that mark_processed stores a timestamp."""
-        tweet_id = "tweet_timestamp"
+        tweet_id = "1800000000000000999"
         mark_processed(tweet_id, db_path=test_db)
 
         with sqlite3.connect(test_db) as conn:
@@ -131,13 +188,13 @@ class TestMarkProcessed:
             result = cursor.fetchone()
 
         assert result is not None
-        assert result[0] is not None
-        # Should be ISO format timestamp
-        assert "T" in result[0]
+        # Should be an epoch-seconds timestamp
+        assert isinstance(result[0], int)
+        assert abs(result[0] - time.time()) < 60
 
     def test_duplicate_insert_ignored(self, test_db):
         """Test that duplicate inserts are ignored (not errored)."""
-        tweet_id = "duplicate_tweet"
+        tweet_id = "1800000000000000555"
 
         # Insert twice
         mark_processed(tweet_id, db_path=test_db)
@@ -154,6 +211,104 @@ class TestMarkProcessed:
         assert count == 1
 
 
+class TestBatchDedupe:
+    """Tests for the bulk dedupe helpers."""
+
+    def test_filter_unprocessed_returns_unseen_subset(self, test_db):
+        """Test that only unprocessed IDs are returned, in input order."""
+        mark_processed("1800000000000000002", db_path=test_db)
+
+        result = filter_unprocessed(["1800000000000000003", "1800000000000000002", "1800000000000000001"], db_path=test_db)
+
+        assert result == ["1800000000000000003", "1800000000000000001"]
+
+    def test_filter_unprocessed_empty(self, test_db):
+        """Test that an empty input needs no query."""
+        assert filter_unprocessed([], db_path=test_db) == []
+
+    def test_filter_unprocessed_dedupes_input(self, test_db):
+        """Test that repeated IDs are returned once."""
+        result = filter_unprocessed(["1800000000000000001", "1800000000000000001"], db_path=test_db)
+
+        assert result == ["1800000000000000001"]
+
+    def test_filter_unprocessed_large_batch(self, test_db):
+        """Test batches larger than one IN (...) chunk."""
+        ids = [str(1_800_000_000_000_000_000 + i) for i in range(1200)]
+        mark_processed_many(ids[::2], db_path=test_db)
+
+        result = filter_unprocessed(ids, db_path=test_db)
+
+        assert result == ids[1::2]
+
+    def test_mark_processed_many_inserts_all(self, test_db):
+        """Test that every ID is marked, and duplicates are ignored."""
+        mark_processed("1800000000000000001", db_path=test_db)
+
+        mark_processed_many(["1800000000000000001", "1800000000000000002", "1800000000000000003"], db_path=test_db)
+
+        with sqlite3.connect(test_db) as conn:
+            count = conn.execute("SELECT COUNT(*) FROM processed_tweets").fetchone()[0]
+
+        assert count == 3
+
+
+class TestSchema:
+    """Tests for the INTEGER / WITHOUT ROWID processed_tweets layout."""
+
+    def test_processed_tweets_is_without_rowid(self, test_db):
+        """Test that processed_tweets is created WITHOUT ROWID with INTEGER keys."""
+        with sqlite3.connect(test_db) as conn:
+            sql = conn.execute(
+                "SELECT sql FROM sqlite_master WHERE name='processed_tweets'"
+            ).fetchone()[0]
+            types = {row[1]: row[2] for row in conn.execute("PRAGMA table_info(processed_tweets)")}
+
+        assert "WITHOUT ROWID" in sql
+        assert types == {"tweet_id": "INTEGER", "processed_at": "INTEGER"}
+
+    def test_migrates_legacy_text_table(self, tmp_path):
+        """Test that a legacy TEXT/ISO table is converted in place."""
+        db_path = str(tmp_path / "legacy.db")
+        with sqlite3.connect(db_path) as conn:
+            conn.execute(
+                "CREATE TABLE processed_tweets (tweet_id TEXT PRIMARY KEY, processed_at TEXT NOT NULL)"
+            )
+            conn.execute(
+                "INSERT INTO processed_tweets VALUES ('1800000000000000001', '2025-01-01T00:00:00+00:00')"
+            )
+            conn.execute(
+                "INSERT INTO processed_tweets VALUES ('not_a_tweet', '2025-01-01T00:00:00+00:00')"
+            )
+
+        init_db(db_path)
+
+        with sqlite3.connect(db_path) as conn:
+            rows = conn.execute("SELECT tweet_id, processed_at FROM processed_tweets").fetchall()
+        assert rows == [(1800000000000000001, 1735689600)]
+        assert is_processed("1800000000000000001", db_path=db_path) is True
+
+
+class TestPruneProcessed:
+    """Tests for snowflake-based retention pruning."""
+
+    def test_prunes_rows_older_than_window(self, test_db):
+        """Test that only tweets older than the window are deleted."""
+        now = datetime.now(timezone.utc)
+        old_id = snowflake_from_datetime(now - timedelta(days=40))
+        recent_id = snowflake_from_datetime(now - timedelta(days=1))
+        mark_processed_many([old_id, recent_id], db_path=test_db)
+
+        deleted = prune_processed(timedelta(days=30), db_path=test_db)
+
+        assert deleted == 1
+        assert filter_unprocessed([old_id, recent_id], db_path=test_db) == [old_id]
+
+    def test_prune_empty_table(self, test_db):
+        """Test pruning with nothing to delete."""
+        assert prune_processed(timedelta(days=30), db_path=test_db) == 0
+
+
 class TestGetConnection:
     """Tests for database connection context manager."""
 
@@ -175,6 +330,165 @@ class TestGetConnection:
             conn.execute("SELECT 1")
 
 
+class TestConnectionPool:
+    """Tests for the pooled, long-lived connections."""
+
+    def test_pool_uses_wal_journal(self, test_db):
+        """Test that pooled connections run in WAL mode."""
+        with get_pool(test_db).writer() as conn:
+            mode = conn.execute("PRAGMA journal_mode").fetchone()[0]
+
+        assert mode == "wal"
+
+    def test_pool_reuses_connections(self, test_db):
+        """Test that repeated calls share the same connections."""
+        pool = get_pool(test_db)
+        assert get_pool(test_db) is pool
+
+        with pool.reader() as first:
+            pass
+        with pool.reader() as second:
+            pass
+
+        assert first is second
+
+    def test_reader_sees_committed_writes(self, test_db):
+        """Test that a read connection sees writes from the writer."""
+        assert is_processed("1800000000000000001", db_path=test_db) is False
+
+        mark_processed("1800000000000000001", db_path=test_db)
+
+        assert is_processed("1800000000000000001", db_path=test_db) is True
+
+    def test_reader_is_read_only(self, test_db):
+        """Test that reader connections reject writes."""
+        with get_pool(test_db).reader() as conn:
+            with pytest.raises(sqlite3.OperationalError):
+                conn.execute("DELETE FROM processed_tweets")
+
+    def test_memory_database_keeps_state(self, test_settings):
+        """Test that :memory: databases persist across helper calls."""
+        init_db(":memory:")
+
+        mark_processed("1800000000000000777", db_path=":memory:")
+
+        assert is_processed("1800000000000000777", db_path=":memory:") is True
+
+    def test_close_pools_closes_connections(self, test_db):
+        """Test that close_pools closes pooled connections."""
+        pool = get_pool(test_db)
+        close_pools()
+
+        with pytest.raises(sqlite3.ProgrammingError):
+            with pool.writer():
+                pass
+
+        # A new pool is created transparently on next use
+        assert get_pool(test_db) is not pool
+
+
+class TestProcessedFilter:
+    """Tests for the Bloom filter in front of processed_tweets."""
+
+    def test_init_builds_filter_from_table(self, tmp_path):
+        """Test that init_db loads existing rows into the filter."""
+        db_path = str(tmp_path / "test.db")
+        init_db(db_path)
+        mark_processed("1800000000000000001", db_path=db_path)
+        close_pools()
+        os.remove(f"{db_path}.bloom")
+
+        init_db(db_path)
+
+        assert "1800000000000000001" in get_pool(db_path).processed_filter
+
+    def test_filter_miss_skips_database(self, test_db):
+        """Test that a filter miss answers without querying SQLite."""
+        # Written behind the pool's back, so the filter never saw it
+        with sqlite3.connect(test_db) as conn:
+            conn.execute(
+                "INSERT INTO processed_tweets (tweet_id, processed_at) VALUES (1800000000000000888, 0)"
+            )
+
+        assert is_processed("1800000000000000888", db_path=test_db) is False
+        assert filter_unprocessed(["1800000000000000888"], db_path=test_db) == ["1800000000000000888"]
+
+    def test_mark_processed_updates_filter(self, test_db):
+        """Test that marking a tweet adds it to the filter."""
+        mark_processed("1800000000000000001", db_path=test_db)
+        mark_processed_many(["1800000000000000002"], db_path=test_db)
+
+        bloom = get_pool(test_db).processed_filter
+        assert "1800000000000000001" in bloom
+        assert "1800000000000000002" in bloom
+
+    def test_filter_persists_across_restart(self, tmp_path):
+        """Test that the filter is saved on close and caught up on load."""
+        db_path = str(tmp_path / "test.db")
+        init_db(db_path)
+        mark_processed("1800000000000000001", db_path=db_path)
+        close_pools()
+        assert os.path.exists(f"{db_path}.bloom")
+
+        # Written after the filter was saved
+        with sqlite3.connect(db_path) as conn:
+            conn.execute(
+                "INSERT INTO processed_tweets (tweet_id, processed_at) VALUES (?, ?)",
+                (1800000000000000002, 4102444800),
+            )
+
+        init_db(db_path)
+
+        assert is_processed("1800000000000000001", db_path=db_path) is True
+        assert is_processed("1800000000000000002", db_path=db_path) is True
+
+    def test_save_keeps_other_processes_rows(self, tmp_path):
+        """Test that a process saving last doesn't drop rows another process wrote."""
+        from app.database import ConnectionPool
+
+        db_path = str(tmp_path / "test.db")
+        init_db(db_path)
+        other = ConnectionPool(db_path)
+        other.load_processed_filter()
+
+        # The other process marks a tweet (stamped two hours ago, before the
+        # rescan margin), saves, and this process saves after it
+        with other.writer() as conn:
+            conn.execute(
+                "INSERT INTO processed_tweets (tweet_id, processed_at) VALUES (?, ?)",
+                (1800000000000000002, int(time.time()) - 7200),
+            )
+        other.processed_filter.add("1800000000000000002")
+        mark_processed("1800000000000000001", db_path=db_path)
+        other.close()
+        close_pools()
+
+        init_db(db_path)
+
+        bloom = get_pool(db_path).processed_filter
+        assert "1800000000000000001" in bloom
+        assert "1800000000000000002" in bloom
+        assert len(bloom) == 2
+
+    def test_snapshot_without_closing(self, tmp_path):
+        """Test that a periodic save survives a crash that skips the shutdown save."""
+        db_path = str(tmp_path / "test.db")
+        init_db(db_path)
+        mark_processed("1800000000000000001", db_path=db_path)
+
+        save_processed_filter(db_path)
+
+        # A crash: the pool is dropped without close() saving the filter
+        from app import database
+        database._pools.clear()
+        with sqlite3.connect(db_path) as conn:
+            conn.execute("DELETE FROM processed_tweets")
+
+        init_db(db_path)
+
+        assert "1800000000000000001" in get_pool(db_path).processed_filter
+
+
 class TestPollState:
     """Tests for poll state (last_seen_id) tracking."""
 
@@ -211,3 +525,220 @@ class TestPollState:
 
         assert result is not None
         assert "T" in result[0]  # ISO format
+
+    def test_generic_poll_state_round_trip(self, test_db):
+        """Test storing, reading and deleting arbitrary poll state keys."""
+        assert get_poll_state("some_key", db_path=test_db) is None
+
+        set_poll_state("some_key", "value", db_path=test_db)
+        assert get_poll_state("some_key", db_path=test_db) == "value"
+
+        delete_poll_state("some_key", db_path=test_db)
+        assert get_poll_state("some_key", db_path=test_db) is None
+
+
+class TestAnalysisCache:
+    """Tests for the cached Grok analysis table."""
+
+    def test_round_trip(self, test_db):
+        """Test storing and reading a cached analysis."""
+        assert get_cached_analysis("key", timedelta(hours=1), db_path=test_db) is None
+
+        set_cached_analysis("key", '{"confidence": 95}', 1200, db_path=test_db)
+
+        assert get_cached_analysis("key", timedelta(hours=1), db_path=test_db) == (
+            '{"confidence": 95}', 1200
+        )
+
+    def test_expired_entries_are_misses_and_pruned(self, test_db):
+        """Test that entries older than the TTL are ignored and pruned."""
+        set_cached_analysis("old", "{}", 10, db_path=test_db)
+        with get_pool(test_db).writer() as conn:
+            conn.execute(
+                "UPDATE analysis_cache SET created_at = ?", (int(time.time()) - 7200,)
+            )
+        set_cached_analysis("new", "{}", 10, db_path=test_db)
+
+        assert get_cached_analysis("old", timedelta(hours=1), db_path=test_db) is None
+        assert prune_analysis_cache(timedelta(hours=1), db_path=test_db) == 1
+        assert get_cached_analysis("new", timedelta(hours=1), db_path=test_db) is not None
+
+
+class TestReplyOutbox:
+    """Tests for the reply outbox table."""
+
+    def test_enqueue_is_idempotent_per_tweet(self, test_db):
+        """Test that a mention can only be queued once."""
+        assert enqueue_reply("1800000000000000001", "Strawman", db_path=test_db) is True
+        assert enqueue_reply("1800000000000000001", "Other text", db_path=test_db) is False
+
+        assert claim_due_reply(db_path=test_db) == ("1800000000000000001", "Strawman", 0)
+
+    def test_claimed_reply_is_not_claimed_again(self, test_db):
+        """Test that claiming moves a reply out of the pending queue."""
+        enqueue_reply("1800000000000000001", "Strawman", db_path=test_db)
+
+        assert claim_due_reply(db_path=test_db) is not None
+        assert claim_due_reply(db_path=test_db) is None
+        assert get_outbox_counts(db_path=test_db)["sending"] == 1
+
+    def test_retry_reschedules(self, test_db):
+        """Test that a retried reply is only due after its delay."""
+        enqueue_reply("1800000000000000001", "Strawman", db_path=test_db)
+        claim_due_reply(db_path=test_db)
+
+        retry_reply("1800000000000000001", timedelta(minutes=5), "503", db_path=test_db)
+
+        assert claim_due_reply(db_path=test_db) is None
+        assert next_reply_due_at(db_path=test_db) >= int(time.time()) + 299
+
+        with get_pool(test_db).writer() as conn:
+            conn.execute("UPDATE reply_outbox SET next_attempt_at = 0")
+        assert claim_due_reply(db_path=test_db) == ("1800000000000000001", "Strawman", 1)
+
+    def test_complete_and_fail(self, test_db):
+        """Test that sent and failed replies leave the queue."""
+        enqueue_reply("1800000000000000001", "One", db_path=test_db)
+        enqueue_reply("1800000000000000002", "Two", db_path=test_db)
+        claim_due_reply(db_path=test_db)
+        claim_due_reply(db_path=test_db)
+
+        complete_reply("1800000000000000001", "1900000000000000001", db_path=test_db)
+        fail_reply("1800000000000000002", "403 duplicate", db_path=test_db)
+
+        assert get_outbox_counts(db_path=test_db) == {
+            "pending": 0, "sending": 0, "sent": 1, "failed": 1
+        }
+        assert next_reply_due_at(db_path=test_db) is None
+
+    def test_interrupted_replies_are_not_retried(self, test_db):
+        """Test that replies left in "sending" by a crash are failed, not re-posted."""
+        enqueue_reply("1800000000000000001", "Strawman", db_path=test_db)
+        claim_due_reply(db_path=test_db)
+
+        assert recover_interrupted_replies(db_path=test_db) == 1
+        assert claim_due_reply(db_path=test_db) is None
+        assert get_outbox_counts(db_path=test_db)["failed"] == 1
+
+
+class TestMentionClaims:
+    """Tests for atomic mention claims across overlapping polls."""
+
+    def test_claimed_mention_is_not_claimed_again(self, test_db):
+        """Test that a live claim keeps other holders off the mention."""
+        ttl = timedelta(minutes=10)
+
+        assert claim_mentions(["101", "102", "101"], "a", ttl, db_path=test_db) == ["101", "102"]
+        assert claim_mentions(["102", "103"], "b", ttl, db_path=test_db) == ["103"]
+
+    def test_processed_and_released_mentions(self, test_db):
+        """Test that processing frees a claim for good and releasing frees it for a retry."""
+        ttl = timedelta(minutes=10)
+        claim_mentions(["101", "102"], "a", ttl, db_path=test_db)
+
+        mark_processed_many(["101"], db_path=test_db)
+        release_mentions(["102"], db_path=test_db)
+
+        assert claim_mentions(["101", "102"], "b", ttl, db_path=test_db) == ["102"]
+
+    def test_expired_claim_can_be_taken_over(self, test_db):
+        """Test that a crashed holder's claim lapses."""
+        claim_mentions(["101"], "crashed", timedelta(seconds=-1), db_path=test_db)
+
+        assert claim_mentions(["101"], "b", timedelta(minutes=10), db_path=test_db) == ["101"]
+
+
+class TestMentionStates:
+    """Tests for the mentions state machine."""
+
+    def _state(self, db, tweet_id):
+        with get_pool(db).reader() as conn:
+            return conn.execute(
+                "SELECT state FROM mentions WHERE tweet_id = ?", (int(tweet_id),)
+            ).fetchone()[0]
+
+    def test_reply_lifecycle(self, test_db):
+        """Test discovered -> claimed -> analyzed -> queued -> posted."""
+        ttl = timedelta(minutes=10)
+        discover_mentions([("101", "{}")], ttl, db_path=test_db)
+        assert self._state(test_db, "101") == "discovered"
+
+        claim_mentions(["101"], "a", ttl, db_path=test_db)
+        assert self._state(test_db, "101") == "claimed"
+
+        mark_mentions_analyzed(["101"], "a", db_path=test_db)
+        assert self._state(test_db, "101") == "analyzed"
+
+        enqueue_reply("101", "Strawman", db_path=test_db)
+        mark_processed("101", db_path=test_db)
+        assert self._state(test_db, "101") == "queued"
+
+        claim_due_reply(db_path=test_db)
+        complete_reply("101", "900", db_path=test_db)
+        assert get_mention_counts(db_path=test_db)["posted"] == 1
+
+    def test_finished_mentions_are_skipped(self, test_db):
+        """Test that mentions without a reply, or whose reply failed, end skipped."""
+        ttl = timedelta(minutes=10)
+        claim_mentions(["101", "102", "103"], "a", ttl, db_path=test_db)
+
+        mark_processed_many(["101"], db_path=test_db)
+        skip_mentions(["102"], db_path=test_db)
+        enqueue_reply("103", "Strawman", db_path=test_db)
+        claim_due_reply(db_path=test_db)
+        fail_reply("103", "403 duplicate", db_path=test_db)
+
+        assert get_mention_counts(db_path=test_db)["skipped"] == 3
+        assert claim_mentions(["102"], "b", ttl, db_path=test_db) == []
+
+    def test_analysis_is_only_recorded_for_the_holder(self, test_db):
+        """Test that a worker whose claim was taken over can't advance the mention."""
+        claim_mentions(["101"], "slow", timedelta(seconds=-1), db_path=test_db)
+        claim_mentions(["101"], "b", timedelta(minutes=10), db_path=test_db)
+
+        mark_mentions_analyzed(["101"], "slow", db_path=test_db)
+
+        assert self._state(test_db, "101") == "claimed"
+
+    def test_abandoned_mentions_are_resumed(self, test_db):
+        """Test that expired and given-back claims are reclaimed with their stored mention."""
+        discover_mentions(
+            [("101", '{"id": 101}'), ("102", '{"id": 102}')], timedelta(minutes=10), db_path=test_db
+        )
+        claim_mentions(["101"], "crashed", timedelta(seconds=-1), db_path=test_db)
+        claim_mentions(["102"], "a", timedelta(minutes=10), db_path=test_db)
+        release_mentions(["102"], db_path=test_db)
+
+        resumed = claim_abandoned_mentions("b", timedelta(minutes=10), limit=10, db_path=test_db)
+
+        assert resumed == [("101", '{"id": 101}'), ("102", '{"id": 102}')]
+        assert claim_abandoned_mentions("c", timedelta(minutes=10), limit=10, db_path=test_db) == []
+
+    def test_prune_keeps_unfinished_mentions(self, test_db):
+        """Test that only old posted/skipped mentions are pruned."""
+        claim_mentions(["101", "102"], "a", timedelta(minutes=10), db_path=test_db)
+        skip_mentions(["101"], db_path=test_db)
+
+        assert prune_mentions(timedelta(seconds=-1), db_path=test_db) == 1
+        assert get_mention_counts(db_path=test_db)["claimed"] == 1
+
+class TestLeases:
+    """Tests for the named leases used for leader election."""
+
+    def test_one_holder_at_a_time(self, test_db):
+        """Test that a held lease is renewed by its holder and refused to others."""
+        ttl = timedelta(seconds=30)
+
+        assert acquire_lease("leader", "a", ttl, db_path=test_db)
+        assert not acquire_lease("leader", "b", ttl, db_path=test_db)
+        assert acquire_lease("leader", "a", ttl, db_path=test_db)
+        assert get_lease("leader", db_path=test_db)[0] == "a"
+
+    def test_released_or_expired_lease_is_taken_over(self, test_db):
+        """Test that another holder gets the lease once it is released or lapses."""
+        acquire_lease("leader", "a", timedelta(seconds=30), db_path=test_db)
+        release_lease("leader", "a", db_path=test_db)
+        assert acquire_lease("leader", "b", timedelta(seconds=-1), db_path=test_db)
+
+        assert acquire_lease("leader", "c", timedelta(seconds=30), db_path=test_db)
+        assert get_lease("leader", db_path=test_db)[0] == "c"
@@ -4,12 +4,35 @@ Tests for Grok API client.
 Tests fallacy analysis with mocked OpenAI-compatible API.
 """
 
+import asyncio
 import json
-from unittest.mock import MagicMock, patch
+from unittest.mock import AsyncMock, MagicMock, patch
 
+import httpx
+import openai
 import pytest
 
-from app.grok_client import analyze_fallacy, FallacyAnalysis, SYSTEM_PROMPT, _parse_analysis_response
+from app.grok_client import (
+    analyze_fallacies_batch,
+    analyze_fallacy,
+    analysis_cache_key,
+    close_grok_client,
+    get_analysis_cache,
+    get_grok_client,
+    get_grok_limiter,
+    FallacyAnalysis,
+    GrokUnavailableError,
+    SYSTEM_PROMPT,
+    _parse_analysis_response,
+    _retry_after_seconds,
+)
+
+
+@pytest.fixture
+def whole_completions(test_settings):
+    """Turn off streaming for mocks that return whole (non-streamed) completions."""
+    test_settings.grok_streaming = False
+    return test_settings
 
 
 class TestFallacyAnalysis:
@@ -89,12 +112,13 @@ class TestParseAnalysisResponse:
         assert result.fallacy_name == "Test"
 
 
+@pytest.mark.usefixtures("whole_completions")
 class TestAnalyzeFallacy:
     """Tests for the analyze_fallacy function."""
 
-    def test_analyze_fallacy_returns_fallacy_analysis(self, mock_grok_client_json):
+    async def test_analyze_fallacy_returns_fallacy_analysis(self, mock_grok_client_json):
         """Test that analyze_fallacy returns a FallacyAnalysis object."""
-        result = analyze_fallacy(
+        result = await analyze_fallacy(
             "Everyone knows this is true!",
             client=mock_grok_client_json
         )
@@ -105,9 +129,9 @@ class TestAnalyzeFallacy:
         assert "Bandwagon" in result.fallacy_name
         mock_grok_client_json.chat.completions.create.assert_called_once()
 
-    def test_analyze_with_context(self, mock_grok_client_json):
+    async def test_analyze_with_context(self, mock_grok_client_json):
         """Test that context tweet is included in the prompt."""
-        result = analyze_fallacy(
+        result = await analyze_fallacy(
             fallacy_tweet="That's completely wrong!",
             context_tweet="Here is my original statement about AI",
             client=mock_grok_client_json
@@ -121,9 +145,9 @@ class TestAnalyzeFallacy:
         assert "REPLY TO ANALYZE" in user_content
         assert "That's completely wrong!" in user_content
 
-    def test_analyze_without_context(self, mock_grok_client_json):
+    async def test_analyze_without_context(self, mock_grok_client_json):
         """Test analysis without context tweet."""
-        result = analyze_fallacy(
+        result = await analyze_fallacy(
             fallacy_tweet="Everyone knows this is true!",
             context_tweet=None,
             client=mock_grok_client_json
@@ -136,9 +160,9 @@ class TestAnalyzeFallacy:
         assert "ORIGINAL TWEET" not in user_content
         assert "Everyone knows this is true!" in user_content
 
-    def test_high_confidence_fallacy(self, mock_grok_client_json):
+    async def test_high_confidence_fallacy(self, mock_grok_client_json):
         """Test detection of high-confidence fallacy."""
-        result = analyze_fallacy(
+        result = await analyze_fallacy(
             "AI is LITERALLY DESTROYING EVERYTHING!!!",
             client=mock_grok_client_json
         )
@@ -146,9 +170,10 @@ class TestAnalyzeFallacy:
         assert result.confidence >= 90
         assert result.fallacy_detected is True
 
-    def test_low_confidence_no_fallacy(self):
+    async def test_low_confidence_no_fallacy(self):
         """Test that genuine questions get low confidence."""
         mock_client = MagicMock()
+        mock_client.chat.completions.create = AsyncMock()
         mock_response = json.dumps({
             "confidence": 10,
             "fallacy_detected": False,
@@ -157,7 +182,7 @@ class TestAnalyzeFallacy:
         })
         mock_client.chat.completions.create.return_value.choices[0].message.content = mock_response
 
-        result = analyze_fallacy(
+        result = await analyze_fallacy(
             "Is AI really that energy intensive?",
             client=mock_client
         )
@@ -165,12 +190,13 @@ class TestAnalyzeFallacy:
         assert result.confidence < 50
         assert result.fallacy_detected is False
 
-    def test_grok_api_error_handling(self):
+    async def test_grok_api_error_handling(self):
         """Test graceful handling of API errors."""
         mock_client = MagicMock()
+        mock_client.chat.completions.create = AsyncMock()
         mock_client.chat.completions.create.side_effect = Exception("API Error")
 
-        result = analyze_fallacy("Test tweet", client=mock_client)
+        result = await analyze_fallacy("Test tweet", client=mock_client)
 
         # Should return fallback with 0 confidence
         assert result.confidence == 0
@@ -187,9 +213,9 @@ class TestAnalyzeFallacy:
         assert "confidence" in SYSTEM_PROMPT.lower()
         assert "JSON" in SYSTEM_PROMPT
 
-    def test_correct_api_call_parameters(self, mock_grok_client_json):
+    async def test_correct_api_call_parameters(self, mock_grok_client_json):
         """Test that the API is called with correct parameters."""
-        analyze_fallacy("Test tweet", client=mock_grok_client_json)
+        await analyze_fallacy("Test tweet", client=mock_grok_client_json)
 
         call_kwargs = mock_grok_client_json.chat.completions.create.call_args.kwargs
         assert "grok" in call_kwargs["model"].lower()
@@ -199,12 +225,14 @@ class TestAnalyzeFallacy:
         assert "Test tweet" in call_kwargs["messages"][1]["content"]
 
 
+@pytest.mark.usefixtures("whole_completions")
 class TestConfidenceThreshold:
     """Tests for confidence-based filtering."""
 
-    def test_confidence_range(self):
+    async def test_confidence_range(self):
         """Test that confidence is always 0-100."""
         mock_client = MagicMock()
+        mock_client.chat.completions.create = AsyncMock()
 
         # Test with various confidence values
         for conf in [0, 50, 100]:
@@ -216,13 +244,14 @@ class TestConfidenceThreshold:
             })
             mock_client.chat.completions.create.return_value.choices[0].message.content = mock_response
 
-            result = analyze_fallacy("Test", client=mock_client)
+            result = await analyze_fallacy("Test", client=mock_client)
 
             assert 0 <= result.confidence <= 100
 
-    def test_borderline_confidence(self):
+    async def test_borderline_confidence(self):
         """Test analysis with borderline confidence (around threshold)."""
         mock_client = MagicMock()
+        mock_client.chat.completions.create = AsyncMock()
         mock_response = json.dumps({
             "confidence": 85,
             "fallacy_detected": True,
@@ -231,18 +260,20 @@ class TestConfidenceThreshold:
         })
         mock_client.chat.completions.create.return_value.choices[0].message.content = mock_response
 
-        result = analyze_fallacy("Arguable statement", client=mock_client)
+        result = await analyze_fallacy("Arguable statement", client=mock_client)
 
         assert result.confidence == 85
         # 85 is below default 90 threshold, so this would NOT be posted
 
 
+@pytest.mark.usefixtures("whole_completions")
 class TestAnalyzeFallacyWithContext:
     """Additional tests for context-aware analysis."""
 
-    def test_context_helps_identify_strawman(self):
+    async def test_context_helps_identify_strawman(self):
         """Test that context enables detection of strawman fallacies."""
         mock_client = MagicMock()
+        mock_client.chat.completions.create = AsyncMock()
         mock_response = json.dumps({
             "confidence": 92,
             "fallacy_detected": True,
@@ -251,7 +282,7 @@ class TestAnalyzeFallacyWithContext:
         })
         mock_client.chat.completions.create.return_value.choices[0].message.content = mock_response
 
-        result = analyze_fallacy(
+        result = await analyze_fallacy(
             fallacy_tweet="So you're saying we should just ignore all safety!",
             context_tweet="We should balance AI development speed with safety measures",
             client=mock_client
@@ -260,9 +291,9 @@ class TestAnalyzeFallacyWithContext:
         assert result.fallacy_name == "Strawman"
         assert result.confidence >= 90
 
-    def test_context_provided_in_correct_format(self, mock_grok_client_json):
+    async def test_context_provided_in_correct_format(self, mock_grok_client_json):
         """Test that context is formatted correctly for the model."""
-        analyze_fallacy(
+        await analyze_fallacy(
             fallacy_tweet="Reply text here",
             context_tweet="Original text here",
             client=mock_grok_client_json
@@ -275,3 +306,521 @@ class TestAnalyzeFallacyWithContext:
         context_pos = user_content.find("Original text here")
         reply_pos = user_content.find("Reply text here")
         assert context_pos < reply_pos, "Context should appear before reply in prompt"
+
+
+class TestAnalysisCache:
+    """Tests for caching Grok results by tweet content."""
+
+    def test_cache_key_normalizes_whitespace_only(self):
+        """Test that whitespace is folded but case still matters."""
+        key = analysis_cache_key("Slippery  slope\n ahead", "context")
+
+        assert key == analysis_cache_key(" Slippery slope ahead ", "context")
+        assert key != analysis_cache_key("SLIPPERY SLOPE AHEAD", "context")
+        assert key != analysis_cache_key("Slippery slope ahead", "other context")
+        assert key != analysis_cache_key("Slippery slope ahead")
+
+    @pytest.mark.usefixtures("whole_completions")
+    async def test_repeat_analysis_served_from_cache(self, test_settings, mock_grok_client_json):
+        """Test that the same tweet only costs one Grok call."""
+        first = await analyze_fallacy("Same tweet", client=mock_grok_client_json)
+        second = await analyze_fallacy("Same  tweet", client=mock_grok_client_json)
+
+        assert second == first
+        assert mock_grok_client_json.chat.completions.create.call_count == 1
+        stats = get_analysis_cache().stats()
+        assert stats["hits"] == 1
+        assert stats["misses"] == 1
+
+    @pytest.mark.usefixtures("whole_completions")
+    async def test_cache_survives_memory_reset(self, test_settings, mock_grok_client_json):
+        """Test that results persisted in SQLite are reused after a restart."""
+        from app.grok_client import reset_analysis_cache
+
+        await analyze_fallacy("Persisted tweet", client=mock_grok_client_json)
+        reset_analysis_cache()
+        result = await analyze_fallacy("Persisted tweet", client=mock_grok_client_json)
+
+        assert result.confidence == 95
+        assert mock_grok_client_json.chat.completions.create.call_count == 1
+
+    @pytest.mark.usefixtures("whole_completions")
+    async def test_concurrent_requests_share_one_call(self, test_settings, mock_grok_client_json):
+        """Test that simultaneous lookups of one tweet wait for a single request."""
+        results = await asyncio.gather(
+            *(analyze_fallacy("Viral tweet", client=mock_grok_client_json) for _ in range(5))
+        )
+
+        assert all(result.confidence == 95 for result in results)
+        assert mock_grok_client_json.chat.completions.create.call_count == 1
+
+    async def test_errors_are_not_cached(self, test_settings):
+        """Test that a failed request is retried on the next call."""
+        mock_client = MagicMock()
+        mock_client.chat.completions.create = AsyncMock(side_effect=Exception("API Error"))
+
+        await analyze_fallacy("Flaky tweet", client=mock_client)
+        await analyze_fallacy("Flaky tweet", client=mock_client)
+
+        assert mock_client.chat.completions.create.call_count == 2
+
+    @pytest.mark.usefixtures("whole_completions")
+    async def test_use_cache_false_bypasses_cache(self, test_settings, mock_grok_client_json):
+        """Test that use_cache=False always calls Grok."""
+        await analyze_fallacy("Tweet", client=mock_grok_client_json, use_cache=False)
+        await analyze_fallacy("Tweet", client=mock_grok_client_json, use_cache=False)
+
+        assert mock_grok_client_json.chat.completions.create.call_count == 2
+
+    @pytest.mark.usefixtures("whole_completions")
+    async def test_near_duplicate_reuses_analysis(self, test_settings, mock_grok_client_json):
+        """Test that a paraphrased pile-on reply with the same context reuses the analysis."""
+        claim = "AI data centres are literally drinking all of our water and nobody in tech even cares"
+
+        first = await analyze_fallacy(claim, context_tweet="ctx", client=mock_grok_client_json)
+        second = await analyze_fallacy(
+            f"@someone {claim}!!", context_tweet="ctx", client=mock_grok_client_json
+        )
+        await analyze_fallacy(f"@someone {claim}!!", context_tweet="other", client=mock_grok_client_json)
+
+        assert second == first
+        assert mock_grok_client_json.chat.completions.create.call_count == 2
+        assert get_analysis_cache().stats()["near_duplicate_hits"] == 1
+
+    @pytest.mark.usefixtures("whole_completions")
+    async def test_signature_computed_off_the_event_loop(self, test_settings, mock_grok_client_json):
+        """Test that the MinHash signature is computed in the lookup's worker thread."""
+        from app import grok_client
+
+        on_loop = []
+        original = grok_client.minhash
+
+        def record(*args):
+            try:
+                asyncio.get_running_loop()
+                on_loop.append(args)
+            except RuntimeError:
+                pass
+            return original(*args)
+
+        claim = "AI data centres are literally drinking all of our water and nobody in tech even cares"
+        with patch("app.grok_client.minhash", side_effect=record) as mock_minhash:
+            await analyze_fallacy(claim, context_tweet="ctx", client=mock_grok_client_json)
+
+        assert mock_minhash.call_count == 1
+        assert on_loop == []
+
+    @pytest.mark.usefixtures("whole_completions")
+    async def test_short_texts_need_exact_match(self, test_settings, mock_grok_client_json):
+        """Test that short texts are never matched as near duplicates."""
+        await analyze_fallacy("this is so wrong", client=mock_grok_client_json)
+        await analyze_fallacy("this is so wrong!!", client=mock_grok_client_json)
+
+        assert mock_grok_client_json.chat.completions.create.call_count == 2
+
+    @pytest.mark.usefixtures("whole_completions")
+    async def test_unreadable_cached_row_is_a_miss(self, test_settings, mock_grok_client_json):
+        """Test that a corrupt SQLite row is re-analyzed and doesn't strand later lookups."""
+        from app.database import set_cached_analysis
+
+        set_cached_analysis(analysis_cache_key("Corrupt tweet"), "{not json", 100)
+
+        first = await analyze_fallacy("Corrupt tweet", client=mock_grok_client_json)
+        second = await asyncio.wait_for(
+            analyze_fallacy("Corrupt tweet", client=mock_grok_client_json), timeout=5
+        )
+
+        assert first.confidence == second.confidence == 95
+        assert mock_grok_client_json.chat.completions.create.call_count == 1
+
+    async def test_cancelled_lookup_releases_claim(self, test_settings):
+        """Test that cancelling a lookup mid-claim lets the next caller proceed."""
+        cache = get_analysis_cache()
+        key = analysis_cache_key("Cancelled tweet")
+
+        with patch("app.grok_client.asyncio.to_thread", side_effect=asyncio.CancelledError):
+            with pytest.raises(asyncio.CancelledError):
+                await cache.get(key)
+
+        assert await asyncio.wait_for(cache.get(key), timeout=5) is None
+
+
+def _completion(content: str) -> MagicMock:
+    response = MagicMock()
+    response.choices[0].message.content = content
+    return response
+
+
+def _result(confidence: int, name: str = "Strawman", item_id: int | None = None) -> dict:
+    result = {} if item_id is None else {"id": item_id}
+    return result | {
+        "confidence": confidence,
+        "fallacy_detected": True,
+        "fallacy_name": name,
+        "reply": f"{name}\\nPro: Fair point.\\nCon: Not what was said.",
+    }
+
+
+class TestAnalyzeFallaciesBatch:
+    """Tests for analyzing several tweets in one request."""
+
+    async def test_batch_uses_one_request(self, test_settings):
+        """Test that a batch is answered by a single completion with every tweet in it."""
+        mock_client = MagicMock()
+        mock_client.chat.completions.create = AsyncMock(return_value=_completion(
+            json.dumps([_result(95, "Strawman", 1), _result(40, "Hyperbole", 2)])
+        ))
+
+        results = await analyze_fallacies_batch(
+            [("First tweet", "Context"), ("Second tweet", None)], client=mock_client
+        )
+
+        assert [r.fallacy_name for r in results] == ["Strawman", "Hyperbole"]
+        assert mock_client.chat.completions.create.call_count == 1
+        call_kwargs = mock_client.chat.completions.create.call_args.kwargs
+        assert call_kwargs["messages"][0]["content"] == SYSTEM_PROMPT
+        user_content = call_kwargs["messages"][1]["content"]
+        assert "JSON array" in user_content
+        assert '"id"' in user_content
+        assert user_content.index("First tweet") < user_content.index("Second tweet")
+        assert call_kwargs["max_tokens"] == 600
+
+    @pytest.mark.usefixtures("whole_completions")
+    async def test_missing_items_are_requested_individually(self, test_settings):
+        """Test that tweets the array didn't cover fall back to single requests."""
+        mock_client = MagicMock()
+        mock_client.chat.completions.create = AsyncMock(side_effect=[
+            _completion(json.dumps([_result(95, item_id=1)])),
+            _completion(json.dumps(_result(20, "Hyperbole"))),
+        ])
+
+        results = await analyze_fallacies_batch(
+            [("First tweet", None), ("Second tweet", None)], client=mock_client
+        )
+
+        assert [r.confidence for r in results] == [95, 20]
+        assert mock_client.chat.completions.create.call_count == 2
+        retry_content = mock_client.chat.completions.create.call_args.kwargs["messages"][1]["content"]
+        assert "Second tweet" in retry_content
+        assert "First tweet" not in retry_content
+
+    async def test_answers_are_matched_by_id(self, test_settings):
+        """Test that reordered array items still land on the right tweets."""
+        mock_client = MagicMock()
+        mock_client.chat.completions.create = AsyncMock(return_value=_completion(
+            json.dumps([_result(40, "Hyperbole", 2), _result(95, "Strawman", 1)])
+        ))
+
+        results = await analyze_fallacies_batch(
+            [("First tweet", None), ("Second tweet", None)], client=mock_client
+        )
+
+        assert [r.fallacy_name for r in results] == ["Strawman", "Hyperbole"]
+        assert mock_client.chat.completions.create.call_count == 1
+
+    @pytest.mark.usefixtures("whole_completions")
+    async def test_items_without_valid_id_are_retried(self, test_settings):
+        """Test that items lacking an id (or answering a tweet twice) aren't attached by position."""
+        mock_client = MagicMock()
+        mock_client.chat.completions.create = AsyncMock(side_effect=[
+            _completion(json.dumps([
+                _result(95, "Strawman"),
+                'Hyperbole "confidence": 30',
+                _result(40, "Hyperbole", 2),
+                _result(50, "Red Herring", 3),
+                _result(60, "Red Herring", 3),
+            ])),
+            _completion(json.dumps(_result(70, "Ad Hominem"))),
+            _completion(json.dumps(_result(80, "Ad Hominem"))),
+        ])
+
+        results = await analyze_fallacies_batch(
+            [("First tweet", None), ("Second tweet", None), ("Third tweet", None)],
+            client=mock_client,
+        )
+
+        assert results[1].fallacy_name == "Hyperbole"
+        assert {results[0].confidence, results[2].confidence} == {70, 80}
+        assert mock_client.chat.completions.create.call_count == 3
+
+    @pytest.mark.usefixtures("whole_completions")
+    async def test_cached_and_repeated_tweets_are_not_resent(self, test_settings, mock_grok_client_json):
+        """Test that cached tweets and duplicates within a batch are analyzed once."""
+        await analyze_fallacy("Cached tweet", client=mock_grok_client_json)
+        mock_client = MagicMock()
+        mock_client.chat.completions.create = AsyncMock(return_value=_completion(
+            json.dumps(_result(60))
+        ))
+
+        # Only one tweet is left to analyze, so it is sent as a single request
+        results = await analyze_fallacies_batch(
+            [("Cached tweet", None), ("New tweet", None), ("New tweet", None)],
+            client=mock_client,
+        )
+
+        assert [r.confidence for r in results] == [95, 60, 60]
+        user_content = mock_client.chat.completions.create.call_args.kwargs["messages"][1]["content"]
+        assert "Cached tweet" not in user_content
+
+    async def test_api_error_returns_fallbacks_without_caching(self, test_settings):
+        """Test that a failed batch request yields low-confidence results that aren't cached."""
+        mock_client = MagicMock()
+        mock_client.chat.completions.create = AsyncMock(side_effect=Exception("API Error"))
+
+        results = await analyze_fallacies_batch(
+            [("First tweet", None), ("Second tweet", None)], client=mock_client
+        )
+
+        assert all(r.confidence == 0 for r in results)
+        assert mock_client.chat.completions.create.call_count == 1
+        assert get_analysis_cache().stats()["entries"] == 0
+
+    @pytest.mark.usefixtures("whole_completions")
+    async def test_overlapping_batches_in_opposite_order_finish(self, test_settings):
+        """Test that concurrent batches sharing keys never wait on each other's claims."""
+        async def answer(**kwargs):
+            await asyncio.sleep(0.01)
+            content = kwargs["messages"][1]["content"]
+            if "JSON array" not in content:
+                return _completion(json.dumps(_result(95)))
+            return _completion(json.dumps([_result(95, item_id=i) for i in (1, 2)]))
+
+        mock_client = MagicMock()
+        mock_client.chat.completions.create = AsyncMock(side_effect=answer)
+        tweets = [("Alpha tweet", None), ("Beta tweet", None)]
+
+        first, second = await asyncio.wait_for(asyncio.gather(
+            analyze_fallacies_batch(tweets, client=mock_client),
+            analyze_fallacies_batch(tweets[::-1], client=mock_client),
+        ), timeout=5)
+
+        assert [r.confidence for r in first + second] == [95] * 4
+        # Each tweet is analyzed once across both batches
+        assert mock_client.chat.completions.create.call_count == 2
+
+    async def test_cancelled_cache_write_releases_every_claim(self, test_settings):
+        """Test that a cancellation while persisting results strands no waiting lookup."""
+        mock_client = MagicMock()
+        mock_client.chat.completions.create = AsyncMock(return_value=_completion(
+            json.dumps([_result(95, item_id=1), _result(40, item_id=2)])
+        ))
+        cache = get_analysis_cache()
+        keys = [analysis_cache_key("Alpha tweet"), analysis_cache_key("Beta tweet")]
+
+        with patch.object(cache, "store", AsyncMock(side_effect=asyncio.CancelledError)):
+            with pytest.raises(asyncio.CancelledError):
+                await analyze_fallacies_batch(
+                    [("Alpha tweet", None), ("Beta tweet", None)], client=mock_client
+                )
+
+        assert not any(cache.in_flight(key) for key in keys)
+        results = await asyncio.wait_for(analyze_fallacies_batch(
+            [("Beta tweet", None)], client=mock_client
+        ), timeout=5)
+        assert results[0].confidence == 40
+
+
+class _FakeStream:
+    """Async iterator of completion chunks that records how far it was read."""
+
+    def __init__(self, pieces: list[str]):
+        self.pieces = pieces
+        self.consumed = 0
+        self.closed = False
+
+    def __aiter__(self):
+        return self
+
+    async def __anext__(self):
+        if self.closed or self.consumed >= len(self.pieces):
+            raise StopAsyncIteration
+        chunk = MagicMock()
+        chunk.choices[0].delta.content = self.pieces[self.consumed]
+        self.consumed += 1
+        return chunk
+
+    async def close(self):
+        self.closed = True
+
+
+def _stream_pieces(result: dict) -> list[str]:
+    text = json.dumps(result)
+    return [text[i:i + 7] for i in range(0, len(text), 7)]
+
+
+class TestStreamingAnalysis:
+    """Tests for streamed analyses that stop early on low confidence."""
+
+    async def test_low_confidence_stops_stream(self, test_settings):
+        """Test that the stream is closed as soon as a low confidence is known."""
+        stream = _FakeStream(_stream_pieces(_result(40, "Hyperbole")))
+        mock_client = MagicMock()
+        mock_client.chat.completions.create = AsyncMock(return_value=stream)
+
+        result = await analyze_fallacy("Meh tweet", client=mock_client)
+
+        assert result.confidence == 40
+        assert result.truncated is True
+        assert result.reply_text == ""
+        assert stream.closed is True
+        assert stream.consumed < len(stream.pieces)
+        assert mock_client.chat.completions.create.call_args.kwargs["stream"] is True
+
+    async def test_high_confidence_reads_whole_answer(self, test_settings):
+        """Test that a postable analysis is streamed to the end and parsed."""
+        stream = _FakeStream(_stream_pieces(_result(95, "Strawman")))
+        mock_client = MagicMock()
+        mock_client.chat.completions.create = AsyncMock(return_value=stream)
+
+        result = await analyze_fallacy("Strawman tweet", client=mock_client)
+
+        assert result.confidence == 95
+        assert result.truncated is False
+        assert result.reply_text.startswith("Strawman\nPro:")
+        assert stream.closed is False
+
+    async def test_truncated_result_not_reused_after_threshold_drop(self, test_settings):
+        """Test that a cached truncated result is ignored once it would be postable."""
+        mock_client = MagicMock()
+        mock_client.chat.completions.create = AsyncMock(
+            side_effect=lambda **kwargs: _FakeStream(_stream_pieces(_result(85)))
+        )
+
+        await analyze_fallacy("Borderline tweet", client=mock_client)
+        await analyze_fallacy("Borderline tweet", client=mock_client)
+        assert mock_client.chat.completions.create.call_count == 1
+
+        test_settings.confidence_threshold = 80
+        result = await analyze_fallacy("Borderline tweet", client=mock_client)
+
+        assert mock_client.chat.completions.create.call_count == 2
+        assert result.truncated is False
+        assert result.reply_text
+
+
+def _status_error(status: int, headers: dict | None = None) -> Exception:
+    import httpx
+    import openai
+
+    response = httpx.Response(
+        status,
+        headers=headers or {},
+        request=httpx.Request("POST", "https://api.x.ai/v1/chat/completions"),
+    )
+    return openai.APIStatusError(f"HTTP {status}", response=response, body=None)
+
+
+class TestGrokOverload:
+    """Tests for 429/5xx handling through the adaptive limiter."""
+
+    async def test_rate_limit_raises_and_shrinks_window(self, test_settings):
+        """Test that a 429 is surfaced (not swallowed) and honors Retry-After."""
+        test_settings.max_concurrent_mentions = 8
+        mock_client = MagicMock()
+        mock_client.chat.completions.create = AsyncMock(
+            side_effect=_status_error(429, {"retry-after": "7"})
+        )
+
+        with pytest.raises(GrokUnavailableError):
+            await analyze_fallacy("Busy tweet", client=mock_client)
+
+        stats = get_grok_limiter().stats()
+        assert stats["window"] == 4
+        assert 6 < stats["retry_after_seconds"] <= 7
+        # Nothing is cached, so the tweet is retried later
+        assert get_analysis_cache().stats()["entries"] == 0
+
+    async def test_connection_error_raises(self, test_settings):
+        """Test that an unreachable Grok is retried later, not a 0% analysis."""
+        request = httpx.Request("POST", "https://api.x.ai/v1/chat/completions")
+        mock_client = MagicMock()
+        mock_client.chat.completions.create = AsyncMock(
+            side_effect=openai.APIConnectionError(request=request)
+        )
+
+        with pytest.raises(GrokUnavailableError):
+            await analyze_fallacy("Offline tweet", client=mock_client)
+        with pytest.raises(GrokUnavailableError):
+            await analyze_fallacies_batch([("One", None), ("Two", None)], client=mock_client)
+
+    async def test_stream_reset_raises(self, test_settings):
+        """Test that a connection dropped mid-stream counts as Grok being unavailable."""
+
+        async def broken_stream():
+            raise httpx.ReadError("connection reset")
+            yield
+
+        mock_client = MagicMock()
+        mock_client.chat.completions.create = AsyncMock(return_value=broken_stream())
+
+        with pytest.raises(GrokUnavailableError):
+            await analyze_fallacy("Dropped tweet", client=mock_client)
+
+    async def test_server_error_fails_whole_batch(self, test_settings):
+        """Test that a 5xx on a batch request raises for the batch."""
+        mock_client = MagicMock()
+        mock_client.chat.completions.create = AsyncMock(side_effect=_status_error(503))
+
+        with pytest.raises(GrokUnavailableError):
+            await analyze_fallacies_batch([("One", None), ("Two", None)], client=mock_client)
+
+    async def test_batch_latency_is_judged_per_tweet(self, test_settings):
+        """Test that a batch slower than the target overall but not per tweet keeps the window."""
+        test_settings.max_concurrent_mentions = 8
+        test_settings.grok_latency_target_seconds = 0.1
+
+        async def slow_answer(**kwargs):
+            await asyncio.sleep(0.15)
+            return _completion(json.dumps([_result(95, item_id=i) for i in range(1, 5)]))
+
+        mock_client = MagicMock()
+        mock_client.chat.completions.create = AsyncMock(side_effect=slow_answer)
+
+        await analyze_fallacies_batch(
+            [(f"Tweet number {i}", None) for i in range(4)], client=mock_client
+        )
+
+        assert get_grok_limiter().window == 8
+
+    async def test_client_error_still_falls_back(self, test_settings):
+        """Test that other API errors keep the low-confidence fallback."""
+        mock_client = MagicMock()
+        mock_client.chat.completions.create = AsyncMock(side_effect=_status_error(400))
+
+        result = await analyze_fallacy("Odd tweet", client=mock_client)
+
+        assert result.confidence == 0
+        assert get_grok_limiter().stats()["overloads"] == 0
+
+    def test_retry_after_http_date(self):
+        """Test that an HTTP-date Retry-After is converted to seconds."""
+        import httpx
+        from datetime import datetime, timedelta, timezone
+        from email.utils import format_datetime
+
+        retry_at = datetime.now(timezone.utc) + timedelta(seconds=30)
+        response = httpx.Response(429, headers={"retry-after": format_datetime(retry_at, usegmt=True)})
+
+        assert 28 <= _retry_after_seconds(response) <= 30
+
+
+class TestGrokClient:
+    """Tests for the shared Grok API client."""
+
+    async def test_client_is_reused(self, test_settings):
+        """Test that every call gets the same client (and connection pool)."""
+        client = get_grok_client()
+        try:
+            assert get_grok_client() is client
+        finally:
+            await close_grok_client()
+
+    async def test_close_drops_client(self, test_settings):
+        """Test that a closed client is replaced by a new one."""
+        client = get_grok_client()
+        await close_grok_client()
+
+        assert client.is_closed()
+        replacement = get_grok_client()
+        assert replacement is not client
+        await close_grok_client()
@@ -0,0 +1,58 @@
+"""
+Tests for leader election between worker processes.
+
+Tests taking, holding, handing over and losing the leader lease.
+"""
+
+from datetime import timedelta
+from unittest.mock import patch
+
+from app.leader import LeaderLease
+
+
+class TestLeaderLease:
+    """Tests for the SQLite leader lease."""
+
+    async def test_single_leader(self, test_settings):
+        """Test that only one process holds the lease and it passes on when released."""
+        first = LeaderLease(timedelta(seconds=30), holder="worker-1")
+        second = LeaderLease(timedelta(seconds=30), holder="worker-2")
+
+        assert await first.acquire()
+        assert not await second.acquire()
+
+        await first.stop()
+        assert not first.is_leader
+        assert await second.acquire()
+        assert second.stats()["leader"] == "worker-2"
+
+    async def test_takes_over_expired_lease(self, test_settings):
+        """Test that a lease its holder stopped renewing is taken over."""
+        crashed = LeaderLease(timedelta(seconds=-1), holder="crashed")
+        standby = LeaderLease(timedelta(seconds=30), holder="standby")
+
+        assert await crashed.acquire()
+        assert await standby.acquire()
+
+    async def test_database_error_keeps_lease_until_expiry(self, test_settings):
+        """Test that a failed renewal keeps leadership only while the lease is still valid."""
+        lease = LeaderLease(timedelta(seconds=30), holder="worker-1")
+        await lease.acquire()
+
+        with patch("app.leader.acquire_lease", side_effect=OSError("disk I/O error")):
+            assert await lease.acquire()
+            lease._expires_at = 0.0
+            assert not await lease.acquire()
+
+    async def test_run_reports_changes(self, test_settings):
+        """Test that run() calls on_change when leadership is gained."""
+        lease = LeaderLease(timedelta(seconds=30), holder="worker-1")
+        changes = []
+
+        async def on_change(leader):
+            changes.append(leader)
+            await lease.stop()
+
+        await lease.run(on_change)
+
+        assert changes == [True]
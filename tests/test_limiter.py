@@ -0,0 +1,101 @@
+"""
+Tests for the adaptive (AIMD) concurrency limiter.
+
+Tests window growth and shrinkage, Retry-After handling, and slot limits.
+"""
+
+import asyncio
+import time
+
+from app.limiter import AIMDLimiter
+
+
+class TestWindow:
+    """Tests for additive increase / multiplicative decrease."""
+
+    async def test_grows_only_while_saturated(self):
+        """Test that healthy responses widen a full window but not an idle one."""
+        limiter = AIMDLimiter(initial_limit=2, max_limit=4)
+
+        limiter.on_success(0.1)  # nothing in flight
+        assert limiter.limit == 2
+
+        # Roughly one step per window's worth of successes
+        async with limiter.slot(), limiter.slot():
+            for _ in range(3):
+                limiter.on_success(0.1)
+
+        assert limiter.window == 3
+
+    def test_overload_halves_window(self):
+        """Test that a 429 halves the window, never below min_limit."""
+        limiter = AIMDLimiter(initial_limit=8, min_limit=2)
+
+        limiter.on_overload()
+        assert limiter.window == 4
+        limiter.on_overload()
+        limiter.on_overload()
+        assert limiter.window == 2
+        assert limiter.stats()["overloads"] == 3
+
+    def test_decreases_once_per_round_trip(self):
+        """Test that failures of requests started before a cut don't halve the window again."""
+        limiter = AIMDLimiter(initial_limit=16, latency_target=5.0)
+        before_cut = time.monotonic()
+
+        limiter.on_overload(started=before_cut)
+        limiter.on_overload(started=before_cut)
+        limiter.on_success(60.0, started=before_cut)
+        assert limiter.window == 8
+
+        # A request sent into the smaller window can cut it again
+        limiter.on_overload(started=time.monotonic())
+        assert limiter.window == 4
+        assert limiter.stats()["overloads"] == 3
+
+    async def test_slot_yields_start_time(self):
+        """Test that slot() hands out the time the request started."""
+        limiter = AIMDLimiter(initial_limit=1)
+
+        before = time.monotonic()
+        async with limiter.slot() as started:
+            assert before <= started <= time.monotonic()
+
+    def test_slow_response_counts_as_overload(self):
+        """Test that responses slower than the latency target shrink the window."""
+        limiter = AIMDLimiter(initial_limit=8, latency_target=5.0)
+
+        limiter.on_success(12.0)
+
+        assert limiter.window == 4
+
+
+class TestSlots:
+    """Tests for waiting on the window and Retry-After."""
+
+    async def test_slots_never_exceed_window(self):
+        """Test that no more than `window` requests hold a slot at once."""
+        limiter = AIMDLimiter(initial_limit=2, max_limit=2)
+        peak = 0
+
+        async def request():
+            nonlocal peak
+            async with limiter.slot():
+                peak = max(peak, limiter.in_flight)
+                await asyncio.sleep(0.01)
+
+        await asyncio.gather(*(request() for _ in range(6)))
+
+        assert peak == 2
+        assert limiter.in_flight == 0
+
+    async def test_retry_after_delays_next_request(self):
+        """Test that a Retry-After pauses new requests until it has passed."""
+        limiter = AIMDLimiter(initial_limit=2)
+        limiter.on_overload(retry_after=0.05)
+
+        started = time.monotonic()
+        async with limiter.slot():
+            pass
+
+        assert time.monotonic() - started >= 0.04
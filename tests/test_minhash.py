@@ -0,0 +1,65 @@
+"""
+Tests for MinHash near-duplicate detection.
+
+Tests tokenization, similarity estimates, and the LSH index.
+"""
+
+from unittest.mock import patch
+
+from app.minhash import MinHashIndex, minhash, shingles, similarity, tokenize
+
+CLAIM = "AI data centres are literally drinking all of our water and nobody in tech even cares"
+
+
+def _signature(text: str):
+    return minhash(shingles(tokenize(text)))
+
+
+class TestSignatures:
+    """Tests for tokenize/minhash/similarity."""
+
+    def test_tokenize_drops_handles_and_links(self):
+        """Test that handles and URLs don't affect the tokens."""
+        assert tokenize("@bob Water BAD https://t.co/abc") == ["water", "bad"]
+
+    def test_paraphrase_scores_high_and_unrelated_low(self):
+        """Test that small edits keep similarity high and different claims score low."""
+        base = _signature(CLAIM)
+        edited = _signature("@someone AI data centres are literally drinking all our water and nobody in tech even cares!!")
+        unrelated = _signature("Vaccines cause autism and the government is hiding the evidence from all of us")
+
+        assert similarity(base, base) == 1.0
+        assert similarity(base, edited) >= 0.8
+        assert similarity(base, unrelated) < 0.3
+
+
+class TestMinHashIndex:
+    """Tests for MinHashIndex lookups and eviction."""
+
+    def test_finds_near_duplicate_in_same_namespace(self):
+        """Test that a paraphrase matches only within its namespace."""
+        index = MinHashIndex(0.8, max_entries=10, window_seconds=60)
+        index.add("context", _signature(CLAIM), "analysis")
+
+        paraphrase = _signature(CLAIM + " at all")
+        assert index.find("context", paraphrase) == "analysis"
+        assert index.find("other context", paraphrase) is None
+        assert index.find("context", _signature("Completely different argument about taxes and roads")) is None
+
+    def test_evicts_oldest_beyond_capacity(self):
+        """Test that the index keeps at most max_entries signatures."""
+        index = MinHashIndex(0.8, max_entries=1, window_seconds=60)
+        index.add("", _signature(CLAIM), "first")
+        index.add("", _signature("Completely different argument about taxes and roads"), "second")
+
+        assert len(index) == 1
+        assert index.find("", _signature(CLAIM)) is None
+
+    def test_entries_expire_after_window(self):
+        """Test that entries older than the window are not matched."""
+        index = MinHashIndex(0.8, max_entries=10, window_seconds=60)
+        with patch("app.minhash.time.time", return_value=1000.0):
+            index.add("", _signature(CLAIM), "analysis")
+        with patch("app.minhash.time.time", return_value=1061.0):
+            assert index.find("", _signature(CLAIM)) is None
+        assert len(index) == 0
@@ -0,0 +1,170 @@
+"""
+Tests for the reply outbox worker.
+
+Tests posting order, retries and rate-limit handling.
+"""
+
+import json
+import time
+from datetime import timedelta
+from unittest.mock import MagicMock
+
+import requests
+import tweepy
+
+from app.database import enqueue_reply, get_outbox_counts, get_pool
+from app.outbox import OutboxWorker
+from app.write_budget import WriteBudget
+
+
+def _response(status: int, headers: dict | None = None, body: dict | None = None) -> requests.Response:
+    response = requests.Response()
+    response.status_code = status
+    response.headers.update(headers or {})
+    response._content = json.dumps(body or {}).encode()
+    return response
+
+
+def _twitter_client(*results) -> MagicMock:
+    """Tweepy client mock whose create_tweet returns/raises the given results in turn."""
+    client = MagicMock()
+    client.create_tweet.side_effect = [
+        result if isinstance(result, Exception) else _response(201, body={"data": {"id": result}})
+        for result in results
+    ]
+    return client
+
+
+def _worker(client: MagicMock, burst: int = 5, daily_limit: int = 0) -> OutboxWorker:
+    return OutboxWorker(WriteBudget(daily_limit, burst), max_attempts=3, client=client)
+
+
+class TestOutboxWorker:
+    """Tests for draining the outbox."""
+
+    async def test_posts_due_replies(self, test_settings):
+        """Test that queued replies are posted and marked sent."""
+        enqueue_reply("1800000000000000001", "Strawman")
+        enqueue_reply("1800000000000000002", "Ad hominem")
+        client = _twitter_client("1", "2")
+        worker = _worker(client)
+
+        await worker.drain()
+
+        assert client.create_tweet.call_count == 2
+        assert get_outbox_counts()["sent"] == 2
+        assert worker.stats()["posted"] == 2
+
+    async def test_stops_when_budget_is_spent(self, test_settings):
+        """Test that replies beyond the budget stay queued."""
+        for i in range(3):
+            enqueue_reply(f"180000000000000000{i}", "Strawman")
+        client = _twitter_client("1", "2", "3")
+        worker = _worker(client, burst=2, daily_limit=17)
+
+        wait = await worker.drain()
+
+        assert client.create_tweet.call_count == 2
+        assert get_outbox_counts()["pending"] == 1
+        assert wait > 0
+
+    async def test_highest_priority_is_posted_first(self, test_settings):
+        """Test that the most confident reply gets the next post."""
+        enqueue_reply("1800000000000000001", "Maybe", priority=90)
+        enqueue_reply("1800000000000000002", "Surely", priority=99)
+        client = _twitter_client("1")
+        worker = _worker(client, burst=1, daily_limit=17)
+
+        await worker.drain()
+
+        assert client.create_tweet.call_args.kwargs["in_reply_to_tweet_id"] == "1800000000000000002"
+
+    async def test_age_lowers_priority(self, test_settings):
+        """Test that a fresh reply beats a slightly surer one to an hours-old mention."""
+        now = time.time()
+        enqueue_reply("1800000000000000001", "Old", priority=0.99, published_at=now - 5 * 3600)
+        enqueue_reply("1800000000000000002", "Fresh", priority=0.95, published_at=now)
+        client = _twitter_client("1")
+        worker = OutboxWorker(WriteBudget(17, 1), max_attempts=3, client=client, age_weight=0.1)
+
+        await worker.drain()
+
+        assert client.create_tweet.call_args.kwargs["in_reply_to_tweet_id"] == "1800000000000000002"
+
+    async def test_stale_replies_are_dropped(self, test_settings):
+        """Test that queued replies to mentions past max_age are failed, not posted."""
+        now = time.time()
+        enqueue_reply("1800000000000000001", "Old", published_at=now - 30 * 3600)
+        enqueue_reply("1800000000000000002", "Fresh", published_at=now)
+        client = _twitter_client("1")
+        worker = OutboxWorker(
+            WriteBudget(0, 5), max_attempts=3, client=client, max_age=timedelta(hours=24)
+        )
+
+        await worker.drain()
+
+        assert client.create_tweet.call_count == 1
+        assert client.create_tweet.call_args.kwargs["in_reply_to_tweet_id"] == "1800000000000000002"
+        assert get_outbox_counts()["failed"] == 1
+        assert worker.stats()["expired"] == 1
+
+    async def test_server_error_is_retried_with_backoff(self, test_settings):
+        """Test that a 5xx puts the reply back in the queue for later."""
+        enqueue_reply("1800000000000000001", "Strawman")
+        client = _twitter_client(tweepy.TwitterServerError(_response(503)))
+        worker = _worker(client)
+
+        await worker.drain()
+
+        assert get_outbox_counts()["pending"] == 1
+        with get_pool().reader() as conn:
+            attempts, due = conn.execute(
+                "SELECT attempts, next_attempt_at FROM reply_outbox"
+            ).fetchone()
+        assert attempts == 1
+        assert due > time.time()
+
+    async def test_gives_up_after_max_attempts(self, test_settings):
+        """Test that a reply is abandoned after max_attempts transient failures."""
+        enqueue_reply("1800000000000000001", "Strawman")
+        with get_pool().writer() as conn:
+            conn.execute("UPDATE reply_outbox SET attempts = 2")
+        client = _twitter_client(requests.ConnectionError("reset"))
+        worker = _worker(client)
+
+        await worker.drain()
+
+        assert get_outbox_counts()["failed"] == 1
+
+    async def test_rejected_reply_is_not_retried(self, test_settings):
+        """Test that a 403 (e.g. duplicate content) fails the reply at once."""
+        enqueue_reply("1800000000000000001", "Strawman")
+        client = _twitter_client(tweepy.Forbidden(_response(403)))
+        worker = _worker(client)
+
+        await worker.drain()
+
+        assert get_outbox_counts()["failed"] == 1
+
+    async def test_rate_limit_pauses_until_reset(self, test_settings):
+        """Test that a 429 pauses posting until the reset, without using an attempt."""
+        enqueue_reply("1800000000000000001", "Strawman")
+        enqueue_reply("1800000000000000002", "Ad hominem")
+        reset = int(time.time()) + 600
+        client = _twitter_client(
+            tweepy.TooManyRequests(_response(429, {
+                "x-rate-limit-limit": "100",
+                "x-rate-limit-remaining": "0",
+                "x-rate-limit-reset": str(reset),
+            }))
+        )
+        worker = _worker(client)
+
+        wait = await worker.drain()
+
+        assert client.create_tweet.call_count == 1
+        assert 590 <= wait <= 600
+        assert get_outbox_counts()["pending"] == 2
+        assert worker.budget.stats()["rate_limited"] == 1
+        with get_pool().reader() as conn:
+            assert conn.execute("SELECT MAX(attempts) FROM reply_outbox").fetchone()[0] == 0
@@ -0,0 +1,91 @@
+"""
+Tests for single-flight poll coordination.
+
+Tests joining an in-flight poll, failures, and poll lookup by ID.
+"""
+
+import asyncio
+
+from app.poll_coordinator import POLL_HISTORY_SIZE, PollCoordinator
+
+
+class TestPollCoordinator:
+    """Tests for running one poll at a time."""
+
+    async def test_overlapping_triggers_join_one_poll(self):
+        """Test that triggers during a poll share it instead of starting another."""
+        calls = 0
+        release = asyncio.Event()
+
+        async def poll():
+            nonlocal calls
+            calls += 1
+            await release.wait()
+
+        coordinator = PollCoordinator(poll)
+        first = asyncio.create_task(coordinator.run("scheduler"))
+        await asyncio.sleep(0)
+        second = asyncio.create_task(coordinator.run("manual"))
+        await asyncio.sleep(0)
+        release.set()
+
+        runs = await asyncio.gather(first, second)
+
+        assert calls == 1
+        assert runs[0] is runs[1]
+        assert runs[0].status == "completed"
+        assert runs[0].joined == 1
+        assert coordinator.current is None
+
+    async def test_next_trigger_starts_new_poll(self):
+        """Test that a trigger after a poll finished starts a fresh one."""
+        async def poll():
+            pass
+
+        coordinator = PollCoordinator(poll)
+
+        first = await coordinator.run("manual")
+        second = await coordinator.run("manual")
+
+        assert first.status == second.status == "completed"
+        assert first.poll_id != second.poll_id
+        assert coordinator.get(first.poll_id) is first
+
+    async def test_failure_is_reported(self):
+        """Test that a failed poll is recorded with its error and frees the slot."""
+        async def poll():
+            raise RuntimeError("RSSHub down")
+
+        coordinator = PollCoordinator(poll)
+        run = await coordinator.run("scheduler")
+
+        assert run.status == "failed"
+        assert "RSSHub down" in run.error
+        assert coordinator.stats()["last"]["poll_id"] == run.poll_id
+
+    async def test_cancelled_caller_leaves_poll_running(self):
+        """Test that a caller giving up doesn't cancel the poll others share."""
+        release = asyncio.Event()
+        coordinator = PollCoordinator(release.wait)
+
+        caller = asyncio.create_task(coordinator.run("manual"))
+        await asyncio.sleep(0)
+        caller.cancel()
+        await asyncio.sleep(0)
+
+        run = coordinator.current
+        assert run is not None and run.status == "running"
+        release.set()
+        await asyncio.sleep(0.01)
+        assert run.status == "completed"
+
+    async def test_history_is_bounded(self):
+        """Test that only the most recent polls can be looked up."""
+        async def poll():
+            pass
+
+        coordinator = PollCoordinator(poll)
+        runs = [await coordinator.run("scheduler") for _ in range(POLL_HISTORY_SIZE + 1)]
+
+        assert coordinator.get(runs[0].poll_id) is None
+        assert coordinator.get(runs[-1].poll_id) is runs[-1]
@@ -0,0 +1,148 @@
+"""
+Tests for the adaptive poll interval.
+
+Tests shortening under load, backing off on empty polls, the bounds, and
+how polls feed the interval and reschedule the poll job.
+"""
+
+from unittest.mock import patch
+
+from app.poll_interval import AdaptivePollInterval, get_poll_interval
+from app.rss_client import FeedPage, RSSMention
+
+
+def _interval(**overrides) -> AdaptivePollInterval:
+    options = dict(initial=300, minimum=60, maximum=900, target_mentions=2, backoff_factor=2)
+    options.update(overrides)
+    return AdaptivePollInterval(**options)
+
+
+def _mention(tweet_id: int) -> RSSMention:
+    return RSSMention(
+        tweet_id=str(tweet_id),
+        text="@FallacySheriff hello",
+        author_username="user",
+        published="",
+        link=f"https://twitter.com/user/status/{tweet_id}",
+        in_reply_to_tweet_id=None,
+        in_reply_to_username=None,
+    )
+
+
+class TestAdaptivePollInterval:
+    """Tests for picking the next interval from the mention rate."""
+
+    def test_starts_at_initial_interval(self):
+        """Test that the interval starts at the configured value, within bounds."""
+        assert _interval().interval == 300
+        assert _interval(initial=10).interval == 60
+        assert _interval(initial=5000).interval == 900
+
+    def test_busy_poll_shortens_interval(self):
+        """Test that many new mentions per poll bring the next poll closer."""
+        interval = _interval()
+        interval.record(0, now=0)
+
+        # 10 mentions in 600 s is one per minute: 2 mentions take 120 s
+        assert interval.record(10, now=600) == 120
+        assert interval.stats()["mentions_per_minute"] == 1.0
+
+    def test_storm_is_clamped_to_minimum(self):
+        """Test that a mention storm never polls faster than the minimum."""
+        interval = _interval()
+        interval.record(0, now=0)
+
+        assert interval.record(200, now=120) == 60
+
+    def test_empty_polls_back_off_exponentially(self):
+        """Test that each empty poll doubles the interval up to the maximum."""
+        interval = _interval()
+
+        assert [interval.record(0, now=t) for t in range(4)] == [600, 900, 900, 900]
+        assert interval.empty_polls == 4
+
+    def test_rate_is_smoothed(self):
+        """Test that one quiet poll after a busy one doesn't jump straight to the quiet rate."""
+        interval = _interval(maximum=3600)
+        interval.record(0, now=0)
+        interval.record(12, now=120)  # 6 per minute
+        interval.record(1, now=720)   # 0.1 per minute
+
+        # Smoothed to 3.05 per minute, not 0.1
+        assert interval.stats()["mentions_per_minute"] == 3.05
+        assert interval.interval < 60 * 2 / 0.1
+
+    def test_equal_bounds_fix_interval(self):
+        """Test that min == max gives a fixed interval."""
+        interval = _interval(minimum=300, maximum=300)
+
+        assert interval.record(0, now=0) == 300
+        assert interval.record(50, now=300) == 300
+
+
+class TestPollCadence:
+    """Tests for polls driving the interval."""
+
+    @patch("app.main.fetch_mentions_page")
+    @patch("app.main.get_last_seen_id")
+    async def test_empty_poll_backs_off(self, mock_get_last_seen, mock_fetch, test_settings):
+        """Test that a poll finding nothing lengthens the interval."""
+        from app.main import poll_mentions
+
+        mock_get_last_seen.return_value = "100"
+        mock_fetch.return_value = FeedPage([])
+        before = get_poll_interval().interval
+
+        await poll_mentions()
+
+        assert get_poll_interval().interval == min(
+            before * test_settings.poll_backoff_factor, test_settings.poll_interval_max_seconds
+        )
+
+    @patch("app.main.fetch_mentions_page")
+    @patch("app.main.get_last_seen_id")
+    async def test_failed_fetch_keeps_interval(self, mock_get_last_seen, mock_fetch, test_settings):
+        """Test that an RSSHub failure says nothing about the mention rate."""
+        from app.main import poll_mentions
+
+        mock_get_last_seen.return_value = "100"
+        mock_fetch.return_value = None
+        before = get_poll_interval().interval
+
+        await poll_mentions()
+
+        assert get_poll_interval().interval == before
+        assert get_poll_interval().polls == 0
+
+    @patch("app.main.fetch_mentions_page")
+    @patch("app.main.get_last_seen_id")
+    async def test_only_new_mentions_count(self, mock_get_last_seen, mock_fetch, test_settings):
+        """Test that mentions at or below last_seen_id don't count toward the rate."""
+        from app.main import poll_mentions
+
+        mock_get_last_seen.return_value = "100"
+        mock_fetch.return_value = FeedPage([_mention(100), _mention(99)])
+
+        await poll_mentions()
+
+        assert get_poll_interval().empty_polls == 1
+
+    @patch("app.main.fetch_mentions_page")
+    def test_poll_reschedules_job(self, mock_fetch, client):
+        """Test that every poll reschedules the poll job at the adapted interval."""
+        from app.main import scheduler
+
+        mock_fetch.return_value = FeedPage([])
+
+        client.post("/poll")
+
+        call = scheduler.reschedule_job.call_args
+        assert call.args == ("poll_mentions",)
+        assert call.kwargs["trigger"].interval.total_seconds() == get_poll_interval().interval
+
+    def test_status_shows_cadence(self, client):
+        """Test that /status reports the current interval."""
+        data = client.get("/status").json()
+
+        assert data["poll_interval"]["interval_seconds"] == get_poll_interval().interval
+        assert data["poll_interval"]["empty_polls"] == 0
@@ -4,12 +4,16 @@ Tests for polling functionality and endpoints.
 Tests the RSS-based mention polling, processing, and HTTP endpoints.
 """
 
+import asyncio
+from datetime import datetime, timezone
 from unittest.mock import patch, MagicMock, AsyncMock
 
 import pytest
 
+from app.catchup import reset_catchup_runner
 from app.grok_client import FallacyAnalysis
-from app.rss_client import RSSMention
+from app.rss_client import FeedPage, RSSMention
+from app.write_budget import reset_write_budget
 
 
 class TestHealthEndpoint:
@@ -41,307 +45,363 @@ class TestStatusEndpoint:
         assert "poll_interval_minutes" in data
         assert "mentions_processed" in data
         assert "rsshub_url" in data
+        assert data["rsshub"]["instances"][0]["url"] == "http://localhost:1200"
+        assert data["analysis_cache"]["hits"] == 0
+
+    def test_status_restores_state_off_the_event_loop(self, client):
+        """Test that saved budget and catch-up state is read in a worker thread."""
+        on_loop = []
+
+        def get_poll_state(key):
+            try:
+                asyncio.get_running_loop()
+                on_loop.append(key)
+            except RuntimeError:
+                pass
+            return None
+
+        with patch("app.write_budget.get_poll_state", side_effect=get_poll_state), \
+                patch("app.catchup.get_poll_state", side_effect=get_poll_state):
+            reset_write_budget()
+            reset_catchup_runner()
+            response = client.get("/status")
+
+        assert response.status_code == 200
+        assert on_loop == []
 
 
 class TestTriggerPoll:
     """Tests for POST /poll endpoint."""
 
-    @patch("app.main.fetch_mentions_rss")
+    @patch("app.main.fetch_mentions_page")
     def test_trigger_poll_completes(self, mock_fetch_mentions, client):
         """Test that manual poll trigger works."""
-        mock_fetch_mentions.return_value = []
+        mock_fetch_mentions.return_value = FeedPage([])
 
         response = client.post("/poll")
 
         assert response.status_code == 200
-        assert response.json() == {"status": "poll_completed"}
+        data = response.json()
+        assert data["status"] == "poll_completed"
+
+        poll = client.get(f"/poll/{data['poll_id']}").json()
+        assert poll["status"] == "completed"
+        assert poll["trigger"] == "manual"
+
+    def test_unknown_poll_id(self, client):
+        """Test that an unknown poll ID is a 404."""
+        assert client.get("/poll/nope").status_code == 404
+
+    def test_scheduled_polls_never_overlap(self, client):
+        """Test that the poll job coalesces missed runs and runs one instance at a time."""
+        from app.main import scheduler
+
+        options = next(
+            call.kwargs for call in scheduler.add_job.call_args_list
+            if call.kwargs["id"] == "poll_mentions"
+        )
+        assert options["coalesce"] is True
+        assert options["max_instances"] == 1
+
+    def test_every_process_runs_mention_worker(self, client):
+        """Test that the mention worker job is scheduled without the leader-only wrapper."""
+        from app.main import scheduler, work_on_mentions
+
+        job = next(
+            call for call in scheduler.add_job.call_args_list
+            if call.kwargs["id"] == "work_on_mentions"
+        )
+        assert job.args[0] is work_on_mentions
+        assert job.kwargs["max_instances"] == 1
+
+    @patch("app.main.get_leader_lease")
+    def test_only_leader_polls(self, mock_get_lease, client):
+        """Test that a worker process without the leader lease doesn't poll."""
+        mock_get_lease.return_value.is_leader = False
+
+        response = client.post("/poll")
+
+        assert response.json() == {"status": "not_leader"}
+
 
+class TestProcessClaimedMentions:
+    """Tests for analyzing claimed mentions and acting on the results."""
 
-class TestProcessMention:
-    """Tests for the process_mention function."""
+    @staticmethod
+    def _analysis(confidence: int, reply_text: str = "Bandwagon fallacy detected"):
+        """side_effect for analyze_fallacies_batch returning one analysis per tweet."""
+        async def analyze(tweets):
+            return [
+                FallacyAnalysis(
+                    reply_text=reply_text,
+                    confidence=confidence,
+                    fallacy_detected=True,
+                    fallacy_name="Bandwagon",
+                )
+                for _ in tweets
+            ]
+        return analyze
 
     @pytest.mark.asyncio
     @patch("app.main.fetch_tweet_chain")
-    @patch("app.main.analyze_fallacy")
-    @patch("app.main.post_reply")
-    @patch("app.main.is_processed")
-    @patch("app.main.mark_processed")
+    @patch("app.main.analyze_fallacies_batch")
+    @patch("app.main.enqueue_reply")
     async def test_process_valid_mention_high_confidence(
         self,
-        mock_mark_processed,
-        mock_is_processed,
-        mock_post_reply,
-        mock_analyze_fallacy,
+        mock_enqueue_reply,
+        mock_analyze,
         mock_fetch_chain,
         sample_rss_mention,
         test_settings,
     ):
         """Test processing a valid mention with high confidence fallacy."""
-        from app.main import process_mention
+        from app.database import is_processed
+        from app.main import _process_claimed_mentions
 
-        mock_is_processed.return_value = False
         mock_fetch_chain.return_value = ("Fallacy tweet text", "Original tweet context")
-        mock_analyze_fallacy.return_value = FallacyAnalysis(
-            reply_text="Bandwagon fallacy detected",
-            confidence=95,
-            fallacy_detected=True,
-            fallacy_name="Bandwagon"
-        )
-        mock_post_reply.return_value = True
+        mock_analyze.side_effect = self._analysis(95)
+        mock_enqueue_reply.return_value = True
 
-        await process_mention(sample_rss_mention)
+        failures = await _process_claimed_mentions([sample_rss_mention], 1)
 
+        assert failures == {}
         mock_fetch_chain.assert_called_once_with(sample_rss_mention)
-        mock_analyze_fallacy.assert_called_once_with(
-            "Fallacy tweet text",
-            context_tweet="Original tweet context"
-        )
-        mock_post_reply.assert_called_once()
-        mock_mark_processed.assert_called()
+        mock_analyze.assert_called_once_with([("Fallacy tweet text", "Original tweet context")])
+        mock_enqueue_reply.assert_called_once()
+        assert is_processed(sample_rss_mention.tweet_id)
 
     @pytest.mark.asyncio
     @patch("app.main.fetch_tweet_chain")
-    @patch("app.main.analyze_fallacy")
-    @patch("app.main.post_reply")
-    @patch("app.main.is_processed")
-    @patch("app.main.mark_processed")
+    @patch("app.main.analyze_fallacies_batch")
+    @patch("app.main.enqueue_reply")
     async def test_process_skips_low_confidence(
         self,
-        mock_mark_processed,
-        mock_is_processed,
-        mock_post_reply,
-        mock_analyze_fallacy,
+        mock_enqueue_reply,
+        mock_analyze,
         mock_fetch_chain,
         sample_rss_mention,
         test_settings,
     ):
         """Test that low confidence analysis doesn't post reply."""
-        from app.main import process_mention
+        from app.database import is_processed
+        from app.main import _process_claimed_mentions
 
-        mock_is_processed.return_value = False
         mock_fetch_chain.return_value = ("Fallacy tweet text", "Original tweet context")
-        mock_analyze_fallacy.return_value = FallacyAnalysis(
-            reply_text="Maybe a fallacy?",
-            confidence=75,  # Below 90% threshold
-            fallacy_detected=True,
-            fallacy_name="Possible Fallacy"
-        )
+        mock_analyze.side_effect = self._analysis(75)  # Below 90% threshold
 
-        await process_mention(sample_rss_mention)
+        await _process_claimed_mentions([sample_rss_mention], 1)
 
-        mock_analyze_fallacy.assert_called_once()
-        mock_post_reply.assert_not_called()  # Should NOT post
-        mock_mark_processed.assert_called()  # But still mark processed
+        mock_analyze.assert_called_once()
+        mock_enqueue_reply.assert_not_called()  # Should NOT queue a reply
+        assert is_processed(sample_rss_mention.tweet_id)  # But still mark processed
 
     @pytest.mark.asyncio
-    @patch("app.main.post_reply")
-    @patch("app.main.analyze_fallacy")
+    @patch("app.main.enqueue_reply")
+    @patch("app.main.analyze_fallacies_batch")
     @patch("app.main.fetch_tweet_chain")
     async def test_process_skips_no_trigger(
         self,
         mock_fetch_chain,
-        mock_analyze_fallacy,
-        mock_post_reply,
+        mock_analyze,
+        mock_enqueue_reply,
         sample_rss_mention_no_trigger,
         test_settings,
     ):
         """Test that mentions without trigger phrase are skipped."""
-        from app.main import process_mention
+        from app.main import _process_claimed_mentions
 
-        await process_mention(sample_rss_mention_no_trigger)
+        await _process_claimed_mentions([sample_rss_mention_no_trigger], 1)
 
         mock_fetch_chain.assert_not_called()
-        mock_analyze_fallacy.assert_not_called()
-        mock_post_reply.assert_not_called()
+        mock_analyze.assert_not_called()
+        mock_enqueue_reply.assert_not_called()
 
     @pytest.mark.asyncio
-    @patch("app.main.post_reply")
-    @patch("app.main.analyze_fallacy")
+    @patch("app.main.enqueue_reply")
+    @patch("app.main.analyze_fallacies_batch")
     @patch("app.main.fetch_tweet_chain")
     async def test_process_skips_non_reply(
         self,
         mock_fetch_chain,
-        mock_analyze_fallacy,
-        mock_post_reply,
+        mock_analyze,
+        mock_enqueue_reply,
         sample_rss_mention_not_reply,
         test_settings,
     ):
         """Test that mentions that aren't replies are skipped."""
-        from app.main import process_mention
+        from app.main import _process_claimed_mentions
 
-        await process_mention(sample_rss_mention_not_reply)
+        await _process_claimed_mentions([sample_rss_mention_not_reply], 1)
 
         mock_fetch_chain.assert_not_called()
-        mock_analyze_fallacy.assert_not_called()
-        mock_post_reply.assert_not_called()
+        mock_analyze.assert_not_called()
+        mock_enqueue_reply.assert_not_called()
 
     @pytest.mark.asyncio
-    @patch("app.main.post_reply")
-    @patch("app.main.analyze_fallacy")
+    @patch("app.main.enqueue_reply")
+    @patch("app.main.analyze_fallacies_batch")
     @patch("app.main.fetch_tweet_chain")
-    @patch("app.main.is_processed")
     async def test_process_skips_duplicate(
         self,
-        mock_is_processed,
         mock_fetch_chain,
-        mock_analyze_fallacy,
-        mock_post_reply,
+        mock_analyze,
+        mock_enqueue_reply,
         sample_rss_mention,
         test_settings,
     ):
-        """Test that already-processed mentions are skipped."""
-        from app.main import process_mention
+        """Test that already-processed mentions are never claimed."""
+        from app.database import mark_processed
+        from app.main import _handle_mentions
 
-        mock_is_processed.return_value = True
+        mark_processed(sample_rss_mention.tweet_id)
 
-        await process_mention(sample_rss_mention)
+        await _handle_mentions([sample_rss_mention], 1)
 
         mock_fetch_chain.assert_not_called()
-        mock_analyze_fallacy.assert_not_called()
-        mock_post_reply.assert_not_called()
+        mock_analyze.assert_not_called()
+        mock_enqueue_reply.assert_not_called()
 
     @pytest.mark.asyncio
     @patch("app.main.fetch_tweet_chain")
-    @patch("app.main.analyze_fallacy")
-    @patch("app.main.post_reply")
-    @patch("app.main.is_processed")
-    @patch("app.main.mark_processed")
+    @patch("app.main.analyze_fallacies_batch")
+    @patch("app.main.enqueue_reply")
     async def test_process_handles_missing_chain(
         self,
-        mock_mark_processed,
-        mock_is_processed,
-        mock_post_reply,
-        mock_analyze_fallacy,
+        mock_enqueue_reply,
+        mock_analyze,
         mock_fetch_chain,
         sample_rss_mention,
         test_settings,
     ):
         """Test handling when tweet chain cannot be fetched."""
-        from app.main import process_mention
+        from app.database import is_processed
+        from app.main import _process_claimed_mentions
 
-        mock_is_processed.return_value = False
         mock_fetch_chain.return_value = (None, None)
 
-        await process_mention(sample_rss_mention)
+        await _process_claimed_mentions([sample_rss_mention], 1)
 
-        mock_analyze_fallacy.assert_not_called()
-        mock_post_reply.assert_not_called()
-        mock_mark_processed.assert_called()  # Should still mark processed
+        mock_analyze.assert_not_called()
+        mock_enqueue_reply.assert_not_called()
+        assert is_processed(sample_rss_mention.tweet_id)  # Should still mark processed
 
     @pytest.mark.asyncio
     @patch("app.main.fetch_tweet_chain")
-    @patch("app.main.analyze_fallacy")
-    @patch("app.main.post_reply")
-    @patch("app.main.is_processed")
-    @patch("app.main.mark_processed")
+    @patch("app.main.analyze_fallacies_batch")
+    @patch("app.main.enqueue_reply")
     async def test_process_works_without_context(
         self,
-        mock_mark_processed,
-        mock_is_processed,
-        mock_post_reply,
-        mock_analyze_fallacy,
+        mock_enqueue_reply,
+        mock_analyze,
         mock_fetch_chain,
         sample_rss_mention,
         test_settings,
     ):
         """Test processing works when original context is not available."""
-        from app.main import process_mention
+        from app.main import _process_claimed_mentions
 
-        mock_is_processed.return_value = False
         mock_fetch_chain.return_value = ("Fallacy tweet text", None)  # No context
-        mock_analyze_fallacy.return_value = FallacyAnalysis(
-            reply_text="Fallacy detected",
-            confidence=92,
-            fallacy_detected=True,
-            fallacy_name="Test Fallacy"
-        )
-        mock_post_reply.return_value = True
+        mock_analyze.side_effect = self._analysis(92)
+        mock_enqueue_reply.return_value = True
 
-        await process_mention(sample_rss_mention)
+        await _process_claimed_mentions([sample_rss_mention], 1)
 
-        mock_analyze_fallacy.assert_called_once_with(
-            "Fallacy tweet text",
-            context_tweet=None
-        )
-        mock_post_reply.assert_called_once()
+        mock_analyze.assert_called_once_with([("Fallacy tweet text", None)])
+        mock_enqueue_reply.assert_called_once()
+
+
+class TestActOnAnalysis:
+    """Tests for the confidence threshold applied to an analysis."""
 
     @pytest.mark.asyncio
-    @patch("app.main.fetch_tweet_chain")
-    @patch("app.main.analyze_fallacy")
-    @patch("app.main.post_reply")
-    @patch("app.main.is_processed")
-    @patch("app.main.mark_processed")
+    @patch("app.main.enqueue_reply")
     async def test_confidence_at_threshold_posts(
-        self,
-        mock_mark_processed,
-        mock_is_processed,
-        mock_post_reply,
-        mock_analyze_fallacy,
-        mock_fetch_chain,
-        sample_rss_mention,
-        test_settings,
+        self, mock_enqueue_reply, sample_rss_mention, test_settings
     ):
         """Test that exactly 90% confidence posts reply."""
-        from app.main import process_mention
+        from app.main import _act_on_analysis
 
-        mock_is_processed.return_value = False
-        mock_fetch_chain.return_value = ("Fallacy tweet text", "Context")
-        mock_analyze_fallacy.return_value = FallacyAnalysis(
+        mock_enqueue_reply.return_value = True
+        analysis = FallacyAnalysis(
             reply_text="Borderline fallacy",
             confidence=90,  # Exactly at threshold
             fallacy_detected=True,
             fallacy_name="Test"
         )
-        mock_post_reply.return_value = True
 
-        await process_mention(sample_rss_mention)
+        assert await _act_on_analysis(sample_rss_mention, analysis) is True
 
-        mock_post_reply.assert_called_once()  # Should post at exactly 90%
+        mock_enqueue_reply.assert_called_once()  # Should queue a reply at exactly 90%
 
     @pytest.mark.asyncio
-    @patch("app.main.fetch_tweet_chain")
-    @patch("app.main.analyze_fallacy")
-    @patch("app.main.post_reply")
-    @patch("app.main.is_processed")
-    @patch("app.main.mark_processed")
+    @patch("app.main.enqueue_reply")
     async def test_confidence_just_below_threshold_skips(
-        self,
-        mock_mark_processed,
-        mock_is_processed,
-        mock_post_reply,
-        mock_analyze_fallacy,
-        mock_fetch_chain,
-        sample_rss_mention,
-        test_settings,
+        self, mock_enqueue_reply, sample_rss_mention, test_settings
     ):
         """Test that 89% confidence does not post reply."""
-        from app.main import process_mention
+        from app.main import _act_on_analysis
 
-        mock_is_processed.return_value = False
-        mock_fetch_chain.return_value = ("Fallacy tweet text", "Context")
-        mock_analyze_fallacy.return_value = FallacyAnalysis(
+        analysis = FallacyAnalysis(
             reply_text="Almost a fallacy",
             confidence=89,  # Just below threshold
             fallacy_detected=True,
             fallacy_name="Test"
         )
 
-        await process_mention(sample_rss_mention)
+        assert await _act_on_analysis(sample_rss_mention, analysis) is True
+
+        mock_enqueue_reply.assert_not_called()  # Should NOT queue a reply at 89%
+
+
+# Recent enough to be replied to; shared so mentions rank only by popularity
+PUBLISHED = datetime.now(timezone.utc).isoformat()
 
-        mock_post_reply.assert_not_called()  # Should NOT post at 89%
+
+@pytest.fixture
+def no_prefilter(test_settings):
+    """Let the bare-tag fixture mentions past the pre-filter, which would drop them."""
+    test_settings.prefilter_enabled = False
+    return test_settings
+
+
+def _mention(tweet_id: str) -> RSSMention:
+    return RSSMention(
+        tweet_id=tweet_id,
+        text="@FallacySheriff fallacyme",
+        author_username="user",
+        published=PUBLISHED,
+        link=f"https://twitter.com/user/status/{tweet_id}",
+        in_reply_to_tweet_id="1",
+        in_reply_to_username="target_user",
+    )
+
+
+def _batch_result(confidence: int):
+    """side_effect for analyze_fallacies_batch returning one analysis per tweet."""
+    async def analyze(tweets):
+        return [
+            FallacyAnalysis(
+                reply_text="Strawman",
+                confidence=confidence,
+                fallacy_detected=confidence >= 50,
+                fallacy_name="Strawman",
+            )
+            for _ in tweets
+        ]
+    return analyze
 
 
 class TestPollMentions:
     """Tests for the poll_mentions function."""
 
     @pytest.mark.asyncio
-    @patch("app.main.fetch_mentions_rss")
+    @patch("app.main.fetch_mentions_page")
     @patch("app.main.get_last_seen_id")
     @patch("app.main.set_last_seen_id")
-    @patch("app.main.process_mention", new_callable=AsyncMock)
+    @patch("app.main.analyze_fallacies_batch")
     async def test_poll_updates_last_seen_id(
         self,
-        mock_process,
+        mock_analyze,
         mock_set_last_seen,
         mock_get_last_seen,
         mock_fetch_mentions,
@@ -351,26 +411,8 @@ class TestPollMentions:
         from app.main import poll_mentions
 
         mock_get_last_seen.return_value = None
-        mock_fetch_mentions.return_value = [
-            RSSMention(
-                tweet_id="999",
-                text="@FallacySheriff fallacyme",
-                author_username="user1",
-                published="2025-01-01",
-                link="https://twitter.com/user1/status/999",
-                in_reply_to_tweet_id="888",
-                in_reply_to_username="target_user",
-            ),
-            RSSMention(
-                tweet_id="998",
-                text="@FallacySheriff fallacyme",
-                author_username="user2",
-                published="2025-01-01",
-                link="https://twitter.com/user2/status/998",
-                in_reply_to_tweet_id="887",
-                in_reply_to_username="target_user2",
-            ),
-        ]
+        mock_fetch_mentions.return_value = FeedPage([_mention("999"), _mention("998")])
+        mock_analyze.side_effect = _batch_result(10)
 
         await poll_mentions()
 
@@ -378,7 +420,7 @@ class TestPollMentions:
         mock_set_last_seen.assert_called_once_with("999")
 
     @pytest.mark.asyncio
-    @patch("app.main.fetch_mentions_rss")
+    @patch("app.main.fetch_mentions_page")
     @patch("app.main.get_last_seen_id")
     @patch("app.main.set_last_seen_id")
     async def test_poll_no_mentions(
@@ -392,21 +434,24 @@ class TestPollMentions:
         from app.main import poll_mentions
 
         mock_get_last_seen.return_value = "12345"
-        mock_fetch_mentions.return_value = []
+        mock_fetch_mentions.return_value = FeedPage([])
 
         await poll_mentions()
 
         # Should not update last_seen_id
         mock_set_last_seen.assert_not_called()
 
+    @pytest.mark.usefixtures("no_prefilter")
     @pytest.mark.asyncio
-    @patch("app.main.fetch_mentions_rss")
+    @patch("app.main.fetch_mentions_page")
     @patch("app.main.get_last_seen_id")
     @patch("app.main.set_last_seen_id")
-    @patch("app.main.process_mention", new_callable=AsyncMock)
+    @patch("app.main.enqueue_reply")
+    @patch("app.main.analyze_fallacies_batch")
     async def test_poll_skips_old_tweets(
         self,
-        mock_process,
+        mock_analyze,
+        mock_enqueue,
         mock_set_last_seen,
         mock_get_last_seen,
         mock_fetch_mentions,
@@ -416,30 +461,504 @@ class TestPollMentions:
         from app.main import poll_mentions
 
         mock_get_last_seen.return_value = "500"  # Already seen up to ID 500
-        mock_fetch_mentions.return_value = [
-            RSSMention(
-                tweet_id="600",  # Newer - should process
-                text="@FallacySheriff fallacyme",
-                author_username="user1",
-                published="2025-01-01",
-                link="https://twitter.com/user1/status/600",
-                in_reply_to_tweet_id="888",
-                in_reply_to_username="target_user",
-            ),
-            RSSMention(
-                tweet_id="400",  # Older - should skip
-                text="@FallacySheriff fallacyme",
-                author_username="user2",
-                published="2025-01-01",
-                link="https://twitter.com/user2/status/400",
-                in_reply_to_tweet_id="887",
-                in_reply_to_username="target_user2",
-            ),
-        ]
+        mock_fetch_mentions.return_value = FeedPage([
+            _mention("600"),  # Newer - should process
+            _mention("400"),  # Older - should skip
+        ])
+        mock_analyze.side_effect = _batch_result(95)
+        mock_enqueue.return_value = True
 
         await poll_mentions()
 
         # Should only process the newer tweet
-        assert mock_process.call_count == 1
-        processed_mention = mock_process.call_args[0][0]
-        assert processed_mention.tweet_id == "600"
+        assert len(mock_analyze.call_args.args[0]) == 1
+        mock_enqueue.assert_called_once()
+        assert mock_enqueue.call_args.args[0] == "600"
+
+    @pytest.mark.usefixtures("no_prefilter")
+    @pytest.mark.asyncio
+    @patch("app.main.fetch_mentions_page")
+    @patch("app.main.get_last_seen_id")
+    @patch("app.main.set_last_seen_id")
+    @patch("app.main.enqueue_reply")
+    @patch("app.main.analyze_fallacies_batch")
+    async def test_poll_holds_last_seen_id_at_failed_mention(
+        self,
+        mock_analyze,
+        mock_enqueue,
+        mock_set_last_seen,
+        mock_get_last_seen,
+        mock_fetch_mentions,
+        test_settings,
+    ):
+        """Test that last_seen_id never advances past a failed mention."""
+        from app.main import poll_mentions
+
+        mock_get_last_seen.return_value = None
+        mock_fetch_mentions.return_value = FeedPage([_mention(i) for i in ("103", "101", "102")])
+        mock_analyze.side_effect = _batch_result(95)
+
+        def fail_on_102(tweet_id, text, priority=0.0, published_at=None):
+            if tweet_id == "102":
+                raise RuntimeError("database is locked")
+            return True
+
+        mock_enqueue.side_effect = fail_on_102
+
+        await poll_mentions()
+
+        # All mentions are attempted, but only 101 is safely behind the watermark
+        assert mock_enqueue.call_count == 3
+        mock_set_last_seen.assert_called_once_with("101")
+
+    @pytest.mark.usefixtures("no_prefilter")
+    @pytest.mark.asyncio
+    @patch("app.main.fetch_mentions_page")
+    @patch("app.main.get_last_seen_id")
+    @patch("app.main.set_last_seen_id")
+    @patch("app.main.analyze_fallacies_batch")
+    async def test_poll_holds_last_seen_id_when_batch_fails(
+        self,
+        mock_analyze,
+        mock_set_last_seen,
+        mock_get_last_seen,
+        mock_fetch_mentions,
+        test_settings,
+    ):
+        """Test that a failed batch holds the watermark before its first mention."""
+        from app.main import poll_mentions
+
+        test_settings.grok_batch_size = 2
+        mock_get_last_seen.return_value = None
+        mock_fetch_mentions.return_value = FeedPage([_mention(str(i)) for i in range(100, 104)])
+
+        async def fail_second_batch(tweets):
+            if mock_analyze.call_count == 2:
+                raise RuntimeError("Grok unavailable")
+            return await _batch_result(10)(tweets)
+
+        mock_analyze.side_effect = fail_second_batch
+
+        await poll_mentions()
+
+        mock_set_last_seen.assert_called_once_with("101")
+
+    @pytest.mark.asyncio
+    @patch("app.main.fetch_mentions_page")
+    @patch("app.main.get_last_seen_id")
+    @patch("app.main.set_last_seen_id")
+    @patch("app.grok_client.get_grok_client")
+    async def test_poll_respects_grok_limiter(
+        self,
+        mock_get_grok_client,
+        mock_set_last_seen,
+        mock_get_last_seen,
+        mock_fetch_mentions,
+        test_settings,
+    ):
+        """Test that the adaptive Grok limiter alone bounds concurrent requests."""
+        import asyncio
+        import json
+
+        from app.main import poll_mentions, work_on_mentions
+
+        test_settings.max_concurrent_mentions = 2
+        test_settings.grok_max_concurrency = 3
+        test_settings.grok_batch_size = 1
+        mock_get_last_seen.return_value = None
+        mentions = [_mention(str(i)) for i in range(200, 206)]
+        for mention in mentions:
+            mention.text += f" claim number {mention.tweet_id}"
+        mock_fetch_mentions.return_value = FeedPage(mentions)
+
+        in_flight = 0
+        peak = 0
+
+        async def slow_create(**kwargs):
+            nonlocal in_flight, peak
+            in_flight += 1
+            peak = max(peak, in_flight)
+            await asyncio.sleep(0.01)
+            in_flight -= 1
+            response = MagicMock()
+            response.choices[0].message.content = json.dumps({"confidence": 10, "reply": "No"})
+            return response
+
+        mock_get_grok_client.return_value.chat.completions.create = AsyncMock(side_effect=slow_create)
+
+        # The poll claims what the window lets through; worker passes take the rest
+        await poll_mentions()
+        for _ in range(3):
+            await work_on_mentions()
+
+        # The window starts at 2 and may grow by one while saturated
+        assert mock_get_grok_client.return_value.chat.completions.create.call_count == 6
+        assert 2 <= peak <= 3
+        mock_set_last_seen.assert_called_once_with("205")
+
+    @pytest.mark.usefixtures("no_prefilter")
+    @pytest.mark.asyncio
+    @patch("app.main.fetch_mentions_page")
+    @patch("app.main.get_last_seen_id")
+    @patch("app.main.set_last_seen_id")
+    @patch("app.main.analyze_fallacies_batch")
+    async def test_poll_groups_mentions_into_batches(
+        self,
+        mock_analyze,
+        mock_set_last_seen,
+        mock_get_last_seen,
+        mock_fetch_mentions,
+        test_settings,
+    ):
+        """Test that a poll's triggers are analyzed grok_batch_size at a time."""
+        from app.main import poll_mentions
+
+        test_settings.grok_batch_size = 3
+        mock_get_last_seen.return_value = None
+        mock_fetch_mentions.return_value = FeedPage([_mention(str(i)) for i in range(200, 207)])
+        mock_analyze.side_effect = _batch_result(10)
+
+        await poll_mentions()
+
+        batch_sizes = sorted(len(call.args[0]) for call in mock_analyze.call_args_list)
+        assert batch_sizes == [1, 3, 3]
+        mock_set_last_seen.assert_called_once_with("206")
+
+    @pytest.mark.usefixtures("no_prefilter")
+    @pytest.mark.asyncio
+    @patch("app.main.fetch_mentions_page")
+    @patch("app.main.analyze_fallacies_batch")
+    async def test_poll_filters_processed_and_marks_in_bulk(
+        self,
+        mock_analyze,
+        mock_fetch_mentions,
+        test_settings,
+    ):
+        """Test that processed tweets are dropped up front and outcomes batch-marked."""
+        from app.database import is_processed, mark_processed
+        from app.main import poll_mentions
+
+        mark_processed("301")
+        mock_fetch_mentions.return_value = FeedPage([_mention(i) for i in ("300", "301", "302")])
+        mock_analyze.side_effect = _batch_result(10)
+
+        await poll_mentions()
+
+        assert mock_analyze.call_count == 1
+        assert len(mock_analyze.call_args.args[0]) == 2
+        assert is_processed("300") is True
+        assert is_processed("302") is True
+
+    @pytest.mark.asyncio
+    @patch("app.main.fetch_mentions_page")
+    @patch("app.main.analyze_fallacies_batch")
+    async def test_poll_prefilter_drops_bare_tags(
+        self,
+        mock_analyze,
+        mock_fetch_mentions,
+        test_settings,
+    ):
+        """Test that the pre-filter skips argument-free tags and records analyzed outcomes."""
+        from app.database import get_pool, is_processed
+        from app.main import poll_mentions
+
+        test_settings.prefilter_enabled = True
+        test_settings.prefilter_shadow_rate = 0.0
+        bare = _mention("400")
+        argued = _mention("401")
+        argued.text = "@FallacySheriff fallacyme everyone I know agrees so it must be true"
+        mock_fetch_mentions.return_value = FeedPage([bare, argued])
+        mock_analyze.side_effect = _batch_result(20)
+
+        await poll_mentions()
+
+        assert mock_analyze.call_args.args[0] == [(argued.text, None)]
+        assert is_processed("400") is True
+        with get_pool().reader() as conn:
+            rows = conn.execute("SELECT confidence, shadow FROM prefilter_examples").fetchall()
+        assert rows == [(20, 0)]
+
+    @pytest.mark.usefixtures("no_prefilter")
+    @pytest.mark.asyncio
+    @patch("app.main.fetch_mentions_page")
+    @patch("app.main.analyze_fallacies_batch")
+    async def test_reused_analysis_posts_distinct_replies(
+        self,
+        mock_analyze,
+        mock_fetch_mentions,
+        test_settings,
+    ):
+        """Test that mentions sharing one analysis don't post duplicate text."""
+        from app.main import poll_mentions
+        from app.outbox import OutboxWorker
+        from app.write_budget import WriteBudget
+
+        mock_fetch_mentions.return_value = FeedPage([_mention("500"), _mention("501")])
+        mock_analyze.side_effect = _batch_result(95)
+
+        await poll_mentions()
+
+        client = MagicMock()
+        client.create_tweet.return_value.json.return_value = {"data": {"id": "1"}}
+        client.create_tweet.return_value.headers = {}
+        await OutboxWorker(WriteBudget(0, 5), max_attempts=3, client=client).drain()
+
+        texts = [call.kwargs["text"] for call in client.create_tweet.call_args_list]
+        assert len(texts) == 2
+        assert texts[0] != texts[1]
+        assert all(text.startswith("@user ") and text.endswith("Strawman") for text in texts)
+
+    @pytest.mark.usefixtures("no_prefilter")
+    @pytest.mark.asyncio
+    @patch("app.main.fetch_mentions_page")
+    @patch("app.main.enqueue_reply")
+    @patch("app.main.analyze_fallacies_batch")
+    async def test_poll_skips_mentions_claimed_elsewhere(
+        self,
+        mock_analyze,
+        mock_enqueue,
+        mock_fetch_mentions,
+        test_settings,
+    ):
+        """Test that a mention another worker is analyzing isn't analyzed again."""
+        from datetime import timedelta
+
+        from app.database import claim_mentions
+        from app.main import poll_mentions
+
+        claim_mentions(["601"], "other-worker", timedelta(minutes=10))
+        mock_fetch_mentions.return_value = FeedPage([_mention("600"), _mention("601")])
+        mock_analyze.side_effect = _batch_result(95)
+        mock_enqueue.return_value = True
+
+        await poll_mentions()
+
+        assert [call.args[0] for call in mock_enqueue.call_args_list] == ["600"]
+
+    @pytest.mark.usefixtures("no_prefilter")
+    @pytest.mark.asyncio
+    @patch("app.main.fetch_mentions_page")
+    @patch("app.main.enqueue_reply")
+    @patch("app.main.analyze_fallacies_batch")
+    async def test_poll_resumes_abandoned_mentions(
+        self,
+        mock_analyze,
+        mock_enqueue,
+        mock_fetch_mentions,
+        test_settings,
+    ):
+        """Test that a mention claimed by a crashed worker is finished by the next poll."""
+        from datetime import timedelta
+
+        from app.database import claim_mentions, discover_mentions, get_mention_counts
+        from app.main import _mention_to_json, poll_mentions
+
+        discover_mentions([("700", _mention_to_json(_mention("700")))], timedelta(minutes=10))
+        claim_mentions(["700"], "crashed-worker", timedelta(seconds=-1))
+        mock_fetch_mentions.return_value = FeedPage([])
+        mock_analyze.side_effect = _batch_result(10)
+
+        await poll_mentions()
+
+        mock_analyze.assert_called_once()
+        assert get_mention_counts()["skipped"] == 1
+
+    @pytest.mark.usefixtures("no_prefilter")
+    @pytest.mark.asyncio
+    @patch("app.main.fetch_mentions_page")
+    @patch("app.main.set_last_seen_id")
+    @patch("app.main.analyze_fallacies_batch")
+    async def test_retried_mention_not_analyzed_twice_per_poll(
+        self,
+        mock_analyze,
+        mock_set_last_seen,
+        mock_fetch_mentions,
+        test_settings,
+    ):
+        """Test that a waiting mention failing again isn't re-sent to Grok from the feed."""
+        from datetime import timedelta
+
+        from app.database import discover_mentions, get_mention_counts
+        from app.main import _mention_to_json, poll_mentions
+
+        discover_mentions([("710", _mention_to_json(_mention("710")))], timedelta(0))
+        mock_fetch_mentions.return_value = FeedPage([_mention("710")])
+        mock_analyze.side_effect = RuntimeError("grok down")
+
+        await poll_mentions()
+
+        mock_analyze.assert_called_once()
+        # The failure still holds last_seen_id, and the mention waits for a retry
+        mock_set_last_seen.assert_not_called()
+        assert get_mention_counts()["discovered"] == 1
+
+    @pytest.mark.usefixtures("no_prefilter")
+    @pytest.mark.asyncio
+    @patch("app.main.fetch_mentions_page")
+    @patch("app.main.enqueue_reply")
+    @patch("app.main.analyze_fallacies_batch")
+    async def test_poll_leaves_excess_mentions_to_other_workers(
+        self,
+        mock_analyze,
+        mock_enqueue,
+        mock_fetch_mentions,
+        test_settings,
+    ):
+        """Test that a poll claims only its Grok capacity and leaves the rest discovered."""
+        from app.database import get_mention_counts
+        from app.main import poll_mentions
+
+        test_settings.grok_batch_size = 1
+        test_settings.max_concurrent_mentions = 2
+        mock_fetch_mentions.return_value = FeedPage([_mention(str(i)) for i in range(800, 805)])
+        mock_analyze.side_effect = _batch_result(10)
+
+        await poll_mentions()
+
+        assert mock_analyze.call_count == 2
+        assert get_mention_counts()["discovered"] == 3
+
+    @pytest.mark.usefixtures("no_prefilter")
+    @pytest.mark.asyncio
+    @patch("app.main.fetch_mentions_page")
+    @patch("app.main.mark_mentions_analyzed")
+    @patch("app.main.enqueue_reply")
+    @patch("app.main.analyze_fallacies_batch")
+    async def test_failed_batch_waits_for_the_others(
+        self,
+        mock_analyze,
+        mock_enqueue,
+        mock_mark_analyzed,
+        mock_fetch_mentions,
+        test_settings,
+    ):
+        """Test that one batch failing doesn't release claims of batches still running."""
+        import asyncio
+        import sqlite3
+
+        from app.database import get_mention_counts, is_processed
+        from app.main import poll_mentions
+
+        test_settings.grok_batch_size = 1
+        mock_fetch_mentions.return_value = FeedPage([_mention("850"), _mention("851")])
+        mock_enqueue.return_value = True
+
+        async def analyze(tweets):
+            if "851" in tweets[0][0]:
+                await asyncio.sleep(0.05)
+            return await _batch_result(95)(tweets)
+
+        def mark_analyzed(tweet_ids, holder):
+            if "850" in tweet_ids:
+                raise sqlite3.OperationalError("database is locked")
+
+        for mention in mock_fetch_mentions.return_value.mentions:
+            mention.text += f" {mention.tweet_id}"
+        mock_analyze.side_effect = analyze
+        mock_mark_analyzed.side_effect = mark_analyzed
+
+        await poll_mentions()
+
+        assert is_processed("851")
+        assert not is_processed("850")
+        assert [call.args[0] for call in mock_enqueue.call_args_list] == ["851"]
+        assert get_mention_counts()["discovered"] == 1
+
+    @pytest.mark.usefixtures("no_prefilter")
+    @pytest.mark.asyncio
+    @patch("app.main.get_leader_lease")
+    @patch("app.main.enqueue_reply")
+    @patch("app.main.analyze_fallacies_batch")
+    async def test_follower_analyzes_waiting_mentions(
+        self,
+        mock_analyze,
+        mock_enqueue,
+        mock_get_lease,
+        test_settings,
+    ):
+        """Test that a process without the leader lease claims and analyzes recorded mentions."""
+        from datetime import timedelta
+
+        from app.database import discover_mentions, get_mention_counts
+        from app.main import _mention_to_json, work_on_mentions
+
+        mock_get_lease.return_value.is_leader = False
+        discover_mentions(
+            [(tweet_id, _mention_to_json(_mention(tweet_id))) for tweet_id in ("900", "901")],
+            timedelta(0),
+        )
+        mock_analyze.side_effect = _batch_result(95)
+        mock_enqueue.return_value = True
+
+        await work_on_mentions()
+
+        assert sorted(call.args[0] for call in mock_enqueue.call_args_list) == ["900", "901"]
+        assert get_mention_counts()["discovered"] == 0
+
+
+class TestPersonalizeReply:
+    """Tests for addressing reused reply text to each mention."""
+
+    def test_long_reply_fits_limit(self):
+        """Test that the prefixed reply is cut to X's length limit."""
+        from app.main import MAX_REPLY_LENGTH, _personalize_reply
+
+        text = _personalize_reply(_mention("503"), "x" * 280)
+
+        assert len(text) == MAX_REPLY_LENGTH
+        assert text.startswith("@user ")
+        assert text.endswith("...")
+
+    @pytest.mark.usefixtures("no_prefilter")
+    @pytest.mark.asyncio
+    @patch("app.main.fetch_mentions_page")
+    @patch("app.main.enqueue_reply")
+    @patch("app.main.analyze_fallacies_batch")
+    async def test_poll_skips_stale_and_scores_pile_ons(
+        self,
+        mock_analyze,
+        mock_enqueue,
+        mock_fetch_mentions,
+        test_settings,
+    ):
+        """Test that stale mentions aren't analyzed and pile-on replies get a higher priority."""
+        from datetime import datetime, timedelta, timezone
+
+        from app.database import is_processed
+        from app.main import poll_mentions
+
+        test_settings.reply_max_age_hours = 24
+        now = datetime.now(timezone.utc)
+        stale = _mention("600")
+        stale.published = (now - timedelta(hours=30)).isoformat()
+        lone = _mention("601")
+        lone.in_reply_to_tweet_id = "77"
+        pile_on = [_mention("602"), _mention("603")]
+        for mention in (lone, *pile_on):
+            mention.published = now.isoformat()
+            mention.text += f" claim {mention.tweet_id}"
+        mock_fetch_mentions.return_value = FeedPage([stale, lone, *pile_on])
+        mock_analyze.side_effect = _batch_result(95)
+        mock_enqueue.return_value = True
+
+        await poll_mentions()
+
+        assert len(mock_analyze.call_args.args[0]) == 3
+        assert is_processed("600") is True
+        priorities = {call.args[0]: call.kwargs["priority"] for call in mock_enqueue.call_args_list}
+        assert set(priorities) == {"601", "602", "603"}
+        assert priorities["602"] == priorities["603"] > priorities["601"]
+
+
+class TestPruneHistory:
+    """Tests for the daily prune job."""
+
+    @pytest.mark.asyncio
+    @patch("app.main.save_processed_filter")
+    async def test_prune_snapshots_processed_filter(self, mock_save, test_settings):
+        """Test that the daily job also saves the processed-tweets filter."""
+        from app.main import prune_history
+
+        await prune_history()
+
+        mock_save.assert_called_once()
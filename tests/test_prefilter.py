@@ -0,0 +1,91 @@
+"""
+Tests for the local pre-filter in front of Grok.
+
+Tests the heuristic, the hashed-feature model, drop/shadow decisions,
+precision/recall tracking, and offline training.
+"""
+
+import json
+import random
+import sqlite3
+
+from app.database import add_prefilter_examples
+from app.prefilter import LinearModel, Prefilter, PrefilterDecision, extract_features, main
+
+FALLACY = "If we allow electric scooters next thing everyone will abandon walking entirely"
+JOKE = "lol this guy again"
+
+
+class TestScoring:
+    """Tests for Prefilter.score and decide."""
+
+    def test_bare_tag_scores_zero(self):
+        """Test that tags without an argument are dropped by the heuristic."""
+        prefilter = Prefilter(None, min_words=3, drop_below=0.05, shadow_rate=0.0)
+
+        assert prefilter.score("@FallacySheriff fallacyme https://t.co/x") == 0.0
+        assert prefilter.score(f"@FallacySheriff fallacyme {FALLACY}") == 1.0
+
+    def test_decide_skips_or_shadows_low_scores(self):
+        """Test that low scores are dropped except for the shadow sample."""
+        always_shadow = Prefilter(None, 3, 0.05, shadow_rate=1.0)
+        never_shadow = Prefilter(None, 3, 0.05, shadow_rate=0.0)
+
+        assert always_shadow.decide("fallacyme").shadow is True
+        assert never_shadow.decide("fallacyme").skip is True
+        assert never_shadow.decide(FALLACY) == PrefilterDecision(1.0, skip=False, shadow=False)
+        assert never_shadow.stats()["dropped"] == 1
+
+    def test_precision_and_recall_weight_shadow_samples(self):
+        """Test that shadow samples count for all the drops they represent."""
+        prefilter = Prefilter(None, 3, 0.05, shadow_rate=0.5, rng=random.Random(0))
+
+        # Dropped tweets that really were below threshold (one shadow sample = 2 drops)
+        prefilter.record(PrefilterDecision(0.0, skip=False, shadow=True), 10, 90)
+        # A wrongly dropped tweet
+        prefilter.record(PrefilterDecision(0.0, skip=False, shadow=True), 95, 90)
+        # Passed tweets: one low (missed drop), one posted
+        prefilter.record(PrefilterDecision(0.9, skip=False, shadow=False), 20, 90)
+        prefilter.record(PrefilterDecision(0.9, skip=False, shadow=False), 95, 90)
+
+        stats = prefilter.stats()
+        assert stats["precision"] == 0.5
+        assert stats["recall"] == round(2 / 3, 3)
+
+
+class TestLinearModel:
+    """Tests for training and persisting the hashed-feature model."""
+
+    def test_learns_to_separate_examples(self):
+        """Test that the model ranks fallacy-like text above jokes."""
+        examples = [(extract_features(FALLACY), True)] * 5 + [(extract_features(JOKE), False)] * 20
+
+        model = LinearModel.train(examples)
+
+        assert model.predict(extract_features(FALLACY)) > 0.5
+        assert model.predict(extract_features(JOKE)) < 0.5
+
+    def test_save_and_load_round_trip(self, tmp_path):
+        """Test that a saved model predicts the same after loading."""
+        model = LinearModel({1: 0.5, 2: -1.0}, bias=0.25)
+        path = str(tmp_path / "model.json")
+
+        model.save(path)
+        loaded = LinearModel.load(path)
+
+        assert loaded.predict([1, 2]) == model.predict([1, 2])
+        assert LinearModel.load(str(tmp_path / "missing.json")) is None
+
+    def test_train_command_uses_stored_outcomes(self, test_db, tmp_path, capsys):
+        """Test that the CLI trains from prefilter_examples and reports metrics."""
+        add_prefilter_examples(
+            [(FALLACY, 1.0, 95, False)] * 5 + [(JOKE, 1.0, 10, False)] * 20,
+            db_path=test_db,
+        )
+        out = str(tmp_path / "model.json")
+
+        main(["train", "--db", test_db, "--out", out])
+
+        report = json.loads(capsys.readouterr().out.split("Saved model")[0])
+        assert report["train"]["examples"] + report["holdout"]["examples"] == 25
+        assert LinearModel.load(out).predict(extract_features(JOKE)) < 0.5
@@ -0,0 +1,124 @@
+"""
+Tests for reply priority scoring.
+
+Tests mention age parsing, score weights and the staleness cutoff.
+"""
+
+from datetime import datetime, timezone
+
+from app.priority import (
+    base_score,
+    is_stale,
+    mention_published_at,
+    reply_age_limit_hours,
+    score,
+    thread_sizes,
+)
+from app.rss_client import RSSMention
+from app.snowflake import snowflake_from_datetime
+
+
+def _mention(tweet_id: str = "1", published: str = "", target: str = "42") -> RSSMention:
+    return RSSMention(
+        tweet_id=tweet_id,
+        text="@FallacySheriff fallacyme",
+        author_username="user",
+        published=published,
+        link=f"https://twitter.com/user/status/{tweet_id}",
+        in_reply_to_tweet_id=target,
+        in_reply_to_username="target_user",
+    )
+
+
+NOON = datetime(2025, 6, 1, 12, 0, tzinfo=timezone.utc).timestamp()
+
+
+class TestMentionPublishedAt:
+    """Tests for finding when a mention was posted."""
+
+    def test_parses_rss_date(self):
+        """Test that an RFC 822 pubDate is parsed."""
+        assert mention_published_at(_mention(published="Sun, 01 Jun 2025 12:00:00 GMT")) == NOON
+
+    def test_parses_iso_date(self):
+        """Test that ISO 8601 dates (naive ones as UTC) are parsed."""
+        assert mention_published_at(_mention(published="2025-06-01T12:00:00Z")) == NOON
+        assert mention_published_at(_mention(published="2025-06-01T12:00:00")) == NOON
+
+    def test_falls_back_to_snowflake(self):
+        """Test that a missing date is taken from the tweet ID."""
+        tweet_id = str(snowflake_from_datetime(datetime.fromtimestamp(NOON, timezone.utc)))
+
+        assert mention_published_at(_mention(tweet_id)) == NOON
+
+    def test_unknown_date(self):
+        """Test that an unparseable date on a non-snowflake ID is unknown."""
+        assert mention_published_at(_mention("500", published="yesterday")) is None
+
+
+class TestScore:
+    """Tests for combining confidence, popularity and age."""
+
+    def test_pile_on_outranks_single_mention(self, test_settings):
+        """Test that more mentions of one tweet raise its replies' priority."""
+        assert base_score(95, thread_size=4) > base_score(95, thread_size=1)
+
+    def test_age_costs_points(self, test_settings):
+        """Test that each hour of age lowers the score by the age weight."""
+        test_settings.priority_age_weight = 0.1
+
+        fresh = score(95, 1, NOON, NOON)
+        old = score(95, 1, NOON - 5 * 3600, NOON)
+
+        assert round(fresh - old, 6) == 0.5
+        assert score(95, 1, None, NOON) == fresh
+
+    def test_weights_are_configurable(self, test_settings):
+        """Test that a zero confidence weight leaves only popularity."""
+        test_settings.priority_confidence_weight = 0.0
+        test_settings.priority_popularity_weight = 1.0
+
+        assert base_score(99, thread_size=1) == 0.0
+        assert base_score(10, thread_size=8) == 3.0
+
+    def test_thread_sizes(self):
+        """Test counting mentions per tagged tweet."""
+        sizes = thread_sizes([_mention("1"), _mention("2"), _mention("3", target="7")])
+
+        assert sizes["42"] == 2
+        assert sizes["7"] == 1
+
+
+class TestIsStale:
+    """Tests for the reply_max_age_hours cutoff."""
+
+    def test_old_mentions_are_stale(self, test_settings):
+        """Test that mentions past the cutoff are stale and others aren't."""
+        test_settings.reply_max_age_hours = 24
+
+        assert is_stale(_mention(published="2025-06-01T12:00:00Z"), NOON + 25 * 3600)
+        assert not is_stale(_mention(published="2025-06-01T12:00:00Z"), NOON + 23 * 3600)
+        assert not is_stale(_mention("500", published="yesterday"), NOON)
+
+    def test_zero_disables_cutoff(self, test_settings):
+        """Test that reply_max_age_hours=0 never drops a mention."""
+        test_settings.reply_max_age_hours = 0
+
+        assert not is_stale(_mention(published="2020-01-01T00:00:00Z"), NOON)
+
+    def test_explicit_limit_overrides_setting(self, test_settings):
+        """Test that a caller's age limit (catch-up's) replaces reply_max_age_hours."""
+        test_settings.reply_max_age_hours = 24
+        mention = _mention(published="2025-06-01T12:00:00Z")
+
+        assert not is_stale(mention, NOON + 30 * 3600, max_age_hours=72)
+        assert is_stale(mention, NOON + 80 * 3600, max_age_hours=72)
+
+    def test_longest_limit_covers_catchup(self, test_settings):
+        """Test that the overall limit is the longer window, or none if either is unlimited."""
+        test_settings.reply_max_age_hours = 24
+        test_settings.catchup_max_age_hours = 72
+        assert reply_age_limit_hours() == 72
+
+        test_settings.catchup_max_age_hours = 0
+        assert reply_age_limit_hours() == 0
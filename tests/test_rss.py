@@ -4,21 +4,47 @@ Tests for RSS client module.
 Tests RSS feed parsing, mention extraction, and tweet chain fetching.
 """
 
-from unittest.mock import patch, MagicMock
+import asyncio
+from unittest.mock import patch, MagicMock, AsyncMock
 
+import httpx
 import pytest
 
 from app.rss_client import (
+    FeedPage,
     RSSMention,
-    TweetData,
+    close_rss_http_client,
+    get_rss_http_client,
+    fetch_mentions_page,
     fetch_mentions_rss,
-    fetch_tweet_data,
     fetch_tweet_chain,
+    invalidate_feed_cache,
     _extract_tweet_id_from_link,
     _extract_username_from_link,
     _extract_text_from_entry,
     _extract_reply_info_from_entry,
+    _extract_entry_fields,
+    _merge_pages,
+    _parse_mentions,
 )
+from app.rss_instances import get_rss_instance_pool
+
+
+def _rss_feed(*tweet_ids: int) -> bytes:
+    """Build an RSSHub-style RSS 2.0 document, items in the given order."""
+    items = "".join(
+        f"""
+        <item>
+            <title>@FallacySheriff fallacyme</title>
+            <description><![CDATA[<p>@FallacySheriff fallacyme</p>]]></description>
+            <pubDate>Wed, 01 Jan 2025 12:00:00 GMT</pubDate>
+            <link>https://x.com/user123/status/{tweet_id}</link>
+        </item>"""
+        for tweet_id in tweet_ids
+    )
+    return f"""<?xml version="1.0" encoding="UTF-8"?>
+<rss version="2.0"><channel><title>Twitter @FallacySheriff</title>{items}
+</channel></rss>""".encode()
 
 
 class TestExtractTweetIdFromLink:
@@ -111,7 +137,7 @@ class TestExtractReplyInfo:
         del entry.description
         del entry.content
 
-        tweet_id, username = _extract_reply_info_from_entry(entry)
+        tweet_id, username, _ = _extract_reply_info_from_entry(entry)
 
         assert tweet_id == "111222333"
         assert username == "original_user"
@@ -123,7 +149,7 @@ class TestExtractReplyInfo:
         del entry.description
         del entry.content
 
-        tweet_id, username = _extract_reply_info_from_entry(entry)
+        tweet_id, username, _ = _extract_reply_info_from_entry(entry)
 
         # Tweet ID not available, but username is
         assert tweet_id is None
@@ -136,149 +162,388 @@ class TestExtractReplyInfo:
         del entry.description
         del entry.content
 
-        tweet_id, username = _extract_reply_info_from_entry(entry)
+        tweet_id, username, _ = _extract_reply_info_from_entry(entry)
 
         assert tweet_id is None
         assert username is None
 
 
+class TestExtractEntryFields:
+    """Tests for the single-pass entry extractor."""
+
+    def test_extracts_all_fields_in_one_pass(self):
+        """Test text, reply link, username and quoted text from one entry."""
+        entry = MagicMock()
+        entry.summary = (
+            'Replying to <a href="https://x.com/orig_user/status/111222333">@orig_user</a>\n'
+            "<blockquote>AI is literally drinking all our water &amp; more</blockquote>\n"
+            "@FallacySheriff fallacyme"
+        )
+        del entry.description
+        del entry.content
+
+        fields = _extract_entry_fields(entry)
+
+        assert fields.reply_to_tweet_id == "111222333"
+        assert fields.reply_to_username == "orig_user"
+        assert fields.reply_to_text == "AI is literally drinking all our water & more"
+        assert fields.text == (
+            "Replying to @orig_user AI is literally drinking all our water & more "
+            "@FallacySheriff fallacyme"
+        )
+
+    def test_short_quoted_line_is_ignored(self):
+        """Test that a too-short line after the break isn't taken as quoted text."""
+        entry = MagicMock()
+        entry.summary = "first line\nshort"
+        del entry.description
+        del entry.content
+
+        assert _extract_entry_fields(entry).reply_to_text is None
+
+    def test_linear_time_on_pathological_html(self):
+        """Test that adversarial HTML can't trigger catastrophic backtracking."""
+        import time
+
+        entry = MagicMock()
+        # Unclosed "<" runs made the old tag regex quadratic (~8s at this size)
+        entry.summary = "Replying to @someone\n" + "<" * 100_000
+        del entry.description
+        del entry.content
+
+        start = time.perf_counter()
+        _extract_entry_fields(entry)
+
+        assert time.perf_counter() - start < 1.0
+
+
 class TestFetchMentionsRss:
     """Tests for fetch_mentions_rss function."""
 
-    @patch("app.rss_client.feedparser.parse")
+    @patch("app.rss_client._fetch_feed", new_callable=AsyncMock)
     @patch("app.rss_client.get_settings")
-    def test_fetches_and_parses_feed(self, mock_settings, mock_parse):
+    async def test_fetches_and_parses_feed(self, mock_settings, mock_fetch, test_settings):
         """Test that feed is fetched and parsed correctly."""
         mock_settings.return_value.rsshub_url = "http://localhost:1200"
         mock_settings.return_value.rsshub_access_key = None
         mock_settings.return_value.bot_username = "FallacySheriff"
+        mock_fetch.return_value = httpx.Response(200, content=_rss_feed(999888777))
 
-        mock_entry = MagicMock()
-        mock_entry.link = "https://twitter.com/user123/status/999888777"
-        mock_entry.summary = "@FallacySheriff fallacyme"
-        mock_entry.published = "2025-01-01T12:00:00Z"
-        del mock_entry.description
-        del mock_entry.content
-
-        mock_feed = MagicMock()
-        mock_feed.bozo = False
-        mock_feed.entries = [mock_entry]
-        mock_parse.return_value = mock_feed
-
-        result = fetch_mentions_rss()
+        result = await fetch_mentions_rss()
 
         assert len(result) == 1
         assert result[0].tweet_id == "999888777"
         assert result[0].author_username == "user123"
+        assert result[0].text == "@FallacySheriff fallacyme"
+        assert result[0].published == "Wed, 01 Jan 2025 12:00:00 GMT"
 
+    @patch("app.rss_client._fetch_feed", new_callable=AsyncMock)
     @patch("app.rss_client.feedparser.parse")
     @patch("app.rss_client.get_settings")
-    def test_handles_feed_parse_error(self, mock_settings, mock_parse):
+    async def test_handles_feed_parse_error(self, mock_settings, mock_parse, mock_fetch, test_settings):
         """Test graceful handling of feed parse errors."""
         mock_settings.return_value.rsshub_url = "http://localhost:1200"
         mock_settings.return_value.rsshub_access_key = None
         mock_settings.return_value.bot_username = "FallacySheriff"
+        mock_fetch.return_value = httpx.Response(200, content=b"not xml")
 
         mock_feed = MagicMock()
         mock_feed.bozo = True
         mock_feed.bozo_exception = Exception("Parse error")
         mock_parse.return_value = mock_feed
 
-        result = fetch_mentions_rss()
+        result = await fetch_mentions_rss()
 
         assert result == []
 
+    @patch("app.rss_client._fetch_feed", new_callable=AsyncMock)
     @patch("app.rss_client.feedparser.parse")
     @patch("app.rss_client.get_settings")
-    def test_adds_access_key_if_configured(self, mock_settings, mock_parse):
+    async def test_handles_fetch_failure(self, mock_settings, mock_parse, mock_fetch, test_settings):
+        """Test that a failed HTTP request yields no mentions without parsing."""
+        mock_settings.return_value.rsshub_url = "http://localhost:1200"
+        mock_settings.return_value.rsshub_access_key = None
+        mock_settings.return_value.bot_username = "FallacySheriff"
+        mock_fetch.return_value = None
+
+        result = await fetch_mentions_rss()
+
+        assert result == []
+        mock_parse.assert_not_called()
+
+    @patch("app.rss_client._fetch_feed", new_callable=AsyncMock)
+    @patch("app.rss_client.get_settings")
+    async def test_adds_access_key_if_configured(self, mock_settings, mock_fetch, test_settings):
         """Test that access key is added to URL when configured."""
         mock_settings.return_value.rsshub_url = "http://localhost:1200"
         mock_settings.return_value.rsshub_access_key = "secret123"
         mock_settings.return_value.bot_username = "FallacySheriff"
+        mock_fetch.return_value = None
 
-        mock_feed = MagicMock()
-        mock_feed.bozo = False
-        mock_feed.entries = []
-        mock_parse.return_value = mock_feed
-
-        fetch_mentions_rss()
+        await fetch_mentions_rss()
 
-        call_url = mock_parse.call_args[0][0]
+        call_url = mock_fetch.call_args[0][0]
         assert "key=secret123" in call_url
 
+    @patch("app.rss_client._fetch_feed", new_callable=AsyncMock)
+    async def test_backward_page_uses_max_id(self, mock_fetch, test_settings):
+        """Test that an older page searches with max_id and skips conditional GET."""
+        mock_fetch.return_value = httpx.Response(
+            200, content=_rss_feed(300, 200, 100), headers={"ETag": '"abc"'}
+        )
 
-class TestFetchTweetData:
-    """Tests for fetch_tweet_data function."""
+        first = await fetch_mentions_page(since_id="100", max_id="250")
+        second = await fetch_mentions_page(since_id="100", max_id="250")
 
-    @patch("app.rss_client.feedparser.parse")
-    @patch("app.rss_client.get_settings")
-    def test_fetches_tweet_data(self, mock_settings, mock_parse):
-        """Test fetching tweet data via RSS."""
+        assert mock_fetch.call_args.args[0] == (
+            "http://localhost:1200/twitter/keyword/@FallacySheriff%20max_id%3A250"
+        )
+        assert mock_fetch.call_args.args[1] == {}
+        assert [m.tweet_id for m in first.mentions] == ["200"]
+        assert second.mentions == first.mentions
+        assert first.reached_since is True
+
+
+class TestParseMentions:
+    """Tests for the since_id-bounded streaming parser."""
+
+    def test_parses_all_items_without_since_id(self):
+        """Test that every item is returned when no since_id is given."""
+        result = _parse_mentions(_rss_feed(300, 200, 100))
+
+        assert [m.tweet_id for m in result.mentions] == ["300", "200", "100"]
+        assert result.reached_since is True
+
+    def test_stops_at_since_id(self):
+        """Test that parsing stops at the first already-seen item."""
+        with patch(
+            "app.rss_client._extract_entry_fields", wraps=_extract_entry_fields
+        ) as mock_extract:
+            result = _parse_mentions(_rss_feed(300, 200, 100, 50), since_id="200")
+
+        assert [m.tweet_id for m in result.mentions] == ["300"]
+        assert result.reached_since is True
+        # Older entries never reach the text extractors
+        assert mock_extract.call_count == 1
+
+    def test_reports_page_not_reaching_since_id(self):
+        """Test that a page entirely newer than since_id is flagged as possibly incomplete."""
+        result = _parse_mentions(_rss_feed(300, 250), since_id="200")
+
+        assert [m.tweet_id for m in result.mentions] == ["300", "250"]
+        assert result.reached_since is False
+
+    def test_max_id_skips_newer_items(self):
+        """Test that items above max_id are left out of a backward page."""
+        result = _parse_mentions(_rss_feed(300, 200, 100, 50), since_id="60", max_id="200")
+
+        assert [m.tweet_id for m in result.mentions] == ["200", "100"]
+        assert result.reached_since is True
+
+    def test_falls_back_to_feedparser_for_non_rss(self):
+        """Test that non-RSS documents (e.g. Atom) use feedparser."""
+        atom = b"""<?xml version="1.0" encoding="utf-8"?>
+<feed xmlns="http://www.w3.org/2005/Atom">
+  <title>Mentions</title>
+  <entry>
+    <title>@FallacySheriff fallacyme</title>
+    <link href="https://x.com/user123/status/300"/>
+    <summary>@FallacySheriff fallacyme</summary>
+  </entry>
+  <entry>
+    <title>old</title>
+    <link href="https://x.com/user123/status/100"/>
+    <summary>old</summary>
+  </entry>
+</feed>"""
+
+        result = _parse_mentions(atom, since_id="200")
+
+        assert [m.tweet_id for m in result.mentions] == ["300"]
+        assert result.reached_since is True
+
+
+class TestConditionalFetch:
+    """Tests for conditional GET and unchanged-feed short-circuiting."""
+
+    @staticmethod
+    def _settings(mock_settings):
         mock_settings.return_value.rsshub_url = "http://localhost:1200"
         mock_settings.return_value.rsshub_access_key = None
+        mock_settings.return_value.bot_username = "FallacySheriff"
 
-        mock_entry = MagicMock()
-        mock_entry.summary = "This is the fallacy tweet"
-        del mock_entry.description
-        del mock_entry.content
-
-        mock_feed = MagicMock()
-        mock_feed.bozo = False
-        mock_feed.entries = [mock_entry]
-        mock_parse.return_value = mock_feed
+    @patch("app.rss_client._fetch_feed", new_callable=AsyncMock)
+    @patch("app.rss_client._parse_mentions")
+    @patch("app.rss_client.get_settings")
+    async def test_sends_stored_validators(self, mock_settings, mock_parse, mock_fetch, test_settings):
+        """Test that ETag / Last-Modified from the last fetch are sent back."""
+        self._settings(mock_settings)
+        mock_parse.return_value = FeedPage()
+        mock_fetch.return_value = httpx.Response(
+            200,
+            content=b"<rss>1</rss>",
+            headers={"ETag": '"abc"', "Last-Modified": "Wed, 01 Jan 2025 00:00:00 GMT"},
+        )
 
-        result = fetch_tweet_data("123456", "someuser")
+        await fetch_mentions_rss()
+        await fetch_mentions_rss()
 
-        assert result is not None
-        assert result.tweet_id == "123456"
-        assert result.author_username == "someuser"
-        assert result.text == "This is the fallacy tweet"
+        assert mock_fetch.call_args_list[0].args[1] == {}
+        assert mock_fetch.call_args_list[1].args[1] == {
+            "If-None-Match": '"abc"',
+            "If-Modified-Since": "Wed, 01 Jan 2025 00:00:00 GMT",
+        }
 
-    @patch("app.rss_client.feedparser.parse")
+    @patch("app.rss_client._fetch_feed", new_callable=AsyncMock)
+    @patch("app.rss_client._parse_mentions")
     @patch("app.rss_client.get_settings")
-    def test_returns_none_on_empty_feed(self, mock_settings, mock_parse):
-        """Test returns None when feed has no entries."""
-        mock_settings.return_value.rsshub_url = "http://localhost:1200"
-        mock_settings.return_value.rsshub_access_key = None
+    async def test_not_modified_skips_parse(self, mock_settings, mock_parse, mock_fetch, test_settings):
+        """Test that a 304 response returns immediately without parsing."""
+        self._settings(mock_settings)
+        mock_fetch.return_value = httpx.Response(304)
 
-        mock_feed = MagicMock()
-        mock_feed.bozo = False
-        mock_feed.entries = []
-        mock_parse.return_value = mock_feed
+        result = await fetch_mentions_rss()
 
-        result = fetch_tweet_data("123456", "someuser")
+        assert result == []
+        mock_parse.assert_not_called()
 
-        assert result is None
+    @patch("app.rss_client._fetch_feed", new_callable=AsyncMock)
+    @patch("app.rss_client._parse_mentions")
+    @patch("app.rss_client.get_settings")
+    async def test_unchanged_body_skips_parse(self, mock_settings, mock_parse, mock_fetch, test_settings):
+        """Test that an identical body is only parsed once."""
+        self._settings(mock_settings)
+        mock_parse.return_value = FeedPage()
+        mock_fetch.return_value = httpx.Response(200, content=b"<rss>same</rss>")
 
+        await fetch_mentions_rss()
+        await fetch_mentions_rss()
 
-class TestFetchTweetChain:
-    """Tests for fetch_tweet_chain function."""
+        assert mock_parse.call_count == 1
 
-    @patch("app.rss_client.fetch_tweet_data")
-    def test_fetches_two_level_chain(self, mock_fetch_tweet):
-        """Test fetching complete tweet chain (fallacy + original)."""
-        # Setup: mention -> fallacy tweet -> original tweet
-        fallacy_tweet = TweetData(
-            tweet_id="222",
-            text="This is a stupid argument!",
-            author_username="fallacy_user",
-            in_reply_to_tweet_id="111",
-            in_reply_to_username="original_user",
+    @patch("app.rss_client._fetch_feed", new_callable=AsyncMock)
+    @patch("app.rss_client._parse_mentions")
+    @patch("app.rss_client.get_settings")
+    async def test_invalidate_forces_reparse(self, mock_settings, mock_parse, mock_fetch, test_settings):
+        """Test that invalidating the cache re-reads an unchanged feed."""
+        self._settings(mock_settings)
+        mock_parse.return_value = FeedPage()
+        mock_fetch.return_value = httpx.Response(
+            200, content=b"<rss>same</rss>", headers={"ETag": '"abc"'}
         )
 
-        original_tweet = TweetData(
-            tweet_id="111",
-            text="Here is my original statement",
-            author_username="original_user",
-            in_reply_to_tweet_id=None,
-            in_reply_to_username=None,
-        )
+        await fetch_mentions_rss()
+        invalidate_feed_cache()
+        await fetch_mentions_rss()
+
+        assert mock_parse.call_count == 2
+        assert mock_fetch.call_args_list[1].args[1] == {}
+
+
+class TestHedgedFetch:
+    """Tests for hedging requests across RSSHub mirrors."""
+
+    MIRROR = "http://mirror:1200"
+
+    @staticmethod
+    def _feed(delays: dict[str, float | None]):
+        """_fetch_feed fake: per host, seconds until it answers (None = fails)."""
+        async def fetch(url, headers=None):
+            host = url.split("/twitter/")[0]
+            delay = delays[host]
+            if delay is None:
+                return None
+            await asyncio.sleep(delay)
+            tweet_id = 200 if host == TestHedgedFetch.MIRROR else 100
+            return httpx.Response(200, content=_rss_feed(tweet_id))
+        return fetch
+
+    @patch("app.rss_instances.RSS_DEFAULT_HEDGE_DELAY", 0.05)
+    async def test_slow_instance_is_hedged(self, test_settings):
+        """Test that a second instance is asked once the first exceeds its p95."""
+        test_settings.rsshub_mirrors = self.MIRROR
+        feed = self._feed({test_settings.rsshub_url: 5.0, self.MIRROR: 0})
+
+        with patch("app.rss_client._fetch_feed", side_effect=feed):
+            page = await fetch_mentions_page()
+
+        assert [m.tweet_id for m in page.mentions] == ["200"]
+        pool = get_rss_instance_pool()
+        assert (pool.hedged, pool.hedge_wins) == (1, 1)
+        # The cancelled request still counts as a (lower-bound) response time
+        assert len(pool.instances[0].latencies) == 1
+
+    @patch("app.rss_instances.RSS_DEFAULT_HEDGE_DELAY", 0.05)
+    async def test_unchanged_answer_waits_for_outstanding_request(self, test_settings):
+        """Test that a lagging mirror's 304 doesn't beat a slower instance's new mentions."""
+        test_settings.rsshub_mirrors = self.MIRROR
+
+        async def fetch(url, headers=None):
+            if url.startswith(self.MIRROR):
+                return httpx.Response(304)
+            await asyncio.sleep(0.2)
+            return httpx.Response(200, content=_rss_feed(100))
+
+        with patch("app.rss_client._fetch_feed", side_effect=fetch):
+            page = await fetch_mentions_page()
+
+        assert [m.tweet_id for m in page.mentions] == ["100"]
+        assert page.unchanged is False
+
+    async def test_failed_instance_fails_over(self, test_settings):
+        """Test that a failed request moves on to the next instance right away."""
+        test_settings.rsshub_mirrors = self.MIRROR
+        feed = self._feed({test_settings.rsshub_url: None, self.MIRROR: 0})
+
+        with patch("app.rss_client._fetch_feed", side_effect=feed):
+            page = await fetch_mentions_page()
+
+        assert [m.tweet_id for m in page.mentions] == ["200"]
+        pool = get_rss_instance_pool()
+        assert pool.hedged == 0
+        assert pool.instances[0].failures == 1
+
+    async def test_fast_instance_not_hedged(self, test_settings):
+        """Test that an instance answering in time is the only one asked."""
+        test_settings.rsshub_mirrors = self.MIRROR
+        feed = self._feed({test_settings.rsshub_url: 0, self.MIRROR: 0})
+
+        with patch("app.rss_client._fetch_feed", side_effect=feed) as mock_fetch:
+            page = await fetch_mentions_page()
+
+        assert [m.tweet_id for m in page.mentions] == ["100"]
+        assert mock_fetch.call_count == 1
+
+    async def test_all_instances_fail(self, test_settings):
+        """Test that the page is None when no instance can serve it."""
+        test_settings.rsshub_mirrors = self.MIRROR
+        feed = self._feed({test_settings.rsshub_url: None, self.MIRROR: None})
+
+        with patch("app.rss_client._fetch_feed", side_effect=feed):
+            assert await fetch_mentions_page() is None
 
-        mock_fetch_tweet.side_effect = [fallacy_tweet, original_tweet]
+    def test_merge_dedupes_by_tweet_id(self):
+        """Test that pages answered together are merged newest first without duplicates."""
+        def mention(tweet_id):
+            return RSSMention(str(tweet_id), "", "user", "", "", None, None)
 
+        merged = _merge_pages([
+            FeedPage([mention(300), mention(100)]),
+            FeedPage([mention(300), mention(200)], reached_since=False),
+        ])
+
+        assert [m.tweet_id for m in merged.mentions] == ["300", "200", "100"]
+        assert merged.reached_since is False
+
+
+class TestFetchTweetChain:
+    """Tests for fetch_tweet_chain function."""
+
+    def test_uses_mention_text_as_fallacy_context(self):
+        """Test that the mention text is returned as the fallacy context."""
         mention = RSSMention(
             tweet_id="333",
-            text="@FallacySheriff fallacyme",
+            text="@FallacySheriff fallacyme This is a stupid argument!",
             author_username="tagger",
             published="2025-01-01",
             link="https://twitter.com/tagger/status/333",
@@ -288,11 +553,10 @@ class TestFetchTweetChain:
 
         fallacy_text, original_text = fetch_tweet_chain(mention)
 
-        assert fallacy_text == "This is a stupid argument!"
-        assert original_text == "Here is my original statement"
+        assert fallacy_text == "@FallacySheriff fallacyme This is a stupid argument!"
+        assert original_text is None
 
-    @patch("app.rss_client.fetch_tweet_data")
-    def test_returns_none_when_no_reply_to_info(self, mock_fetch_tweet):
+    def test_returns_none_when_no_reply_to_info(self):
         """Test returns None when mention has no reply-to info."""
         mention = RSSMention(
             tweet_id="333",
@@ -308,25 +572,12 @@ class TestFetchTweetChain:
 
         assert fallacy_text is None
         assert original_text is None
-        mock_fetch_tweet.assert_not_called()
-
-    @patch("app.rss_client.fetch_tweet_data")
-    def test_handles_missing_original_tweet(self, mock_fetch_tweet):
-        """Test handling when original tweet cannot be fetched."""
-        fallacy_tweet = TweetData(
-            tweet_id="222",
-            text="This is a stupid argument!",
-            author_username="fallacy_user",
-            in_reply_to_tweet_id="111",
-            in_reply_to_username="original_user",
-        )
-
-        # First call returns fallacy tweet, second call returns None
-        mock_fetch_tweet.side_effect = [fallacy_tweet, None]
 
+    def test_returns_none_when_text_empty(self):
+        """Test returns None when the mention has no text content."""
         mention = RSSMention(
             tweet_id="333",
-            text="@FallacySheriff fallacyme",
+            text="",
             author_username="tagger",
             published="2025-01-01",
             link="https://twitter.com/tagger/status/333",
@@ -336,35 +587,26 @@ class TestFetchTweetChain:
 
         fallacy_text, original_text = fetch_tweet_chain(mention)
 
-        # Should still return fallacy text, just no context
-        assert fallacy_text == "This is a stupid argument!"
+        assert fallacy_text is None
         assert original_text is None
 
-    @patch("app.rss_client.fetch_tweet_data")
-    def test_handles_fallacy_not_a_reply(self, mock_fetch_tweet):
-        """Test handling when fallacy tweet is not a reply to anything."""
-        fallacy_tweet = TweetData(
-            tweet_id="222",
-            text="This is a standalone tweet!",
-            author_username="fallacy_user",
-            in_reply_to_tweet_id=None,
-            in_reply_to_username=None,
-        )
 
-        mock_fetch_tweet.return_value = fallacy_tweet
+class TestRssHttpClient:
+    """Tests for the shared RSSHub HTTP client."""
 
-        mention = RSSMention(
-            tweet_id="333",
-            text="@FallacySheriff fallacyme",
-            author_username="tagger",
-            published="2025-01-01",
-            link="https://twitter.com/tagger/status/333",
-            in_reply_to_tweet_id="222",
-            in_reply_to_username="fallacy_user",
-        )
+    async def test_client_is_reused(self, test_settings):
+        """Test that every fetch uses the same keep-alive client."""
+        client = get_rss_http_client()
+        try:
+            assert get_rss_http_client() is client
+        finally:
+            await close_rss_http_client()
 
-        fallacy_text, original_text = fetch_tweet_chain(mention)
+    async def test_close_drops_client(self, test_settings):
+        """Test that closing the client closes its connections."""
+        client = get_rss_http_client()
+        await close_rss_http_client()
 
-        # Fallacy text available, no context
-        assert fallacy_text == "This is a standalone tweet!"
-        assert original_text is None
+        assert client.is_closed
+        assert get_rss_http_client() is not client
+        await close_rss_http_client()
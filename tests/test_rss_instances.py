@@ -0,0 +1,106 @@
+"""
+Tests for RSSHub instance health.
+
+Tests ranking, hedge delays, and ejecting failing and slow instances.
+"""
+
+import time
+
+from app.rss_instances import (
+    RSS_DEFAULT_HEDGE_DELAY,
+    RSS_EJECT_FAILURES,
+    RSS_MIN_SAMPLES,
+    RSSInstancePool,
+    get_rss_instance_pool,
+)
+
+PRIMARY = "http://primary:1200"
+MIRROR = "http://mirror:1200"
+
+
+def _warm(pool: RSSInstancePool, url: str, latency: float) -> None:
+    instance = next(i for i in pool.instances if i.url == url)
+    for _ in range(RSS_MIN_SAMPLES):
+        pool.record_success(instance, latency)
+
+
+class TestRanking:
+    """Tests for the order instances are tried in."""
+
+    def test_configured_order_until_measured(self):
+        """Test that unmeasured instances are tried in configured order."""
+        pool = RSSInstancePool([PRIMARY, MIRROR])
+
+        assert [i.url for i in pool.ranked()] == [PRIMARY, MIRROR]
+
+    def test_faster_instance_first(self):
+        """Test that the instance with the lower p95 is tried first."""
+        pool = RSSInstancePool([PRIMARY, MIRROR])
+        _warm(pool, PRIMARY, 1.0)
+        _warm(pool, MIRROR, 0.5)
+
+        assert [i.url for i in pool.ranked()] == [MIRROR, PRIMARY]
+
+    def test_hedge_delay_is_p95(self):
+        """Test that the hedge delay is the default until measured, then the p95."""
+        pool = RSSInstancePool([PRIMARY])
+        primary = pool.instances[0]
+
+        assert pool.hedge_delay(primary) == RSS_DEFAULT_HEDGE_DELAY
+
+        for latency in [0.3] * 19 + [1.2]:
+            pool.record_success(primary, latency)
+
+        assert pool.hedge_delay(primary) == 0.3
+
+    def test_mirrors_from_settings(self, test_settings):
+        """Test that rsshub_url comes first, then the mirrors, without duplicates."""
+        test_settings.rsshub_mirrors = f" {MIRROR}, {test_settings.rsshub_url},"
+
+        pool = get_rss_instance_pool()
+
+        assert [i.url for i in pool.instances] == [test_settings.rsshub_url, MIRROR]
+
+
+class TestEjection:
+    """Tests for passing over failing and slow instances."""
+
+    def test_consecutive_failures_eject(self):
+        """Test that an instance failing repeatedly moves behind healthy ones."""
+        pool = RSSInstancePool([PRIMARY, MIRROR])
+        primary = pool.instances[0]
+
+        for _ in range(RSS_EJECT_FAILURES):
+            pool.record_failure(primary)
+
+        assert primary.is_ejected(time.monotonic())
+        assert [i.url for i in pool.ranked()] == [MIRROR, PRIMARY]
+        assert pool.stats()["instances"][0]["ejected_for_seconds"] > 0
+
+    def test_one_failure_after_ejection_ejects_again(self):
+        """Test that a returning instance is ejected again on its next failure."""
+        pool = RSSInstancePool([PRIMARY, MIRROR])
+        primary = pool.instances[0]
+        for _ in range(RSS_EJECT_FAILURES):
+            pool.record_failure(primary)
+        primary.ejected_until = 0
+
+        pool.record_failure(primary)
+
+        assert primary.is_ejected(time.monotonic())
+
+    def test_slow_instance_ejected(self):
+        """Test that an instance much slower than the fastest is ejected."""
+        pool = RSSInstancePool([PRIMARY, MIRROR])
+        _warm(pool, MIRROR, 0.5)
+        _warm(pool, PRIMARY, 5.0)
+
+        assert pool.instances[0].is_ejected(time.monotonic())
+        assert not pool.instances[1].is_ejected(time.monotonic())
+
+    def test_single_instance_never_slow(self):
+        """Test that a lone instance is not ejected for being slow."""
+        pool = RSSInstancePool([PRIMARY])
+        _warm(pool, PRIMARY, 10.0)
+
+        assert not pool.instances[0].is_ejected(time.monotonic())
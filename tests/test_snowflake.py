@@ -0,0 +1,30 @@
+"""
+Tests for snowflake ID helpers.
+"""
+
+from datetime import datetime, timezone
+
+from app.snowflake import snowflake_from_datetime, snowflake_to_datetime
+
+
+class TestSnowflake:
+    """Tests for converting between snowflakes and timestamps."""
+
+    def test_decodes_known_tweet(self):
+        """Test decoding the timestamp of a real tweet ID."""
+        created = snowflake_to_datetime("1212092628029698048")
+
+        assert created == datetime(2019, 12, 31, 19, 26, 16, 771000, tzinfo=timezone.utc)
+
+    def test_round_trip(self):
+        """Test that encoding then decoding preserves the millisecond."""
+        moment = datetime(2025, 6, 1, 12, 0, 0, 123000, tzinfo=timezone.utc)
+
+        assert snowflake_to_datetime(snowflake_from_datetime(moment)) == moment
+
+    def test_ordering(self):
+        """Test that later moments give larger IDs."""
+        earlier = snowflake_from_datetime(datetime(2025, 1, 1, tzinfo=timezone.utc))
+        later = snowflake_from_datetime(datetime(2025, 1, 2, tzinfo=timezone.utc))
+
+        assert earlier < later
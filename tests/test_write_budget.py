@@ -0,0 +1,123 @@
+"""
+Tests for the process-wide X write budget.
+
+Tests pacing, header accounting, rate-limit blocking and persistence.
+"""
+
+import json
+
+from app.database import get_poll_state
+from app.write_budget import (
+    BUDGET_STATE_KEY,
+    WriteBudget,
+    get_write_budget,
+    reset_write_budget,
+    save_write_budget,
+)
+
+DAY = 24 * 3600
+
+
+class _Clock:
+    """Manually advanced wall clock."""
+
+    def __init__(self, now: float = 1_700_000_000.0):
+        self.now = now
+
+    def __call__(self) -> float:
+        return self.now
+
+
+def _headers(prefix: str, limit: int, remaining: int, reset: float) -> dict:
+    return {
+        f"{prefix}-limit": str(limit),
+        f"{prefix}-remaining": str(remaining),
+        f"{prefix}-reset": str(int(reset)),
+    }
+
+
+class TestPacing:
+    """Tests for the token bucket over the daily allowance."""
+
+    def test_burst_then_paced(self):
+        """Test that a burst goes out at once, then posts are spread over the day."""
+        clock = _Clock()
+        budget = WriteBudget(daily_limit=24, burst=2, clock=clock)
+
+        for _ in range(2):
+            assert budget.wait_time() == 0
+            budget.record_post({})
+
+        # 22 posts left for a day: one about every 65 minutes
+        assert 3900 <= budget.wait_time() <= 3940
+
+    def test_unused_budget_speeds_up_pace(self):
+        """Test that allowance left near the reset is spent faster."""
+        clock = _Clock()
+        budget = WriteBudget(daily_limit=24, burst=1, clock=clock)
+        budget.record_post({})
+
+        clock.now += DAY - 3600  # quiet day, 23 posts left for the last hour
+
+        budget.record_post({})
+        assert budget.wait_time() < 200
+
+    def test_exhausted_window_blocks_until_reset(self):
+        """Test that no post is allowed once a window has nothing left."""
+        clock = _Clock()
+        budget = WriteBudget(daily_limit=0, burst=5, clock=clock)
+
+        budget.record_post(_headers("x-rate-limit", 100, 0, clock.now + 300))
+
+        assert budget.wait_time() == 300
+        clock.now += 300
+        assert budget.wait_time() == 0
+
+
+class TestHeaders:
+    """Tests for accounting from X's rate-limit headers."""
+
+    def test_headers_override_local_count(self):
+        """Test that X's remaining count replaces the local estimate."""
+        clock = _Clock()
+        budget = WriteBudget(daily_limit=17, burst=3, clock=clock)
+
+        budget.record_post(_headers("x-user-limit-24hour", 100, 40, clock.now + DAY))
+
+        window = budget.stats()["windows"]["24hour"]
+        assert window["limit"] == 100
+        assert window["remaining"] == 40
+
+    def test_local_count_without_headers(self):
+        """Test that posts are counted locally when X sends no headers."""
+        budget = WriteBudget(daily_limit=17, burst=3, clock=_Clock())
+
+        budget.record_post({})
+
+        assert budget.stats()["windows"]["24hour"]["remaining"] == 16
+
+    def test_rate_limit_without_headers_blocks(self):
+        """Test that a bare 429 still pauses posting."""
+        budget = WriteBudget(daily_limit=17, burst=3, clock=_Clock())
+
+        budget.record_rate_limited({})
+
+        assert budget.wait_time() == 15 * 60
+
+
+class TestPersistence:
+    """Tests for saving the budget in SQLite."""
+
+    def test_state_survives_restart(self, test_settings):
+        """Test that posts made before a restart still count."""
+        budget = get_write_budget()
+        budget.record_post({})
+        budget.record_post({})
+        save_write_budget()
+
+        reset_write_budget()
+        restored = get_write_budget()
+
+        assert restored is not budget
+        assert restored.stats()["windows"]["24hour"]["remaining"] == test_settings.reply_rate_limit - 2
+        assert json.loads(get_poll_state(BUDGET_STATE_KEY))["windows"]["24hour"]["limit"] == 17